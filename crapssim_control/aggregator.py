@@ -1,11 +1,30 @@
+"""
+aggregator.py -- roll batch/sweep run reports up into index, aggregates and leaderboard files.
+
+Report-derived metrics are cached per run in ``metrics_index.sqlite`` next to
+``batch_manifest.json``, keyed by run_id together with the report's path,
+mtime and size. Re-aggregating only opens reports that are new or changed
+(in parallel); ``metrics-only`` items are read straight from the summary in
+their manifest record. Summaries and correlations are built from running aggregates
+fed once per row.
+"""
+
 import csv
+import heapq
 import json
 import os
+import sqlite3
 import statistics
 import zipfile
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from .comparator import make_comparisons, make_leaderboard
+from .analytics.streaming import RunningStats
+from .comparator import RunningCorrelations, make_comparisons, make_leaderboard
+
+METRICS_INDEX_NAME = "metrics_index.sqlite"
+METRICS_INDEX_VERSION = 1
+SUMMARY_METRICS = ("ROI", "bankroll_final", "hands", "rolls")
 
 
 def _load_json(path: str) -> Any:
@@ -57,76 +76,319 @@ def _compute_roi(
         return None
 
 
+class MetricSummary:
+    """Running summary of one metric: moments, extremes, values for the median, top-k heap."""
+
+    __slots__ = ("metric", "top_k", "stats", "values", "_sum", "_min", "_max", "_top", "_order")
+
+    def __init__(self, metric: str, top_k: int = 10) -> None:
+        self.metric = metric
+        self.top_k = top_k
+        self.stats = RunningStats()
+        self.values: List[float] = []
+        # raw sum and extremes: integer metrics stay ints, as in statistics.mean/min/max
+        self._sum: float = 0
+        self._min: Optional[float] = None
+        self._max: Optional[float] = None
+        self._top: List[Tuple[float, int, str]] = []  # min-heap of the current top_k
+        self._order = 0
+
+    def push(self, row: Dict[str, Any]) -> None:
+        val = row.get(self.metric)
+        if not isinstance(val, (int, float)):
+            return
+        self.stats.push(val)
+        self.values.append(val)
+        self._sum += val
+        if self._min is None or val < self._min:
+            self._min = val
+        if self._max is None or val > self._max:
+            self._max = val
+        if self.top_k <= 0:
+            return
+        # ties keep first-seen order, matching a stable descending sort
+        self._order -= 1
+        item = (val, self._order, row["run_id"])
+        if len(self._top) < self.top_k:
+            heapq.heappush(self._top, item)
+        elif item > self._top[0]:
+            heapq.heapreplace(self._top, item)
+
+    def result(self) -> Dict[str, Any]:
+        st = self.stats
+        n = st.count
+        mean: Optional[float] = None
+        if n and isinstance(self._sum, int):
+            whole, rem = divmod(self._sum, n)
+            mean = whole if rem == 0 else self._sum / n
+        elif n:
+            mean = st.mean
+        agg: Dict[str, Any] = {
+            "count": n,
+            "mean": mean,
+            "median": statistics.median(self.values) if n else None,
+            "stdev": st.stddev if n > 1 else 0 if n == 1 else None,
+            "min": self._min,
+            "max": self._max,
+        }
+        top = sorted(self._top, reverse=True)
+        agg["top_k"] = [{"run_id": run_id, self.metric: val} for val, _, run_id in top]
+        return agg
+
+
 def _summarize_rows(rows: List[Dict[str, Any]], metric: str, top_k: int = 10) -> Dict[str, Any]:
-    vals = [r[metric] for r in rows if isinstance(r.get(metric), (int, float))]
-    agg: Dict[str, Any] = {
-        "count": len(vals),
-        "mean": statistics.mean(vals) if vals else None,
-        "median": statistics.median(vals) if vals else None,
-        "stdev": statistics.stdev(vals) if len(vals) > 1 else 0 if len(vals) == 1 else None,
-        "min": min(vals) if vals else None,
-        "max": max(vals) if vals else None,
+    summary = MetricSummary(metric, top_k)
+    for r in rows:
+        summary.push(r)
+    return summary.result()
+
+
+# ---------------------------------------------------------------------------
+# Persistent per-run metrics index
+# ---------------------------------------------------------------------------
+
+
+def _report_sources(rec: Dict[str, Any]) -> List[Tuple[str, int, int]]:
+    """``(path, mtime_ns, size)`` of each report a manifest item can resolve to, preferred first."""
+
+    candidates = []
+    if rec.get("artifacts_dir") and os.path.isdir(rec["artifacts_dir"]):
+        candidates.append(os.path.join(rec["artifacts_dir"], "report.json"))
+    if rec.get("output_zip"):
+        candidates.append(rec["output_zip"])
+    sources = []
+    for path in candidates:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        if os.path.isfile(path):
+            sources.append((os.path.abspath(path), st.st_mtime_ns, st.st_size))
+    return sources
+
+
+def _report_metrics(report: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    if not report:
+        return None
+    # Expect stable fields; tolerate missing values
+    final = _get_metric(report, ["summary", "bankroll_final"])
+    start = _get_metric(report, ["summary", "bankroll_start"])
+    return {
+        "bankroll_final": final,
+        "ROI": _compute_roi(final, start),
+        "hands": _get_metric(report, ["summary", "hands_played"]),
+        "rolls": _get_metric(report, ["summary", "rolls"]),
+        "max_drawdown": _get_metric(report, ["summary", "max_drawdown"]),
+        "pso_count": _get_metric(report, ["summary", "pso_count"]),
+        "points_made": _get_metric(report, ["summary", "points_made"]),
+        "top_bet_family": _get_metric(report, ["by_bet_family", "top_name"]),
     }
-    top = sorted(
-        [r for r in rows if isinstance(r.get(metric), (int, float))],
-        key=lambda r: r[metric],
-        reverse=True,
-    )[:top_k]
-    agg["top_k"] = [{"run_id": r["run_id"], metric: r[metric]} for r in top]
-    return agg
 
 
-def aggregate(
-    out_dir: str, leaderboard_metric: str = "ROI", top_k: int = 10, write_comparisons: bool = False
-) -> Dict[str, Any]:
-    manifest_path = os.path.join(out_dir, "batch_manifest.json")
-    batch_manifest = _load_json(manifest_path)
+def _read_metrics(path: str) -> Optional[Dict[str, Any]]:
+    if path.endswith(".json"):
+        try:
+            report = _load_json(path)
+        except (OSError, ValueError):
+            return None
+    else:
+        report = _read_report_from_zip(path)
+    return _report_metrics(report)
+
+
+def _read_first_metrics(
+    sources: List[Tuple[str, int, int]],
+) -> Tuple[Tuple[str, int, int], Optional[Dict[str, Any]]]:
+    """Metrics of the first readable source; an unreadable report.json falls back to the zip."""
+
+    for source in sources:
+        metrics = _read_metrics(source[0])
+        if metrics:
+            return source, metrics
+    return sources[0], None
+
+
+class MetricsIndex:
+    """
+    SQLite cache of report-derived metrics per run.
+
+    A row is reused while the run's report path, mtime and size are unchanged.
+    Any failure to open or write the database degrades to "no cache".
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = sqlite3.connect(path)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " key TEXT PRIMARY KEY, report TEXT NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " size INTEGER NOT NULL, metrics TEXT)"
+            )
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT)")
+            row = conn.execute("SELECT value FROM meta WHERE name = 'version'").fetchone()
+            if row is None or row[0] != str(METRICS_INDEX_VERSION):
+                conn.execute("DELETE FROM runs")
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                    (str(METRICS_INDEX_VERSION),),
+                )
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error:
+            self._conn = None
+
+    def load(self) -> Dict[str, Tuple[str, int, int, Optional[Dict[str, Any]]]]:
+        if self._conn is None:
+            return {}
+        try:
+            cur = self._conn.execute("SELECT key, report, mtime_ns, size, metrics FROM runs")
+            return {
+                key: (report, mtime_ns, size, json.loads(metrics) if metrics else None)
+                for key, report, mtime_ns, size, metrics in cur
+            }
+        except (sqlite3.Error, ValueError):
+            return {}
+
+    def store(
+        self,
+        entries: Iterable[Tuple[str, str, int, int, Optional[Dict[str, Any]]]],
+        keep: Iterable[str],
+    ) -> None:
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO runs VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (key, report, mtime_ns, size, json.dumps(metrics, sort_keys=True))
+                        for key, report, mtime_ns, size, metrics in entries
+                    ],
+                )
+                keep_keys = set(keep)
+                stale = [
+                    (k,)
+                    for (k,) in self._conn.execute("SELECT key FROM runs")
+                    if k not in keep_keys
+                ]
+                if stale:
+                    self._conn.executemany("DELETE FROM runs WHERE key = ?", stale)
+        except sqlite3.Error:
+            pass
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def _index_key(rec: Dict[str, Any], source: Tuple[str, int, int]) -> str:
+    run_id = rec.get("run_id")
+    return f"{run_id}\x00{source[0]}" if run_id is not None else source[0]
+
+
+def collect_rows(
+    out_dir: str,
+    items: List[Dict[str, Any]],
+    *,
+    workers: Optional[int] = None,
+    use_index: bool = True,
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Build one index row per manifest item; returns ``(rows, reports_read)``.
+
+    Reports whose path/mtime/size match the metrics index are not reopened;
+    the rest are read on a thread pool (``workers``, default ``min(8, cpus)``).
+    """
+
+    index = MetricsIndex(os.path.join(out_dir, METRICS_INDEX_NAME)) if use_index else None
+    cached = index.load() if index is not None else {}
 
     rows: List[Dict[str, Any]] = []
-    for rec in batch_manifest.get("items", []):
-        row: Dict[str, Any] = {
-            "run_id": rec.get("run_id"),
-            "source": rec.get("source"),
-            "input_type": rec.get("input_type"),
-            "status": rec.get("status"),
-            "bankroll_final": None,
-            "ROI": None,
-            "hands": None,
-            "rolls": None,
-            "max_drawdown": None,
-            "pso_count": None,
-            "points_made": None,
-            "top_bet_family": None,
-            "artifacts_dir": rec.get("artifacts_dir"),
-            "artifacts_zip": rec.get("output_zip"),
-            "error": rec.get("error"),
-        }
+    keys: List[Optional[str]] = []
+    sources: List[List[Tuple[str, int, int]]] = []
+    metrics: List[Optional[Dict[str, Any]]] = []
+    todo: List[int] = []
+    for rec in items:
+        rows.append(
+            {
+                "run_id": rec.get("run_id"),
+                "source": rec.get("source"),
+                "input_type": rec.get("input_type"),
+                "status": rec.get("status"),
+                "bankroll_final": None,
+                "ROI": None,
+                "hands": None,
+                "rolls": None,
+                "max_drawdown": None,
+                "pso_count": None,
+                "points_made": None,
+                "top_bet_family": None,
+                "artifacts_dir": rec.get("artifacts_dir"),
+                "artifacts_zip": rec.get("output_zip"),
+                "error": rec.get("error"),
+            }
+        )
+        found = _report_sources(rec) if rec.get("status") == "success" else []
+        key = _index_key(rec, found[0]) if found else None
+        keys.append(key)
+        sources.append(found)
+        metrics.append(None)
+        if not found:
+            # metrics-only runs carry their summary in the manifest record
+            if rec.get("status") == "success" and isinstance(rec.get("summary"), dict):
+                metrics[-1] = _report_metrics({"summary": rec["summary"]})
+            continue
+        hit = cached.get(key)
+        if hit is not None and hit[:3] == found[0]:
+            metrics[-1] = hit[3]
+        else:
+            todo.append(len(rows) - 1)
 
-        report = None
-        if rec.get("status") == "success":
-            # Prefer artifacts_dir/report.json; fallback to output_zip/artifacts/report.json
-            if rec.get("artifacts_dir") and os.path.isdir(rec["artifacts_dir"]):
-                report = _read_report_from_artifacts_dir(rec["artifacts_dir"])
-            if report is None and rec.get("output_zip"):
-                report = _read_report_from_zip(rec["output_zip"])
-
-        if report:
-            # Expect stable fields; tolerate missing values
-            final = _get_metric(report, ["summary", "bankroll_final"])
-            start = _get_metric(report, ["summary", "bankroll_start"])
-            row["bankroll_final"] = final
-            row["ROI"] = _compute_roi(final, start)
-            row["hands"] = _get_metric(report, ["summary", "hands_played"])
-            row["rolls"] = _get_metric(report, ["summary", "rolls"])
-            row["max_drawdown"] = _get_metric(report, ["summary", "max_drawdown"])
-            row["pso_count"] = _get_metric(report, ["summary", "pso_count"])
-            row["points_made"] = _get_metric(report, ["summary", "points_made"])
-            row["top_bet_family"] = _get_metric(report, ["by_bet_family", "top_name"])
+    if todo:
+        n_workers = workers if workers is not None else min(8, os.cpu_count() or 1)
+        pending = [sources[i] for i in todo]
+        if n_workers > 1 and len(todo) > 1:
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(_read_first_metrics, pending))
         else:
-            if not row.get("error"):
-                row["error"] = "report_not_found"
+            results = [_read_first_metrics(found) for found in pending]
+        for i, (used, result) in zip(todo, results):
+            # only a hit on the preferred report is reused; fallbacks are reread
+            sources[i] = [used]
+            metrics[i] = result
+
+    for row, result in zip(rows, metrics):
+        if result:
+            row.update(result)
+        elif not row.get("error"):
+            row["error"] = "report_not_found"
 
-        rows.append(row)
+    if index is not None:
+        index.store(
+            ((keys[i],) + sources[i][0] + (metrics[i],) for i in todo),
+            (k for k in keys if k is not None),
+        )
+        index.close()
+    return rows, len(todo)
+
+
+def aggregate(
+    out_dir: str,
+    leaderboard_metric: str = "ROI",
+    top_k: int = 10,
+    write_comparisons: bool = False,
+    *,
+    workers: Optional[int] = None,
+    use_index: bool = True,
+) -> Dict[str, Any]:
+    manifest_path = os.path.join(out_dir, "batch_manifest.json")
+    batch_manifest = _load_json(manifest_path)
+    rows, reports_read = collect_rows(
+        out_dir, batch_manifest.get("items", []), workers=workers, use_index=use_index
+    )
 
     # Write batch_index.json
     index_path = os.path.join(out_dir, "batch_index.json")
@@ -158,17 +420,22 @@ def aggregate(
         for r in rows:
             w.writerow({k: r.get(k) for k in fieldnames})
 
-    # Aggregates & leaderboard
+    # Aggregates & leaderboard: one pass feeds every running summary
+    summaries = [MetricSummary(m, top_k) for m in SUMMARY_METRICS]
+    correlations = RunningCorrelations() if write_comparisons else None
+    successes = 0
+    for r in rows:
+        if r.get("status") == "success":
+            successes += 1
+        for summary in summaries:
+            summary.push(r)
+        if correlations is not None:
+            correlations.push(r)
     aggregates: Dict[str, Any] = {
         "total_runs": len(rows),
-        "successes": sum(1 for r in rows if r.get("status") == "success"),
-        "errors": sum(1 for r in rows if r.get("status") != "success"),
-        "metrics": {
-            "ROI": _summarize_rows(rows, "ROI", top_k=top_k),
-            "bankroll_final": _summarize_rows(rows, "bankroll_final", top_k=top_k),
-            "hands": _summarize_rows(rows, "hands", top_k=top_k),
-            "rolls": _summarize_rows(rows, "rolls", top_k=top_k),
-        },
+        "successes": successes,
+        "errors": len(rows) - successes,
+        "metrics": {summary.metric: summary.result() for summary in summaries},
     }
     aggregates_path = os.path.join(out_dir, "aggregates.json")
     with open(aggregates_path, "w", encoding="utf-8") as f:
@@ -202,7 +469,7 @@ def aggregate(
 
     comparisons_path = None
     if write_comparisons:
-        comps = make_comparisons(rows, leaderboard_metric)
+        comps = make_comparisons(rows, leaderboard_metric, correlations=correlations)
         comparisons_path = os.path.join(out_dir, "comparisons.json")
         with open(comparisons_path, "w", encoding="utf-8") as f:
             json.dump(comps, f, indent=2, sort_keys=True)
@@ -214,5 +481,7 @@ def aggregate(
         "leaderboard_path": leaderboard_path,
         "leaderboard_csv_path": leaderboard_csv_path,
         "comparisons_path": comparisons_path,
+        "metrics_index_path": (os.path.join(out_dir, METRICS_INDEX_NAME) if use_index else None),
         "rows": len(rows),
+        "reports_read": reports_read,
     }
@@ -0,0 +1,163 @@
+"""
+streaming.py -- constant-memory running statistics for long roll streams.
+
+:class:`RunningStats` keeps first/last, peak/trough, peak-to-valley drawdown and
+Welford mean/variance of a series without storing it. :class:`P2Quantile`
+estimates one quantile with the P-square algorithm (Jain & Chlamtac) in five
+markers; :class:`QuantileSketch` bundles several of them.
+
+    stats = RunningStats()
+    sketch = QuantileSketch((0.05, 0.5, 0.95))
+    for bankroll in stream:
+        stats.push(bankroll)
+        sketch.push(bankroll)
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+class RunningStats:
+    """Running summary of a numeric series in O(1) memory."""
+
+    __slots__ = ("count", "first", "last", "peak", "trough", "max_drawdown", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.first: Optional[float] = None
+        self.last: Optional[float] = None
+        self.peak: Optional[float] = None
+        self.trough: Optional[float] = None
+        self.max_drawdown = 0.0  # largest drop from a running peak
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        self.count += 1
+        if self.count == 1:
+            self.first = self.peak = self.trough = x
+        else:
+            if x > self.peak:
+                self.peak = x
+            elif x < self.trough:
+                self.trough = x
+            dd = self.peak - x
+            if dd > self.max_drawdown:
+                self.max_drawdown = dd
+        self.last = x
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def extend(self, xs: Iterable[float]) -> "RunningStats":
+        for x in xs:
+            self.push(x)
+        return self
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two observations)."""
+
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class P2Quantile:
+    """Streaming estimate of quantile ``q`` using five markers (P-square algorithm)."""
+
+    __slots__ = ("q", "_heights", "_pos", "_desired", "_incr", "_count")
+
+    def __init__(self, q: float) -> None:
+        if not 0.0 < q < 1.0:
+            raise ValueError("quantile must be in (0, 1)")
+        self.q = float(q)
+        self._heights: List[float] = []
+        self._pos = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * q, 4 * q, 2 + 2 * q, 4.0]
+        self._incr = [0.0, q / 2, q, (1 + q) / 2, 1.0]
+        self._count = 0
+
+    def push(self, x: float) -> None:
+        x = float(x)
+        self._count += 1
+        h = self._heights
+        if self._count <= 5:
+            h.append(x)
+            if self._count == 5:
+                h.sort()
+            return
+
+        if x < h[0]:
+            h[0] = x
+            k = 0
+        elif x >= h[4]:
+            h[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= h[k + 1]:
+                k += 1
+        pos = self._pos
+        for i in range(k + 1, 5):
+            pos[i] += 1
+        desired = self._desired
+        for i in range(5):
+            desired[i] += self._incr[i]
+
+        for i in (1, 2, 3):
+            d = desired[i] - pos[i]
+            if (d >= 1 and pos[i + 1] - pos[i] > 1) or (d <= -1 and pos[i - 1] - pos[i] < -1):
+                step = 1 if d > 0 else -1
+                candidate = self._parabolic(i, step)
+                if h[i - 1] < candidate < h[i + 1]:
+                    h[i] = candidate
+                else:
+                    h[i] += step * (h[i + step] - h[i]) / (pos[i + step] - pos[i])
+                pos[i] += step
+
+    def _parabolic(self, i: int, d: int) -> float:
+        h, n = self._heights, self._pos
+        return h[i] + d / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + d) * (h[i + 1] - h[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - d) * (h[i] - h[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        if self._count == 0:
+            return None
+        if self._count < 5:
+            ordered = sorted(self._heights)
+            return ordered[min(len(ordered) - 1, int(self.q * len(ordered)))]
+        return self._heights[2]
+
+
+class QuantileSketch:
+    """Several :class:`P2Quantile` estimators fed from one stream."""
+
+    __slots__ = ("_estimators",)
+
+    def __init__(self, quantiles: Sequence[float] = (0.05, 0.5, 0.95)) -> None:
+        self._estimators = tuple(P2Quantile(q) for q in quantiles)
+
+    def push(self, x: float) -> None:
+        for est in self._estimators:
+            est.push(x)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        """``{"p05": ..., "p50": ...}`` keyed by percentile."""
+
+        return {_label(est.q): est.value() for est in self._estimators}
+
+
+def _label(q: float) -> str:
+    pct = q * 100
+    return f"p{int(pct):02d}" if float(pct).is_integer() else f"p{pct:g}"
+
+
+__all__ = ["P2Quantile", "QuantileSketch", "RunningStats"]
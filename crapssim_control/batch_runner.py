@@ -1,20 +1,22 @@
 import json
 import os
 import shutil
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
+from .rng import RngStreams
+from .run.artifacts import RUN_METRICS_NAME, normalize_artifact_level
 from .utils.dna_conveyor import (
     spec_seed_fingerprint,
+    pack_spec_with_artifacts,
     unpack_bundle,
     repack_with_artifacts,
 )
 
-# These imports are expected to exist in the project already
-# Controller/single-run entrypoints should remain unchanged
+# In-process single-run entrypoint; one warm worker per process is reused across items.
 try:
     from .controller import (
         run_single,
-    )  # expected signature: run_single(spec_path_or_dict, out_dir) -> artifacts_dir
+    )  # run_single(spec_path_or_dict, out_dir, *, seed, rolls, artifacts) -> SingleRunResult
 except Exception:  # pragma: no cover
     run_single = None  # tests will mock or skip if unavailable
 
@@ -63,16 +65,136 @@ def _ensure_dir(p: str) -> str:
     return p
 
 
+def _spec_has_seed(spec: Dict[str, Any]) -> bool:
+    run = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+    return run.get("seed", spec.get("seed")) is not None
+
+
+def _result_status(run_result: Any) -> Dict[str, Any]:
+    """Manifest ``status``/``error`` for a run: anything but an ok run is an error."""
+
+    if run_result.status == "ok":
+        return {"status": "success"}
+    return {"status": "error", "error": "; ".join(run_result.errors) or run_result.status}
+
+
+def _run_loaded(
+    spec: Dict[str, Any],
+    seed: Optional[Dict[str, Any]],
+    record: Dict[str, Any],
+    out_root: str,
+    *,
+    engine_version: str,
+    csc_version: str,
+    artifacts: str,
+    pack: Callable[[str, str], None],
+    default_seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run a loaded spec and fill ``record``; ``pack(artifacts_dir, zip_path)`` writes the zip.
+
+    ``default_seed`` (the item's stream from a plan-level root seed) applies
+    only when neither a ``seed.json`` nor the spec itself carries a seed.
+    """
+
+    item_path = record["source"]
+    if seed is None and default_seed is not None and not _spec_has_seed(spec):
+        seed = {"seed": default_seed}
+    run_id = spec_seed_fingerprint(spec, seed, engine_version, csc_version)
+    seed_value = seed.get("seed") if isinstance(seed, dict) else None
+
+    run_out = os.path.join(out_root, run_id)
+    if artifacts == "metrics-only" and run_single is not None:
+        run_result = run_single(
+            spec_path_or_dict=spec,
+            out_dir=run_out,
+            seed=seed_value,
+            artifacts=artifacts,
+            metrics_path=os.path.join(out_root, RUN_METRICS_NAME),
+            run_id=run_id,
+            source=item_path,
+        )
+        record.update(
+            {
+                "run_id": run_id,
+                "artifacts": artifacts,
+                "artifacts_dir": None,
+                "output_zip": None,
+                **_result_status(run_result),
+                "run_status": run_result.status,
+                "seed": run_result.seed,
+                "rolls": run_result.rolls,
+                "summary": {
+                    "bankroll_start": run_result.bankroll_start,
+                    "bankroll_final": run_result.bankroll_final,
+                    "rolls": run_result.rolls,
+                    "hands_played": run_result.hands,
+                },
+            }
+        )
+        if run_result.errors:
+            record["run_errors"] = list(run_result.errors)
+        return record
+
+    _ensure_dir(run_out)
+    # Delegate to existing single-run path if available; else emit placeholders
+    artifacts_dir = None
+    run_result = None
+    if run_single is not None:
+        run_result = run_single(
+            spec_path_or_dict=spec,
+            out_dir=run_out,
+            seed=seed_value,
+            artifacts=artifacts,
+            run_id=run_id,
+            source=item_path,
+        )
+        artifacts_dir = run_result.artifacts_dir
+    else:
+        # Minimal placeholder: ensure folder and write a trivial manifest
+        artifacts_dir = run_out
+        with open(os.path.join(artifacts_dir, "manifest.json"), "w", encoding="utf-8") as f:
+            json.dump({"run_id": run_id, "note": "placeholder artifacts (run_single missing)"}, f)
+
+    # Always generate an output zip that preserves unknown payloads and adds artifacts/
+    output_zip = os.path.join(out_root, f"{run_id}.zip")
+    pack(artifacts_dir, output_zip)
+
+    record.update(
+        {
+            "run_id": run_id,
+            "artifacts_dir": artifacts_dir,
+            "output_zip": output_zip,
+            "status": "success",
+        }
+    )
+    if run_result is not None:
+        record["artifacts"] = artifacts
+        record["seed"] = run_result.seed
+        record.update(_result_status(run_result))
+        record["run_status"] = run_result.status
+        if run_result.errors:
+            record["run_errors"] = list(run_result.errors)
+    return record
+
+
 def run_single_bundle_or_spec(
     item_path: str,
     out_root: str,
     engine_version: str = "engine-unknown",
     csc_version: str = "csc-unknown",
+    artifacts: str = "standard",
+    default_seed: Optional[int] = None,
 ) -> Dict[str, Any]:
     """
     Execute a single batch item. Accepts a .zip bundle or a path to spec.json.
     Returns a record for batch_manifest.
+
+    With ``artifacts="metrics-only"`` no per-run directory or output zip is
+    written; the run appends one record to ``<out_root>/run_metrics.jsonl``
+    and the manifest record carries the seed, rolls and summary instead.
     """
+    artifacts = normalize_artifact_level(artifacts, "standard")
     temp_dir = None
     is_zip = False
     record: Dict[str, Any] = {
@@ -84,40 +206,23 @@ def run_single_bundle_or_spec(
         root, is_zip = unpack_bundle(item_path)
         temp_dir = root if is_zip else None
 
-        spec, seed, spec_path = _find_spec_and_seed(root)
-        run_id = spec_seed_fingerprint(spec, seed, engine_version, csc_version)
-
-        run_out = _ensure_dir(os.path.join(out_root, run_id))
-        # Delegate to existing single-run path if available; else emit placeholders
-        artifacts_dir = None
-        if run_single is not None:
-            artifacts_dir = run_single(spec_path_or_dict=spec, out_dir=run_out)
-        else:
-            # Minimal placeholder: ensure folder and write a trivial manifest
-            artifacts_dir = run_out
-            with open(os.path.join(artifacts_dir, "manifest.json"), "w", encoding="utf-8") as f:
-                json.dump(
-                    {"run_id": run_id, "note": "placeholder artifacts (run_single missing)"}, f
-                )
-
-        # Always generate an output zip that preserves unknown payloads and adds artifacts/
-        output_zip = os.path.join(out_root, f"{run_id}.zip")
-        repack_with_artifacts(
-            input_path=item_path,
-            artifacts_dir=artifacts_dir,
-            output_zip_path=output_zip,
-            artifacts_prefix="artifacts/",
-        )
-
-        record.update(
-            {
-                "run_id": run_id,
-                "artifacts_dir": artifacts_dir,
-                "output_zip": output_zip,
-                "status": "success",
-            }
+        spec, seed, _spec_path = _find_spec_and_seed(root)
+        return _run_loaded(
+            spec,
+            seed,
+            record,
+            out_root,
+            engine_version=engine_version,
+            csc_version=csc_version,
+            artifacts=artifacts,
+            pack=lambda artifacts_dir, output_zip: repack_with_artifacts(
+                input_path=item_path,
+                artifacts_dir=artifacts_dir,
+                output_zip_path=output_zip,
+                artifacts_prefix="artifacts/",
+            ),
+            default_seed=default_seed,
         )
-        return record
     except Exception as e:
         record.update({"status": "error", "error": str(e)})
         return record
@@ -126,6 +231,83 @@ def run_single_bundle_or_spec(
             shutil.rmtree(temp_dir, ignore_errors=True)
 
 
+def run_spec_item(
+    spec: Dict[str, Any],
+    source: str,
+    out_root: str,
+    engine_version: str = "engine-unknown",
+    csc_version: str = "csc-unknown",
+    artifacts: str = "standard",
+    seed: Optional[Dict[str, Any]] = None,
+    default_seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Execute an in-memory spec as a batch item (no spec file needed).
+
+    ``source`` is recorded as the item's origin; the output zip holds the
+    spec as ``spec.json`` next to ``artifacts/``.
+    """
+    artifacts = normalize_artifact_level(artifacts, "standard")
+    record: Dict[str, Any] = {"source": source, "input_type": "spec", "status": "pending"}
+    try:
+        return _run_loaded(
+            spec,
+            seed,
+            record,
+            out_root,
+            engine_version=engine_version,
+            csc_version=csc_version,
+            artifacts=artifacts,
+            pack=lambda artifacts_dir, output_zip: pack_spec_with_artifacts(
+                spec, artifacts_dir, output_zip, artifacts_prefix="artifacts/"
+            ),
+            default_seed=default_seed,
+        )
+    except Exception as e:
+        record.update({"status": "error", "error": str(e)})
+        return record
+
+
+class BatchManifestWriter:
+    """
+    Stream ``batch_manifest.json`` one record at a time.
+
+    The file is byte-identical to ``json.dump(manifest, f, indent=2,
+    sort_keys=True)`` of the same manifest, but records are never held in
+    memory together. It is written to a temp file and moved into place on
+    :meth:`close`.
+    """
+
+    def __init__(self, path: str, header: Dict[str, Any]) -> None:
+        self.path = path
+        self.count = 0
+        self._tail = {k: v for k, v in header.items() if k > "items"}
+        self._tmp = path + ".tmp"
+        self._fh = open(self._tmp, "w", encoding="utf-8")
+        self._fh.write("{\n")
+        for key in sorted(k for k in header if k < "items"):
+            self._fh.write(f"  {json.dumps(key)}: {self._dump(header[key])},\n")
+        self._fh.write('  "items": [')
+
+    @staticmethod
+    def _dump(value: Any) -> str:
+        return json.dumps(value, indent=2, sort_keys=True).replace("\n", "\n  ")
+
+    def add(self, record: Dict[str, Any]) -> None:
+        item = json.dumps(record, indent=2, sort_keys=True).replace("\n", "\n    ")
+        self._fh.write(("," if self.count else "") + "\n    " + item)
+        self.count += 1
+
+    def close(self) -> str:
+        self._fh.write("\n  ]" if self.count else "]")
+        for key in sorted(self._tail):
+            self._fh.write(f",\n  {json.dumps(key)}: {self._dump(self._tail[key])}")
+        self._fh.write("\n}")
+        self._fh.close()
+        os.replace(self._tmp, self.path)
+        return self.path
+
+
 def load_plan(plan_path: str) -> Dict[str, Any]:
     """
     Minimal plan loader supporting YAML (if PyYAML available) or JSON.
@@ -150,10 +332,19 @@ def load_plan(plan_path: str) -> Dict[str, Any]:
         raise
 
 
-def run_batch(plan_path: str) -> Dict[str, Any]:
+def run_batch(plan_path: str, *, artifacts: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Run every plan item and write ``batch_manifest.json`` under ``out_dir``.
+
+    ``artifacts`` (default: the plan's ``artifacts`` key, else ``standard``)
+    selects the per-run artifact profile for the whole batch. A plan-level
+    ``seed`` gives every unseeded item ``i`` its own stream,
+    ``RngStreams(seed).item(i)``, so results do not depend on run order.
+    """
     plan = load_plan(plan_path)
     if not isinstance(plan, dict):
         raise TypeError("Batch plan must be a mapping")
+    level = normalize_artifact_level(artifacts or plan.get("artifacts"), "standard")
     raw_items = plan.get("items", [])
     items = []
     for entry in raw_items:
@@ -170,17 +361,27 @@ def run_batch(plan_path: str) -> Dict[str, Any]:
     engine_version = plan.get("engine_version", "engine-unknown")
     csc_version = plan.get("csc_version", "csc-unknown")
 
+    root_seed = plan.get("seed")
+    streams = RngStreams(root_seed) if root_seed is not None else None
+
     batch_manifest = {
         "plan": os.path.basename(plan_path),
         "out_dir": out_root,
+        "artifacts": level,
         "items": [],
     }
-    for p in items:
+    if root_seed is not None:
+        batch_manifest["seed"] = root_seed
+    if level == "metrics-only":
+        batch_manifest["metrics_path"] = os.path.join(out_root, RUN_METRICS_NAME)
+    for index, p in enumerate(items):
         rec = run_single_bundle_or_spec(
             item_path=p,
             out_root=out_root,
             engine_version=engine_version,
             csc_version=csc_version,
+            artifacts=level,
+            default_seed=streams.item_seed(index) if streams is not None else None,
         )
         batch_manifest["items"].append(rec)
 
@@ -2,7 +2,11 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
+
+from .. import hotpath
+from ..run.decisions_trace import is_error_reason, sampled_roll
+from ..run.flight_recorder import DEFAULT_CAPACITY, DEFAULT_POST_TRIGGER, FlightRecorder
 
 
 @dataclass
@@ -25,11 +29,73 @@ DecisionSnapshot = Dict[str, Any]
 
 
 class DecisionsJournal:
-    def __init__(self, artifacts_dir: str, verbose: bool = False):
+    """
+    Appends DSL decision attempts to ``decisions.jsonl``.
+
+    Takes the same ``mode``/``capacity``/``post_trigger``/``sample_every`` options as
+    :class:`~crapssim_control.run.decisions_trace.DecisionsTrace`. In flight mode an
+    attempt whose reason ends in ``ERROR`` dumps the buffer, preceded by a
+    ``{"trigger": ...}`` line.
+    """
+
+    def __init__(
+        self,
+        artifacts_dir: str,
+        verbose: bool = False,
+        *,
+        mode: str = "full",
+        capacity: int = DEFAULT_CAPACITY,
+        post_trigger: int = DEFAULT_POST_TRIGGER,
+        sample_every: int = 1,
+    ):
         self.path = Path(artifacts_dir) / "decisions.jsonl"
         self.verbose = verbose
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.mode = mode
+        self.sample_every = max(1, int(sample_every)) if mode == "sample" else 1
+        self._recorder: Optional[FlightRecorder] = None
+        if mode == "flight":
+            self._recorder = FlightRecorder(
+                self._append,
+                capacity=capacity,
+                post_trigger=post_trigger,
+                is_trigger=_attempt_trigger,
+            )
 
     def write(self, attempt: DecisionAttempt) -> None:
+        t_span = hotpath.start()
+        try:
+            if self._recorder is not None:
+                self._recorder.record(attempt)
+                return
+            if self.sample_every > 1 and not sampled_roll(attempt.roll_index, self.sample_every):
+                return
+            self._append((attempt,), None)
+        finally:
+            hotpath.stop("journal.dsl_attempt", t_span)
+
+    def trigger(self, reason: str) -> int:
+        """Flight mode: dump buffered attempts now. Returns attempts dumped."""
+
+        if self._recorder is None:
+            return 0
+        return self._recorder.trigger(reason)
+
+    def _append(self, attempts: Sequence[DecisionAttempt], reason: Optional[str]) -> None:
+        lines = []
+        if reason is not None:
+            marker: Dict[str, Any] = {"trigger": reason}
+            if attempts:
+                marker["roll_index"] = attempts[-1].roll_index
+            lines.append(json.dumps(marker, separators=(",", ":")))
+        lines.extend(json.dumps(asdict(a), separators=(",", ":")) for a in attempts)
+        if not lines:
+            return
         with self.path.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(asdict(attempt), separators=(",", ":")) + "\n")
+            f.write("\n".join(lines) + "\n")
+
+
+def _attempt_trigger(attempt: DecisionAttempt) -> Optional[str]:
+    if is_error_reason(attempt.reason):
+        return f"rule_error:{attempt.reason}"
+    return None
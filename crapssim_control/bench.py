@@ -0,0 +1,620 @@
+"""
+bench.py -- fixed scenario catalog for ``crapssim-ctl bench``.
+
+Each scenario builds a small, self-contained workload (stub rolls, live engine,
+DSL- and rule-heavy strategies, journaling on/off, the external command
+channel, the HTTP transports against a local stand-in engine, batch/sweep items
+and report generation) and times one operation at a time so the results carry
+per-op latency percentiles as well as throughput.
+
+Results are plain JSON (``BENCH_SCHEMA_VERSION``) so they can be stored next to
+``baselines/`` and diffed with :func:`compare_results`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .events import event_for_roll
+
+BENCH_SCHEMA_VERSION = "1.0"
+DEFAULT_RESULTS_PATH = Path("baselines") / "bench" / "latest.json"
+DEFAULT_BASELINE_PATH = Path("baselines") / "bench" / "baseline.json"
+
+# Regression thresholds, as fractions of the baseline value.
+DEFAULT_MAX_THROUGHPUT_DROP = 0.20
+DEFAULT_MAX_P99_GROWTH = 0.50
+
+_ALLOC_SAMPLE_OPS = 200
+
+
+@dataclass
+class BenchContext:
+    """Shared inputs handed to every scenario setup."""
+
+    workdir: Path
+    seed: int = 42
+
+
+@dataclass
+class BenchCase:
+    """A prepared workload: ``op`` runs one unit of work, ``close`` releases resources."""
+
+    op: Callable[[], Any]
+    close: Optional[Callable[[], None]] = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    description: str
+    setup: Callable[[BenchContext], BenchCase]
+    ops: int
+    quick_ops: int
+    unit: str = "roll"
+    requires: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Workload helpers
+# ---------------------------------------------------------------------------
+
+
+def _base_spec(seed: int, **run_overrides: Any) -> Dict[str, Any]:
+    run: Dict[str, Any] = {
+        "seed": seed,
+        "bankroll": 1_000_000,
+        "stop_on_bankrupt": False,
+        "stop_on_unactionable": False,
+        "http_commands": {"enabled": False},
+    }
+    run.update(run_overrides)
+    return {
+        "table": {"bubble": False, "level": 10},
+        "variables": {"units": 10},
+        "modes": {"Main": {"template": {"pass": "units", "place": {"6": 12, "8": 12}}}},
+        "rules": [],
+        "run": run,
+    }
+
+
+def _dsl_ruleset(copies: int = 4) -> str:
+    lines: List[str] = []
+    for idx in range(copies):
+        amt = 5 * (idx + 1)
+        for number in (4, 5, 6, 8, 9, 10):
+            lines.append(
+                f"WHEN point_on AND bets.{number} == 0 AND bankroll > {100 * idx} "
+                f"THEN place_bet(number={number}, amount={amt})"
+            )
+        lines.append(
+            f"WHEN NOT point_on AND bankroll > {100 * idx} THEN line_bet(side=pass, amount=10)"
+        )
+    return "\n".join(lines)
+
+
+def _brain_rules(count: int = 32) -> List[Dict[str, Any]]:
+    rules: List[Dict[str, Any]] = []
+    for idx in range(count):
+        rules.append(
+            {
+                "id": f"bench_{idx:03d}",
+                "when": f"bankroll_after < {500 + idx} or box_hits >= {idx + 50}",
+                "scope": "roll",
+                "cooldown": 0,
+                "action": "switch_profile('Main')",
+                "enabled": True,
+            }
+        )
+    return rules
+
+
+def _adapter_case(
+    spec: Dict[str, Any], *, transport: Any = None, dsl_path: Optional[str] = None
+) -> BenchCase:
+    from .engine_adapter import VanillaAdapter
+
+    adapter = VanillaAdapter(transport) if transport is not None else VanillaAdapter()
+    adapter.start_session(spec)
+    if dsl_path:
+        adapter.load_ruleset(dsl_path)
+    return BenchCase(op=adapter.step_roll)
+
+
+def _controller_case(
+    spec: Dict[str, Any], ctx: BenchContext, *, commands: bool = False
+) -> tuple[BenchCase, Any]:
+    from .controller import ControlStrategy
+    from .engine_adapter import VanillaAdapter
+
+    run_blk = spec.setdefault("run", {})
+    run_blk.setdefault(
+        "external",
+        {
+            "mode": "live",
+            "tape_path": str(ctx.workdir / "command_tape.jsonl"),
+            "limits": {
+                "queue_max_depth": 1_000_000,
+                "per_source_quota": 1_000_000,
+                "rate": {"tokens": 1_000_000, "refill_seconds": 0.001},
+            },
+        },
+    )
+    adapter = VanillaAdapter()
+    adapter.start_session(spec)
+    ctrl = ControlStrategy(spec)
+    state: Dict[str, Any] = {"prev_point": None, "seq": 0}
+    verbs = ("press", "regress", "same_bet")
+
+    def op() -> None:
+        if commands:
+            state["seq"] += 1
+            ctrl.command_queue.enqueue(
+                {
+                    "run_id": ctrl.run_id,
+                    "action": verbs[state["seq"] % len(verbs)],
+                    "args": {"bet": "6", "units": 1},
+                    "source": "bench",
+                    "correlation_id": f"bench-{state['seq']}",
+                }
+            )
+        result = adapter.step_roll()
+        ctrl.handle_event(event_for_roll(state["prev_point"], result), adapter.bets)
+        state["prev_point"] = (result.get("snapshot") or {}).get("point_value")
+
+    return BenchCase(op=op, close=ctrl.stop), ctrl
+
+
+# ---------------------------------------------------------------------------
+# Scenario setups
+# ---------------------------------------------------------------------------
+
+
+def _setup_stub_rolls(ctx: BenchContext) -> BenchCase:
+    return _adapter_case(_base_spec(ctx.seed))
+
+
+def _setup_live_engine(ctx: BenchContext) -> BenchCase:
+    return _adapter_case(_base_spec(ctx.seed, adapter={"live_engine": True}))
+
+
+def _setup_dsl_heavy(ctx: BenchContext) -> BenchCase:
+    spec = _base_spec(ctx.seed, journal={"dsl_trace": True})
+    rules_path = ctx.workdir / "bench_rules.dsl"
+    rules_path.write_text(_dsl_ruleset(), encoding="utf-8")
+    return _adapter_case(spec, dsl_path=str(rules_path))
+
+
+def _setup_rule_heavy(ctx: BenchContext) -> BenchCase:
+    spec = _base_spec(ctx.seed)
+    spec["internal_brain"] = {"rules": _brain_rules()}
+    return _controller_case(spec, ctx)[0]
+
+
+def _setup_journal_on(ctx: BenchContext) -> BenchCase:
+    spec = _base_spec(
+        ctx.seed,
+        csv={"enabled": True, "path": str(ctx.workdir / "journal.csv"), "append": False},
+    )
+    return _controller_case(spec, ctx)[0]
+
+
+def _setup_journal_off(ctx: BenchContext) -> BenchCase:
+    return _controller_case(_base_spec(ctx.seed, csv={"enabled": False}), ctx)[0]
+
+
+def _setup_command_channel(ctx: BenchContext) -> BenchCase:
+    return _controller_case(_base_spec(ctx.seed), ctx, commands=True)[0]
+
+
+def _http_case(ctx: BenchContext, transport_cls: Any) -> BenchCase:
+    from .testing.http_engine_stub import serve_stub_engine
+
+    server, base_url = serve_stub_engine()
+    transport = transport_cls(base_url=base_url)
+    case = _adapter_case(_base_spec(ctx.seed), transport=transport)
+
+    def close() -> None:
+        getattr(transport, "close", lambda: None)()
+        server.shutdown()
+        server.server_close()
+
+    case.close = close
+    return case
+
+
+def _setup_http_transport(ctx: BenchContext) -> BenchCase:
+    from .transport import HTTPTransport
+
+    return _http_case(ctx, HTTPTransport)
+
+
+def _setup_http_keepalive(ctx: BenchContext) -> BenchCase:
+    from .transport import KeepAliveHTTPTransport
+
+    return _http_case(ctx, KeepAliveHTTPTransport)
+
+
+def _setup_batch_sweep(ctx: BenchContext) -> BenchCase:
+    from . import batch_runner
+    from .sweep import expand_plan
+
+    template = ctx.workdir / "bench_template.json"
+    template.write_text(json.dumps(_base_spec(ctx.seed)), encoding="utf-8")
+    # Plans are YAML-first (see sweep._load_struct); mirror examples/sweep_grid.yaml.
+    plan_path = ctx.workdir / "bench_sweep.yaml"
+    plan_path.write_text(
+        "mode: grid\n"
+        f"template: {template}\n"
+        f"out_dir: {ctx.workdir / 'sweep_out'}\n"
+        "vars:\n"
+        "  bankroll: [500, 1000, 2000, 4000]\n"
+        "  seed: [1, 2, 3, 4]\n",
+        encoding="utf-8",
+    )
+    items, out_dir, _ = expand_plan(str(plan_path))
+    state = {"idx": 0}
+
+    def op() -> None:
+        item = items[state["idx"] % len(items)]
+        state["idx"] += 1
+        batch_runner.run_spec_item(
+            items.spec_for(item),
+            item.path,
+            out_dir,
+            engine_version="engine-unknown",
+            csc_version="csc-unknown",
+        )
+
+    return BenchCase(op=op)
+
+
+def _setup_report_generation(ctx: BenchContext) -> BenchCase:
+    spec = _base_spec(ctx.seed, report={"path": str(ctx.workdir / "report.json")})
+    case, ctrl = _controller_case(spec, ctx)
+    for _ in range(200):
+        case.op()
+    report_path = ctx.workdir / "report.json"
+
+    def op() -> None:
+        ctrl.generate_report(report_path)
+
+    return BenchCase(op=op, close=case.close)
+
+
+SCENARIOS: Dict[str, Scenario] = {
+    s.name: s
+    for s in (
+        Scenario(
+            "stub_rolls", "VanillaAdapter stub rolls, no strategy", _setup_stub_rolls, 5000, 300
+        ),
+        Scenario(
+            "live_engine",
+            "VanillaAdapter driving the in-process CrapsSim engine",
+            _setup_live_engine,
+            2000,
+            200,
+            requires="crapssim",
+        ),
+        Scenario(
+            "dsl_heavy",
+            "28 DSL WHEN/THEN rules with dsl_trace on",
+            _setup_dsl_heavy,
+            3000,
+            200,
+        ),
+        Scenario(
+            "rule_heavy",
+            "ControlStrategy with 32 internal_brain rules",
+            _setup_rule_heavy,
+            2000,
+            200,
+        ),
+        Scenario(
+            "journal_on",
+            "ControlStrategy with the CSV journal enabled",
+            _setup_journal_on,
+            2000,
+            200,
+        ),
+        Scenario(
+            "journal_off",
+            "ControlStrategy with the CSV journal disabled",
+            _setup_journal_off,
+            2000,
+            200,
+        ),
+        Scenario(
+            "command_channel",
+            "One external command enqueued and drained per roll",
+            _setup_command_channel,
+            2000,
+            200,
+        ),
+        Scenario(
+            "http_transport",
+            "VanillaAdapter over HTTPTransport against a local stand-in engine",
+            _setup_http_transport,
+            1000,
+            100,
+        ),
+        Scenario(
+            "http_keepalive",
+            "VanillaAdapter over KeepAliveHTTPTransport (one round trip per roll)",
+            _setup_http_keepalive,
+            1000,
+            100,
+        ),
+        Scenario(
+            "batch_sweep",
+            "Grid sweep items executed through batch_runner",
+            _setup_batch_sweep,
+            32,
+            8,
+            unit="item",
+        ),
+        Scenario(
+            "report_generation",
+            "ControlStrategy.generate_report after 200 rolls",
+            _setup_report_generation,
+            50,
+            10,
+            unit="report",
+        ),
+    )
+}
+
+
+# ---------------------------------------------------------------------------
+# Measurement
+# ---------------------------------------------------------------------------
+
+
+def _percentile(sorted_ns: Sequence[int], q: float) -> int:
+    if not sorted_ns:
+        return 0
+    idx = min(len(sorted_ns) - 1, max(0, int(q * len(sorted_ns) + 0.999999) - 1))
+    return sorted_ns[idx]
+
+
+def _requirement_missing(module: Optional[str]) -> Optional[str]:
+    if not module:
+        return None
+    try:
+        __import__(module)
+    except Exception as exc:  # pragma: no cover - depends on environment
+        return f"{module} unavailable: {exc}"
+    return None
+
+
+def measure(scenario: Scenario, ctx: BenchContext, ops: int) -> Dict[str, Any]:
+    """Run ``ops`` timed operations of ``scenario`` and summarize them."""
+
+    out: Dict[str, Any] = {"unit": scenario.unit, "description": scenario.description}
+    missing = _requirement_missing(scenario.requires)
+    if missing:
+        out.update({"status": "skipped", "reason": missing})
+        return out
+
+    case = scenario.setup(ctx)
+    try:
+        for _ in range(min(20, max(1, ops // 10))):
+            case.op()
+
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        lat: List[int] = [0] * ops
+        t_start = perf_counter_ns()
+        for i in range(ops):
+            t0 = perf_counter_ns()
+            case.op()
+            lat[i] = perf_counter_ns() - t0
+        elapsed_ns = perf_counter_ns() - t_start
+        gc.collect()
+        retained = sys.getallocatedblocks() - blocks_before
+
+        sample = min(ops, _ALLOC_SAMPLE_OPS)
+        tracemalloc.start()
+        try:
+            base_current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            for _ in range(sample):
+                case.op()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        if case.close is not None:
+            try:
+                case.close()
+            except Exception:
+                pass
+
+    lat.sort()
+    elapsed_s = elapsed_ns / 1e9
+    out.update(
+        {
+            "status": "ok",
+            "ops": ops,
+            "elapsed_s": round(elapsed_s, 6),
+            "ops_per_sec": round(ops / elapsed_s, 3) if elapsed_s > 0 else None,
+            "latency_us": {
+                "mean": round(sum(lat) / ops / 1e3, 3),
+                "p50": round(_percentile(lat, 0.50) / 1e3, 3),
+                "p95": round(_percentile(lat, 0.95) / 1e3, 3),
+                "p99": round(_percentile(lat, 0.99) / 1e3, 3),
+                "max": round(lat[-1] / 1e3, 3),
+            },
+            "retained_blocks_per_op": round(retained / ops, 3),
+            "peak_traced_kib_per_op": round(max(0, peak - base_current) / 1024 / sample, 3),
+        }
+    )
+    return out
+
+
+def run_bench(
+    names: Optional[Iterable[str]] = None,
+    *,
+    quick: bool = False,
+    ops: Optional[int] = None,
+    seed: int = 42,
+    workdir: Optional[Path] = None,
+) -> Dict[str, Any]:
+    """Run the selected scenarios (default: all) and return a results document."""
+
+    selected = list(names) if names else list(SCENARIOS)
+    unknown = [n for n in selected if n not in SCENARIOS]
+    if unknown:
+        raise KeyError(f"unknown bench scenario(s): {', '.join(unknown)}")
+
+    results: Dict[str, Any] = {}
+    with contextlib.ExitStack() as stack:
+        if workdir is None:
+            workdir = Path(stack.enter_context(tempfile.TemporaryDirectory(prefix="csc-bench-")))
+        workdir = Path(workdir).resolve()
+        workdir.mkdir(parents=True, exist_ok=True)
+        # Controller side effects (decision journals, command tapes) land in cwd.
+        stack.enter_context(contextlib.chdir(workdir))
+        for name in selected:
+            scenario = SCENARIOS[name]
+            n_ops = ops or (scenario.quick_ops if quick else scenario.ops)
+            scen_dir = workdir / name
+            scen_dir.mkdir(parents=True, exist_ok=True)
+            try:
+                results[name] = measure(scenario, BenchContext(workdir=scen_dir, seed=seed), n_ops)
+            except Exception as exc:
+                results[name] = {
+                    "unit": scenario.unit,
+                    "description": scenario.description,
+                    "status": "error",
+                    "error": f"{type(exc).__name__}: {exc}",
+                }
+
+    return {
+        "schema_version": BENCH_SCHEMA_VERSION,
+        "kind": "csc_bench",
+        "created_utc": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "quick": bool(quick),
+        "seed": seed,
+        "selected": selected,
+        "scenarios": results,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    *,
+    max_throughput_drop: float = DEFAULT_MAX_THROUGHPUT_DROP,
+    max_p99_growth: float = DEFAULT_MAX_P99_GROWTH,
+) -> List[Dict[str, Any]]:
+    """Return one record per metric that regressed past its threshold.
+
+    A scenario that was ``ok`` in the baseline and is now errored, or missing
+    although it was selected, is a ``status`` regression. Scenarios skipped for
+    a missing optional dependency, or not ``ok`` in the baseline, are ignored.
+    """
+
+    regressions: List[Dict[str, Any]] = []
+    cur_all = current.get("scenarios") or {}
+    base_all = baseline.get("scenarios") or {}
+    selected = current.get("selected")
+    expected = set(selected) if selected is not None else set(base_all)
+    for name in sorted(set(cur_all) | expected):
+        cur, base = cur_all.get(name), base_all.get(name) or {}
+        if base.get("status") != "ok":
+            continue
+        status = "missing" if cur is None else cur.get("status")
+        if status == "skipped":
+            continue
+        if status != "ok":
+            regressions.append(
+                {
+                    "scenario": name,
+                    "metric": "status",
+                    "baseline": "ok",
+                    "current": status,
+                    "error": (cur or {}).get("error"),
+                }
+            )
+            continue
+        cur_tp, base_tp = cur.get("ops_per_sec"), base.get("ops_per_sec")
+        if cur_tp and base_tp:
+            change = (cur_tp - base_tp) / base_tp
+            if change < -max_throughput_drop:
+                regressions.append(
+                    {
+                        "scenario": name,
+                        "metric": "ops_per_sec",
+                        "baseline": base_tp,
+                        "current": cur_tp,
+                        "change": round(change, 4),
+                        "threshold": -max_throughput_drop,
+                    }
+                )
+        cur_p99 = (cur.get("latency_us") or {}).get("p99")
+        base_p99 = (base.get("latency_us") or {}).get("p99")
+        if cur_p99 and base_p99:
+            change = (cur_p99 - base_p99) / base_p99
+            if change > max_p99_growth:
+                regressions.append(
+                    {
+                        "scenario": name,
+                        "metric": "latency_us.p99",
+                        "baseline": base_p99,
+                        "current": cur_p99,
+                        "change": round(change, 4),
+                        "threshold": max_p99_growth,
+                    }
+                )
+    return regressions
+
+
+def write_results(results: Dict[str, Any], path: Path | str) -> Path:
+    """Write ``results`` atomically as pretty JSON and return the path."""
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    tmp.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp, target)
+    return target
+
+
+def load_results(path: Path | str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+__all__ = [
+    "BENCH_SCHEMA_VERSION",
+    "BenchCase",
+    "BenchContext",
+    "DEFAULT_BASELINE_PATH",
+    "DEFAULT_RESULTS_PATH",
+    "SCENARIOS",
+    "Scenario",
+    "compare_results",
+    "event_for_roll",
+    "load_results",
+    "measure",
+    "run_bench",
+    "write_results",
+]
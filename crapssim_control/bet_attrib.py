@@ -3,7 +3,7 @@ Bet-type attribution
 (Batch 5 + Batch 7 + Batch 9 + Batch 10)
 
 What this module provides:
-  - Hooks to attribute results + opportunity/exposure to bet types
+  - A tracker observer attributing results + opportunity/exposure to bet types
   - Canonical bet-type keys (via bet_types.normalize_bet_type)
   - Batch 10 computed rates and richer metadata aggregation
 
@@ -38,19 +38,18 @@ Snapshot shape (unchanged at the top level for compatibility):
 
 from __future__ import annotations
 
-from collections import defaultdict, deque
 from dataclasses import dataclass, asdict
-from typing import Any, Dict, DefaultDict, Deque, Optional
+from typing import Any, Dict, List, Optional
 
 from .bet_types import normalize_bet_type
-
+from .tracker import RollRecord, Tracker, TrackerObserver
 
 # -----------------------------
 # Internal structures
 # -----------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class _PerTypeStats:
     # Batch 7 (opportunity/exposure)
     placed_count: int = 0
@@ -129,66 +128,71 @@ def _bet_key(event: Dict[str, Any]) -> str:
 
 
 # -----------------------------
-# Public API
+# Observer
 # -----------------------------
 
 
-def attach_bet_attrib(tracker: Any, enabled: Optional[bool] = None) -> None:
-    """
-    Monkey-patch a live Tracker with bet attribution + exposure counters + Batch 10 rates.
-
-    Adds:
-      tracker.on_bet_placed(event)
-      tracker.on_bet_resolved(event)
-      tracker.on_bet_cleared(event)   # optional
-    Wraps:
-      tracker.on_roll(...) to accrue exposure for open bets
-      tracker.snapshot()   to include 'bet_attrib' (with computed rates) when enabled
+class BetAttribObserver(TrackerObserver):
     """
-    # determine enablement
-    if enabled is None:
-        cfg = getattr(tracker, "config", {}) or {}
-        enabled = bool(cfg.get("bet_attrib_enabled", True))
-    tracker._bet_attrib_enabled = bool(enabled)
-
-    # internal state on tracker
-    if not hasattr(tracker, "_bet_stats"):
-        tracker._bet_stats: DefaultDict[str, _PerTypeStats] = defaultdict(_PerTypeStats)
-    if not hasattr(tracker, "_bet_open"):
-        tracker._bet_open: DefaultDict[str, Deque[Dict[str, Any]]] = defaultdict(deque)
+    Bet attribution + exposure counters + Batch 10 rates, as a tracker observer.
 
-    # ------------- on_bet_placed --------------------------------------------
+    Each canonical bet type gets a slot index; per-slot stats and open-unit
+    counts live in parallel lists. Exposure is accrued lazily: a roll only bumps
+    a counter, and a slot settles ``open_units * rolls_elapsed`` when its open
+    count changes or a snapshot is taken.
+    """
 
-    def on_bet_placed(event: Dict[str, Any]) -> None:
-        if not tracker._bet_attrib_enabled:
-            return
-        key = _bet_key(event)
+    name = "bet_attrib"
+
+    def __init__(self) -> None:
+        self._slots: Dict[str, int] = {}
+        self._keys: List[str] = []
+        self._stats: List[_PerTypeStats] = []
+        self._open: List[int] = []
+        self._mark: List[int] = []
+        self._rolls = 0
+
+    def _slot(self, key: str) -> int:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = len(self._keys)
+            self._keys.append(key)
+            self._stats.append(_PerTypeStats())
+            self._open.append(0)
+            self._mark.append(self._rolls)
+        return slot
+
+    def _settle(self, slot: int) -> None:
+        if self._open[slot]:
+            self._stats[slot].exposure_rolls += self._open[slot] * (self._rolls - self._mark[slot])
+        self._mark[slot] = self._rolls
+
+    def _close_one(self, slot: int) -> None:
+        if self._open[slot]:
+            self._settle(slot)
+            self._open[slot] -= 1
+
+    # ------------- events ---------------------------------------------------
+
+    def on_roll(self, rec: RollRecord) -> None:
+        self._rolls += 1
+
+    def on_bet_placed(self, event: Dict[str, Any]) -> None:
+        slot = self._slot(_bet_key(event))
         amt = _coerce_float(event, "amount", "stake", default=0.0)
 
-        stats = tracker._bet_stats[key]
+        stats = self._stats[slot]
         stats.placed_count += 1
         stats.total_staked += float(amt)
 
-        # track an open unit for exposure accrual
-        opened_at_roll = _safe_roll_index(tracker)
-        # store minimal meta in case we want to expand context later
-        tracker._bet_open[key].append(
-            {
-                "opened_at_roll": opened_at_roll,
-                "amount": float(amt),
-            }
-        )
-
-        # peak concurrency per type
-        if len(tracker._bet_open[key]) > stats.peak_open_bets:
-            stats.peak_open_bets = len(tracker._bet_open[key])
+        # open one exposure unit; peak concurrency per type
+        self._settle(slot)
+        self._open[slot] += 1
+        if self._open[slot] > stats.peak_open_bets:
+            stats.peak_open_bets = self._open[slot]
 
-    # ------------- on_bet_resolved ------------------------------------------
-
-    def on_bet_resolved(event: Dict[str, Any]) -> None:
-        if not tracker._bet_attrib_enabled:
-            return
-        key = _bet_key(event)
+    def on_bet_resolved(self, event: Dict[str, Any]) -> None:
+        slot = self._slot(_bet_key(event))
         outcome = _coerce_bool_outcome(event)
 
         # commission/vig handling (Batch 10)
@@ -202,13 +206,12 @@ def attach_bet_attrib(tracker: Any, enabled: Optional[bool] = None) -> None:
             pnl = payout - amount
         net_pnl = float(pnl) - float(commission)
 
-        stats = tracker._bet_stats[key]
+        stats = self._stats[slot]
         stats.resolved_count += 1
         stats.total_commission += float(commission)
 
         # Lightweight context recording (count only; does not split exposure)
-        woc = event.get("working_on_comeout")
-        woc_b = _coerce_bool(woc)
+        woc_b = _coerce_bool(event.get("working_on_comeout"))
         if woc_b is True:
             stats.comeout_resolved += 1
         elif woc_b is False:
@@ -216,85 +219,59 @@ def attach_bet_attrib(tracker: Any, enabled: Optional[bool] = None) -> None:
 
         if outcome is True:
             stats.wins += 1
-            stats.pnl += net_pnl
         elif outcome is False:
             stats.losses += 1
-            stats.pnl += net_pnl
         else:
-            stats.push_count += 1
-            stats.pnl += net_pnl  # usually ~0 after commission, but keep engine-provided value
-
-        # close one open unit if present (LIFO)
-        if tracker._bet_open[key]:
-            tracker._bet_open[key].pop()
-
-    # ------------- on_bet_cleared (optional) --------------------------------
-
-    def on_bet_cleared(event: Dict[str, Any]) -> None:
-        """
-        Optional hook: if your engine emits a "clear" without resolve, close one open exposure unit.
-        """
-        if not tracker._bet_attrib_enabled:
-            return
-        key = _bet_key(event)
-        if tracker._bet_open[key]:
-            tracker._bet_open[key].pop()
-
-    # ------------- on_roll wrapper (exposure accrual) ------------------------
-
-    prev_on_roll = getattr(tracker, "on_roll", None)
-
-    def on_roll_wrapper(*args, **kwargs):
-        if tracker._bet_attrib_enabled:
-            for key, stack in tracker._bet_open.items():
-                if stack:
-                    tracker._bet_stats[key].exposure_rolls += len(stack)
-        if callable(prev_on_roll):
-            return prev_on_roll(*args, **kwargs)
-
-    if callable(prev_on_roll):
-        setattr(tracker, "on_roll", on_roll_wrapper)
-
-    # ------------- snapshot wrapper -----------------------------------------
-
-    prev_snapshot = getattr(tracker, "snapshot")
-
-    def snapshot_with_buckets(*args, **kwargs):
-        snap = prev_snapshot(*args, **kwargs)
-        if tracker._bet_attrib_enabled:
-            by_type: Dict[str, Any] = {}
-            for key, stats in tracker._bet_stats.items():
-                row = asdict(stats)
-                # Derived metrics (Batch 10)
-                denom_resolved_no_push = max(1, stats.resolved_count - stats.push_count)
-                row["hit_rate"] = float(stats.wins) / float(denom_resolved_no_push)
-                row["roi"] = float(stats.pnl) / float(max(1.0, stats.total_staked))
-                row["pnl_per_exposure_roll"] = float(stats.pnl) / float(
-                    max(1, stats.exposure_rolls)
-                )
-                # Present context as a nested, clearly named block
-                row["_ctx"] = {
-                    "comeout_resolved": stats.comeout_resolved,
-                    "point_resolved": stats.point_resolved,
-                }
-                by_type[key] = row
-            snap["bet_attrib"] = {"by_bet_type": by_type}
-        return snap
-
-    # Patch hooks + snapshot
-    setattr(tracker, "on_bet_placed", on_bet_placed)
-    setattr(tracker, "on_bet_resolved", on_bet_resolved)
-    setattr(tracker, "on_bet_cleared", on_bet_cleared)
-    setattr(tracker, "snapshot", snapshot_with_buckets)
+            stats.push_count += 1  # pnl usually ~0 after commission; keep engine-provided value
+        stats.pnl += net_pnl
+
+        self._close_one(slot)
+
+    def on_bet_cleared(self, event: Dict[str, Any]) -> None:
+        """If the engine emits a "clear" without resolve, close one open exposure unit."""
+        self._close_one(self._slot(_bet_key(event)))
+
+    # ------------- snapshot -------------------------------------------------
+
+    def contribute(self, snap: Dict[str, Any]) -> None:
+        by_type: Dict[str, Any] = {}
+        for slot, key in enumerate(self._keys):
+            self._settle(slot)
+            stats = self._stats[slot]
+            row = asdict(stats)
+            # Derived metrics (Batch 10)
+            denom_resolved_no_push = max(1, stats.resolved_count - stats.push_count)
+            row["hit_rate"] = float(stats.wins) / float(denom_resolved_no_push)
+            row["roi"] = float(stats.pnl) / float(max(1.0, stats.total_staked))
+            row["pnl_per_exposure_roll"] = float(stats.pnl) / float(max(1, stats.exposure_rolls))
+            # Present context as a nested, clearly named block
+            row["_ctx"] = {
+                "comeout_resolved": stats.comeout_resolved,
+                "point_resolved": stats.point_resolved,
+            }
+            by_type[key] = row
+        snap["bet_attrib"] = {"by_bet_type": by_type}
 
 
 # -----------------------------
-# Helpers
+# Public API
 # -----------------------------
 
 
-def _safe_roll_index(tracker: Any) -> int:
-    try:
-        return int(getattr(tracker, "roll").shooter_rolls)
-    except Exception:
-        return 0
+def attach_bet_attrib(tracker: Tracker, enabled: Optional[bool] = None) -> None:
+    """
+    Register a :class:`BetAttribObserver` on ``tracker``.
+
+    Afterwards tracker.on_bet_placed / on_bet_resolved / on_bet_cleared feed it,
+    tracker.on_roll accrues exposure for open bets, and tracker.snapshot()
+    includes 'bet_attrib' (with computed rates). ``enabled=None`` reads
+    ``bet_attrib_enabled`` (default True) from ``tracker.config`` when present;
+    disabling removes a previously attached observer.
+    """
+    if enabled is None:
+        cfg = getattr(tracker, "config", {}) or {}
+        enabled = bool(cfg.get("bet_attrib_enabled", True))
+    if not enabled:
+        tracker.unregister_observer(BetAttribObserver.name)
+        return
+    tracker.register_observer(BetAttribObserver())
@@ -2,6 +2,7 @@
 from __future__ import annotations
 from dataclasses import dataclass, field, asdict
 from typing import Dict, Any, List, Optional, Tuple
+import sys
 import time
 import itertools
 import copy
@@ -38,7 +39,12 @@ def _lifo_key(bet: str, meta: Dict[str, Any]) -> str:
     n = meta.get("number") or meta.get("point") or meta.get("box")
     if n is not None:
         parts.append(str(n))
-    return "|".join(parts)
+    # Interned: the same handful of keys repeat for every bet of a session.
+    return sys.intern("|".join(parts))
+
+
+def _bump(bucket: Dict[str, float], key: str, delta: float) -> None:
+    bucket[key] = bucket.get(key, 0.0) + delta
 
 
 # --------------------------
@@ -46,7 +52,7 @@ def _lifo_key(bet: str, meta: Dict[str, Any]) -> str:
 # --------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class LedgerEntry:
     id: int
     created_ts: float
@@ -71,7 +77,7 @@ class LedgerEntry:
 # --------------------------
 
 
-@dataclass
+@dataclass(slots=True)
 class IntentEntry:
     id: int
     created_ts: float
@@ -92,25 +98,73 @@ class IntentEntry:
         return d
 
 
+_SNAPSHOT_TAIL = 50
+
+
+class _History:
+    """Id-indexed, insertion-ordered store of finished records with an optional cap."""
+
+    def __init__(self, cap: Optional[int]) -> None:
+        self.cap = cap
+        self.by_id: Dict[int, Any] = {}
+
+    def add(self, item: Any) -> None:
+        self.by_id[item.id] = item
+        if self.cap is not None and len(self.by_id) > self.cap:
+            del self.by_id[next(iter(self.by_id))]
+
+    def tail(self, n: int) -> List[Any]:
+        out: List[Any] = []
+        for item in reversed(self.by_id.values()):
+            if len(out) >= n:
+                break
+            out.append(item)
+        out.reverse()
+        return out
+
+
 # --------------------------
 # BetLedger
 # --------------------------
 
 
 class BetLedger:
-    def __init__(self) -> None:
-        self._entries: List[LedgerEntry] = []
+    """Open/closed bet ledger with O(1) id lookups and running per-category aggregates.
+
+    Open entries live in an id-indexed dict; closing one folds it into the
+    realized/closed-count rollups and moves it to a history store. Pass
+    ``history_cap`` to keep only the most recent closed entries and finished
+    intents; counts and totals still cover the whole session.
+    """
+
+    def __init__(self, *, history_cap: Optional[int] = None) -> None:
+        cap = int(history_cap) if history_cap is not None else None
+        if cap is not None and cap < 0:
+            raise ValueError("history_cap must be >= 0")
+        self.history_cap = cap
+
+        self._open: Dict[int, LedgerEntry] = {}
+        self._closed = _History(cap)
+        self._closed_count = 0
         self._open_stack: Dict[str, List[int]] = {}
         self._id_seq = itertools.count(1)
         self._realized_pnl_total: float = 0.0
         self._open_exposure: float = 0.0
+        self._exposure_by_cat: Dict[str, float] = {}
+        self._realized_by_cat: Dict[str, float] = {}
+        self._open_by_cat: Dict[str, int] = {}
 
         self._in_point_cycle: bool = False
         self._pnl_since_point: float = 0.0
 
         self._current_roll_index: Optional[int] = None
 
-        self._intents: List[IntentEntry] = []
+        self._intents_open: Dict[int, IntentEntry] = {}
+        self._intents_done: Dict[str, _History] = {
+            "matched": _History(cap),
+            "canceled": _History(cap),
+        }
+        self._intent_counts: Dict[str, int] = {"matched": 0, "canceled": 0}
         self._intent_id_seq = itertools.count(1)
 
     # ----- Bets API ----------------------------------------------------------
@@ -122,7 +176,7 @@ class BetLedger:
             raise ValueError("amount must be >= 0")
 
         canon_type = normalize_bet_type(bet, meta)
-        cat = category or _infer_category(canon_type or bet)
+        cat = sys.intern(category or _infer_category(canon_type or bet))
 
         meta = dict(meta) if meta else {}
         meta.setdefault("raw_bet_type", bet)
@@ -132,7 +186,7 @@ class BetLedger:
         e = LedgerEntry(
             id=eid,
             created_ts=time.time(),
-            bet=canon_type or (bet or ""),
+            bet=sys.intern(canon_type or (bet or "")),
             amount=float(amount),
             category=cat,
             meta=meta,
@@ -147,10 +201,12 @@ class BetLedger:
         else:
             self._maybe_match_nearest_intent(eid, bet, e.meta)
 
-        self._entries.append(e)
+        self._open[eid] = e
         key = _lifo_key(e.bet, e.meta)
         self._open_stack.setdefault(key, []).append(eid)
         self._open_exposure += e.amount
+        _bump(self._exposure_by_cat, cat, e.amount)
+        self._open_by_cat[cat] = self._open_by_cat.get(cat, 0) + 1
         return eid
 
     def resolve(
@@ -176,7 +232,14 @@ class BetLedger:
                 if not stack:
                     raise KeyError(f"No open {bet} to resolve for key={key}")
             entry_id = stack.pop()
-        entry = self._by_id(entry_id)
+            entry = self._by_id(entry_id)
+        else:
+            entry = self._by_id(entry_id)
+            if entry.status == "open":
+                # keep LIFO resolution from popping an entry already closed by id
+                open_stack = self._open_stack.get(_lifo_key(entry.bet, entry.meta))
+                if open_stack and entry_id in open_stack:
+                    open_stack.remove(entry_id)
 
         if entry.status != "open":
             raise ValueError(f"Entry {entry_id} is already {entry.status}")
@@ -190,7 +253,15 @@ class BetLedger:
         if self._current_roll_index is not None:
             entry.meta.setdefault("roll_index_closed", self._current_roll_index)
 
+        del self._open[entry_id]
+        self._closed.add(entry)
+        self._closed_count += 1
         self._open_exposure -= entry.amount
+        _bump(self._exposure_by_cat, entry.category, -entry.amount)
+        self._open_by_cat[entry.category] -= 1
+        if not self._open_by_cat[entry.category]:
+            self._exposure_by_cat[entry.category] = 0.0  # drop float drift
+        _bump(self._realized_by_cat, entry.category, entry.realized_pnl)
         self._realized_pnl_total += entry.realized_pnl
         if self._in_point_cycle:
             self._pnl_since_point += entry.realized_pnl
@@ -239,7 +310,7 @@ class BetLedger:
         ie = IntentEntry(
             id=iid,
             created_ts=time.time(),
-            bet=canon_bet or bet,
+            bet=sys.intern(canon_bet or bet),
             stake=stake,
             number=int(number) if number is not None else None,
             status="open",
@@ -249,7 +320,7 @@ class BetLedger:
         )
         ie.meta.setdefault("raw_bet_type", bet)
         ie.meta.setdefault("canon_bet_type", ie.bet)
-        self._intents.append(ie)
+        self._intents_open[iid] = ie
         return iid
 
     def cancel_intent(self, intent_id: int, *, reason: Optional[str] = None) -> None:
@@ -259,32 +330,41 @@ class BetLedger:
         ie.status = "canceled"
         ie.reason = reason or ie.reason or "canceled"
         ie.canceled_ts = time.time()
+        self._finish_intent(ie)
+
+    def _finish_intent(self, ie: IntentEntry) -> None:
+        del self._intents_open[ie.id]
+        self._intents_done[ie.status].add(ie)
+        self._intent_counts[ie.status] += 1
 
     def _intent_by_id(self, iid: int) -> IntentEntry:
-        for ie in self._intents:
-            if ie.id == iid:
+        ie = self._intents_open.get(iid)
+        if ie is not None:
+            return ie
+        for store in self._intents_done.values():
+            ie = store.by_id.get(iid)
+            if ie is not None:
                 return ie
         raise KeyError(f"Unknown intent id {iid}")
 
     def _mark_intent_matched(self, intent_id: int, entry_id: int) -> None:
-        try:
-            ie = self._intent_by_id(intent_id)
-        except KeyError:
-            return
-        if ie.status != "open":
+        ie = self._intents_open.get(intent_id)
+        if ie is None:
             return
         ie.status = "matched"
         ie.matched_entry_id = entry_id
         ie.matched_ts = time.time()
+        self._finish_intent(ie)
 
     def _maybe_match_nearest_intent(self, entry_id: int, bet: str, meta: Dict[str, Any]) -> None:
+        if not self._intents_open:
+            return
         canon = normalize_bet_type(bet, meta)
         number = meta.get("number") or meta.get("point") or meta.get("box")
+        wanted = (canon or bet or "").lower()
         candidate: Optional[IntentEntry] = None
-        for ie in reversed(self._intents):
-            if ie.status != "open":
-                continue
-            if (ie.bet or "").lower() != (canon or bet or "").lower():
+        for ie in reversed(self._intents_open.values()):
+            if (ie.bet or "").lower() != wanted:
                 continue
             if number is not None and ie.number is not None and int(ie.number) != int(number):
                 continue
@@ -296,48 +376,41 @@ class BetLedger:
     # ----- Snapshot ----------------------------------------------------------
 
     def snapshot(self) -> Dict[str, Any]:
-        open_entries = [e.snapshot() for e in self._entries if e.status == "open"]
-        closed_entries = [e.snapshot() for e in self._entries if e.status == "closed"]
-
-        exposure_by_cat: Dict[str, float] = {}
-        for e in open_entries:
-            exposure_by_cat[e["category"]] = exposure_by_cat.get(e["category"], 0.0) + float(
-                e["amount"]
-            )
-
-        realized_by_cat: Dict[str, float] = {}
-        for e in closed_entries:
-            realized_by_cat[e["category"]] = realized_by_cat.get(e["category"], 0.0) + float(
-                e["realized_pnl"]
-            )
-
-        intents_open = [i.snapshot() for i in self._intents if i.status == "open"]
-        intents_matched = [i.snapshot() for i in self._intents if i.status == "matched"]
-        intents_canceled = [i.snapshot() for i in self._intents if i.status == "canceled"]
+        intents_open = list(self._intents_open.values())
+        matched = self._intents_done["matched"]
+        canceled = self._intents_done["canceled"]
 
         return {
-            "open_count": len(open_entries),
-            "closed_count": len(closed_entries),
+            "open_count": len(self._open),
+            "closed_count": self._closed_count,
             "open_exposure": float(self._open_exposure),
             "realized_pnl": float(self._realized_pnl_total),
             "realized_pnl_since_point": float(self._pnl_since_point),
-            "by_category": {"exposure": exposure_by_cat, "realized": realized_by_cat},
-            "open": open_entries,
-            "closed": closed_entries[-50:],
+            "by_category": {
+                # Only categories with a bet still open report exposure.
+                "exposure": {
+                    cat: amt
+                    for cat, amt in self._exposure_by_cat.items()
+                    if self._open_by_cat.get(cat)
+                },
+                "realized": dict(self._realized_by_cat),
+            },
+            "open": [e.snapshot() for e in self._open.values()],
+            "closed": [e.snapshot() for e in self._closed.tail(_SNAPSHOT_TAIL)],
             "intents": {
                 "open_count": len(intents_open),
-                "matched_count": len(intents_matched),
-                "canceled_count": len(intents_canceled),
-                "open": intents_open[-50:],
-                "matched": intents_matched[-50:],
-                "canceled": intents_canceled[-50:],
+                "matched_count": self._intent_counts["matched"],
+                "canceled_count": self._intent_counts["canceled"],
+                "open": [i.snapshot() for i in intents_open[-_SNAPSHOT_TAIL:]],
+                "matched": [i.snapshot() for i in matched.tail(_SNAPSHOT_TAIL)],
+                "canceled": [i.snapshot() for i in canceled.tail(_SNAPSHOT_TAIL)],
             },
         }
 
     # ----- Utils -------------------------------------------------------------
 
     def _by_id(self, eid: int) -> LedgerEntry:
-        for e in self._entries:
-            if e.id == eid:
-                return e
-        raise KeyError(f"Unknown entry id {eid}")
+        entry = self._open.get(eid) or self._closed.by_id.get(eid)
+        if entry is None:
+            raise KeyError(f"Unknown entry id {eid}")
+        return entry
@@ -1,11 +1,13 @@
 # Lightweight namespace for bundle I/O utilities
 from .export import export_bundle
 from .importers import import_evo_bundle
+from .store import BlobStore
 from .errors import ExportEmptyError, BundleReadError, SchemaMismatchError
 
 __all__ = [
     "export_bundle",
     "import_evo_bundle",
+    "BlobStore",
     "ExportEmptyError",
     "BundleReadError",
     "SchemaMismatchError",
@@ -0,0 +1,241 @@
+"""
+store.py -- content-addressed blob store backing run exports.
+
+An export root's store is the hidden sibling ``.<name>.blobs``, so the root
+itself still lists only run folders and zips. It always holds a SQLite
+digest index mapping ``(path, size, mtime_ns, inode)`` to the file's sha256,
+so unchanged sources and previously exported files are never re-hashed, and
+identical content already in an export directory is found with one query
+instead of hashing every ``name-vN.ext`` candidate.
+
+Folder exports are plain copies by default. With ``run.export.link`` each
+distinct content is also kept once under ``<root>/<aa>/<sha256>`` and the
+exported files are hard links to that blob (a plain copy where links are not
+possible, e.g. across devices). Blobs and their links are read-only, since
+writing one in place would change every export sharing it. Deleting exports
+leaves their blobs behind until :meth:`BlobStore.gc` removes every blob that
+nothing links to any more. Zip exports never touch blobs.
+
+Hashing and storing a new source is a single read pass. Any index failure
+degrades to hashing, never to a failed export.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+import sqlite3
+import stat
+import tempfile
+from pathlib import Path
+from typing import Optional, Tuple
+
+BLOB_DIR_SUFFIX = ".blobs"
+INDEX_NAME = "digest_index.sqlite"
+_CHUNK = 1024 * 1024
+
+
+def _stat_key(path: Path) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns, st.st_ino
+
+
+class BlobStore:
+    """sha256 -> blob store with a persistent path -> digest index."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        try:
+            conn = sqlite3.connect(str(self.root / INDEX_NAME))
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS digests ("
+                " path TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL,"
+                " ino INTEGER NOT NULL, digest TEXT NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS digests_by_digest ON digests (digest)")
+            conn.commit()
+            self._conn = conn
+        except sqlite3.Error:
+            self._conn = None
+
+    @classmethod
+    def for_export_root(cls, export_root: str | Path) -> "BlobStore":
+        root = Path(export_root).absolute()
+        return cls(root.parent / f".{root.name}{BLOB_DIR_SUFFIX}")
+
+    def close(self) -> None:
+        if self._conn is not None:
+            try:
+                self._conn.commit()
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def __enter__(self) -> "BlobStore":
+        return self
+
+    def __exit__(self, *_exc: object) -> None:
+        self.close()
+
+    # -- index -------------------------------------------------------------
+    def _lookup(self, path: Path, key: Tuple[int, int, int]) -> Optional[str]:
+        if self._conn is None:
+            return None
+        try:
+            row = self._conn.execute(
+                "SELECT size, mtime_ns, ino, digest FROM digests WHERE path = ?",
+                (str(path.absolute()),),
+            ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None or tuple(row[:3]) != key:
+            return None
+        return row[3]
+
+    def remember(self, path: str | Path, digest: str) -> None:
+        """Record that ``path`` (as it is now) holds ``digest``."""
+
+        self._remember(Path(path), digest)
+
+    def _remember(self, path: Path, digest: str) -> None:
+        key = _stat_key(path)
+        if self._conn is None or key is None:
+            return
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO digests VALUES (?, ?, ?, ?, ?)",
+                (str(path.absolute()), *key, digest),
+            )
+        except sqlite3.Error:
+            pass
+
+    # -- blobs -------------------------------------------------------------
+    def blob_path(self, digest: str) -> Path:
+        return self.root / digest[:2] / digest
+
+    def digest(self, path: str | Path) -> Optional[str]:
+        """sha256 of ``path``, from the index when its stat is unchanged."""
+
+        path = Path(path)
+        key = _stat_key(path)
+        if key is None:
+            return None
+        cached = self._lookup(path, key)
+        if cached is not None:
+            return cached
+        h = hashlib.sha256()
+        try:
+            with path.open("rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK), b""):
+                    h.update(chunk)
+        except OSError:
+            return None
+        digest = h.hexdigest()
+        self._remember(path, digest)
+        return digest
+
+    def put(self, src: str | Path) -> Tuple[str, Path, bool]:
+        """
+        Store ``src``; returns ``(digest, blob_path, added)``.
+
+        A source the index already knows (and whose blob exists) is not read
+        at all; otherwise it is hashed while being copied into a temp blob.
+        """
+
+        src = Path(src)
+        key = _stat_key(src)
+        cached = self._lookup(src, key) if key is not None else None
+        if cached is not None and self.blob_path(cached).exists():
+            return cached, self.blob_path(cached), False
+
+        h = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(prefix=".incoming-", dir=str(self.root))
+        try:
+            with os.fdopen(fd, "wb") as out, src.open("rb") as f:
+                for chunk in iter(lambda: f.read(_CHUNK), b""):
+                    h.update(chunk)
+                    out.write(chunk)
+            digest = h.hexdigest()
+            blob = self.blob_path(digest)
+            added = not blob.exists()
+            if added:
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                os.chmod(tmp_name, stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH)
+                os.replace(tmp_name, blob)
+        finally:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+        self._remember(src, digest)
+        return digest, blob, added
+
+    def materialize(self, digest: str, dst: str | Path) -> Path:
+        """Place blob ``digest`` at ``dst`` as a hard link (copy as a fallback)."""
+
+        dst = Path(dst)
+        blob = self.blob_path(digest)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(blob, dst)
+        except OSError:
+            shutil.copyfile(blob, dst)
+        self._remember(dst, digest)
+        return dst
+
+    def gc(self) -> int:
+        """
+        Drop blobs no export links to any more, and index rows for vanished paths.
+
+        A blob whose only link is the store's own is unreferenced. Returns the
+        number of blobs removed.
+        """
+
+        removed = 0
+        for sub in self.root.iterdir() if self.root.is_dir() else ():
+            if not sub.is_dir() or len(sub.name) != 2:
+                continue
+            for blob in sub.iterdir():
+                try:
+                    if blob.stat().st_nlink <= 1:
+                        blob.unlink()
+                        removed += 1
+                except OSError:
+                    continue
+        if self._conn is not None:
+            try:
+                rows = self._conn.execute("SELECT path FROM digests").fetchall()
+                gone = [(p,) for (p,) in rows if not os.path.exists(p)]
+                self._conn.executemany("DELETE FROM digests WHERE path = ?", gone)
+                self._conn.commit()
+            except sqlite3.Error:
+                pass
+        return removed
+
+    def find_in_dir(self, digest: str, directory: str | Path) -> Optional[Path]:
+        """A file directly inside ``directory`` known to hold ``digest``, if still unchanged."""
+
+        if self._conn is None:
+            return None
+        prefix = str(Path(directory).absolute()) + os.sep
+        try:
+            rows = self._conn.execute(
+                "SELECT path, size, mtime_ns, ino FROM digests WHERE digest = ?", (digest,)
+            ).fetchall()
+        except sqlite3.Error:
+            return None
+        for path, *key in sorted(rows):
+            if not path.startswith(prefix) or os.sep in path[len(prefix) :]:
+                continue
+            candidate = Path(path)
+            if _stat_key(candidate) == tuple(key):
+                return candidate
+        return None
+
+
+__all__ = ["BLOB_DIR_SUFFIX", "BlobStore"]
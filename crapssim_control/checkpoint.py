@@ -0,0 +1,500 @@
+"""
+checkpoint.py -- periodic session checkpoints, resume and what-if forks.
+
+A checkpoint captures everything a stub-engine ``VanillaAdapter`` +
+``ControlStrategy`` session needs to continue exactly where it stopped:
+
+* adapter bets/odds/flat maps, counters, dice RNG state and DSL rule cooldowns
+  (:meth:`VanillaAdapter.checkpoint_state`);
+* controller mode, memory, point bookkeeping, run stats and identity;
+* analytics tracker, decision journal (cooldowns/scope locks/sequence) and
+  behavior-engine cooldowns;
+* byte offsets of every journal file the session appends to.
+
+On resume, journals are truncated back to the recorded offsets so rows written
+after the checkpoint (before the crash) are not duplicated, and the continuation
+appends the same bytes an uninterrupted run would have written (wall-clock
+``ts``/``timestamp`` columns aside).
+
+File layout (little endian)::
+
+    b"CSCCKPT\\0" | u16 version | u32 header_len | header JSON | zlib(state JSON)
+
+The JSON header (spec, rolls done/target, seed) can be read without the body.
+The body is plain data only: tuples, sets, deques and non-string dict keys are
+written as small tagged objects, and anything else is refused, so loading a
+checkpoint never constructs arbitrary objects.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+from .engine_adapter import VanillaAdapter
+from .events import event_for_roll
+from .external.command_tape import index_path
+
+CHECKPOINT_MAGIC = b"CSCCKPT\x00"
+CHECKPOINT_VERSION = 2
+DEFAULT_CHECKPOINT_EVERY = 10_000
+_PREFIX = struct.Struct("<8sHI")
+
+# Plain-value controller attributes restored verbatim.
+_CONTROLLER_FIELDS = (
+    "mode",
+    "memory",
+    "point",
+    "rolls_since_point",
+    "on_comeout",
+    "_stats",
+    "_hands_played_fallback",
+    "_hand_active_fallback",
+    "_mode_changed_this_event",
+    "_dsl_roll_index",
+    "_dsl_last_roll_total",
+    "_dsl_initial_bankroll",
+    "_run_id",
+    "_seed_value",
+    "_replay_commands",
+    "_replay_position",
+    "_analytics_session_closed",
+    "_outbound_run_started",
+)
+
+# Controller sub-objects whose data attributes are restored in place. File
+# bindings (``path``) and attributes holding anything but plain data (buffers,
+# back references) always come from the freshly built object, so forks can
+# redirect their output.
+_CONTROLLER_OBJECTS = ("_tracker", "_tracker_session_ctx", "journal", "_journal")
+_KEEP_ON_RESTORE = frozenset({"path"})
+
+
+class CheckpointError(RuntimeError):
+    """Raised when a checkpoint cannot be written, read or resumed."""
+
+
+# ---------------------------------------------------------------------------
+# Serialization
+# ---------------------------------------------------------------------------
+
+
+_TAG = "__ckpt__"
+
+
+def _encode(value: Any) -> Any:
+    """Plain data -> JSON-safe data; ``TypeError`` for anything else."""
+
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        if all(isinstance(k, str) for k in value) and _TAG not in value:
+            return {k: _encode(v) for k, v in value.items()}
+        return {_TAG: "dict", "items": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, tuple):
+        return {_TAG: "tuple", "items": [_encode(v) for v in value]}
+    if isinstance(value, (set, frozenset)):
+        return {_TAG: "set", "items": [_encode(v) for v in value]}
+    if isinstance(value, deque):
+        return {_TAG: "deque", "items": [_encode(v) for v in value], "maxlen": value.maxlen}
+    raise TypeError(f"cannot checkpoint {type(value).__name__} values")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if not isinstance(value, dict):
+        return value
+    tag = value.get(_TAG)
+    if tag is None:
+        return {k: _decode(v) for k, v in value.items()}
+    items = [_decode(v) for v in value["items"]]
+    if tag == "dict":
+        return {k: v for k, v in items}
+    if tag == "tuple":
+        return tuple(items)
+    if tag == "set":
+        return set(items)
+    if tag == "deque":
+        return deque(items, value.get("maxlen"))
+    raise CheckpointError(f"unknown checkpoint value tag {tag!r}")
+
+
+def _dumps(state: Any) -> bytes:
+    try:
+        return json.dumps(_encode(state), separators=(",", ":")).encode("utf-8")
+    except TypeError as exc:
+        raise CheckpointError(str(exc)) from exc
+
+
+def _loads(data: bytes) -> Any:
+    return _decode(json.loads(data.decode("utf-8")))
+
+
+def _data_state(obj: Any) -> Optional[Dict[str, Any]]:
+    """Snapshot an object's plain-data attributes, skipping hooks, buffers and references."""
+
+    if obj is None:
+        return None
+    out: Dict[str, Any] = {}
+    for key, value in vars(obj).items():
+        try:
+            out[key] = _encode(value)
+        except TypeError:
+            continue
+    return _decode(out)
+
+
+def _restore_data_state(obj: Any, state: Optional[Mapping[str, Any]]) -> None:
+    if obj is None or not state:
+        return
+    for key, value in state.items():
+        if key in _KEEP_ON_RESTORE and hasattr(obj, key):
+            continue
+        setattr(obj, key, value)
+
+
+def write_checkpoint(path: str | Path, header: Mapping[str, Any], state: Any) -> Path:
+    """Atomically write ``header`` + ``state`` to ``path``."""
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    head = json.dumps(dict(header), sort_keys=True, separators=(",", ":"), default=str).encode(
+        "utf-8"
+    )
+    body = zlib.compress(_dumps(state), 6)
+    tmp = target.with_suffix(target.suffix + ".tmp")
+    with tmp.open("wb") as fh:
+        fh.write(_PREFIX.pack(CHECKPOINT_MAGIC, CHECKPOINT_VERSION, len(head)))
+        fh.write(head)
+        fh.write(body)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, target)
+    return target
+
+
+def read_checkpoint_header(path: str | Path) -> Dict[str, Any]:
+    with Path(path).open("rb") as fh:
+        return _read_header(fh, path)
+
+
+def _read_header(fh: Any, path: str | Path) -> Dict[str, Any]:
+    prefix = fh.read(_PREFIX.size)
+    if len(prefix) != _PREFIX.size:
+        raise CheckpointError(f"{path}: truncated checkpoint")
+    magic, version, head_len = _PREFIX.unpack(prefix)
+    if magic != CHECKPOINT_MAGIC:
+        raise CheckpointError(f"{path}: not a checkpoint file")
+    if version != CHECKPOINT_VERSION:
+        raise CheckpointError(f"{path}: unsupported checkpoint version {version}")
+    return json.loads(fh.read(head_len).decode("utf-8"))
+
+
+def read_checkpoint(path: str | Path) -> Tuple[Dict[str, Any], Any]:
+    """Return ``(header, state)`` from a checkpoint file."""
+
+    try:
+        with Path(path).open("rb") as fh:
+            header = _read_header(fh, path)
+            state = _loads(zlib.decompress(fh.read()))
+    except CheckpointError:
+        raise
+    except Exception as exc:
+        raise CheckpointError(f"{path}: unreadable checkpoint ({exc})") from exc
+    return header, state
+
+
+# ---------------------------------------------------------------------------
+# Journal offsets
+# ---------------------------------------------------------------------------
+
+
+def journal_offsets(ctrl: Any) -> Dict[str, int]:
+    """Map each journal file the controller appends to onto its current size."""
+
+    paths = []
+    csv_journal = getattr(ctrl, "_journal", None)
+    if csv_journal is not None:
+        paths.append(getattr(csv_journal, "path", None))
+    paths.append(getattr(getattr(ctrl, "journal", None), "path", None))
+    paths.append(getattr(getattr(ctrl, "_dsl_journal", None), "path", None))
+    tape_path = getattr(ctrl, "_command_tape_path", None)
+    if tape_path:
+        paths.extend((tape_path, str(index_path(tape_path))))
+    offsets: Dict[str, int] = {}
+    for raw in paths:
+        if not raw:
+            continue
+        path = Path(raw).resolve()
+        offsets[str(path)] = path.stat().st_size if path.exists() else 0
+    return offsets
+
+
+def rewind_journals(offsets: Mapping[str, int]) -> None:
+    """Truncate journals back to checkpointed sizes before continuing."""
+
+    for raw, size in offsets.items():
+        path = Path(raw)
+        current = path.stat().st_size if path.exists() else 0
+        if current < int(size):
+            raise CheckpointError(
+                f"{path} is shorter than at checkpoint ({current} < {size} bytes)"
+            )
+        if current > int(size):
+            with path.open("r+b") as fh:
+                fh.truncate(int(size))
+
+
+# ---------------------------------------------------------------------------
+# Sessions
+# ---------------------------------------------------------------------------
+
+
+def _deep_merge(base: Dict[str, Any], overlay: Mapping[str, Any]) -> Dict[str, Any]:
+    for key, value in overlay.items():
+        if isinstance(value, Mapping) and isinstance(base.get(key), dict):
+            _deep_merge(base[key], value)
+        else:
+            base[key] = copy.deepcopy(value)
+    return base
+
+
+class CheckpointSession:
+    """A stub-engine adapter + controller pair stepped one roll at a time."""
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        *,
+        spec_path: Optional[str] = None,
+        rolls_target: Optional[int] = None,
+    ) -> None:
+        from .controller import ControlStrategy
+
+        self.spec = spec
+        self.spec_path = spec_path
+        run_blk = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+        self.rolls_target = int(
+            rolls_target if rolls_target is not None else run_blk.get("rolls", 1000)
+        )
+        self.ctrl = ControlStrategy(copy.deepcopy(spec), spec_path=spec_path)
+        if isinstance(self.ctrl.adapter, VanillaAdapter):
+            self.adapter = self.ctrl.adapter
+        else:
+            self.adapter = VanillaAdapter()
+            self.adapter.start_session(copy.deepcopy(spec))
+        self.rolls_done = 0
+        self._prev_point: Optional[int] = None
+
+    # -- driving -----------------------------------------------------------
+    @property
+    def finished(self) -> bool:
+        return self.rolls_done >= self.rolls_target
+
+    def step(self) -> Dict[str, Any]:
+        result = self.adapter.step_roll()
+        self.ctrl.handle_event(event_for_roll(self._prev_point, result), self.adapter.bets)
+        self._prev_point = (result.get("snapshot") or {}).get("point_value")
+        self.rolls_done += 1
+        return result
+
+    def close(self, *, finalize: bool = True) -> None:
+        try:
+            if finalize:
+                self.ctrl.finalize_run()
+        finally:
+            self.ctrl.stop()
+
+    # -- checkpointing -----------------------------------------------------
+    def capture(self) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        try:
+            adapter_state = self.adapter.checkpoint_state()
+        except RuntimeError as exc:
+            raise CheckpointError(str(exc)) from exc
+        ctrl = self.ctrl
+        fields = _loads(_dumps({name: getattr(ctrl, name) for name in _CONTROLLER_FIELDS}))
+        behavior = getattr(ctrl, "_dsl_engine", None)
+        state = {
+            "adapter": adapter_state,
+            "controller": {
+                "fields": fields,
+                "objects": {
+                    name: _data_state(getattr(ctrl, name, None)) for name in _CONTROLLER_OBJECTS
+                },
+                "behavior_cooldowns": (
+                    copy.deepcopy(behavior._cooldowns) if behavior is not None else None
+                ),
+            },
+            "driver": {"prev_point": self._prev_point},
+            "journal_offsets": journal_offsets(ctrl),
+        }
+        header = {
+            "spec": self.spec,
+            "spec_path": self.spec_path,
+            "rolls_done": self.rolls_done,
+            "rolls_target": self.rolls_target,
+            "seed": getattr(self.adapter, "seed", None),
+            "run_id": ctrl.run_id,
+            "created": time.time(),
+        }
+        return header, state
+
+    def save(self, path: str | Path) -> Path:
+        header, state = self.capture()
+        return write_checkpoint(path, header, state)
+
+    def restore(self, header: Mapping[str, Any], state: Mapping[str, Any]) -> None:
+        self.adapter.restore_checkpoint_state(state["adapter"])
+        ctrl = self.ctrl
+        ctrl_state = state["controller"]
+        for name, value in ctrl_state["fields"].items():
+            setattr(ctrl, name, value)
+        objects = ctrl_state.get("objects") or {}
+        if objects.get("_journal") and getattr(ctrl, "_journal", None) is None:
+            ctrl._ensure_journal()
+        for name in _CONTROLLER_OBJECTS:
+            _restore_data_state(getattr(ctrl, name, None), objects.get(name))
+        behavior = getattr(ctrl, "_dsl_engine", None)
+        if behavior is not None and ctrl_state.get("behavior_cooldowns") is not None:
+            behavior._cooldowns = ctrl_state["behavior_cooldowns"]
+        self._prev_point = state["driver"]["prev_point"]
+        self.rolls_done = int(header["rolls_done"])
+
+    @classmethod
+    def resume(
+        cls,
+        path: str | Path,
+        *,
+        rolls_target: Optional[int] = None,
+        spec_overrides: Optional[Mapping[str, Any]] = None,
+        rewind: Optional[bool] = None,
+    ) -> "CheckpointSession":
+        """Rebuild a session from ``path``.
+
+        A plain resume rewinds journals to the checkpointed offsets. Passing
+        ``spec_overrides`` makes a what-if fork: the overrides are merged into
+        the stored spec (typically new journal paths or strategy tweaks) and the
+        original run's journals are left untouched.
+        """
+
+        header, state = read_checkpoint(path)
+        spec = copy.deepcopy(header["spec"])
+        if spec_overrides:
+            _deep_merge(spec, spec_overrides)
+        if rewind is None:
+            rewind = not spec_overrides
+        if rewind:
+            rewind_journals(state.get("journal_offsets") or {})
+        session = cls(
+            spec,
+            spec_path=header.get("spec_path"),
+            rolls_target=rolls_target if rolls_target is not None else header["rolls_target"],
+        )
+        session.restore(header, state)
+        return session
+
+
+def fork_sessions(
+    path: str | Path, variants: Iterable[Mapping[str, Any]]
+) -> Iterable[CheckpointSession]:
+    """Yield one what-if session per spec overlay, all starting from ``path``."""
+
+    for overlay in variants:
+        yield CheckpointSession.resume(path, spec_overrides=overlay)
+
+
+class Checkpointer:
+    """Decides when to write: every ``every_rolls`` rolls and/or ``every_seconds``."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        every_rolls: Optional[int] = None,
+        every_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.path = Path(path)
+        self.every_rolls = int(every_rolls) if every_rolls else None
+        self.every_seconds = float(every_seconds) if every_seconds else None
+        self._clock = clock
+        self._last_time = clock()
+        self._last_rolls = 0
+        self.written = 0
+
+    def due(self, rolls_done: int) -> bool:
+        if self.every_rolls and rolls_done - self._last_rolls >= self.every_rolls:
+            return True
+        if self.every_seconds and self._clock() - self._last_time >= self.every_seconds:
+            return True
+        return False
+
+    def write(self, session: CheckpointSession) -> Path:
+        out = session.save(self.path)
+        self._last_rolls = session.rolls_done
+        self._last_time = self._clock()
+        self.written += 1
+        return out
+
+    def maybe_write(self, session: CheckpointSession) -> bool:
+        if self.due(session.rolls_done):
+            self.write(session)
+            return True
+        return False
+
+
+def run_checkpointed(
+    session: CheckpointSession,
+    checkpointer: Optional[Checkpointer] = None,
+    *,
+    finalize: bool = True,
+) -> Dict[str, Any]:
+    """Drive ``session`` to its roll target, checkpointing along the way."""
+
+    status = "ok"
+    try:
+        while not session.finished:
+            result = session.step()
+            if result.get("status") not in (None, "ok"):
+                status = str(result.get("status"))
+                break
+            if checkpointer is not None:
+                checkpointer.maybe_write(session)
+        if checkpointer is not None:
+            checkpointer.write(session)
+    finally:
+        session.close(finalize=finalize)
+    snapshot = session.adapter.snapshot_state()
+    return {
+        "status": status,
+        "rolls": session.rolls_done,
+        "bankroll": snapshot.get("bankroll"),
+        "run_id": session.ctrl.run_id,
+        "checkpoints_written": checkpointer.written if checkpointer is not None else 0,
+    }
+
+
+__all__ = [
+    "CHECKPOINT_VERSION",
+    "DEFAULT_CHECKPOINT_EVERY",
+    "CheckpointError",
+    "CheckpointSession",
+    "Checkpointer",
+    "fork_sessions",
+    "journal_offsets",
+    "read_checkpoint",
+    "read_checkpoint_header",
+    "rewind_journals",
+    "run_checkpointed",
+    "write_checkpoint",
+]
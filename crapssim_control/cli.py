@@ -6,7 +6,6 @@ import copy
 import json
 import logging
 import os
-import random
 import uvicorn
 import sys
 import traceback
@@ -38,17 +37,25 @@ from .config import (
     get_stop_options,
     normalize_demo_fallbacks,
 )
-from .commands import doctor_run, init_run, summarize_run
+from .commands import bench_run, doctor_run, init_run, summarize_run
+from . import hotpath
 from .logging_utils import setup_logging
 from .policy_engine import PolicyEngine
 from .risk_schema import load_risk_policy
+from .rng import RngStreams, draw_seed
 from .spec_validation import VALIDATION_ENGINE_VERSION
 from .spec_loader import load_spec_file
 from .rules_engine.author import RuleBuilder
 from .schemas import JOURNAL_SCHEMA_VERSION, SUMMARY_SCHEMA_VERSION
 from .commands.run_cmd import _finalize_per_run_artifacts, _fallback_summary
+from .run.artifacts import (
+    ARTIFACT_LEVELS,
+    RUN_METRICS_NAME,
+    append_run_metrics,
+    artifact_level_from_spec,
+)
 from .run.controller import ControllerRunResult
-from .run.decisions_trace import DecisionsTrace
+from .run.decisions_trace import DecisionsTrace, trace_options
 from .manifest import generate_manifest
 from .utils.io_atomic import write_json_atomic
 
@@ -175,120 +182,6 @@ def _engine_soft_fail_enabled() -> bool:
     return flag in {"1", "true", "yes", "on"}
 
 
-def _smart_seed(seed: Optional[int]) -> None:
-    if seed is not None:
-        random.seed(seed)
-        try:
-            import numpy as _np  # type: ignore
-
-            _np.random.seed(seed)  # affects legacy RandomState only
-        except Exception:
-            pass
-
-
-def _reseed_engine(seed: Optional[int]) -> None:
-    """
-    Reset any module-level engine RNGs (best-effort).
-    """
-    if seed is None:
-        return
-    try:
-        import crapssim.dice as dice_mod  # type: ignore
-
-        # Prefer an explicit module hook, if present
-        if hasattr(dice_mod, "set_seed"):
-            dice_mod.set_seed(seed)
-            return
-        # Fall back to a Dice() helper, if it exposes a seed method
-        if hasattr(dice_mod, "Dice"):
-            d = dice_mod.Dice()
-            if hasattr(d, "seed"):
-                d.seed(seed)  # type: ignore[attr-defined]
-    except Exception as e:
-        log.debug("Engine reseed skipped: %s", e)
-
-
-def _force_seed_on_table(table: Any, seed: Optional[int]) -> None:
-    """
-    Ensure the *actual* dice/RNG instance the table uses is seeded.
-    Handles:
-      • objects exposing .set_seed(...) or .seed(...)
-      • objects carrying a Python random.Random in .random / ._random
-      • objects carrying a NumPy Generator in .rng / ._rng (default_rng)
-      • 'dice' containers that themselves have an inner .rng / .random
-    Never raises; logs at DEBUG on best-effort failures.
-    """
-    if seed is None:
-        return
-
-    # Lazy import numpy only if we need it
-    try:
-        import numpy as _np  # type: ignore
-
-        _has_numpy = True
-    except Exception:
-        _np = None
-        _has_numpy = False
-
-    def _is_np_generator(obj: Any) -> bool:
-        # Heuristic: new API Generators have .bit_generator and .random method
-        return (
-            _has_numpy and hasattr(obj, "bit_generator") and callable(getattr(obj, "random", None))
-        )
-
-    def _try_seed_leaf(obj: Any) -> bool:
-        # Direct seeding hooks
-        try:
-            if hasattr(obj, "set_seed"):
-                obj.set_seed(seed)  # type: ignore[attr-defined]
-                return True
-            if hasattr(obj, "seed"):
-                obj.seed(seed)  # type: ignore[attr-defined]
-                return True
-        except Exception:
-            pass
-
-        # random.Random instances living on the object
-        try:
-            for attr in ("random", "_random"):
-                r = getattr(obj, attr, None)
-                if isinstance(r, random.Random):
-                    r.seed(seed)
-                    return True
-        except Exception:
-            pass
-
-        # NumPy Generator: replace with a freshly seeded one
-        if _has_numpy:
-            try:
-                for attr in ("rng", "_rng"):
-                    g = getattr(obj, attr, None)
-                    if g is not None and _is_np_generator(g):
-                        setattr(obj, attr, _np.random.default_rng(seed))  # type: ignore[attr-defined]
-                        return True
-            except Exception:
-                pass
-
-        return False
-
-    # Common attachment points on the table
-    for attr in ("dice", "_dice", "rng", "_rng"):
-        if hasattr(table, attr) and _try_seed_leaf(getattr(table, attr)):
-            return
-
-    # Some tables hang dice on a game/engine member
-    for parent_attr in ("game", "engine", "_engine", "_game"):
-        parent = getattr(table, parent_attr, None)
-        if parent is None:
-            continue
-        for attr in ("dice", "_dice", "rng", "_rng"):
-            obj = getattr(parent, attr, None)
-            if obj is not None and _try_seed_leaf(obj):
-                return
-
-    log.debug("Could not locate dice/rng on table to force seed")
-
-
 def _run_table_rolls(table: Any, rolls: int) -> Tuple[bool, str]:
     """
     Try several ways to drive the Table for N rolls.
@@ -558,6 +451,17 @@ def _merge_cli_run_flags(spec: Dict[str, Any], args: argparse.Namespace) -> None
         sources["embed_analytics"] = "cli"
         changed = True
 
+    if getattr(args, "profile_hotpath", False):
+        run_dict["profile_hotpath"] = True
+        sources["profile_hotpath"] = "cli"
+        changed = True
+
+    artifacts_choice = getattr(args, "artifacts", None)
+    if isinstance(artifacts_choice, str) and artifacts_choice:
+        run_dict["artifacts"] = artifacts_choice
+        sources["artifacts"] = "cli"
+        changed = True
+
     engine_choice = getattr(args, "engine", None)
     if engine_choice:
         run_dict["engine"] = str(engine_choice)
@@ -623,11 +527,16 @@ def _prepare_run_artifacts(
     artifacts_root.mkdir(parents=True, exist_ok=True)
 
     run_dir = artifacts_root / run_id
-    run_dir.mkdir(parents=True, exist_ok=True)
+    lean = artifact_level_from_spec(spec) == "metrics-only"
+    if not lean:
+        run_dir.mkdir(parents=True, exist_ok=True)
 
     if not run_block.get("artifacts_dir"):
         run_block["artifacts_dir"] = str(run_dir)
 
+    if lean:
+        # metrics-only: no per-run journal; the run leaves one shared record
+        csv_blk["enabled"] = False
     csv_blk.setdefault("enabled", True)
     csv_blk.setdefault("append", False)
     if not str(csv_blk.get("path", "")).strip():
@@ -641,7 +550,21 @@ def _prepare_run_artifacts(
     explain_mode = explain_cli or explain_spec
     explain_source = "cli" if explain_cli else ("spec" if explain_spec else "default")
 
-    decisions_writer = DecisionsTrace(run_dir) if explain_mode else None
+    trace_mode = getattr(args, "trace_mode", None)
+    sample_every = getattr(args, "trace_sample_every", None)
+    if trace_mode or sample_every:
+        if not isinstance(journal_blk, dict):
+            journal_blk = run_block["journal"] = {}
+        trace_blk = journal_blk.setdefault("trace", {})
+        if trace_mode:
+            trace_blk["mode"] = trace_mode
+        if sample_every:
+            trace_blk.setdefault("mode", "sample")
+            trace_blk["sample_every"] = int(sample_every)
+
+    decisions_writer = (
+        DecisionsTrace(run_dir, **trace_options(journal_blk)) if explain_mode else None
+    )
 
     return run_dir, run_id, decisions_writer, explain_mode, explain_source
 
@@ -738,6 +661,7 @@ def _finalize_run_artifacts(
     decisions_writer: Optional[DecisionsTrace],
     summary_defaults: Optional[Mapping[str, Any]] = None,
     journal_src: Optional[Path] = None,
+    artifacts: str = "full",
 ) -> SimpleNamespace:
     run_dir.mkdir(parents=True, exist_ok=True)
 
@@ -814,6 +738,7 @@ def _finalize_run_artifacts(
         explain_source=explain_source,
         decisions_writer=decisions_writer,
         run_id=run_id,
+        artifacts=artifacts,
     )
 
     try:
@@ -823,6 +748,7 @@ def _finalize_run_artifacts(
             summary=serializable_summary,
             export_summary_path=None,
             journal_src=journal_source if journal_source and journal_source.exists() else None,
+            artifacts=artifacts,
         )
     except Exception as exc:  # pragma: no cover - defensive
         log.debug("emit per-run artifacts failed; writing fallback payload", exc_info=True)
@@ -840,6 +766,7 @@ def _finalize_run_artifacts(
             summary=fallback_payload,
             export_summary_path=None,
             journal_src=None,
+            artifacts=artifacts,
         )
 
     summary_path = run_dir / "summary.json"
@@ -864,6 +791,8 @@ def _finalize_run_artifacts(
         ensure_journal = not journal_path.exists() or journal_path.stat().st_size == 0
     except OSError:
         ensure_journal = True
+    if artifacts != "full":
+        ensure_journal = False
 
     if ensure_journal:
         wrote_summary = False
@@ -895,7 +824,8 @@ def _finalize_run_artifacts(
 
     # A final safeguard: if no journal was materialized above, emit an empty
     # stub so downstream tooling still finds the expected file.
-    _ensure_journal_present(journal_path)
+    if artifacts == "full":
+        _ensure_journal_present(journal_path)
 
     try:
         result.summary = dict(serializable_summary)
@@ -913,6 +843,13 @@ def _finalize_run_artifacts(
     return result
 
 
+def _run_metrics_record(summary: Mapping[str, Any]) -> Dict[str, Any]:
+    """Compact ``metrics-only`` record; ``spec`` + ``seed`` + ``rolls`` reproduce the run."""
+
+    keys = ("run_id", "spec", "seed", "rolls", "result", "final_bankroll", "note")
+    return {key: summary.get(key) for key in keys if summary.get(key) is not None}
+
+
 def _build_manifest_payload(
     spec_path: Path,
     args: argparse.Namespace,
@@ -921,12 +858,14 @@ def _build_manifest_payload(
     explain_source: str,
     decisions_writer: Optional[DecisionsTrace],
     run_id: str,
+    artifacts: str = "full",
 ) -> Dict[str, Any]:
     outputs = {
         "summary": "summary.json",
         "manifest": "manifest.json",
     }
-    outputs["journal"] = "journal.csv"
+    if artifacts == "full":
+        outputs["journal"] = "journal.csv"
     if decisions_writer is not None:
         outputs["decisions"] = "decisions.csv"
 
@@ -947,6 +886,7 @@ def _build_manifest_payload(
         run_manifest = manifest_payload.setdefault("run", {})
         flags_block = run_manifest.setdefault("flags", {})
         flags_block["explain"] = bool(explain_mode)
+        run_manifest["artifacts"] = artifacts
     except Exception:
         pass
 
@@ -1098,6 +1038,170 @@ def _capture_control_surface_artifacts(
     return ControllerRunResult(summary=summary_result, journal_path=journal_file)
 
 
+def _engine_choice(spec: Dict[str, Any]) -> str:
+    run_blk = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+    return str(run_blk.get("engine") or "").strip().lower()
+
+
+def _run_checkpointed(args: argparse.Namespace) -> int:
+    """
+    Run (or resume) a stub-engine controller session with periodic checkpoints.
+
+    The live CrapsSim table cannot be serialized, so a new checkpointed run
+    must select ``--engine stub``. The per-run artifact directory is prepared
+    up front and stored with the spec in the checkpoint; whichever process
+    finishes the run writes the summary/manifest/journal artifacts (and the
+    ``--export`` row) a normal run leaves.
+    """
+
+    from .checkpoint import (
+        DEFAULT_CHECKPOINT_EVERY,
+        CheckpointError,
+        Checkpointer,
+        CheckpointSession,
+        run_checkpointed,
+    )
+
+    resume_path = getattr(args, "resume", None)
+    decisions_writer: Optional[DecisionsTrace] = None
+    explain_mode, explain_source = False, "default"
+    try:
+        if resume_path:
+            session = CheckpointSession.resume(resume_path, rolls_target=args.rolls)
+        else:
+            spec_arg = getattr(args, "spec_override", None) or getattr(args, "spec", None)
+            if not spec_arg:
+                print("error: spec path is required", file=sys.stderr)
+                return 2
+            spec_path = Path(spec_arg)
+            spec = _load_spec_file(spec_path)
+            _merge_cli_run_flags(spec, args)
+            run_blk = spec.setdefault("run", {})
+            if args.rolls is not None:
+                run_blk["rolls"] = int(args.rolls)
+            if args.seed is not None:
+                run_blk["seed"] = int(args.seed)
+            if getattr(args, "no_stop_on_bankrupt", False):
+                run_blk["stop_on_bankrupt"] = False
+            if getattr(args, "no_stop_on_unactionable", False):
+                run_blk["stop_on_unactionable"] = False
+            if _engine_choice(spec) != "stub":
+                print(
+                    "error: --checkpoint runs the stub engine; pass --engine stub "
+                    "(or set run.engine: stub) to confirm",
+                    file=sys.stderr,
+                )
+                return 2
+            _run_dir, _run_id, decisions_writer, explain_mode, explain_source = (
+                _prepare_run_artifacts(spec, spec_path, args)
+            )
+            session = CheckpointSession(spec, spec_path=str(spec_path))
+    except CheckpointError as exc:
+        if decisions_writer is not None:
+            decisions_writer.close()
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+
+    checkpoint_path = getattr(args, "checkpoint", None) or resume_path
+    every_rolls = getattr(args, "checkpoint_every", None)
+    every_seconds = getattr(args, "checkpoint_seconds", None)
+    if not every_rolls and not every_seconds:
+        every_rolls = DEFAULT_CHECKPOINT_EVERY
+    checkpointer = Checkpointer(
+        checkpoint_path, every_rolls=every_rolls, every_seconds=every_seconds
+    )
+    if resume_path:
+        print(f"Resuming {resume_path} at roll {session.rolls_done}/{session.rolls_target}")
+    try:
+        result = run_checkpointed(session, checkpointer)
+        bankroll = result.get("bankroll")
+        if bankroll is not None:
+            print(f"RESULT: rolls={result['rolls']} bankroll={float(bankroll):.2f}")
+        else:
+            print(f"RESULT: rolls={result['rolls']}")
+        print(f"Checkpoint → {checkpoint_path} ({result['checkpoints_written']} written)")
+        _finalize_checkpointed_run(
+            session,
+            result,
+            args,
+            decisions_writer=decisions_writer,
+            explain_mode=explain_mode,
+            explain_source=explain_source,
+        )
+    except CheckpointError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        if decisions_writer is not None:
+            decisions_writer.close()
+    return 0
+
+
+def _finalize_checkpointed_run(
+    session: Any,
+    result: Mapping[str, Any],
+    args: argparse.Namespace,
+    *,
+    decisions_writer: Optional[DecisionsTrace],
+    explain_mode: bool,
+    explain_source: str,
+) -> None:
+    """Write the artifacts of a normal ``run`` for a finished checkpointed session."""
+
+    spec = session.spec
+    run_blk = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+    csv_blk = run_blk.get("csv") if isinstance(run_blk.get("csv"), dict) else {}
+    spec_path = Path(session.spec_path or "spec.json")
+    run_id = str(csv_blk.get("run_id") or session.ctrl.run_id)
+    raw_dir = run_blk.get("artifacts_dir")
+    run_dir = Path(raw_dir) if raw_dir else spec_path.parent / "artifacts" / run_id
+    bankroll = result.get("bankroll")
+    seed = run_blk.get("seed")
+    summary_payload: Dict[str, Any] = {
+        "run_id": run_id,
+        "spec": str(spec_path),
+        "rolls": result["rolls"],
+        "seed": seed,
+        "final_bankroll": float(bankroll) if bankroll is not None else None,
+        "artifacts_dir": str(run_dir),
+        "decisions_rows": decisions_writer.rows_written if decisions_writer is not None else 0,
+        "result": result["status"],
+    }
+
+    if getattr(args, "export", None):
+        try:
+            _write_csv_summary(
+                args.export,
+                {
+                    "spec": str(spec_path),
+                    "rolls": result["rolls"],
+                    "final_bankroll": summary_payload["final_bankroll"],
+                    "seed": seed,
+                    "note": "checkpoint",
+                },
+            )
+        except Exception as e:
+            print(f"warn: export failed: {e}", file=sys.stderr)
+
+    artifacts = artifact_level_from_spec(spec)
+    if artifacts == "metrics-only":
+        append_run_metrics(run_dir.parent / RUN_METRICS_NAME, _run_metrics_record(summary_payload))
+        return
+    journal_src = csv_blk.get("path") if csv_blk.get("enabled", True) else None
+    _finalize_run_artifacts(
+        run_dir,
+        run_id,
+        spec_path,
+        args,
+        explain_mode=explain_mode,
+        explain_source=explain_source,
+        summary=summary_payload,
+        decisions_writer=decisions_writer,
+        journal_src=Path(journal_src) if journal_src else None,
+        artifacts=artifacts,
+    )
+
+
 def run(args: argparse.Namespace) -> int:
     """
     Executes a CrapsSim-Control run:
@@ -1106,6 +1210,9 @@ def run(args: argparse.Namespace) -> int:
       3. Invokes the controller to simulate
       4. Finalizes per-run artifacts (summary.json, manifest.json, journal.csv, decisions.csv)
     """
+    if getattr(args, "resume", None) or getattr(args, "checkpoint", None):
+        return _run_checkpointed(args)
+
     # Load spec
     run_artifacts_dir: Optional[Path] = None
     run_id: str = ""
@@ -1119,6 +1226,9 @@ def run(args: argparse.Namespace) -> int:
         manifest=None,
         export_summary_path=None,
         journal_src=None,
+        profiling=False,
+        artifacts="full",
+        metrics_path=None,
     )
 
     def _close_decisions_trace() -> None:
@@ -1144,6 +1254,10 @@ def run(args: argparse.Namespace) -> int:
 
     # Merge CLI flag overrides (before normalization/adapter usage)
     _merge_cli_run_flags(spec, args)
+    if isinstance(spec, dict) and _engine_choice(spec) == "stub":
+        print("error: the stub engine is only available with --checkpoint", file=sys.stderr)
+        _close_decisions_trace()
+        return 2
 
     risk_overrides: Dict[str, Any] = {}
     if not isinstance(spec, dict):
@@ -1160,7 +1274,12 @@ def run(args: argparse.Namespace) -> int:
         )
     )
     try:
-        finalization_state.run_dir = run_artifacts_dir
+        artifacts = artifact_level_from_spec(spec)
+        finalization_state.artifacts = artifacts
+        if artifacts == "metrics-only":
+            finalization_state.metrics_path = run_artifacts_dir.parent / RUN_METRICS_NAME
+        else:
+            finalization_state.run_dir = run_artifacts_dir
         risk_block = run_block.get("risk")
         if not isinstance(risk_block, dict):
             risk_block = {}
@@ -1305,8 +1424,10 @@ def run(args: argparse.Namespace) -> int:
                 seed_int = int(seed)
             except Exception:
                 seed_int = None
-        _smart_seed(seed_int)
-        _reseed_engine(seed_int)
+        if seed_int is None and artifacts == "metrics-only":
+            # the shared record is the only trace of the run: make it re-runnable
+            seed_int = draw_seed()
+        rng_streams = RngStreams(seed_int) if seed_int is not None else None
 
         # Attach engine
         adapter_reason: Optional[str] = None
@@ -1335,8 +1456,9 @@ def run(args: argparse.Namespace) -> int:
                 except Exception:
                     print("Risk policy active: overrides applied")
             table = attach_result.table
-            # CRITICAL: seed the actual dice/rng instance now that it exists
-            _force_seed_on_table(table, seed_int)
+            # CRITICAL: hand the run's dice stream to the table now that it exists
+            if rng_streams is not None:
+                rng_streams.bind_table(table)
 
             if rng_audit:
                 # best-effort introspection only (stdout, ignored by RESULT grep)
@@ -1402,7 +1524,11 @@ def run(args: argparse.Namespace) -> int:
 
         # Drive the table
         log.info("Starting run: rolls=%s seed=%s", rolls, seed_int)
-        ok, used = _run_table_rolls(table, rolls)
+        if hotpath.configure_from_spec(spec):
+            hotpath.PROFILER.reset()
+            finalization_state.profiling = True
+        with hotpath.span("cli.table_rolls"):
+            ok, used = _run_table_rolls(table, rolls)
         if not ok:
             msg = f"Could not run {rolls} rolls. {used}."
             if os.environ.get("CSC_DEBUG", "0").lower() in ("1", "true", "yes"):
@@ -1469,17 +1595,21 @@ def run(args: argparse.Namespace) -> int:
             except Exception as e:
                 print(f"warn: export failed: {e}", file=sys.stderr)
 
+        if artifacts == "metrics-only":
+            return 0
+
         try:
-            control_result = _capture_control_surface_artifacts(
-                spec,
-                spec_path,
-                args,
-                seed_int,
-                rolls,
-                float(bankroll) if bankroll is not None else None,
-                decisions_writer=decisions_writer,
-                explain_mode=explain_mode,
-            )
+            if artifacts == "full":
+                control_result = _capture_control_surface_artifacts(
+                    spec,
+                    spec_path,
+                    args,
+                    seed_int,
+                    rolls,
+                    float(bankroll) if bankroll is not None else None,
+                    decisions_writer=decisions_writer,
+                    explain_mode=explain_mode,
+                )
         except Exception:
             if os.environ.get("CSC_DEBUG", "0").lower() in ("1", "true", "yes"):
                 print("warn: control-surface capture failed", file=sys.stderr)
@@ -1510,6 +1640,7 @@ def run(args: argparse.Namespace) -> int:
                 decisions_writer=decisions_writer,
                 summary_defaults=summary_payload,
                 journal_src=(control_result.journal_path if control_result else None),
+                artifacts=artifacts,
             )
             finalization_state.summary = finalize_result.summary
             finalization_state.manifest = finalize_result.manifest
@@ -1534,6 +1665,7 @@ def run(args: argparse.Namespace) -> int:
                     explain_source=explain_source,
                     decisions_writer=decisions_writer,
                     run_id=run_id,
+                    artifacts=artifacts,
                 )
             except Exception:
                 finalization_state.manifest = None
@@ -1556,6 +1688,14 @@ def run(args: argparse.Namespace) -> int:
                 log.debug("failed to ensure summary.json fallback", exc_info=True)
 
         return 0
+    except BaseException as exc:
+        # Flight-recorder traces dump their buffered rows when the run dies.
+        if decisions_writer is not None:
+            try:
+                decisions_writer.trigger(f"exception:{type(exc).__name__}")
+            except Exception:
+                pass
+        raise
     finally:
         run_dir_for_final = finalization_state.run_dir
         try:
@@ -1566,11 +1706,21 @@ def run(args: argparse.Namespace) -> int:
                     summary=finalization_state.summary,
                     export_summary_path=finalization_state.export_summary_path,
                     journal_src=finalization_state.journal_src,
+                    artifacts=finalization_state.artifacts,
+                )
+            elif finalization_state.metrics_path is not None and isinstance(
+                finalization_state.summary, Mapping
+            ):
+                append_run_metrics(
+                    finalization_state.metrics_path,
+                    _run_metrics_record(finalization_state.summary),
                 )
         except Exception:
             log.debug("finalize per-run artifacts failed in finally", exc_info=True)
         finally:
             _close_decisions_trace()
+            if finalization_state.profiling:
+                hotpath.PROFILER.disable()
 
 
 # ------------------------------ Parser/Main --------------------------------- #
@@ -1649,6 +1799,21 @@ def _cmd_doctor(args: argparse.Namespace) -> int:
     return int(result)
 
 
+def _cmd_bench(args: argparse.Namespace) -> int:
+    return bench_run(
+        args.scenario or None,
+        quick=bool(args.quick),
+        ops=args.ops,
+        seed=int(args.seed),
+        out=args.out,
+        baseline=args.baseline,
+        update_baseline=bool(args.update_baseline),
+        max_regression=float(args.max_regression),
+        max_p99_regression=float(args.max_p99_regression),
+        list_only=bool(args.list),
+    )
+
+
 def _cmd_ui(args: argparse.Namespace) -> int:
     from .http_app import create_app
 
@@ -1707,6 +1872,48 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     p_doc.set_defaults(func=_cmd_doctor)
 
+    # bench
+    p_bench = sub.add_parser("bench", help="Run the fixed performance scenario catalog")
+    p_bench.add_argument(
+        "--scenario",
+        action="append",
+        default=[],
+        help="Scenario name to run (repeatable; default: all). See --list.",
+    )
+    p_bench.add_argument("--list", action="store_true", help="List scenarios and exit")
+    p_bench.add_argument("--quick", action="store_true", help="Use short per-scenario op counts")
+    p_bench.add_argument("--ops", type=int, default=None, help="Override ops per scenario")
+    p_bench.add_argument("--seed", type=int, default=42, help="Seed for every scenario")
+    p_bench.add_argument(
+        "--out", default=None, help="Results JSON path (default: baselines/bench/latest.json)"
+    )
+    p_bench.add_argument(
+        "--baseline",
+        default=None,
+        help="Baseline JSON to compare against (default: baselines/bench/baseline.json)",
+    )
+    p_bench.add_argument(
+        "--update-baseline",
+        dest="update_baseline",
+        action="store_true",
+        help="Store these results as the new baseline instead of comparing",
+    )
+    p_bench.add_argument(
+        "--max-regression",
+        dest="max_regression",
+        type=float,
+        default=0.20,
+        help="Allowed ops/sec drop vs baseline, as a fraction (default: 0.20)",
+    )
+    p_bench.add_argument(
+        "--max-p99-regression",
+        dest="max_p99_regression",
+        type=float,
+        default=0.50,
+        help="Allowed p99 latency growth vs baseline, as a fraction (default: 0.50)",
+    )
+    p_bench.set_defaults(func=_cmd_bench)
+
     # ui
     p_ui = sub.add_parser("ui", help="Launch the CSC UI (FastAPI)")
     p_ui.add_argument("--host", default="127.0.0.1", help="Host interface to bind")
@@ -1788,8 +1995,8 @@ def _build_parser() -> argparse.ArgumentParser:
     )
     p_run.add_argument(
         "--engine",
-        choices=["inprocess", "http_api"],
-        help="Select the engine backend (default: inprocess).",
+        choices=["inprocess", "http_api", "stub"],
+        help="Select the engine backend (default: inprocess; stub only with --checkpoint).",
     )
     p_run.add_argument(
         "--engine-url",
@@ -1889,6 +2096,53 @@ def _build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Print rule decisions and write artifacts/<run_id>/decisions.csv",
     )
+    p_run.add_argument(
+        "--trace-mode",
+        choices=["full", "flight", "sample"],
+        help="decisions.csv tracing: every row (full), last rows dumped on a trigger "
+        "(flight), or 1-in-K rolls (sample). Overrides run.journal.trace.mode.",
+    )
+    p_run.add_argument(
+        "--trace-sample-every",
+        type=int,
+        metavar="K",
+        help="Keep decision rows for one roll in K (implies --trace-mode sample).",
+    )
+    p_run.add_argument(
+        "--artifacts",
+        choices=ARTIFACT_LEVELS,
+        default=None,
+        help="Per-run artifact profile: full (default), standard (summary/manifest only) or "
+        "metrics-only (one record appended to artifacts/run_metrics.jsonl). "
+        "Overrides run.artifacts.",
+    )
+    p_run.add_argument(
+        "--profile-hotpath",
+        action="store_true",
+        help="Time hot-path spans and add p50/p99/max latencies to report.json (hotpath).",
+    )
+    p_run.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="Checkpoint a stub-engine session to PATH (requires --engine stub).",
+    )
+    p_run.add_argument(
+        "--checkpoint-every",
+        type=int,
+        metavar="N",
+        help="Write a checkpoint every N rolls (default 10000 when no cadence is given).",
+    )
+    p_run.add_argument(
+        "--checkpoint-seconds",
+        type=float,
+        metavar="T",
+        help="Write a checkpoint every T seconds of wall time.",
+    )
+    p_run.add_argument(
+        "--resume",
+        metavar="CHECKPOINT",
+        help="Continue a checkpointed run; --rolls raises the roll target.",
+    )
     p_run.set_defaults(func=_cmd_run)
 
     # dsl helpers
@@ -7,13 +7,20 @@ Usage:
 
 import argparse
 from .batch_runner import run_batch
+from .run.artifacts import ARTIFACT_LEVELS
 
 
 def main():
     ap = argparse.ArgumentParser(prog="csc-batch", description="CSC batch runner")
     ap.add_argument("--plan", required=True, help="Path to batch plan (YAML or JSON)")
+    ap.add_argument(
+        "--artifacts",
+        choices=ARTIFACT_LEVELS,
+        default=None,
+        help="Per-run artifact profile (default: plan value, else standard)",
+    )
     args = ap.parse_args()
-    run_batch(args.plan)
+    run_batch(args.plan, artifacts=args.artifacts)
 
 
 if __name__ == "__main__":
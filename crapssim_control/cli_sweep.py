@@ -9,6 +9,7 @@ import argparse
 import os
 from .sweep import run_sweep, expand_plan
 from .aggregator import aggregate
+from .run.artifacts import ARTIFACT_LEVELS
 
 
 def main():
@@ -23,11 +24,17 @@ def main():
     ap.add_argument(
         "--compare", action="store_true", help="Write comparisons.json with deltas and correlations"
     )
+    ap.add_argument(
+        "--artifacts",
+        choices=ARTIFACT_LEVELS,
+        default=None,
+        help="Per-run artifact profile (default: plan value, else standard)",
+    )
     args = ap.parse_args()
 
     # Expand once to learn out_dir
     _, out_dir, _ = expand_plan(args.plan)
-    manifest_path = run_sweep(args.plan)
+    manifest_path = run_sweep(args.plan, artifacts=args.artifacts)
     out = aggregate(
         out_dir=out_dir,
         leaderboard_metric=args.metric,
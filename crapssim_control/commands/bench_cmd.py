@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from crapssim_control.bench import (
+    DEFAULT_BASELINE_PATH,
+    DEFAULT_MAX_P99_GROWTH,
+    DEFAULT_MAX_THROUGHPUT_DROP,
+    DEFAULT_RESULTS_PATH,
+    SCENARIOS,
+    compare_results,
+    load_results,
+    run_bench,
+    write_results,
+)
+
+
+def _print_table(results: dict) -> None:
+    print(f"{'scenario':<20} {'unit':<7} {'ops/s':>10} {'p50 us':>10} {'p99 us':>10} {'blk/op':>8}")
+    for name, rec in (results.get("scenarios") or {}).items():
+        status = rec.get("status")
+        if status != "ok":
+            detail = rec.get("reason") or rec.get("error") or ""
+            print(f"{name:<20} {rec.get('unit', ''):<7} {status:>10}  {detail}")
+            continue
+        lat = rec.get("latency_us") or {}
+        print(
+            f"{name:<20} {rec['unit']:<7} {rec['ops_per_sec']:>10.1f} "
+            f"{lat.get('p50', 0):>10.1f} {lat.get('p99', 0):>10.1f} "
+            f"{rec.get('retained_blocks_per_op', 0):>8.2f}"
+        )
+
+
+def run(
+    scenarios: Optional[Sequence[str]] = None,
+    *,
+    quick: bool = False,
+    ops: Optional[int] = None,
+    seed: int = 42,
+    out: Optional[str] = None,
+    baseline: Optional[str] = None,
+    update_baseline: bool = False,
+    max_regression: float = DEFAULT_MAX_THROUGHPUT_DROP,
+    max_p99_regression: float = DEFAULT_MAX_P99_GROWTH,
+    list_only: bool = False,
+) -> int:
+    """Run the bench catalog; returns 1 when a baseline regression is detected."""
+
+    if list_only:
+        for name, scenario in SCENARIOS.items():
+            print(f"{name:<20} {scenario.description}")
+        return 0
+
+    try:
+        results = run_bench(scenarios, quick=quick, ops=ops, seed=seed)
+    except KeyError as exc:
+        print(f"[ERR] {exc.args[0]}")
+        return 2
+
+    _print_table(results)
+    out_path = write_results(results, Path(out) if out else DEFAULT_RESULTS_PATH)
+    print(f"[OK] results written to {out_path}")
+
+    baseline_path = Path(baseline) if baseline else DEFAULT_BASELINE_PATH
+    if update_baseline:
+        write_results(results, baseline_path)
+        print(f"[OK] baseline updated at {baseline_path}")
+        return 0
+
+    stored = load_results(baseline_path)
+    if stored is None:
+        print(f"[WARN] no baseline at {baseline_path}; use --update-baseline to record one")
+        return 0
+
+    regressions: List[dict] = compare_results(
+        results,
+        stored,
+        max_throughput_drop=max_regression,
+        max_p99_growth=max_p99_regression,
+    )
+    if not regressions:
+        print(f"[OK] no regressions against {baseline_path}")
+        return 0
+    for reg in regressions:
+        if reg["metric"] == "status":
+            detail = f" ({reg['error']})" if reg.get("error") else ""
+            print(f"[ERR] {reg['scenario']}: was ok, now {reg['current']}{detail}")
+            continue
+        print(
+            f"[ERR] {reg['scenario']}: {reg['metric']} {reg['baseline']} -> {reg['current']} "
+            f"({reg['change']:+.1%}, limit {reg['threshold']:+.0%})"
+        )
+    return 1
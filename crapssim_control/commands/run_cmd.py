@@ -49,8 +49,14 @@ def _finalize_per_run_artifacts(
     summary: Optional[dict[str, Any]],
     export_summary_path: Optional[Path],
     journal_src: Optional[Path],
+    artifacts: str = "full",
 ) -> None:
-    """Always materialize manifest.json and summary.json beside decisions.csv."""
+    """
+    Always materialize manifest.json and summary.json beside decisions.csv.
+
+    Below the ``full`` artifact profile the decisions/journal stubs and the
+    journal copy are skipped.
+    """
 
     run_dir.mkdir(parents=True, exist_ok=True)
 
@@ -80,6 +86,9 @@ def _finalize_per_run_artifacts(
 
     write_json_atomic(manifest_path, manifest_payload)
 
+    if artifacts != "full":
+        return
+
     if not decisions_path.exists():
         try:
             trace = DecisionsTrace(run_dir)
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import heapq
 import math
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -17,9 +18,8 @@ def make_leaderboard(
     Deterministic tie-breaker: run_id ascending.
     """
     filtered = [r for r in rows if _is_num(r.get(metric))]
-    # Stable tiebreak by run_id
-    filtered.sort(key=lambda r: (-(r[metric]), r.get("run_id", "")))
-    return filtered[:top_k]
+    # Stable tiebreak by run_id; nsmallest keeps only top_k while scanning
+    return heapq.nsmallest(top_k, filtered, key=lambda r: _leader_key(r, metric))
 
 
 def _delta(a: Optional[float], b: Optional[float]) -> Optional[float]:
@@ -34,14 +34,81 @@ def _ratio(a: Optional[float], b: Optional[float]) -> Optional[float]:
     return None
 
 
-def make_comparisons(rows: List[Dict[str, Any]], metric: str) -> Dict[str, Any]:
+class PairMoments:
+    """Running co-moments of two series (Welford), enough for a Pearson correlation."""
+
+    __slots__ = ("n", "mean_x", "mean_y", "m2_x", "m2_y", "c_xy")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.m2_x = 0.0
+        self.m2_y = 0.0
+        self.c_xy = 0.0
+
+    def push(self, x: float, y: float) -> None:
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def pearson(self) -> Optional[float]:
+        if self.n < 2 or self.m2_x <= 0 or self.m2_y <= 0:
+            return None
+        return self.c_xy / math.sqrt(self.m2_x * self.m2_y)
+
+
+CORRELATION_PAIRS: Tuple[Tuple[str, str], ...] = (
+    ("ROI", "max_drawdown"),
+    ("ROI", "hands"),
+    ("ROI", "rolls"),
+)
+
+
+class RunningCorrelations:
+    """Feeds rows one at a time into a :class:`PairMoments` per metric pair."""
+
+    __slots__ = ("pairs", "_moments")
+
+    def __init__(self, pairs: Tuple[Tuple[str, str], ...] = CORRELATION_PAIRS) -> None:
+        self.pairs = pairs
+        self._moments = [PairMoments() for _ in pairs]
+
+    def push(self, row: Dict[str, Any]) -> None:
+        for (a, b), moments in zip(self.pairs, self._moments):
+            va, vb = row.get(a), row.get(b)
+            if _is_num(va) and _is_num(vb):
+                moments.push(float(va), float(vb))
+
+    def result(self) -> Dict[str, Optional[float]]:
+        return {f"{a}~{b}": m.pearson() for (a, b), m in zip(self.pairs, self._moments)}
+
+
+def _leader_key(row: Dict[str, Any], metric: str) -> Tuple[float, str]:
+    return (-(row[metric]), row.get("run_id", ""))
+
+
+def make_comparisons(
+    rows: List[Dict[str, Any]],
+    metric: str,
+    *,
+    correlations: Optional[RunningCorrelations] = None,
+) -> Dict[str, Any]:
     """
     Build delta set vs. the top row (by metric). Skips rows without numeric metric.
+
+    Pass ``correlations`` when the caller already fed the rows through a
+    :class:`RunningCorrelations` (e.g. while building them) to skip that pass.
     """
     numeric = [r for r in rows if _is_num(r.get(metric))]
     if not numeric:
         return {"metric": metric, "top_run": None, "comparisons": [], "correlations": {}}
-    top = sorted(numeric, key=lambda r: (-(r[metric]), r.get("run_id", "")))[0]
+    top = min(numeric, key=lambda r: _leader_key(r, metric))
     comps: List[Dict[str, Any]] = []
     for r in numeric:
         if r is top:
@@ -55,43 +122,13 @@ def make_comparisons(rows: List[Dict[str, Any]], metric: str) -> Dict[str, Any]:
                 "relative_efficiency": _ratio(r.get(metric), top.get(metric)),
             }
         )
+    if correlations is None:
+        correlations = RunningCorrelations()
+        for r in rows:
+            correlations.push(r)
     return {
         "metric": metric,
         "top_run": top.get("run_id"),
         "comparisons": comps,
-        "correlations": _correlations(rows),
+        "correlations": correlations.result(),
     }
-
-
-def _pearson(xs: List[float], ys: List[float]) -> Optional[float]:
-    n = len(xs)
-    if n < 2:
-        return None
-    mean_x = sum(xs) / n
-    mean_y = sum(ys) / n
-    num = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
-    den_x = math.sqrt(sum((x - mean_x) ** 2 for x in xs))
-    den_y = math.sqrt(sum((y - mean_y) ** 2 for y in ys))
-    if den_x == 0 or den_y == 0:
-        return None
-    return num / (den_x * den_y)
-
-
-def _collect(rows: List[Dict[str, Any]], a: str, b: str) -> Tuple[List[float], List[float]]:
-    xs: List[float] = []
-    ys: List[float] = []
-    for r in rows:
-        va, vb = r.get(a), r.get(b)
-        if _is_num(va) and _is_num(vb):
-            xs.append(float(va))
-            ys.append(float(vb))
-    return xs, ys
-
-
-def _correlations(rows: List[Dict[str, Any]]) -> Dict[str, Optional[float]]:
-    pairs = [("ROI", "max_drawdown"), ("ROI", "hands"), ("ROI", "rolls")]
-    out: Dict[str, Optional[float]] = {}
-    for a, b in pairs:
-        xs, ys = _collect(rows, a, b)
-        out[f"{a}~{b}"] = _pearson(xs, ys)
-    return out
@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from collections import deque
+from contextlib import nullcontext
 from dataclasses import asdict, is_dataclass
 from datetime import datetime
 import hashlib  # P5C5: for content fingerprints
@@ -9,18 +10,19 @@ import json
 import logging
 from pathlib import Path
 import platform
+import re
 import shutil
 import subprocess
 import time
 from types import SimpleNamespace
-from typing import Any, Deque, Dict, List, Optional, Tuple
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
 from uuid import uuid4
 import zipfile
 import csv
 import os
 
-from crapssim_control.external.command_channel import CommandQueue
-from crapssim_control.external.command_tape import CommandTape
+from crapssim_control.external.command_channel import CommandQueue, dedupe_key
+from crapssim_control.external.command_tape import CommandTape, CommandTapeReader
 from crapssim_control.external.http_api import (
     HTTPServerHandle,
     _validate_and_attach_effect,
@@ -44,11 +46,15 @@ from crapssim_control.plugins.runtime import (
 )
 from crapssim_control.plugins.registry import PluginRegistry
 from crapssim_control.plugins.loader import PluginLoader
-from .run.decisions_trace import DecisionsTrace
+from .bundles.store import BlobStore
+from .run.artifacts import RUN_METRICS_NAME, append_run_metrics, artifact_level_from_spec
+from .run.decisions_trace import DecisionsTrace, trace_options
 
 from .actions import make_action  # Action Envelope helper
+from .analytics.streaming import QuantileSketch, RunningStats
 from .analytics.tracker import Tracker
 from .analytics.types import HandCtx, RollCtx, SessionCtx
+from . import hotpath
 from .config import (
     DEMO_FALLBACKS_DEFAULT,
     EMBED_ANALYTICS_DEFAULT,
@@ -57,6 +63,7 @@ from .config import (
     normalize_demo_fallbacks,
 )
 from .report_builder import (
+    attach_hotpath_metadata,
     attach_manifest_risk_overrides,
     attach_termination_metadata,
     attach_trace_metadata,
@@ -65,16 +72,17 @@ from .csv_journal import CSVJournal  # Per-event journaling
 from .engine.factory import build_engine_adapter
 from .engine_adapter import NullAdapter, VanillaAdapter
 from .eval import evaluate, EvalError
-from .events import canonicalize_event, COMEOUT, POINT_ESTABLISHED, ROLL, SEVEN_OUT
+from .events import canonicalize_event, COMEOUT, POINT_ESTABLISHED, POINT_MADE, ROLL, SEVEN_OUT
 from .integrations.evo_hooks import EvoBridge
 from .integrations.hooks import Outbound
 from .manifest import generate_manifest
 from .rules_engine import apply_rules  # Runtime rules engine
-from .rules_engine.evaluator import evaluate_rules
+from .rules_engine.evaluator import CompiledRuleset, compile_ruleset
 from .rules_engine.journal import DecisionJournal, JournalWriter
 from .rules_engine.schema import validate_ruleset
 from .schemas import JOURNAL_SCHEMA_VERSION, SUMMARY_SCHEMA_VERSION
 from .spec_validation import VALIDATION_ENGINE_VERSION
+from .table_policy import compile_table_policy
 from .templates import diff_bets, render_template as render_runtime_template
 
 logger = logging.getLogger("CSC.Controller")
@@ -161,6 +169,10 @@ class ControlStrategy:
         self._command_tape: Optional[CommandTape] = None
         self._command_tape_path: Optional[str] = None
         self._replay_commands: Deque[Dict[str, Any]] = deque()
+        self._replay_reader: Optional[CommandTapeReader] = None
+        self._replay_entries: Optional[Iterator[Tuple[int, Dict[str, Any]]]] = None
+        self._replay_entries_pos = 0
+        self._replay_position = 0  # records pulled from the tape, in index order
         run_block = spec.get("run") if isinstance(spec, dict) else None
         adapter_cfg: Dict[str, Any] = {}
         if isinstance(run_block, dict):
@@ -183,6 +195,7 @@ class ControlStrategy:
             explain_source = "spec"
         self._explain_mode: bool = bool(explain_cli or explain_param or explain_spec)
         self._explain_flag_source: str = explain_source
+        self._trace_options: Dict[str, Any] = trace_options(journal_cfg)
         self._human_summary_flag: bool = bool(self._cli_flags_context.get("human_summary", False))
         self._decisions_writer: Optional[DecisionsTrace] = decisions_writer
         self._decisions_writer_external: bool = decisions_writer is not None
@@ -198,7 +211,7 @@ class ControlStrategy:
             except Exception:
                 pass
             self._decisions_trace_dir = decisions_dir
-            self._decisions_writer = DecisionsTrace(decisions_dir)
+            self._decisions_writer = DecisionsTrace(decisions_dir, **self._trace_options)
         elif self._decisions_writer is not None and isinstance(artifacts_dir_value, (str, Path)):
             self._decisions_trace_dir = Path(artifacts_dir_value)
 
@@ -302,9 +315,17 @@ class ControlStrategy:
                 once_per_window=self._dsl_once_per_window,
                 verbose=self._dsl_verbose_journal,
             )
-            self._dsl_journal = DecisionsJournal(artifacts_path, verbose=self._dsl_verbose_journal)
+            journal_opts = {
+                k: v
+                for k, v in self._trace_options.items()
+                if k in ("mode", "capacity", "post_trigger", "sample_every")
+            }
+            self._dsl_journal = DecisionsJournal(
+                artifacts_path, verbose=self._dsl_verbose_journal, **journal_opts
+            )
             self._dsl_enabled = True
         self.table_cfg = table_cfg or spec.get("table") or {}
+        self._table_policy = compile_table_policy({**spec, "table": self.table_cfg})
         self.point: Optional[int] = None
         self.rolls_since_point: int = 0
         self.on_comeout: bool = True
@@ -702,62 +723,52 @@ class ControlStrategy:
         if not path:
             return None
         if self._command_tape is None or self._command_tape_path != path:
+            if self._command_tape is not None:
+                self._command_tape.close()
             self._command_tape = CommandTape(path)
             self._command_tape_path = path
         return self._command_tape
 
     def _load_replay_tape(self) -> None:
         self._replay_commands.clear()
+        self._replay_reader = None
+        self._replay_entries = None
         path = self._command_tape_path
         if not path:
             return
-        records: List[Dict[str, Any]] = []
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        data = json.loads(line)
-                    except Exception:
-                        continue
-                    if not isinstance(data, dict):
-                        continue
-                    data.setdefault("args", {})
-                    data.setdefault("source", "replay")
-                    records.append(data)
+            self._replay_reader = CommandTapeReader(path)
         except Exception:
             return
+        from_hand = self.config.get("run.external.replay_from_hand", None)
+        if from_hand is not None and not self._replay_position:
+            try:
+                self._replay_position = self._replay_reader.position_of_hand(int(from_hand))
+            except Exception:
+                pass
+        first = self._peek_replay_command()
+        if first is not None:
+            run_id = first.get("run_id")
+            if run_id:
+                self._run_id = str(run_id)
 
-        def _num(val: Any) -> Optional[float]:
-            if isinstance(val, (int, float)):
-                return float(val)
-            if isinstance(val, str):
-                try:
-                    return float(val)
-                except Exception:
-                    return None
-            return None
-
-        records.sort(
-            key=lambda item: (
-                0 if _num(item.get("journal_seq")) is not None else 1,
-                _num(item.get("journal_seq")) or 0.0,
-                0 if _num(item.get("hand_id")) is not None else 1,
-                _num(item.get("hand_id")) or 0.0,
-                0 if _num(item.get("roll_in_hand")) is not None else 1,
-                _num(item.get("roll_in_hand")) or 0.0,
-                _num(item.get("ts")) or 0.0,
-            )
-        )
+    def _peek_replay_command(self) -> Optional[Dict[str, Any]]:
+        """Next tape command, pulled one at a time from the indexed reader."""
 
-        for record in records:
+        if self._replay_commands:
+            return self._replay_commands[0]
+        reader = self._replay_reader
+        if reader is None:
+            return None
+        if self._replay_entries is None or self._replay_entries_pos != self._replay_position:
+            # (re)open at the cursor, e.g. after a checkpoint restored _replay_position
+            self._replay_entries = reader.entries(start=self._replay_position)
+        for position, record in self._replay_entries:
+            self._replay_position = self._replay_entries_pos = position + 1
             self._replay_commands.append(record)
-        if records:
-            run_id = records[0].get("run_id")
-            if run_id:
-                self._run_id = str(run_id)
+            return record
+        self._replay_entries_pos = self._replay_position
+        return None
 
     def _enqueue_replay_command(self, payload: Dict[str, Any]) -> None:
         if not hasattr(self, "command_queue"):
@@ -805,8 +816,10 @@ class ControlStrategy:
         if self.external_mode != "replay":
             return
         current_hand = tracker.hand_id if tracker is not None else None
-        while self._replay_commands:
-            entry = self._replay_commands[0]
+        while True:
+            entry = self._peek_replay_command()
+            if entry is None:
+                break
             hand_target = entry.get("hand_id")
             if hand_target is not None and current_hand is not None and hand_target > current_hand:
                 break
@@ -844,6 +857,114 @@ class ControlStrategy:
             seq=seq,
         )
 
+    def _execute_external_commands(
+        self, pending: List[Dict[str, Any]], current_state: Dict[str, Any], tracker: Any
+    ) -> None:
+        """Dispatch one drained batch; its journal and tape rows are flushed in one write each."""
+
+        tape = self._get_command_tape() if self.external_mode != "replay" else None
+        with self.journal.buffered(), tape.buffered() if tape is not None else nullcontext():
+            seen_this_roll = set()
+            for cmd in pending:
+                cmd.pop("_csc_replay", None)
+                # enqueue/dispatch wall-clock stamps let load generators split latency per command
+                stamps = {"enqueued_at": cmd.pop("enqueued_at", None), "executed_at": time.time()}
+                verb = cmd["action"]
+                raw_args = cmd.get("args")
+                args = raw_args if isinstance(raw_args, dict) else {}
+                source_label = str(cmd.get("source", "external"))
+                origin = f"external:{source_label}"
+                corr = cmd.get("correlation_id")
+                key = cmd.pop("dedupe_key", None) or dedupe_key(source_label, verb, args)
+                if key in seen_this_roll:
+                    rejection_reason = "duplicate_roll"
+                    record = {
+                        "run_id": self.run_id,
+                        "hand_id": tracker.hand_id if tracker is not None else None,
+                        "roll_in_hand": tracker.roll_in_hand if tracker is not None else None,
+                        "origin": origin,
+                        "action": verb,
+                        "args": args,
+                        "executed": False,
+                        "rejection_reason": rejection_reason,
+                        "correlation_id": str(corr) if corr is not None else None,
+                        **stamps,
+                    }
+                    outcome = self.command_queue.record_outcome(
+                        source_label,
+                        executed=False,
+                        rejection_reason=rejection_reason,
+                    )
+                    if outcome.get("circuit_breaker_reset"):
+                        record["circuit_breaker_reset"] = True
+                    entry = self.journal.record(record, controller=self)
+                    self._append_command_tape(
+                        source=source_label,
+                        action=verb,
+                        args=args,
+                        executed=False,
+                        correlation_id=str(corr) if corr is not None else None,
+                        rejection_reason=rejection_reason,
+                        hand_id=entry.get("hand_id"),
+                        roll_in_hand=entry.get("roll_in_hand"),
+                        seq=entry.get("seq") if isinstance(entry, dict) else None,
+                    )
+                    continue
+                seen_this_roll.add(key)
+                legal, reason = is_legal_timing(current_state, {"verb": verb})
+                rejection_reason = None
+                record = {
+                    "run_id": self.run_id,
+                    "hand_id": tracker.hand_id if tracker is not None else None,
+                    "roll_in_hand": tracker.roll_in_hand if tracker is not None else None,
+                    "action": verb,
+                    "args": args,
+                    "origin": origin,
+                    "correlation_id": corr,
+                    "timing_legal": legal,
+                    "timing_reason": reason,
+                    **stamps,
+                }
+                executed = False
+                result: Any = None
+                if not legal:
+                    rejection_reason = f"timing:{reason}"
+                    record["rejection_reason"] = rejection_reason
+                else:
+                    result = ACTIONS[verb].execute(self.__dict__, {"args": args})
+                    executed = True
+                    record["result"] = result
+                    _validate_and_attach_effect(self, record)
+                record["executed"] = executed
+                outcome = self.command_queue.record_outcome(
+                    source_label,
+                    executed=executed,
+                    rejection_reason=rejection_reason,
+                )
+                if outcome.get("circuit_breaker_reset"):
+                    record["circuit_breaker_reset"] = True
+                entry = self._journal_writer.write(
+                    run_id=self.run_id,
+                    origin=origin,
+                    action=verb,
+                    args=args,
+                    executed=executed,
+                    rejection_reason=rejection_reason,
+                    correlation_id=str(corr) if corr is not None else None,
+                    extra=record,
+                )
+                self._append_command_tape(
+                    source=source_label,
+                    action=verb,
+                    args=args,
+                    executed=executed,
+                    correlation_id=str(corr) if corr is not None else None,
+                    rejection_reason=rejection_reason,
+                    hand_id=record["hand_id"],
+                    roll_in_hand=record["roll_in_hand"],
+                    seq=entry.get("seq") if isinstance(entry, dict) else None,
+                )
+
     def _on_command_rejection(self, payload: Dict[str, Any]) -> None:
         try:
             if not isinstance(payload, dict):
@@ -983,6 +1104,9 @@ class ControlStrategy:
 
     def stop(self) -> None:
         self._stop_http_server()
+        tape = getattr(self, "_command_tape", None)
+        if tape is not None:
+            tape.close()
 
     def _stop_http_server(self) -> None:
         server = getattr(self, "_http_server", None)
@@ -994,29 +1118,30 @@ class ControlStrategy:
     # ----- Phase 5: Internal Brain ruleset ----------------------------------
 
     @staticmethod
-    def _copy_rule_template(data: Dict[str, Any]) -> Dict[str, Any]:
-        try:
-            return json.loads(json.dumps(data))
-        except Exception:
-            return dict(data)
+    def _copy_rule_template(data: Any, substitutions: Tuple[Tuple[str, str], ...] = ()) -> Any:
+        """Structural copy of a JSON-like rule template, applying ``$param`` substitutions."""
 
-    @staticmethod
-    def _substitute_placeholders(payload: Any, key: str, value: Any) -> Any:
-        placeholder = f"${key}"
-        if isinstance(payload, str):
-            return payload.replace(placeholder, str(value))
-        if isinstance(payload, list):
-            return [ControlStrategy._substitute_placeholders(item, key, value) for item in payload]
-        if isinstance(payload, dict):
+        if isinstance(data, str):
+            for placeholder, value in substitutions:
+                data = data.replace(placeholder, value)
+            return data
+        if isinstance(data, dict):
             return {
-                k: ControlStrategy._substitute_placeholders(v, key, value)
-                for k, v in payload.items()
+                str(k): ControlStrategy._copy_rule_template(v, substitutions)
+                for k, v in data.items()
             }
-        return payload
+        if isinstance(data, (list, tuple)):
+            return [ControlStrategy._copy_rule_template(item, substitutions) for item in data]
+        return data
+
+    @staticmethod
+    def _substitute_placeholders(payload: Any, key: str, value: Any) -> Any:
+        return ControlStrategy._copy_rule_template(payload, ((f"${key}", str(value)),))
 
     def _load_internal_rules(self) -> None:
         self.ruleset: List[Dict[str, Any]] = []
         self._ruleset_errors: List[str] = []
+        self._compiled_rules: Optional[CompiledRuleset] = None
 
         brain_cfg = {}
         raw_brain = self.spec.get("internal_brain") if isinstance(self.spec, dict) else None
@@ -1046,13 +1171,12 @@ class ControlStrategy:
                 macro = macros.get(macro_name)
                 if not macro:
                     continue
-                rule_obj = self._copy_rule_template(macro)
                 params = entry.get("params")
+                substitutions: Tuple[Tuple[str, str], ...] = ()
                 if isinstance(params, dict):
-                    for param_key, param_val in params.items():
-                        rule_obj = self._substitute_placeholders(
-                            rule_obj, str(param_key), param_val
-                        )
+                    substitutions = tuple((f"${k}", str(v)) for k, v in params.items())
+                # one walk copies the macro and applies every parameter in order
+                rule_obj = self._copy_rule_template(macro, substitutions)
                 for key, val in entry.items():
                     if key in {"use", "params"}:
                         continue
@@ -1070,9 +1194,10 @@ class ControlStrategy:
         if not expanded:
             return
 
-        errors = validate_ruleset(expanded)
-        self._ruleset_errors = errors
+        compiled = compile_ruleset(expanded)
+        self._ruleset_errors = validate_ruleset(expanded) + compiled.errors
         self.ruleset = expanded
+        self._compiled_rules = compiled
 
     def _emit_run_started(self) -> None:
         if self._outbound_run_started:
@@ -1123,7 +1248,7 @@ class ControlStrategy:
             return
 
         ev_type = (event.get("type") or "").lower()
-        if ev_type in {COMEOUT, POINT_ESTABLISHED, ROLL, SEVEN_OUT}:
+        if ev_type in {COMEOUT, POINT_ESTABLISHED, ROLL, SEVEN_OUT, POINT_MADE}:
             self._fallback_start_hand()
 
     def _analytics_start_hand(self, point_value: Optional[int] = None) -> None:
@@ -1152,255 +1277,255 @@ class ControlStrategy:
             return None
 
     def _analytics_record_roll(self, event: Dict[str, Any]) -> None:
-        tracker = self._tracker
-        if tracker is None:
-            self._fallback_ensure_hand_started(event)
-            return
+        t_span = hotpath.start()
+        try:
+            tracker = self._tracker
+            if tracker is None:
+                self._fallback_ensure_hand_started(event)
+                return
 
-        if tracker.hand_id == 0:
-            self._analytics_start_hand(point_value=None)
+            if tracker.hand_id == 0:
+                self._analytics_start_hand(point_value=None)
 
-        # Decrement per-roll cooldowns before evaluating new decisions.
-        if hasattr(self, "journal"):
-            self.journal.tick()
+            # Decrement per-roll cooldowns before evaluating new decisions.
+            if hasattr(self, "journal"):
+                self.journal.tick()
 
-        bankroll_before = self._analytics_to_float(event.get("bankroll_before"))
-        bankroll_after = self._analytics_to_float(event.get("bankroll_after"))
-        bankroll_value = self._analytics_to_float(event.get("bankroll"))
-        delta = self._analytics_to_float(event.get("bankroll_delta"))
-        if delta is None:
-            delta = self._analytics_to_float(event.get("delta"))
-        if delta is None:
-            delta = self._analytics_to_float(event.get("payout"))
+            bankroll_before = self._analytics_to_float(event.get("bankroll_before"))
+            bankroll_after = self._analytics_to_float(event.get("bankroll_after"))
+            bankroll_value = self._analytics_to_float(event.get("bankroll"))
+            delta = self._analytics_to_float(event.get("bankroll_delta"))
+            if delta is None:
+                delta = self._analytics_to_float(event.get("delta"))
+            if delta is None:
+                delta = self._analytics_to_float(event.get("payout"))
 
-        if bankroll_after is None and bankroll_value is not None:
-            bankroll_after = bankroll_value
+            if bankroll_after is None and bankroll_value is not None:
+                bankroll_after = bankroll_value
 
-        if bankroll_before is None:
-            bankroll_before = tracker.bankroll
+            if bankroll_before is None:
+                bankroll_before = tracker.bankroll
 
-        if delta is None:
-            if bankroll_after is not None and bankroll_before is not None:
-                delta = bankroll_after - bankroll_before
-            else:
-                delta = 0.0
+            if delta is None:
+                if bankroll_after is not None and bankroll_before is not None:
+                    delta = bankroll_after - bankroll_before
+                else:
+                    delta = 0.0
 
-        if bankroll_after is None and bankroll_before is not None:
-            bankroll_after = bankroll_before + delta
+            if bankroll_after is None and bankroll_before is not None:
+                bankroll_after = bankroll_before + delta
 
-        event_type = str(event.get("type") or event.get("event") or "")
-        point_raw = event.get("point")
-        point_value: int | None = None
-        if isinstance(point_raw, int) and not isinstance(point_raw, bool):
-            point_value = point_raw
-        else:
-            try:
-                point_value = int(point_raw) if point_raw is not None else None
-            except Exception:
-                point_value = None
-        point_on = event.get("point_on")
-
-        total: Any = None
-        roll_ctx = RollCtx(
-            hand_id=tracker.hand_id,
-            roll_number=self.rolls_since_point,
-            bankroll_before=bankroll_before if bankroll_before is not None else 0.0,
-            delta=delta,
-            event_type=event_type,
-            point=point_value,
-            point_on=bool(point_on),
-        )
-        tracker.on_roll(roll_ctx)
+            event_type = str(event.get("type") or event.get("event") or "")
+            point_raw = event.get("point")
+            point_value: int | None = None
+            if isinstance(point_raw, int) and not isinstance(point_raw, bool):
+                point_value = point_raw
+            else:
+                try:
+                    point_value = int(point_raw) if point_raw is not None else None
+                except Exception:
+                    point_value = None
+            point_on = event.get("point_on")
 
-        try:
-            snap = tracker.get_roll_snapshot()
-        except Exception:
-            snap = {}
-
-        # Ensure tracker mirrors the resolved bankroll when provided explicitly.
-        if bankroll_after is not None:
-            tracker.bankroll = bankroll_after
-            tracker.bankroll_peak = max(tracker.bankroll_peak, tracker.bankroll)
-            tracker.bankroll_low = min(tracker.bankroll_low, tracker.bankroll)
-            tracker.max_drawdown = max(
-                tracker.max_drawdown,
-                tracker.bankroll_peak - tracker.bankroll,
-            )
-        ruleset = getattr(self, "ruleset", None)
-        if tracker is not None and isinstance(ruleset, list) and ruleset:
-            ctx: Dict[str, Any] = {
-                "bankroll_after": tracker.bankroll,
-                "drawdown_after": tracker.bankroll_peak - tracker.bankroll,
-                "hand_id": tracker.hand_id,
-                "roll_in_hand": tracker.roll_in_hand,
-                "point_on": (
-                    bool(event.get("point_on")) if isinstance(event, dict) else bool(self.point)
-                ),
-            }
             total: Any = None
-            if isinstance(event, dict):
-                roll_info = event.get("roll")
-                if isinstance(roll_info, dict):
-                    total = roll_info.get("total")
-                if total is None:
-                    total = event.get("total")
-                box_hits = event.get("box_hits")
-                if isinstance(box_hits, (list, tuple, dict)):
-                    ctx["box_hits"] = box_hits
-                for key in ("dc_losses", "dc_wins"):
-                    val = event.get(key)
-                    if isinstance(val, (int, float)):
-                        ctx[key] = val
-                    elif isinstance(val, str):
-                        try:
-                            ctx[key] = float(val)
-                        except ValueError:
-                            continue
-            if "box_hits" not in ctx:
-                ctx["box_hits"] = 0
-            if isinstance(total, (int, float)):
-                ctx["last_roll_total"] = total
-            fired_rules: List[Dict[str, Any]] = []
-            decisions: List[Dict[str, Any]] = []
+            roll_ctx = RollCtx(
+                hand_id=tracker.hand_id,
+                roll_number=self.rolls_since_point,
+                bankroll_before=bankroll_before if bankroll_before is not None else 0.0,
+                delta=delta,
+                event_type=event_type,
+                point=point_value,
+                point_on=bool(point_on),
+            )
+            tracker.on_roll(roll_ctx)
+
             try:
-                results = evaluate_rules(ruleset, ctx)
+                snap = tracker.get_roll_snapshot()
             except Exception:
-                results = []
-            if results:
-                rule_lookup: Dict[str, Dict[str, Any]] = {}
-                if isinstance(ruleset, list):
-                    rule_lookup = {
-                        str(rule.get("id")): rule
-                        for rule in ruleset
-                        if isinstance(rule, dict) and rule.get("id") is not None
-                    }
-                for record in results:
-                    decision = dict(record)
-                    rid = decision.get("rule_id")
-                    rule_def = rule_lookup.get(str(rid)) if rid is not None else None
-                    if rule_def is not None:
-                        decision["action"] = rule_def.get("action", "")
-                    decisions.append(decision)
-                    if decision.get("fired"):
-                        fired_rules.append(decision)
+                snap = {}
+
+            # Ensure tracker mirrors the resolved bankroll when provided explicitly.
+            if bankroll_after is not None:
+                tracker.bankroll = bankroll_after
+                tracker.bankroll_peak = max(tracker.bankroll_peak, tracker.bankroll)
+                tracker.bankroll_low = min(tracker.bankroll_low, tracker.bankroll)
+                tracker.max_drawdown = max(
+                    tracker.max_drawdown,
+                    tracker.bankroll_peak - tracker.bankroll,
+                )
+            ruleset = getattr(self, "_compiled_rules", None)
+            if tracker is not None and ruleset:
+                ctx: Dict[str, Any] = {
+                    "bankroll_after": tracker.bankroll,
+                    "drawdown_after": tracker.bankroll_peak - tracker.bankroll,
+                    "hand_id": tracker.hand_id,
+                    "roll_in_hand": tracker.roll_in_hand,
+                    "point_on": (
+                        bool(event.get("point_on")) if isinstance(event, dict) else bool(self.point)
+                    ),
+                }
+                total: Any = None
+                if isinstance(event, dict):
+                    roll_info = event.get("roll")
+                    if isinstance(roll_info, dict):
+                        total = roll_info.get("total")
+                    if total is None:
+                        total = event.get("total")
+                    box_hits = event.get("box_hits")
+                    if isinstance(box_hits, (list, tuple, dict)):
+                        ctx["box_hits"] = box_hits
+                    for key in ("dc_losses", "dc_wins"):
+                        val = event.get(key)
+                        if isinstance(val, (int, float)):
+                            ctx[key] = val
+                        elif isinstance(val, str):
+                            try:
+                                ctx[key] = float(val)
+                            except ValueError:
+                                continue
+                if "box_hits" not in ctx:
+                    ctx["box_hits"] = 0
+                if isinstance(total, (int, float)):
+                    ctx["last_roll_total"] = total
+                fired_rules: List[Dict[str, Any]] = []
+                decisions: List[Dict[str, Any]] = []
                 try:
-                    with open("decision_candidates.jsonl", "a", encoding="utf-8") as f:
-                        for record in decisions:
-                            f.write(json.dumps(record) + "\n")
+                    results = ruleset.evaluate(ctx)
                 except Exception:
-                    pass
+                    results = []
+                if results:
+                    rule_lookup = ruleset.by_id
+                    for record in results:
+                        decision = dict(record)
+                        rid = decision.get("rule_id")
+                        rule_def = rule_lookup.get(str(rid)) if rid is not None else None
+                        if rule_def is not None:
+                            decision["action"] = rule_def.get("action", "")
+                        decisions.append(decision)
+                        if decision.get("fired"):
+                            fired_rules.append(decision)
+                    try:
+                        with open("decision_candidates.jsonl", "a", encoding="utf-8") as f:
+                            for record in decisions:
+                                f.write(json.dumps(record) + "\n")
+                    except Exception:
+                        pass
 
-            if fired_rules:
-                current_state: Dict[str, Any] = {
-                    "resolving": bool((event or {}).get("resolving")),
-                    "point_on": bool(ctx.get("point_on")),
-                    "roll_in_hand": ctx.get("roll_in_hand"),
-                }
-                runtime: Dict[str, Any] = {
-                    "tracker": tracker,
-                    "state": current_state,
-                    "context": dict(ctx),
-                }
-                verbs_executed: set[str] = set()
-                for decision in fired_rules:
-                    action_str = str(decision.get("action") or "")
-                    if not action_str:
-                        continue
-                    verb = action_str.split("(")[0]
-                    act = ACTIONS.get(verb)
-                    if not act:
-                        continue
+                if fired_rules:
+                    current_state: Dict[str, Any] = {
+                        "resolving": bool((event or {}).get("resolving")),
+                        "point_on": bool(ctx.get("point_on")),
+                        "roll_in_hand": ctx.get("roll_in_hand"),
+                    }
+                    runtime: Dict[str, Any] = {
+                        "tracker": tracker,
+                        "state": current_state,
+                        "context": dict(ctx),
+                    }
+                    verbs_executed: set[str] = set()
+                    for decision in fired_rules:
+                        action_str = str(decision.get("action") or "")
+                        if not action_str:
+                            continue
+                        verb = action_str.split("(")[0]
+                        act = ACTIONS.get(verb)
+                        if not act:
+                            continue
 
-                    rule_id_raw = decision.get("rule_id")
-                    if rule_id_raw is None:
-                        continue
-                    rule_id = str(rule_id_raw)
-                    decision["rule_id"] = rule_id
+                        rule_id_raw = decision.get("rule_id")
+                        if rule_id_raw is None:
+                            continue
+                        rule_id = str(rule_id_raw)
+                        decision["rule_id"] = rule_id
 
-                    scope = str(decision.get("scope") or "roll")
-                    cooldown_raw = decision.get("cooldown", 0)
-                    try:
-                        cooldown = int(cooldown_raw)
-                    except (TypeError, ValueError):
-                        cooldown = 0
-                    decision["cooldown"] = cooldown
-                    decision["cooldown_remaining"] = self.journal.cooldowns.get(rule_id, 0)
-
-                    allowed, reason = self.journal.can_fire(rule_id, scope, cooldown)
-                    decision["cooldown_allowed"] = allowed
-                    decision["cooldown_reason"] = reason
-
-                    legal, timing_reason = is_legal_timing(current_state, {"verb": verb})
-                    decision["timing_legal"] = legal
-                    decision["timing_reason"] = timing_reason
-
-                    duplicate_blocked = False
-                    executed = False
-                    result: Any = None
-
-                    if allowed and legal:
-                        if verb in verbs_executed:
-                            duplicate_blocked = True
+                        scope = str(decision.get("scope") or "roll")
+                        cooldown_raw = decision.get("cooldown", 0)
+                        try:
+                            cooldown = int(cooldown_raw)
+                        except (TypeError, ValueError):
+                            cooldown = 0
+                        decision["cooldown"] = cooldown
+                        decision["cooldown_remaining"] = self.journal.cooldowns.get(rule_id, 0)
+
+                        allowed, reason = self.journal.can_fire(rule_id, scope, cooldown)
+                        decision["cooldown_allowed"] = allowed
+                        decision["cooldown_reason"] = reason
+
+                        legal, timing_reason = is_legal_timing(current_state, {"verb": verb})
+                        decision["timing_legal"] = legal
+                        decision["timing_reason"] = timing_reason
+
+                        duplicate_blocked = False
+                        executed = False
+                        result: Any = None
+
+                        if allowed and legal:
+                            if verb in verbs_executed:
+                                duplicate_blocked = True
+                            else:
+                                result = act.execute(runtime, decision)
+                                executed = True
+                                verbs_executed.add(verb)
+                                self.journal.apply_fire(rule_id, scope, cooldown)
+                                decision["cooldown_remaining"] = self.journal.cooldowns.get(
+                                    rule_id, 0
+                                )
+                        decision["duplicate_blocked"] = duplicate_blocked
+
+                        if executed:
+                            decision["executed"] = True
+                            decision["result"] = result
                         else:
-                            result = act.execute(runtime, decision)
-                            executed = True
-                            verbs_executed.add(verb)
-                            self.journal.apply_fire(rule_id, scope, cooldown)
-                            decision["cooldown_remaining"] = self.journal.cooldowns.get(rule_id, 0)
-                    decision["duplicate_blocked"] = duplicate_blocked
-
-                    if executed:
-                        decision["executed"] = True
-                        decision["result"] = result
-                    else:
-                        decision["executed"] = False
-                        rejection_reason = None
-                        if duplicate_blocked:
-                            decision["note"] = "duplicate_blocked"
-                            rejection_reason = "duplicate_blocked"
-                        elif not allowed:
-                            decision["note"] = reason
-                            rejection_reason = str(reason)
-                        elif not legal:
-                            decision["note"] = timing_reason
-                            rejection_reason = str(timing_reason)
-                        decision["rejection_reason"] = rejection_reason
-
-                    decision["run_id"] = self.run_id
-                    decision["origin"] = f"rule:{rule_id}"
-                    args_payload = decision.get("args")
-                    if not isinstance(args_payload, dict):
-                        args_payload = {}
-                    self._journal_writer.write(
-                        run_id=self.run_id,
-                        origin=f"rule:{rule_id}",
-                        action=verb,
-                        args=args_payload,
-                        executed=bool(decision.get("executed")),
-                        rejection_reason=decision.get("rejection_reason"),
-                        extra=dict(decision),
-                    )
-        payload = {
-            **self._webhook_base_payload(),
-            "hand_id": snap.get("hand_id") if isinstance(snap, dict) else None,
-            "roll_in_hand": snap.get("roll_in_hand") if isinstance(snap, dict) else None,
-        }
-        if self._outbound.enabled:
-            self._outbound.emit("roll.processed", payload)
-        roll_payload = dict(payload)
-        roll_payload.update(
-            {
-                "bankroll_before": bankroll_before,
-                "bankroll_after": bankroll_after,
-                "bankroll_delta": delta,
-                "event_type": event_type,
-                "point": point_value,
-                "point_on": bool(point_on),
+                            decision["executed"] = False
+                            rejection_reason = None
+                            if duplicate_blocked:
+                                decision["note"] = "duplicate_blocked"
+                                rejection_reason = "duplicate_blocked"
+                            elif not allowed:
+                                decision["note"] = reason
+                                rejection_reason = str(reason)
+                            elif not legal:
+                                decision["note"] = timing_reason
+                                rejection_reason = str(timing_reason)
+                            decision["rejection_reason"] = rejection_reason
+
+                        decision["run_id"] = self.run_id
+                        decision["origin"] = f"rule:{rule_id}"
+                        args_payload = decision.get("args")
+                        if not isinstance(args_payload, dict):
+                            args_payload = {}
+                        self._journal_writer.write(
+                            run_id=self.run_id,
+                            origin=f"rule:{rule_id}",
+                            action=verb,
+                            args=args_payload,
+                            executed=bool(decision.get("executed")),
+                            rejection_reason=decision.get("rejection_reason"),
+                            extra=dict(decision),
+                        )
+            payload = {
+                **self._webhook_base_payload(),
+                "hand_id": snap.get("hand_id") if isinstance(snap, dict) else None,
+                "roll_in_hand": snap.get("roll_in_hand") if isinstance(snap, dict) else None,
             }
-        )
-        if isinstance(total, (int, float)):
-            roll_payload["last_roll_total"] = total
-        self._emit_webhook("roll.processed", roll_payload)
+            if self._outbound.enabled:
+                self._outbound.emit("roll.processed", payload)
+            roll_payload = dict(payload)
+            roll_payload.update(
+                {
+                    "bankroll_before": bankroll_before,
+                    "bankroll_after": bankroll_after,
+                    "bankroll_delta": delta,
+                    "event_type": event_type,
+                    "point": point_value,
+                    "point_on": bool(point_on),
+                }
+            )
+            if isinstance(total, (int, float)):
+                roll_payload["last_roll_total"] = total
+            self._emit_webhook("roll.processed", roll_payload)
+        finally:
+            hotpath.stop("controller.analytics", t_span)
 
     def _analytics_end_hand(self, point_value: Optional[int]) -> None:
         self._fallback_end_hand()
@@ -1550,20 +1675,24 @@ class ControlStrategy:
         return snap
 
     def _journal_actions(self, event: Dict[str, Any], actions: List[Dict[str, Any]]) -> None:
-        if not actions:
-            return
-        j = self._ensure_journal()
-        if j is None:
-            return
+        t_span = hotpath.start()
         try:
-            j.write_actions(
-                actions,
-                snapshot=self._snapshot_for_event(event),
-                controller=self,
-            )
-        except Exception:
-            self._journal_enabled = False
-            self._journal = None
+            if not actions:
+                return
+            j = self._ensure_journal()
+            if j is None:
+                return
+            try:
+                j.write_actions(
+                    actions,
+                    snapshot=self._snapshot_for_event(event),
+                    controller=self,
+                )
+            except Exception:
+                self._journal_enabled = False
+                self._journal = None
+        finally:
+            hotpath.stop("journal.csv_actions", t_span)
 
     # ----- Phase 19 helpers -----
 
@@ -1572,12 +1701,12 @@ class ControlStrategy:
             return
         if not event_type:
             return
-        if event_type in {COMEOUT, POINT_ESTABLISHED, ROLL, SEVEN_OUT}:
+        if event_type in {COMEOUT, POINT_ESTABLISHED, ROLL, SEVEN_OUT, POINT_MADE}:
             self._dsl_engine.on_scope_advance("roll")
             self._dsl_roll_index += 1
         if event_type == COMEOUT:
             self._dsl_engine.on_scope_advance("hand")
-        if event_type in {POINT_ESTABLISHED, SEVEN_OUT}:
+        if event_type in {POINT_ESTABLISHED, SEVEN_OUT, POINT_MADE}:
             self._dsl_engine.on_scope_advance("point_cycle")
 
     def _dsl_snapshot(self, event: Dict[str, Any]) -> Dict[str, Any]:
@@ -1829,45 +1958,49 @@ class ControlStrategy:
         event: Dict[str, Any],
         current_bets: Optional[Dict[str, Any]],
     ) -> None:
-        if not self._dsl_enabled or self._dsl_engine is None or self._dsl_journal is None:
-            return
-        snapshot = self._dsl_snapshot(event)
-        intent = self._dsl_engine.evaluate_window(window_name, snapshot, self._dsl_journal)
-        if not intent:
-            return
-        attempt = self._dsl_engine.last_attempt
-        reason = self._dsl_legality_gate(window_name, intent, current_bets)
-        if reason:
-            args_payload: Dict[str, Any]
-            verb = str(intent.get("verb") or "")
-            if attempt is not None:
-                args_payload = dict(attempt.args)
-                verb = attempt.verb
-            else:
-                args_payload = {k: v for k, v in intent.items() if k != "verb"}
-            record = DecisionAttempt(
-                roll_index=int(snapshot.get("roll_index", 0)),
-                window=window_name,
-                rule_id=attempt.rule_id if attempt is not None else "unknown",
-                origin=attempt.origin if attempt is not None else "dsl",
-                when_expr=attempt.when_expr if attempt is not None else "",
-                evaluated_true=attempt.evaluated_true if attempt is not None else True,
-                verb=verb,
-                args=args_payload,
-                legal=False,
-                applied=False,
-                reason=reason,
-            )
-            self._record_decision_trace(
-                snapshot,
-                window_name,
-                record,
-                applied=False,
-                reason=reason,
-            )
-            self._dsl_journal.write(record)
-            return
-        self._apply_dsl_intent(intent, snapshot, attempt, window_name)
+        t_span = hotpath.start()
+        try:
+            if not self._dsl_enabled or self._dsl_engine is None or self._dsl_journal is None:
+                return
+            snapshot = self._dsl_snapshot(event)
+            intent = self._dsl_engine.evaluate_window(window_name, snapshot, self._dsl_journal)
+            if not intent:
+                return
+            attempt = self._dsl_engine.last_attempt
+            reason = self._dsl_legality_gate(window_name, intent, current_bets)
+            if reason:
+                args_payload: Dict[str, Any]
+                verb = str(intent.get("verb") or "")
+                if attempt is not None:
+                    args_payload = dict(attempt.args)
+                    verb = attempt.verb
+                else:
+                    args_payload = {k: v for k, v in intent.items() if k != "verb"}
+                record = DecisionAttempt(
+                    roll_index=int(snapshot.get("roll_index", 0)),
+                    window=window_name,
+                    rule_id=attempt.rule_id if attempt is not None else "unknown",
+                    origin=attempt.origin if attempt is not None else "dsl",
+                    when_expr=attempt.when_expr if attempt is not None else "",
+                    evaluated_true=attempt.evaluated_true if attempt is not None else True,
+                    verb=verb,
+                    args=args_payload,
+                    legal=False,
+                    applied=False,
+                    reason=reason,
+                )
+                self._record_decision_trace(
+                    snapshot,
+                    window_name,
+                    record,
+                    applied=False,
+                    reason=reason,
+                )
+                self._dsl_journal.write(record)
+                return
+            self._apply_dsl_intent(intent, snapshot, attempt, window_name)
+        finally:
+            hotpath.stop("controller.dsl_window", t_span)
 
     @staticmethod
     def _extract_amount(val: Any) -> float:
@@ -1920,29 +2053,37 @@ class ControlStrategy:
     def _apply_mode_template_plan(
         self, current_bets: Dict[str, Any], mode_name: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        mode = mode_name or self.mode or self._default_mode()
-        tmpl = (self.spec.get("modes", {}).get(mode) or {}).get("template") or {}
-        st = self._current_state_for_eval()
-        synth_event = canonicalize_event(
-            {
-                "type": POINT_ESTABLISHED if self.point else COMEOUT,
-                "point": self.point,
-                "on_comeout": self.on_comeout,
-            }
-        )
-        desired = render_runtime_template(tmpl, st, synth_event)
-        return diff_bets(
-            current_bets or {},
-            desired,
-            source="template",
-            source_id=f"template:{mode}",
-            notes="template diff",
-        )
+        t_span = hotpath.start()
+        try:
+            mode = mode_name or self.mode or self._default_mode()
+            tmpl = (self.spec.get("modes", {}).get(mode) or {}).get("template") or {}
+            st = self._current_state_for_eval()
+            synth_event = canonicalize_event(
+                {
+                    "type": POINT_ESTABLISHED if self.point else COMEOUT,
+                    "point": self.point,
+                    "on_comeout": self.on_comeout,
+                }
+            )
+            desired = render_runtime_template(tmpl, st, synth_event, self._table_policy)
+            return diff_bets(
+                current_bets or {},
+                desired,
+                source="template",
+                source_id=f"template:{mode}",
+                notes="template diff",
+            )
+        finally:
+            hotpath.stop("controller.template", t_span)
 
     def _apply_rules_for_event(self, event: Dict[str, Any]) -> List[Dict[str, Any]]:
-        rules = self.spec.get("rules") if isinstance(self.spec, dict) else None
-        st = self._current_state_for_eval()
-        return apply_rules(rules, st, event or {})
+        t_span = hotpath.start()
+        try:
+            rules = self.spec.get("rules") if isinstance(self.spec, dict) else None
+            st = self._current_state_for_eval()
+            return apply_rules(rules, st, event or {})
+        finally:
+            hotpath.stop("controller.rules", t_span)
 
     # ----- P4C3/P4C4 merge helpers -----
 
@@ -2079,271 +2220,203 @@ class ControlStrategy:
     def handle_event(
         self, event: Dict[str, Any], current_bets: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        # Reset per-event flags
-        self._mode_changed_this_event = False
-
-        # Normalize inbound event
-        event = canonicalize_event(event or {})
-        ev_type = event.get("type")
-
-        roll_val = event.get("roll")
-        if roll_val is None:
-            roll_val = event.get("total")
-        if isinstance(roll_val, (int, float)):
-            self._dsl_last_roll_total = int(roll_val)
-
-        self._dsl_prepare_for_event(ev_type)
+        t_span = hotpath.start()
+        try:
+            # Reset per-event flags
+            self._mode_changed_this_event = False
 
-        template_and_regress: List[Dict[str, Any]] = []
-        rule_actions: List[Dict[str, Any]] = []
+            # Normalize inbound event
+            event = canonicalize_event(event or {})
+            ev_type = event.get("type")
 
-        if ev_type == COMEOUT:
-            self._analytics_start_hand(point_value=None)
-            self.point = None
-            self.rolls_since_point = 0
-            self.on_comeout = True
+            roll_val = event.get("roll")
+            if roll_val is None:
+                roll_val = event.get("total")
+            if isinstance(roll_val, (int, float)):
+                self._dsl_last_roll_total = int(roll_val)
 
-            self._analytics_record_roll(event)
-            self._evaluate_window("come_out_start", event, current_bets)
+            self._dsl_prepare_for_event(ev_type)
 
-            rule_actions = self._apply_rules_for_event(event)
-            switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
-            if switches:
-                self._mode_changed_this_event = (
-                    self._apply_switches_now(switches) or self._mode_changed_this_event
-                )
-            if setvars:
-                self._apply_setvars_now(setvars, event)
+            template_and_regress: List[Dict[str, Any]] = []
+            rule_actions: List[Dict[str, Any]] = []
 
-            final = self._merge_actions_for_event(
-                switches + template_and_regress + rule_non_special
-            )
-            final = self._annotate_seq(final)
-            self._journal_actions(event, final)
-            self._bump_stats(ev_type, final)
-            return final
-
-        if ev_type == POINT_ESTABLISHED:
-            try:
-                self.point = int(event.get("point"))
-            except Exception:
+            if ev_type == COMEOUT:
+                self._analytics_start_hand(point_value=None)
                 self.point = None
-            self.rolls_since_point = 0
-            self.on_comeout = self.point in (None, 0)
-
-            self._analytics_record_roll(event)
-            self._evaluate_window("after_point_set", event, current_bets)
-
-            rule_actions = self._apply_rules_for_event(event)
-            switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
-            if switches:
-                self._mode_changed_this_event = (
-                    self._apply_switches_now(switches) or self._mode_changed_this_event
-                )
-            if setvars:
-                self._apply_setvars_now(setvars, event)
+                self.rolls_since_point = 0
+                self.on_comeout = True
 
-            template_and_regress.extend(self._apply_mode_template_plan(current_bets, self.mode))
+                self._analytics_record_roll(event)
+                self._evaluate_window("come_out_start", event, current_bets)
 
-            # Fallback: if template produced no actions on a 6 point, synthesize one.
-            if (
-                self._flags.get("demo_fallbacks", False)
-                and not template_and_regress
-                and self.point == 6
-            ):
-                amt = self._units_from_spec_or_state() or 12.0
-                template_and_regress.append(
-                    make_action(
-                        "set",
-                        bet_type="place_6",
-                        amount=amt,
-                        # mark as 'rule' so bucket ordering keeps switch first
-                        source="rule",
-                        id_="template:fallback_place6",
-                        notes="fallback action for POINT_ESTABLISHED(6)",
+                rule_actions = self._apply_rules_for_event(event)
+                switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
+                if switches:
+                    self._mode_changed_this_event = (
+                        self._apply_switches_now(switches) or self._mode_changed_this_event
                     )
+                if setvars:
+                    self._apply_setvars_now(setvars, event)
+
+                final = self._merge_actions_for_event(
+                    switches + template_and_regress + rule_non_special
                 )
+                final = self._annotate_seq(final)
+                self._journal_actions(event, final)
+                self._bump_stats(ev_type, final)
+                return final
 
-            final = self._merge_actions_for_event(
-                switches + template_and_regress + rule_non_special
-            )
-            final = self._annotate_seq(final)
-            self._journal_actions(event, final)
-            self._bump_stats(ev_type, final)
-            return final
-
-        if ev_type == ROLL:
-            if self.point:
-                self.rolls_since_point += 1
-                if self._flags.get("demo_fallbacks", False) and self.rolls_since_point == 3:
-                    template_and_regress.extend(
-                        [
-                            make_action(
-                                "clear",
-                                bet_type="place_6",
-                                source="template",
-                                id_="template:regress_roll3",
-                                notes="auto-regress after 3rd roll",
-                            ),
-                            make_action(
-                                "clear",
-                                bet_type="place_8",
-                                source="template",
-                                id_="template:regress_roll3",
-                                notes="auto-regress after 3rd roll",
-                            ),
-                        ]
+            if ev_type == POINT_ESTABLISHED:
+                try:
+                    self.point = int(event.get("point"))
+                except Exception:
+                    self.point = None
+                self.rolls_since_point = 0
+                self.on_comeout = self.point in (None, 0)
+
+                self._analytics_record_roll(event)
+                self._evaluate_window("after_point_set", event, current_bets)
+
+                rule_actions = self._apply_rules_for_event(event)
+                switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
+                if switches:
+                    self._mode_changed_this_event = (
+                        self._apply_switches_now(switches) or self._mode_changed_this_event
+                    )
+                if setvars:
+                    self._apply_setvars_now(setvars, event)
+
+                template_and_regress.extend(self._apply_mode_template_plan(current_bets, self.mode))
+
+                # Fallback: if template produced no actions on a 6 point, synthesize one.
+                if (
+                    self._flags.get("demo_fallbacks", False)
+                    and not template_and_regress
+                    and self.point == 6
+                ):
+                    amt = self._units_from_spec_or_state() or 12.0
+                    template_and_regress.append(
+                        make_action(
+                            "set",
+                            bet_type="place_6",
+                            amount=amt,
+                            # mark as 'rule' so bucket ordering keeps switch first
+                            source="rule",
+                            id_="template:fallback_place6",
+                            notes="fallback action for POINT_ESTABLISHED(6)",
+                        )
                     )
 
-            self._analytics_record_roll(event)
-            self._evaluate_window("after_resolve", event, current_bets)
-
-            current_state = self._current_state_for_eval()
-            tracker = self._tracker
-            self._inject_replay_commands(tracker)
-            pending = list(self.command_queue.drain()) if hasattr(self, "command_queue") else []
-            seen_this_roll = set()
-            for cmd in pending:
-                cmd.pop("_csc_replay", None)
-                verb = cmd["action"]
-                raw_args = cmd.get("args")
-                args = raw_args if isinstance(raw_args, dict) else {}
-                source_label = str(cmd.get("source", "external"))
-                origin = f"external:{source_label}"
-                corr = cmd.get("correlation_id")
-                key = (
-                    origin,
-                    verb,
-                    json.dumps(args, sort_keys=True),
+                final = self._merge_actions_for_event(
+                    switches + template_and_regress + rule_non_special
                 )
-                if key in seen_this_roll:
-                    rejection_reason = "duplicate_roll"
-                    record = {
-                        "run_id": self.run_id,
-                        "hand_id": tracker.hand_id if tracker is not None else None,
-                        "roll_in_hand": tracker.roll_in_hand if tracker is not None else None,
-                        "origin": origin,
-                        "action": verb,
-                        "args": args,
-                        "executed": False,
-                        "rejection_reason": rejection_reason,
-                        "correlation_id": str(corr) if corr is not None else None,
-                    }
-                    outcome = self.command_queue.record_outcome(
-                        source_label,
-                        executed=False,
-                        rejection_reason=rejection_reason,
-                    )
-                    if outcome.get("circuit_breaker_reset"):
-                        record["circuit_breaker_reset"] = True
-                    entry = self.journal.record(record, controller=self)
-                    self._append_command_tape(
-                        source=source_label,
-                        action=verb,
-                        args=args,
-                        executed=False,
-                        correlation_id=str(corr) if corr is not None else None,
-                        rejection_reason=rejection_reason,
-                        hand_id=entry.get("hand_id"),
-                        roll_in_hand=entry.get("roll_in_hand"),
-                        seq=entry.get("seq") if isinstance(entry, dict) else None,
+                final = self._annotate_seq(final)
+                self._journal_actions(event, final)
+                self._bump_stats(ev_type, final)
+                return final
+
+            if ev_type == ROLL:
+                if self.point:
+                    self.rolls_since_point += 1
+                    if self._flags.get("demo_fallbacks", False) and self.rolls_since_point == 3:
+                        template_and_regress.extend(
+                            [
+                                make_action(
+                                    "clear",
+                                    bet_type="place_6",
+                                    source="template",
+                                    id_="template:regress_roll3",
+                                    notes="auto-regress after 3rd roll",
+                                ),
+                                make_action(
+                                    "clear",
+                                    bet_type="place_8",
+                                    source="template",
+                                    id_="template:regress_roll3",
+                                    notes="auto-regress after 3rd roll",
+                                ),
+                            ]
+                        )
+
+                self._analytics_record_roll(event)
+                self._evaluate_window("after_resolve", event, current_bets)
+
+                current_state = self._current_state_for_eval()
+                tracker = self._tracker
+                t_ext = hotpath.start()
+                self._inject_replay_commands(tracker)
+                pending = list(self.command_queue.drain()) if hasattr(self, "command_queue") else []
+                if pending:
+                    self._execute_external_commands(pending, current_state, tracker)
+                hotpath.stop("controller.external_commands", t_ext)
+
+                rule_actions = self._apply_rules_for_event(event)
+                switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
+                if switches:
+                    self._mode_changed_this_event = (
+                        self._apply_switches_now(switches) or self._mode_changed_this_event
                     )
-                    continue
-                seen_this_roll.add(key)
-                legal, reason = is_legal_timing(current_state, {"verb": verb})
-                rejection_reason = None
-                record = {
-                    "run_id": self.run_id,
-                    "hand_id": tracker.hand_id if tracker is not None else None,
-                    "roll_in_hand": tracker.roll_in_hand if tracker is not None else None,
-                    "action": verb,
-                    "args": args,
-                    "origin": origin,
-                    "correlation_id": corr,
-                    "timing_legal": legal,
-                    "timing_reason": reason,
-                }
-                executed = False
-                result: Any = None
-                if not legal:
-                    rejection_reason = f"timing:{reason}"
-                    record["rejection_reason"] = rejection_reason
-                else:
-                    result = ACTIONS[verb].execute(self.__dict__, {"args": args})
-                    executed = True
-                    record["result"] = result
-                    _validate_and_attach_effect(self, record)
-                record["executed"] = executed
-                outcome = self.command_queue.record_outcome(
-                    source_label,
-                    executed=executed,
-                    rejection_reason=rejection_reason,
-                )
-                if outcome.get("circuit_breaker_reset"):
-                    record["circuit_breaker_reset"] = True
-                entry = self._journal_writer.write(
-                    run_id=self.run_id,
-                    origin=origin,
-                    action=verb,
-                    args=args,
-                    executed=executed,
-                    rejection_reason=rejection_reason,
-                    correlation_id=str(corr) if corr is not None else None,
-                    extra=record,
-                )
-                self._append_command_tape(
-                    source=source_label,
-                    action=verb,
-                    args=args,
-                    executed=executed,
-                    correlation_id=str(corr) if corr is not None else None,
-                    rejection_reason=rejection_reason,
-                    hand_id=record["hand_id"],
-                    roll_in_hand=record["roll_in_hand"],
-                    seq=entry.get("seq") if isinstance(entry, dict) else None,
-                )
+                if setvars:
+                    self._apply_setvars_now(setvars, event)
 
-            rule_actions = self._apply_rules_for_event(event)
-            switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
-            if switches:
-                self._mode_changed_this_event = (
-                    self._apply_switches_now(switches) or self._mode_changed_this_event
+                final = self._merge_actions_for_event(
+                    switches + template_and_regress + rule_non_special
                 )
-            if setvars:
-                self._apply_setvars_now(setvars, event)
+                final = self._annotate_seq(final)
+                self._journal_actions(event, final)
+                self._bump_stats(ev_type, final)
+                return final
+
+            if ev_type == SEVEN_OUT:
+                point_before = self.point
+                self._analytics_record_roll(event)
+                self._analytics_end_hand(point_before)
+                self.point = None
+                self.rolls_since_point = 0
+                self.on_comeout = True
 
-            final = self._merge_actions_for_event(
-                switches + template_and_regress + rule_non_special
-            )
-            final = self._annotate_seq(final)
-            self._journal_actions(event, final)
-            self._bump_stats(ev_type, final)
-            return final
-
-        if ev_type == SEVEN_OUT:
-            point_before = self.point
-            self._analytics_record_roll(event)
-            self._analytics_end_hand(point_before)
-            self.point = None
-            self.rolls_since_point = 0
-            self.on_comeout = True
+                self._evaluate_window("hand_end", event, current_bets)
 
-            self._evaluate_window("hand_end", event, current_bets)
+                rule_actions = self._apply_rules_for_event(event)
+                switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
+                if switches:
+                    self._mode_changed_this_event = (
+                        self._apply_switches_now(switches) or self._mode_changed_this_event
+                    )
+                if setvars:
+                    self._apply_setvars_now(setvars, event)
+
+                final = self._merge_actions_for_event(switches + rule_non_special)
+                final = self._annotate_seq(final)
+                self._journal_actions(event, final)
+                self._bump_stats(ev_type, final)
+                return final
+
+            if ev_type == POINT_MADE:
+                # The point is off again but the shooter keeps the dice: same hand.
+                self._analytics_record_roll(event)
+                self.point = None
+                self.rolls_since_point = 0
+                self.on_comeout = True
 
-            rule_actions = self._apply_rules_for_event(event)
-            switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
-            if switches:
-                self._mode_changed_this_event = (
-                    self._apply_switches_now(switches) or self._mode_changed_this_event
-                )
-            if setvars:
-                self._apply_setvars_now(setvars, event)
+                self._evaluate_window("after_resolve", event, current_bets)
 
-            final = self._merge_actions_for_event(switches + rule_non_special)
-            final = self._annotate_seq(final)
-            self._journal_actions(event, final)
-            self._bump_stats(ev_type, final)
-            return final
+                rule_actions = self._apply_rules_for_event(event)
+                switches, setvars, rule_non_special = self._split_switch_setvar_other(rule_actions)
+                if switches:
+                    self._mode_changed_this_event = (
+                        self._apply_switches_now(switches) or self._mode_changed_this_event
+                    )
+                if setvars:
+                    self._apply_setvars_now(setvars, event)
+
+                final = self._merge_actions_for_event(switches + rule_non_special)
+                final = self._annotate_seq(final)
+                self._journal_actions(event, final)
+                self._bump_stats(ev_type, final)
+                return final
+        finally:
+            hotpath.stop("controller.handle_event", t_span)
 
     def _bump_stats(self, ev_type: Optional[str], actions: List[Dict[str, Any]]) -> None:
         ev = (ev_type or "").lower()
@@ -2667,25 +2740,16 @@ class ControlStrategy:
         external_executed = 0
         external_rejected = 0
         dsl_trace_count = 0
-        journal_path = getattr(getattr(self, "journal", None), "path", None)
+        journal = getattr(self, "journal", None)
+        journal_path = getattr(journal, "path", None)
         if isinstance(journal_path, (str, Path)) and str(journal_path):
             try:
-                for line in Path(journal_path).read_text(encoding="utf-8").splitlines():
-                    if not line.strip():
-                        continue
-                    journal_lines += 1
-                    try:
-                        entry = json.loads(line)
-                    except Exception:
-                        continue
-                    if isinstance(entry, dict) and entry.get("type") == "dsl_trace":
-                        dsl_trace_count += 1
-                    origin = str(entry.get("origin") or "")
-                    if origin.startswith("external:"):
-                        if entry.get("executed"):
-                            external_executed += 1
-                        else:
-                            external_rejected += 1
+                # live counters; the journal rescans only if they no longer match the file
+                run_metrics = journal.report_metrics()
+                journal_lines = run_metrics.journal_lines
+                external_executed = run_metrics.external_executed
+                external_rejected = run_metrics.external_rejected
+                dsl_trace_count = run_metrics.dsl_traces
             except Exception:
                 pass
 
@@ -2712,6 +2776,7 @@ class ControlStrategy:
         summary_block["external_executed"] = external_executed
         summary_block["external_rejected"] = external_rejected
         attach_trace_metadata(report, trace_count=dsl_trace_count)
+        attach_hotpath_metadata(report)
 
         limits_stats = ((report.get("metadata") or {}).get("limits", {}) or {}).get("stats", {})
         rejected_map = {}
@@ -2928,65 +2993,78 @@ class ControlStrategy:
             bool(compress),
         )
 
-    # ---- P5C5 dedup/versioning helpers (folder mode only) ----
+    def _export_link_from_spec(self) -> bool:
+        """``run.export.link`` (or ``run.report.export.link``): hard-link folder exports."""
+        run_blk = self.spec.get("run") if isinstance(self.spec, dict) else {}
+        link = False
+        if isinstance(run_blk, dict):
+            for exp in ((run_blk.get("report") or {}).get("export"), run_blk.get("export")):
+                if isinstance(exp, dict) and "link" in exp:
+                    link = bool(exp.get("link"))
+        return link
 
-    @staticmethod
-    def _fingerprint_file(path: Path, *, chunk_size: int = 1024 * 1024) -> Optional[str]:
-        """Return SHA-256 hex digest of file contents, or None if not readable."""
-        try:
-            h = hashlib.sha256()
-            with path.open("rb") as f:
-                while True:
-                    chunk = f.read(chunk_size)
-                    if not chunk:
-                        break
-                    h.update(chunk)
-            return h.hexdigest()
-        except Exception:
-            return None
+    # ---- P5C5 dedup/versioning helpers (folder mode only) ----
 
     @staticmethod
     def _export_copy(
-        src: Path, dst_dir: Path, *, versioning: bool = True
+        src: Path,
+        dst_dir: Path,
+        *,
+        versioning: bool = True,
+        store: Optional[BlobStore] = None,
+        link: bool = False,
     ) -> Tuple[Path, bool, Optional[str]]:
         """
-        Copy src into dst_dir with content-aware behavior.
+        Place src into dst_dir with content-aware behavior.
         Returns (dst_path, copied_bool, fingerprint_hex).
           - If a file of same basename exists and contents are identical → skip copy (copied=False).
           - If different and versioning=False → overwrite existing basename.
-          - If different and versioning=True → create 'name-vN.ext' (N increments).
+          - If different and versioning=True → create 'name-vN.ext' (N increments),
+            or reuse an older version with identical content.
+        Digests come from the export root's digest index (``store``, default
+        :meth:`BlobStore.for_export_root`), so existing versions are never
+        re-hashed. Files are plain copies; with ``link`` they are instead
+        read-only hard links to one shared blob per distinct content.
         """
-        dst_dir.mkdir(parents=True, exist_ok=True)
-        base = src.name
-        dst = dst_dir / base
-
-        src_fp = ControlStrategy._fingerprint_file(src)
-
-        if dst.exists():
-            dst_fp = ControlStrategy._fingerprint_file(dst)
-            if dst_fp and src_fp and dst_fp == src_fp:
+        owned = store is None
+        if store is None:
+            store = BlobStore.for_export_root(dst_dir.parent)
+        try:
+            dst_dir.mkdir(parents=True, exist_ok=True)
+            dst = dst_dir / src.name
+            src_fp = store.put(src)[0] if link else store.digest(src)
+
+            def _place(target: Path) -> Path:
+                if link and src_fp is not None:
+                    return store.materialize(src_fp, target)
+                shutil.copy2(src, target)
+                if src_fp is not None:
+                    store.remember(target, src_fp)
+                return target
+
+            if not dst.exists():
+                return _place(dst), True, src_fp
+            if src_fp is not None and store.digest(dst) == src_fp:
                 return dst, False, src_fp  # identical, no copy
 
             if not versioning:
-                shutil.copy2(src, dst)
-                return dst, True, src_fp
-
-            stem = dst.stem
-            suffix = dst.suffix
+                dst.unlink()
+                return _place(dst), True, src_fp
+
+            stem, suffix = dst.stem, dst.suffix
+            # If an older version has identical content, reuse it:
+            same = store.find_in_dir(src_fp, dst_dir) if src_fp is not None else None
+            if same is not None and re.fullmatch(
+                rf"{re.escape(stem)}-v\d+{re.escape(suffix)}", same.name
+            ):
+                return same, False, src_fp
             n = 1
-            while True:
-                cand = dst_dir / f"{stem}-v{n}{suffix}"
-                if not cand.exists():
-                    shutil.copy2(src, cand)
-                    return cand, True, src_fp
-                # If an older version has identical content, reuse it:
-                cand_fp = ControlStrategy._fingerprint_file(cand)
-                if cand_fp and src_fp and cand_fp == src_fp:
-                    return cand, False, src_fp
+            while (dst_dir / f"{stem}-v{n}{suffix}").exists():
                 n += 1
-        else:
-            shutil.copy2(src, dst)
-            return dst, True, src_fp
+            return _place(dst_dir / f"{stem}-v{n}{suffix}"), True, src_fp
+        finally:
+            if owned:
+                store.close()
 
     def export_bundle(
         self, export_root: Optional[str | Path] = None, compress: Optional[bool] = None
@@ -3033,82 +3111,83 @@ class ControlStrategy:
         base_name = identity.get("run_id") or "run"
         folder_name = f"{base_name}_{stamp}"
 
-        # Relative names (preferred basenames)
-        rel_csv = "journal.csv" if csv_path else None
-        rel_meta = "meta.json" if meta_path else None
-        rel_report = "report.json" if report_path else None
-
-        if not compress:
-            # Folder export (with content-aware copy + versioning)
-            dest_dir = export_root / folder_name
-            dest_dir.mkdir(parents=True, exist_ok=True)
-
-            artifacts: Dict[str, Optional[str]] = {}
-            fingerprints: Dict[str, Optional[str]] = {}
-
-            if csv_path and csv_path.exists():
-                dst, _copied, fp = self._export_copy(csv_path, dest_dir, versioning=True)
-                artifacts["csv"] = str(dst.relative_to(dest_dir))
-                fingerprints["csv"] = fp
-            if meta_path and meta_path.exists():
-                dst, _copied, fp = self._export_copy(meta_path, dest_dir, versioning=True)
-                artifacts["meta"] = str(dst.relative_to(dest_dir))
-                fingerprints["meta"] = fp
-            else:
-                artifacts["meta"] = None
-                fingerprints["meta"] = None
-            if report_path and report_path.exists():
-                dst, _copied, fp = self._export_copy(report_path, dest_dir, versioning=True)
-                artifacts["report"] = str(dst.relative_to(dest_dir))
-                fingerprints["report"] = fp
-            else:
-                artifacts.setdefault("report", None)
-                fingerprints.setdefault("report", None)
-            if tape_path and tape_path.exists():
-                dst, _copied, fp = self._export_copy(tape_path, dest_dir, versioning=True)
-                artifacts["command_tape"] = str(dst.relative_to(dest_dir))
-                fingerprints["command_tape"] = fp
-            else:
-                artifacts.setdefault("command_tape", None)
-                fingerprints.setdefault("command_tape", None)
-
-            manifest = {
-                "identity": identity,
-                "artifacts": artifacts,
-                "fingerprints": fingerprints,
-            }
-            (dest_dir / "manifest.json").write_text(
-                json.dumps(manifest, ensure_ascii=False, separators=(",", ":"), sort_keys=True),
-                encoding="utf-8",
+        # (manifest key, source, name inside a zip)
+        entries = [
+            ("csv", csv_path, "journal.csv"),
+            ("meta", meta_path, "meta.json"),
+            ("report", report_path, "report.json"),
+            ("command_tape", tape_path, "command_tape.jsonl"),
+        ]
+        if compress:
+            return self._export_zip(export_root / f"{folder_name}.zip", identity, entries)
+        with BlobStore.for_export_root(export_root) as store:
+            return self._export_folder(
+                export_root / folder_name, store, identity, entries, self._export_link_from_spec()
             )
-            return dest_dir
 
-        # Zip export (unchanged behavior)
-        zip_path = export_root / f"{folder_name}.zip"
+    def _export_folder(
+        self,
+        dest_dir: Path,
+        store: BlobStore,
+        identity: Dict[str, Any],
+        entries: List[Tuple[str, Optional[Path], str]],
+        link: bool = False,
+    ) -> Path:
+        # Folder export: indexed digests, copies (or hard links into the blob store), versioning
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        artifacts: Dict[str, Optional[str]] = {}
+        fingerprints: Dict[str, Optional[str]] = {}
+        for key, src, _arcname in entries:
+            if src and src.exists():
+                dst, _copied, fp = self._export_copy(
+                    src, dest_dir, versioning=True, store=store, link=link
+                )
+                artifacts[key] = str(dst.relative_to(dest_dir))
+                fingerprints[key] = fp
+            elif key != "csv":
+                artifacts[key] = None
+                fingerprints[key] = None
+
+        manifest = {
+            "identity": identity,
+            "artifacts": artifacts,
+            "fingerprints": fingerprints,
+        }
+        (dest_dir / "manifest.json").write_text(
+            json.dumps(manifest, ensure_ascii=False, separators=(",", ":"), sort_keys=True),
+            encoding="utf-8",
+        )
+        return dest_dir
+
+    @staticmethod
+    def _export_zip(
+        zip_path: Path,
+        identity: Dict[str, Any],
+        entries: List[Tuple[str, Optional[Path], str]],
+    ) -> Path:
+        # Zip export: members are streamed from the sources and hashed in the same pass
         artifacts_zip: Dict[str, Optional[str]] = {}
+        fingerprints: Dict[str, Optional[str]] = {}
         with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-            if csv_path and csv_path.exists():
-                zf.write(csv_path, arcname=rel_csv or "journal.csv")
-                artifacts_zip["csv"] = rel_csv or "journal.csv"
-            if meta_path and meta_path.exists():
-                zf.write(meta_path, arcname=rel_meta or "meta.json")
-                artifacts_zip["meta"] = rel_meta or "meta.json"
-            else:
-                artifacts_zip["meta"] = None
-            if report_path and report_path.exists():
-                zf.write(report_path, arcname=rel_report or "report.json")
-                artifacts_zip["report"] = rel_report or "report.json"
-            else:
-                artifacts_zip.setdefault("report", None)
-            if tape_path and tape_path.exists():
-                zf.write(tape_path, arcname="command_tape.jsonl")
-                artifacts_zip["command_tape"] = "command_tape.jsonl"
-            else:
-                artifacts_zip.setdefault("command_tape", None)
+            for key, src, arcname in entries:
+                if src and src.exists():
+                    info = zipfile.ZipInfo.from_file(src, arcname=arcname)
+                    info.compress_type = zipfile.ZIP_DEFLATED
+                    h = hashlib.sha256()
+                    with src.open("rb") as f, zf.open(info, "w") as member:
+                        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                            h.update(chunk)
+                            member.write(chunk)
+                    artifacts_zip[key] = arcname
+                    fingerprints[key] = h.hexdigest()
+                elif key != "csv":
+                    artifacts_zip[key] = None
 
             manifest = {
                 "identity": identity,
                 "artifacts": artifacts_zip,
+                "fingerprints": fingerprints,
             }
             zf.writestr(
                 "manifest.json",
@@ -3121,14 +3200,37 @@ class ControlStrategy:
         """
         Emit a one-row summary to CSV (if enabled), optionally write meta.json,
         generate a report if auto-report is enabled, and export a bundle if configured.
+
+        ``run.artifacts`` trims this: ``standard`` skips the export bundle and
+        ``metrics-only`` replaces everything with one compact record appended
+        to the shared ``run_metrics.jsonl``.
         """
         try:
+            artifacts = artifact_level_from_spec(self.spec)
             j = self._ensure_journal()  # may be None if CSV disabled
 
             identity = {
                 "run_id": getattr(j, "run_id", None),
                 "seed": getattr(j, "seed", None),
             }
+            if artifacts == "metrics-only":
+                try:
+                    append_run_metrics(
+                        self._run_metrics_path(),
+                        {
+                            "run_id": identity["run_id"] or self.run_id,
+                            "seed": identity["seed"] or getattr(self, "_seed_value", None),
+                            "status": "ok",
+                            "mode": getattr(self, "mode", None),
+                            "stats": dict(self._stats),
+                        },
+                    )
+                except Exception:
+                    pass
+                self._stop_http_server()
+                self._analytics_session_end()
+                return
+
             summary_event = {
                 "type": "summary",
                 "point": self.point,
@@ -3187,7 +3289,7 @@ class ControlStrategy:
 
             # P5C5: auto-export if configured
             exp_root, _comp = self._export_cfg_from_spec()
-            if exp_root is not None:
+            if exp_root is not None and artifacts == "full":
                 try:
                     self.export_bundle(exp_root)  # use configured compress flag by default
                 except Exception:
@@ -3206,6 +3308,18 @@ class ControlStrategy:
             self._decisions_writer = None
             clear_registries()
 
+    def _run_metrics_path(self) -> Path:
+        """Shared ``metrics-only`` file: ``run.metrics_path`` or ``<artifacts_dir>/run_metrics.jsonl``."""
+
+        run_blk = self.spec.get("run") if isinstance(self.spec, dict) else None
+        run_dict = run_blk if isinstance(run_blk, dict) else {}
+        configured = run_dict.get("metrics_path")
+        if isinstance(configured, (str, Path)) and str(configured).strip():
+            return Path(configured)
+        base = run_dict.get("artifacts_dir")
+        root = Path(base) if isinstance(base, (str, Path)) and str(base).strip() else Path("export")
+        return root / RUN_METRICS_NAME
+
     def state_snapshot(self) -> Dict[str, Any]:
         return {
             "point": self.point,
@@ -3230,13 +3344,42 @@ class ControlStrategy:
         return None
 
 
+_SIM_JOURNAL_FIELDS = ["roll", "dice", "total", "bankroll_after", "point_value", "pso"]
+_JOURNAL_BUFFER = 1 << 20
+
+
+def _bankroll_stats_summary(
+    stats: RunningStats, sketch: Optional[QuantileSketch]
+) -> Dict[str, Any]:
+    empty = stats.count == 0
+    out: Dict[str, Any] = {
+        "bankroll_start": 0.0 if empty else stats.first,
+        "bankroll_end": 0.0 if empty else stats.last,
+        "bankroll_peak": 0.0 if empty else stats.peak,
+        "bankroll_trough": 0.0 if empty else stats.trough,
+        "bankroll_max_drawdown": stats.max_drawdown,
+        "bankroll_mean": stats.mean,
+        "bankroll_stddev": stats.stddev,
+    }
+    if sketch is not None:
+        out["bankroll_quantiles"] = sketch.summary()
+    return out
+
+
 def simulate_rounds(
     adapter: Any,
     rolls: int = 20,
     seed: Optional[int] = 42,
     outfile_prefix: str = "baseline_run",
+    *,
+    quantiles: Optional[Sequence[float]] = None,
 ) -> Dict[str, Any]:
-    """Perform a full seeded run and produce journal, summary, and manifest artifacts."""
+    """Perform a full seeded run and produce journal, summary, and manifest artifacts.
+
+    Rolls are streamed: each one is journaled and folded into running bankroll
+    statistics, so memory stays flat at any roll count. Pass ``quantiles``
+    (e.g. ``(0.05, 0.5, 0.95)``) to add P-square bankroll quantile estimates.
+    """
 
     if seed is not None:
         set_seed = getattr(adapter, "set_seed", None)
@@ -3249,64 +3392,49 @@ def simulate_rounds(
     summary_path = os.path.join("baselines", f"{outfile_prefix}_summary.json")
     manifest_path = os.path.join("baselines", f"{outfile_prefix}_manifest.json")
 
-    results: List[Dict[str, Any]] = []
-    bankroll_track: List[float] = []
-
-    with open(csv_path, "w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(
-            handle,
-            fieldnames=[
-                "roll",
-                "dice",
-                "total",
-                "bankroll_after",
-                "point_value",
-                "pso",
-            ],
-        )
-        writer.writeheader()
+    stats = RunningStats()
+    sketch = QuantileSketch(quantiles) if quantiles else None
+    psos = 0
+
+    with open(csv_path, "w", newline="", encoding="utf-8", buffering=_JOURNAL_BUFFER) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(_SIM_JOURNAL_FIELDS)
 
         for idx in range(rolls):
             roll_summary = adapter.step_roll()
-            snapshot = roll_summary.get("snapshot", {}) if isinstance(roll_summary, dict) else {}
-
-            dice_val = roll_summary.get("dice") if isinstance(roll_summary, dict) else None
-            dice_repr = "" if dice_val is None else str(dice_val)
+            if not isinstance(roll_summary, dict):
+                roll_summary = {}
+            snapshot = roll_summary.get("snapshot") or {}
 
+            dice_val = roll_summary.get("dice")
             bankroll_after = snapshot.get("bankroll_after", 0.0)
-            point_value = snapshot.get("point_value")
+            pso = roll_summary.get("pso")
 
             writer.writerow(
-                {
-                    "roll": idx + 1,
-                    "dice": dice_repr,
-                    "total": roll_summary.get("total") if isinstance(roll_summary, dict) else None,
-                    "bankroll_after": bankroll_after,
-                    "point_value": point_value,
-                    "pso": roll_summary.get("pso") if isinstance(roll_summary, dict) else None,
-                }
+                (
+                    idx + 1,
+                    "" if dice_val is None else str(dice_val),
+                    roll_summary.get("total"),
+                    bankroll_after,
+                    snapshot.get("point_value"),
+                    pso,
+                )
             )
 
-            bankroll_track.append(float(bankroll_after))
-            if isinstance(roll_summary, dict):
-                results.append(roll_summary)
-
-    bankroll_start = bankroll_track[0] if bankroll_track else 0.0
-    bankroll_end = bankroll_track[-1] if bankroll_track else 0.0
-    bankroll_peak = max(bankroll_track) if bankroll_track else 0.0
-    bankroll_trough = min(bankroll_track) if bankroll_track else 0.0
-
-    hands = sum(1 for entry in results if entry.get("pso"))
-    psos = sum(1 for entry in results if entry.get("pso"))
+            stats.push(bankroll_after)
+            if sketch is not None:
+                sketch.push(bankroll_after)
+            if pso:
+                psos += 1
 
+    bankroll = _bankroll_stats_summary(stats, sketch)
     summary: Dict[str, Any] = {
         "rolls": rolls,
-        "hands": hands,
+        "hands": psos,
         "psos": psos,
-        "bankroll_start": bankroll_start,
-        "bankroll_end": bankroll_end,
-        "bankroll_peak": bankroll_peak,
-        "bankroll_drawdown": bankroll_peak - bankroll_trough if bankroll_track else 0.0,
+        **bankroll,
+        # Historical meaning: peak minus trough over the run (see bankroll_max_drawdown).
+        "bankroll_drawdown": bankroll["bankroll_peak"] - bankroll["bankroll_trough"],
         "snapshot_schema": "2.0",
         "roll_event_schema": "1.0",
         "engine_contract_version": "1.0",
@@ -3331,42 +3459,80 @@ def simulate_rounds(
     return {"summary": summary, "manifest": manifest}
 
 
-def replay_run(adapter: Any, journal_path: str) -> Dict[str, Any]:
-    """Replay dice sequence from a prior journal and return summary digest."""
+def iter_journal_dice(journal_path: str) -> Iterator[Tuple[int, int]]:
+    """Yield ``(d1, d2)`` from a ``simulate_rounds`` journal one row at a time."""
 
-    if not os.path.exists(journal_path):
-        raise FileNotFoundError(journal_path)
-
-    dice_sequence: List[Tuple[int, int]] = []
-
-    with open(journal_path, newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
+    with open(journal_path, newline="", encoding="utf-8", buffering=_JOURNAL_BUFFER) as handle:
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        try:
+            dice_col = header.index("dice")
+        except ValueError:
+            return
         for row in reader:
-            dice_raw = (row.get("dice") or "").strip()
-            if not dice_raw:
+            if len(row) <= dice_col:
                 continue
-            cleaned = dice_raw.strip("() ")
+            dice_raw = row[dice_col].strip()
+            cleaned = dice_raw.strip("()[] ")
             if not cleaned:
                 continue
             parts = [part.strip() for part in cleaned.split(",") if part.strip()]
             if len(parts) != 2:
                 raise ValueError(f"Invalid dice format in journal: {dice_raw}")
-            dice_pair = (int(parts[0]), int(parts[1]))
-            dice_sequence.append(dice_pair)
+            yield (int(parts[0]), int(parts[1]))
+
+
+def replay_run(
+    adapter: Any,
+    journal_path: str,
+    *,
+    quantiles: Optional[Sequence[float]] = None,
+) -> Dict[str, Any]:
+    """Replay dice sequence from a prior journal and return summary digest.
+
+    The journal is read lazily and bankrolls are folded into running stats, so
+    replaying a 100M-roll baseline needs no more memory than a short one.
+    """
+
+    if not os.path.exists(journal_path):
+        raise FileNotFoundError(journal_path)
 
-    bankroll_track: List[float] = []
+    stats = RunningStats()
+    sketch = QuantileSketch(quantiles) if quantiles else None
 
-    for dice in dice_sequence:
+    for dice in iter_journal_dice(journal_path):
         roll_summary = adapter.step_roll(dice=dice)
         snapshot = roll_summary.get("snapshot", {}) if isinstance(roll_summary, dict) else {}
         bankroll_after = snapshot.get("bankroll_after", 0.0)
-        bankroll_track.append(float(bankroll_after))
-
-    bankroll_start = bankroll_track[0] if bankroll_track else 0.0
-    bankroll_end = bankroll_track[-1] if bankroll_track else 0.0
-
-    return {
-        "bankroll_start": bankroll_start,
-        "bankroll_end": bankroll_end,
-        "rolls": len(dice_sequence),
-    }
+        stats.push(bankroll_after)
+        if sketch is not None:
+            sketch.push(bankroll_after)
+
+    return {**_bankroll_stats_summary(stats, sketch), "rolls": stats.count}
+
+
+def run_single(
+    spec_path_or_dict: Any,
+    out_dir: str | Path,
+    *,
+    seed: Optional[int] = None,
+    rolls: Optional[int] = None,
+    artifacts: str = "standard",
+    worker: Optional[Any] = None,
+    **options: Any,
+) -> Any:
+    """Run one spec in-process; see :func:`crapssim_control.run.single.run_single`."""
+
+    from .run.single import run_single as _run_single
+
+    return _run_single(
+        spec_path_or_dict,
+        out_dir,
+        seed=seed,
+        rolls=rolls,
+        artifacts=artifacts,
+        worker=worker,
+        **options,
+    )
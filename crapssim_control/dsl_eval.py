@@ -4,6 +4,8 @@ import copy
 import re
 from typing import Any, Dict, List, Tuple, Union
 
+from . import hotpath
+
 __all__ = [
     "ExpressionError",
     "compile_expr",
@@ -268,5 +270,9 @@ def compile_expr(expr: str) -> Dict[str, Any]:
 
 
 def evaluate_condition(expr: str, snapshot: Dict[str, Any]) -> bool:
-    ast = compile_expr(expr)
-    return bool(_eval_node(ast, snapshot))
+    t_span = hotpath.start()
+    try:
+        ast = compile_expr(expr)
+        return bool(_eval_node(ast, snapshot))
+    finally:
+        hotpath.stop("eval.dsl_condition", t_span)
@@ -3,10 +3,12 @@
 from .base import EngineAdapter, EngineStateDict
 from .factory import build_engine_adapter
 from .http_api_adapter import HttpEngineAdapter
+from .http_api_async import AsyncHttpEngineAdapter
 
 __all__ = [
     "EngineAdapter",
     "EngineStateDict",
     "build_engine_adapter",
     "HttpEngineAdapter",
+    "AsyncHttpEngineAdapter",
 ]
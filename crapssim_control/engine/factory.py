@@ -38,7 +38,7 @@ def build_engine_adapter(
     if engine_name in {"null", "noop"}:
         return NullAdapter()
 
-    if engine_name in {"inprocess", "vanilla"}:
+    if engine_name in {"inprocess", "vanilla", "stub"}:
         return VanillaAdapter()
 
     if engine_name == "http_api":
@@ -19,6 +19,69 @@ from .http_api_capabilities import (
 )
 
 
+def _coerce_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value))
+    except Exception:
+        return None
+
+
+def normalize_engine_snapshot(
+    payload: Mapping[str, Any] | None,
+    *,
+    session_id: Optional[str] = None,
+    seed: Optional[int] = None,
+) -> EngineStateDict:
+    """Map an Engine API snapshot payload onto the CSC ``EngineStateDict`` shape."""
+
+    data: Mapping[str, Any]
+    if isinstance(payload, Mapping):
+        data = payload
+    else:
+        data = {}
+    dice_value = data.get("dice")
+    dice: Tuple[int, int] | None = None
+    if isinstance(dice_value, (list, tuple)) and len(dice_value) == 2:
+        try:
+            dice = (int(dice_value[0]), int(dice_value[1]))
+        except Exception:
+            dice = None
+    bankroll = _coerce_float(data.get("bankroll_after"))
+    bets_map: Dict[str, float] = {}
+    raw_bets = data.get("bets")
+    if isinstance(raw_bets, list):
+        for bet in raw_bets:
+            if not isinstance(bet, Mapping):
+                continue
+            key_parts = [bet.get("type"), bet.get("name"), bet.get("id")]
+            key = next((str(v) for v in key_parts if isinstance(v, str) and v), None)
+            amount = bet.get("amount")
+            amt_val = _coerce_float(amount)
+            if key and amt_val is not None:
+                bets_map[key] = amt_val
+    snapshot: EngineStateDict = {
+        "session_id": data.get("session_id") or session_id,
+        "hand_id": data.get("hand_id"),
+        "roll_seq": data.get("roll_seq"),
+        "dice": dice,
+        "puck": data.get("puck"),
+        "point": data.get("point"),
+        "bankroll": bankroll,
+        "bankroll_after": bankroll,
+        "bets": bets_map,
+        "bets_raw": raw_bets if isinstance(raw_bets, list) else [],
+        "events": data.get("events", []),
+        "identity": data.get("identity", {}),
+        "raw": dict(data),
+        "seed": seed,
+    }
+    return snapshot
+
+
 class HttpEngineAdapter(EngineAdapter):
     """Adapter that talks to a CrapsSim Engine API instance over HTTP."""
 
@@ -92,58 +155,10 @@ class HttpEngineAdapter(EngineAdapter):
 
     @staticmethod
     def _coerce_float(value: Any) -> Optional[float]:
-        if value is None:
-            return None
-        if isinstance(value, (int, float)):
-            return float(value)
-        try:
-            return float(str(value))
-        except Exception:
-            return None
+        return _coerce_float(value)
 
     def _normalize_snapshot(self, payload: Mapping[str, Any] | None) -> EngineStateDict:
-        data: Mapping[str, Any]
-        if isinstance(payload, Mapping):
-            data = payload
-        else:
-            data = {}
-        dice_value = data.get("dice")
-        dice: Tuple[int, int] | None = None
-        if isinstance(dice_value, (list, tuple)) and len(dice_value) == 2:
-            try:
-                dice = (int(dice_value[0]), int(dice_value[1]))
-            except Exception:
-                dice = None
-        bankroll = self._coerce_float(data.get("bankroll_after"))
-        bets_map: Dict[str, float] = {}
-        raw_bets = data.get("bets")
-        if isinstance(raw_bets, list):
-            for bet in raw_bets:
-                if not isinstance(bet, Mapping):
-                    continue
-                key_parts = [bet.get("type"), bet.get("name"), bet.get("id")]
-                key = next((str(v) for v in key_parts if isinstance(v, str) and v), None)
-                amount = bet.get("amount")
-                amt_val = self._coerce_float(amount)
-                if key and amt_val is not None:
-                    bets_map[key] = amt_val
-        snapshot: EngineStateDict = {
-            "session_id": data.get("session_id") or self._session_id,
-            "hand_id": data.get("hand_id"),
-            "roll_seq": data.get("roll_seq"),
-            "dice": dice,
-            "puck": data.get("puck"),
-            "point": data.get("point"),
-            "bankroll": bankroll,
-            "bankroll_after": bankroll,
-            "bets": bets_map,
-            "bets_raw": raw_bets if isinstance(raw_bets, list) else [],
-            "events": data.get("events", []),
-            "identity": data.get("identity", {}),
-            "raw": dict(data),
-            "seed": self._seed,
-        }
-        return snapshot
+        return normalize_engine_snapshot(payload, session_id=self._session_id, seed=self._seed)
 
     # ------------------------------------------------------------------ protocol
     def start_session(self, spec: Dict[str, Any], seed: int | None = None) -> None:
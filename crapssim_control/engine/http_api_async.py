@@ -0,0 +1,299 @@
+"""Asyncio engine adapter multiplexing many CrapsSim Engine API sessions.
+
+:class:`AsyncHttpEngineAdapter` owns one ``httpx.AsyncClient`` connection pool
+and hands out :class:`AsyncHttpEngineSession` objects that share it, so roll
+requests from hundreds of sessions interleave on the wire instead of waiting
+on each other's round trips. Capability discovery goes through the
+per-base-URL cache in :mod:`.http_api_capabilities`.
+
+    results = run_sessions("http://engine:8000", seeds=range(200), rolls=500)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+try:  # Optional dependency; adapter can be constructed without httpx when a client is injected.
+    import httpx  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover - httpx optional in minimal environments
+    httpx = None  # type: ignore[assignment]
+
+from .base import EngineStateDict
+from .http_api_adapter import normalize_engine_snapshot
+from .http_api_capabilities import (
+    DEFAULT_ENGINE_INFO,
+    HttpEngineError,
+    coerce_success,
+    fetch_capabilities_async,
+    transport_error,
+)
+
+RollCallback = Callable[["AsyncHttpEngineSession", EngineStateDict], Any]
+
+
+class AsyncHttpEngineSession:
+    """One engine session driven over a client shared with other sessions."""
+
+    def __init__(self, owner: "AsyncHttpEngineAdapter") -> None:
+        self._owner = owner
+        self._session_id: Optional[str] = None
+        self._seed: Optional[int] = None
+        self._last_snapshot: EngineStateDict = {}
+        self.rolls = 0
+
+    @property
+    def session_id(self) -> Optional[str]:
+        return self._session_id
+
+    async def start_session(self, spec: Dict[str, Any], seed: int | None = None) -> None:
+        session_spec = dict(spec or {})
+        if seed is not None:
+            self._seed = int(seed)
+        else:
+            seed_from_spec = session_spec.get("seed")
+            self._seed = int(seed_from_spec) if isinstance(seed_from_spec, int) else None
+        payload: Dict[str, Any] = {"spec": session_spec}
+        if self._seed is not None:
+            payload["seed"] = self._seed
+        data = await self._owner._request_json("post", "/session/start", payload)
+        session_id = data.get("session_id")
+        if not isinstance(session_id, str):
+            raise HttpEngineError("engine did not return session_id")
+        self._session_id = session_id
+        self._last_snapshot = normalize_engine_snapshot(
+            data.get("snapshot"), session_id=session_id, seed=self._seed
+        )
+        self._last_snapshot["session_id"] = session_id
+
+    async def step_roll(self, dice: Tuple[int, int] | None = None) -> EngineStateDict:
+        if not self._session_id:
+            raise RuntimeError("start_session() must be called before step_roll().")
+        payload: Dict[str, Any] = {"session_id": self._session_id}
+        if dice is not None:
+            payload["dice"] = [int(dice[0]), int(dice[1])]
+        data = await self._owner._request_json("post", "/session/roll", payload)
+        self._last_snapshot = normalize_engine_snapshot(
+            data.get("snapshot"), session_id=self._session_id, seed=self._seed
+        )
+        self.rolls += 1
+        return self._last_snapshot
+
+    async def apply_action(self, verb: str, args: Dict[str, Any]) -> EngineStateDict:
+        if not self._session_id:
+            raise RuntimeError("start_session() must be called before apply_action().")
+        payload = {"session_id": self._session_id, "verb": verb, "args": dict(args or {})}
+        data = await self._owner._request_json("post", "/apply_action", payload)
+        effect = data.get("effect_summary")
+        normalized = normalize_engine_snapshot(
+            data.get("snapshot"), session_id=self._session_id, seed=self._seed
+        )
+        self._last_snapshot = normalized
+        return {
+            "effect_summary": dict(effect) if isinstance(effect, Mapping) else {},
+            "snapshot": normalized,
+        }
+
+    def snapshot_state(self) -> EngineStateDict:
+        if self._last_snapshot:
+            return dict(self._last_snapshot)
+        return {
+            "session_id": self._session_id,
+            "bankroll": None,
+            "bets": {},
+            "events": [],
+            "seed": self._seed,
+        }
+
+    def get_engine_info(self) -> Dict[str, Any]:
+        info = self._owner.get_engine_info()
+        if self._session_id:
+            info["session_id"] = self._session_id
+        if self._seed is not None:
+            info["seed"] = self._seed
+        return info
+
+
+class AsyncHttpEngineAdapter:
+    """Shares one ``httpx.AsyncClient`` pool across many engine sessions."""
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout_seconds: float = 10.0,
+        client: Any | None = None,
+        *,
+        max_connections: int = 100,
+    ) -> None:
+        if not isinstance(base_url, str) or not base_url.strip():
+            raise ValueError("base_url must be a non-empty string")
+        self.base_url = base_url.rstrip("/")
+        self.timeout_seconds = float(timeout_seconds)
+        self.max_connections = max(1, int(max_connections))
+        self._client = client
+        self._owns_client = False
+        self._engine_info: Dict[str, Any] = dict(DEFAULT_ENGINE_INFO)
+        self._engine_info["base_url"] = self.base_url
+        self._capabilities: Dict[str, Any] = {}
+
+    async def __aenter__(self) -> "AsyncHttpEngineAdapter":
+        self._ensure_client()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.aclose()
+
+    # ------------------------------------------------------------------ helpers
+    def _ensure_client(self) -> Any:
+        if self._client is not None:
+            return self._client
+        if httpx is None:  # pragma: no cover - httpx missing in environment
+            raise RuntimeError(
+                "httpx is required for AsyncHttpEngineAdapter when no client is provided"
+            )
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url, timeout=self.timeout_seconds, limits=limits
+        )
+        self._owns_client = True
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._owns_client and self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception:  # pragma: no cover - defensive cleanup
+                pass
+        self._client = None
+        self._owns_client = False
+
+    async def _request_json(
+        self, method: str, path: str, payload: Mapping[str, Any] | None = None
+    ) -> Mapping[str, Any]:
+        client = self._ensure_client()
+        request_fn = getattr(client, method.lower())
+        kwargs: Dict[str, Any] = {}
+        if payload is not None:
+            kwargs["json"] = payload
+        # absolute URL: an injected client may have no (or a different) base_url
+        url = f"{self.base_url}{path}"
+        try:
+            response = await request_fn(url, timeout=self.timeout_seconds, **kwargs)
+        except Exception as exc:
+            raise transport_error(exc) from exc
+        return coerce_success(response)
+
+    async def ensure_capabilities(self) -> Dict[str, Any]:
+        if not self._capabilities:
+            try:
+                info, caps = await fetch_capabilities_async(
+                    self.base_url, self._ensure_client(), self.timeout_seconds
+                )
+            except HttpEngineError:
+                self._engine_info.setdefault("capabilities_source", "static")
+                return {}
+            self._engine_info.update(info)
+            self._capabilities = caps
+        return dict(self._capabilities)
+
+    def get_engine_info(self) -> Dict[str, Any]:
+        info = dict(self._engine_info)
+        info.setdefault("engine_type", "http_api")
+        info.setdefault("engine_name", "crapssim-api")
+        info.setdefault("base_url", self.base_url)
+        return info
+
+    # ------------------------------------------------------------------ sessions
+    def session(self) -> AsyncHttpEngineSession:
+        return AsyncHttpEngineSession(self)
+
+    async def run_session(
+        self,
+        seed: int | None,
+        rolls: int,
+        spec: Optional[Dict[str, Any]] = None,
+        *,
+        dice: Optional[Iterable[Tuple[int, int]]] = None,
+        on_roll: Optional[RollCallback] = None,
+    ) -> Dict[str, Any]:
+        """Start one seeded session and roll it ``rolls`` times; errors are captured."""
+
+        sess = self.session()
+        result: Dict[str, Any] = {"seed": seed, "session_id": None, "rolls": 0}
+        dice_iter = iter(dice) if dice is not None else None
+        try:
+            await sess.start_session(dict(spec or {}), seed=seed)
+            result["session_id"] = sess.session_id
+            for _ in range(int(rolls)):
+                forced = next(dice_iter, None) if dice_iter is not None else None
+                snap = await sess.step_roll(forced)
+                if on_roll is not None:
+                    ret = on_roll(sess, snap)
+                    if asyncio.iscoroutine(ret):
+                        await ret
+        except HttpEngineError as exc:
+            result["error"] = {"code": exc.code, "message": exc.message, "status": exc.status}
+        result["rolls"] = sess.rolls
+        result["final_snapshot"] = sess.snapshot_state()
+        return result
+
+    async def run_sessions(
+        self,
+        seeds: Iterable[int | None],
+        rolls: int,
+        spec: Optional[Dict[str, Any]] = None,
+        *,
+        concurrency: Optional[int] = None,
+        on_roll: Optional[RollCallback] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Run one session per seed concurrently; results keep the order of ``seeds``.
+
+        A session that fails outside the engine API (transport error, callback
+        exception) gets an ``error`` record instead of aborting the others.
+        """
+
+        await self.ensure_capabilities()
+        gate = asyncio.Semaphore(max(1, int(concurrency or self.max_connections)))
+
+        async def _one(seed: int | None) -> Dict[str, Any]:
+            async with gate:
+                try:
+                    return await self.run_session(seed, rolls, spec, on_roll=on_roll)
+                except Exception as exc:
+                    return {
+                        "seed": seed,
+                        "session_id": None,
+                        "rolls": 0,
+                        "error": {"code": type(exc).__name__, "message": str(exc), "status": None},
+                    }
+
+        return list(await asyncio.gather(*(_one(seed) for seed in seeds)))
+
+
+def run_sessions(
+    base_url: str,
+    seeds: Iterable[int | None],
+    rolls: int,
+    spec: Optional[Dict[str, Any]] = None,
+    *,
+    concurrency: int = 64,
+    timeout_seconds: float = 10.0,
+    client: Any | None = None,
+) -> List[Dict[str, Any]]:
+    """Blocking helper: run N seeded sessions concurrently against one engine."""
+
+    async def _main() -> List[Dict[str, Any]]:
+        adapter = AsyncHttpEngineAdapter(
+            base_url, timeout_seconds, client, max_connections=concurrency
+        )
+        async with adapter:
+            return await adapter.run_sessions(seeds, rolls, spec, concurrency=concurrency)
+
+    return asyncio.run(_main())
+
+
+__all__ = ["AsyncHttpEngineAdapter", "AsyncHttpEngineSession", "run_sessions"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import threading
 from dataclasses import dataclass
 from typing import Any, Dict, Mapping, Optional, Tuple
 
@@ -93,12 +94,63 @@ def build_engine_info(
     return info
 
 
-def fetch_capabilities(
-    base_url: str, client: Any, timeout: float | None = None
+# Capability discovery is per engine deployment, not per session: cache by base URL.
+_CAPABILITIES_CACHE: Dict[str, Tuple[Dict[str, Any], Dict[str, Any]]] = {}
+_CAPABILITIES_LOCK = threading.Lock()
+
+
+def _cache_key(base_url: str) -> str:
+    return str(base_url).rstrip("/")
+
+
+def _cached_capabilities(base_url: str) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    with _CAPABILITIES_LOCK:
+        hit = _CAPABILITIES_CACHE.get(_cache_key(base_url))
+    if hit is None:
+        return None
+    return dict(hit[0]), dict(hit[1])
+
+
+def _store_capabilities(
+    base_url: str, data: Mapping[str, Any]
 ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-    response = client.get(f"{base_url}/capabilities", timeout=timeout)  # type: ignore[arg-type]
-    data = coerce_success(response)
     engine_info = build_engine_info(base_url, data, source="api")
     caps = data.get("capabilities")
     caps_payload = dict(caps) if isinstance(caps, Mapping) else {}
-    return engine_info, caps_payload
+    with _CAPABILITIES_LOCK:
+        _CAPABILITIES_CACHE[_cache_key(base_url)] = (engine_info, caps_payload)
+    return dict(engine_info), dict(caps_payload)
+
+
+def clear_capabilities_cache(base_url: Optional[str] = None) -> None:
+    """Forget cached capabilities for ``base_url`` (or for every engine)."""
+
+    with _CAPABILITIES_LOCK:
+        if base_url is None:
+            _CAPABILITIES_CACHE.clear()
+        else:
+            _CAPABILITIES_CACHE.pop(_cache_key(base_url), None)
+
+
+def fetch_capabilities(
+    base_url: str, client: Any, timeout: float | None = None, *, refresh: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    if not refresh:
+        hit = _cached_capabilities(base_url)
+        if hit is not None:
+            return hit
+    response = client.get(f"{base_url}/capabilities", timeout=timeout)  # type: ignore[arg-type]
+    return _store_capabilities(base_url, coerce_success(response))
+
+
+async def fetch_capabilities_async(
+    base_url: str, client: Any, timeout: float | None = None, *, refresh: bool = False
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """``fetch_capabilities`` for an async client; shares the per-base-URL cache."""
+
+    if not refresh:
+        hit = _cached_capabilities(base_url)
+        if hit is not None:
+            return hit
+    response = await client.get(f"{base_url}/capabilities", timeout=timeout)
+    return _store_capabilities(base_url, coerce_success(response))
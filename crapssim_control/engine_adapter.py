@@ -5,6 +5,7 @@ See docs/engine_contract.md#effect-schema-10 for the uniform effect_summary sche
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+import copy
 from dataclasses import dataclass
 from datetime import datetime
 from importlib import import_module
@@ -13,15 +14,19 @@ import re
 import warnings
 from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Type, TypedDict
 
+from crapssim_control import hotpath
 from crapssim_control.config import (
     get_journal_options,
     get_policy_options,
     get_stop_options,
     get_table_mins,
 )
+from crapssim_control import journal as _journal_mod
 from crapssim_control.journal import append_effect_summary_line, reset_group_state
+from crapssim_control.table_policy import TablePolicy, compile_table_policy
 from crapssim_control.transport import EngineTransport, LocalTransport
 from crapssim_control.rule_engine import RuleEngine
+from crapssim_control.rng import RngStreams
 from crapssim_control.dsl_parser import parse_file, compile_rules
 
 __all__ = [
@@ -37,6 +42,32 @@ __all__ = [
 
 _BOX_NUMBERS = (4, 5, 6, 8, 9, 10)
 
+# Mutable per-session fields captured by VanillaAdapter.checkpoint_state(); everything
+# else is either derived from the spec at start_session() or engine wiring.
+_CHECKPOINT_FIELDS = (
+    "seed",
+    "bankroll",
+    "bets",
+    "come_flat",
+    "dc_flat",
+    "odds_state",
+    "on_comeout",
+    "box_bet_types",
+    "last_effect",
+    "martingale_levels",
+    "_props_intent",
+    "_props_pending",
+    "_snapshot_cache",
+    "_last_snapshot",
+    "_rolls_completed",
+    "_rolls_requested",
+    "_policy_violations",
+    "_policy_applied",
+    "_terminated_early",
+    "_termination_reason",
+    "_ats_progress",
+)
+
 try:
     import crapssim.bet as cs_bet
 except Exception:
@@ -986,6 +1017,7 @@ class VanillaAdapter(EngineAdapter):
         self._policy_opts = get_policy_options(self.spec)
         self._stop_opts = get_stop_options(self.spec)
         self._table_mins = get_table_mins(self.spec)
+        self._table_policy: Optional[TablePolicy] = None
         self._policy_violations = 0
         self._policy_applied = 0
         self._terminated_early = False
@@ -1002,20 +1034,6 @@ class VanillaAdapter(EngineAdapter):
         self._rolls_completed = 0
         if not hasattr(self, "_risk_policy"):
             self._risk_policy = None  # type: ignore[attr-defined]
-        risk_cfg = {}
-        if isinstance(run_cfg_for_rolls, dict):
-            raw_risk = run_cfg_for_rolls.get("risk")
-            if isinstance(raw_risk, dict):
-                risk_cfg = dict(raw_risk)
-        self._spec_risk_caps = (
-            dict(risk_cfg.get("bet_caps", {})) if isinstance(risk_cfg.get("bet_caps"), dict) else {}
-        )
-        try:
-            self._spec_max_heat = (
-                float(risk_cfg.get("max_heat")) if risk_cfg.get("max_heat") is not None else None
-            )
-        except Exception:
-            self._spec_max_heat = None
         reset_group_state()
         run_cfg = self.spec.get("run") if isinstance(self.spec, dict) else {}
         run_seed: Optional[int] = None
@@ -1096,6 +1114,18 @@ class VanillaAdapter(EngineAdapter):
             except Exception:
                 return 0.0
 
+    def _compiled_table_policy(self) -> TablePolicy:
+        """Return the session TablePolicy, recompiling only if the risk policy was swapped."""
+
+        risk_policy = getattr(self, "_risk_policy", None)
+        if risk_policy is None:
+            risk_policy = getattr(getattr(self, "_policy_engine", None), "policy", None)
+        cached = getattr(self, "_table_policy", None)
+        if cached is None or cached.risk_policy is not risk_policy:
+            cached = compile_table_policy(self.spec, risk_policy=risk_policy)
+            self._table_policy = cached
+        return cached
+
     def _can_any_bet_be_placed(self, snapshot: Dict[str, Any]) -> bool:
         """Return True if at least one legal bet could be placed now given mins, caps, and policy."""
 
@@ -1103,96 +1133,38 @@ class VanillaAdapter(EngineAdapter):
         if bankroll <= 0.01:
             return False
 
-        active_sum = float(snapshot.get("active_bets_sum", 0.0))
-        max_heat = None
-        if hasattr(self, "_policy_engine") and getattr(self, "_risk_policy", None) is not None:
-            max_heat = getattr(self._risk_policy, "max_heat", None)
-        if max_heat is None:
-            max_heat = getattr(self, "_spec_max_heat", None)
-        if max_heat is not None:
+        policy = self._compiled_table_policy()
+
+        if policy.max_heat is not None:
             try:
-                if active_sum >= float(max_heat):
+                if float(snapshot.get("active_bets_sum", 0.0)) >= policy.max_heat:
                     return False
             except Exception:
                 pass
 
-        if getattr(self, "_policy_opts", {}).get("enforce", True) and hasattr(
-            self, "_policy_engine"
+        if (
+            getattr(self, "_policy_opts", {}).get("enforce", True)
+            and hasattr(self, "_policy_engine")
+            and policy.max_drawdown_pct
         ):
-            probe = {"verb": "probe", "args": {"amount": 0}}
             try:
-                policy_eval = self._policy_engine.evaluate(probe, snapshot)  # type: ignore[attr-defined]
+                current = float(snapshot.get("bankroll_after", snapshot.get("bankroll", 0)))
+                peak = float(snapshot.get("bankroll_peak", current))
             except Exception:
-                policy_eval = {"allowed": True}
-            triggers = policy_eval.get("policy_triggered") or []
-            if not policy_eval.get("allowed", True) and "drawdown_limit" in triggers:
+                current = peak = 0.0
+            if policy.drawdown_exceeded(current, peak):
                 return False
 
-        mins = getattr(self, "_table_mins", {}) or {}
-        candidates: List[float] = []
         try:
             point_on = bool(snapshot.get("point_on"))
         except Exception:
             point_on = False
-
-        line_min = mins.get("line")
-        if not point_on and line_min is not None:
-            try:
-                candidates.append(float(line_min))
-            except Exception:
-                pass
-
-        field_min = mins.get("field")
-        if field_min is not None:
-            try:
-                candidates.append(float(field_min))
-            except Exception:
-                pass
-
-        if point_on:
-            place_unit = mins.get("place_unit") or {}
-            for num in ("4", "5", "6", "8", "9", "10"):
-                unit = place_unit.get(num, place_unit.get("default"))
-                if unit is None:
-                    continue
-                try:
-                    candidates.append(float(unit))
-                except Exception:
-                    continue
-
         has_flat_line = bool(snapshot.get("line_flat", 0) or snapshot.get("pass_line", 0))
-        if point_on and has_flat_line:
-            odds_min = mins.get("odds_unit")
-            if odds_min is not None:
-                try:
-                    candidates.append(float(odds_min))
-                except Exception:
-                    pass
+        effective_min = policy.min_bet(point_on=point_on, has_flat_line=has_flat_line)
 
-        if not candidates:
+        if not policy.caps_allow(effective_min):
             return False
 
-        effective_min = min(candidates)
-
-        caps_obj = getattr(getattr(self, "_risk_policy", None), "bet_caps", None)
-        caps: Dict[str, Any] = {}
-        if isinstance(caps_obj, dict):
-            caps = dict(caps_obj)
-        elif isinstance(getattr(self, "_spec_risk_caps", {}), dict):
-            caps = dict(getattr(self, "_spec_risk_caps", {}))
-
-        if caps:
-            meets_cap = False
-            for cap in caps.values():
-                try:
-                    if float(cap) >= effective_min:
-                        meets_cap = True
-                        break
-                except Exception:
-                    continue
-            if not meets_cap:
-                return False
-
         return bankroll >= effective_min
 
     def _journal_termination(self, reason: str, snapshot: Dict[str, Any]) -> None:
@@ -1375,13 +1347,19 @@ class VanillaAdapter(EngineAdapter):
         if seed is not None:
             self.set_seed(seed)
 
+        t_roll = hotpath.start()
+        t0 = hotpath.start()
         pre_snapshot = self.snapshot_state()
+        hotpath.stop("adapter.snapshot", t0)
         early_stop = self._maybe_early_stop(pre_snapshot)
         if early_stop:
+            hotpath.stop("adapter.step_roll", t_roll)
             return early_stop
 
         trace_enabled = bool(getattr(self, "dsl_trace_enabled", False))
+        t0 = hotpath.start()
         actions, traces = self.maybe_eval_rules(pre_snapshot, trace_enabled)
+        hotpath.stop("adapter.rule_eval", t0)
 
         for act in actions:
             verb = act.get("verb", "")
@@ -1390,12 +1368,16 @@ class VanillaAdapter(EngineAdapter):
             )
             args = dict(act.get("args", {}))
             args.setdefault("_why", reason)
+            t0 = hotpath.start()
             self.apply_action(verb, args)
+            hotpath.stop("adapter.apply_action", t0)
 
+        t0 = hotpath.start()
         try:
             self.transport.step(dice, seed)
         except Exception:
             pass
+        hotpath.stop("adapter.transport_step", t0)
 
         def _emit_traces() -> None:
             if not (trace_enabled and traces):
@@ -1417,17 +1399,23 @@ class VanillaAdapter(EngineAdapter):
         total = int(d1) + int(d2)
 
         if self.live_engine:
+            t0 = hotpath.start()
             live_result = self._step_roll_live((int(d1), int(d2)), total)
+            hotpath.stop("adapter.live_roll", t0)
             if live_result is not None:
                 _emit_traces()
                 finalized = self._finalize_prop_cleanup(live_result)
                 self._rolls_completed += 1
+                hotpath.stop("adapter.step_roll", t_roll)
                 return finalized
 
+        t0 = hotpath.start()
         stub_result = self._step_roll_stub((int(d1), int(d2)), total)
+        hotpath.stop("adapter.stub_roll", t0)
         _emit_traces()
         finalized_stub = self._finalize_prop_cleanup(stub_result)
         self._rolls_completed += 1
+        hotpath.stop("adapter.step_roll", t_roll)
         return finalized_stub
 
     def _step_roll_live(self, dice: Tuple[int, int], total: int) -> Optional[Dict[str, Any]]:
@@ -3082,6 +3070,46 @@ class VanillaAdapter(EngineAdapter):
         }
         return effect
 
+    def checkpoint_state(self) -> Dict[str, Any]:
+        """Return the mutable stub-session state needed to resume mid-run.
+
+        Covers bets/odds/flat maps, counters, the dice RNG state and DSL rule
+        cooldowns. Live CrapsSim tables hold engine objects that cannot be
+        captured, so checkpointing is limited to the stub engine.
+        """
+
+        if self.live_engine:
+            raise RuntimeError("checkpointing is only supported for the stub engine")
+        fields = {
+            name: copy.deepcopy(getattr(self, name))
+            for name in _CHECKPOINT_FIELDS
+            if hasattr(self, name)
+        }
+        rule_state: Optional[Dict[str, Any]] = None
+        if self.rule_engine is not None:
+            rule_state = {
+                "rules": copy.deepcopy(self.rule_engine.state.rules),
+                "group_seq": self.rule_engine._group_seq,
+            }
+        return {
+            "fields": fields,
+            "rng": self._rng.getstate(),
+            "rule_engine": rule_state,
+            "explain_groups": set(_journal_mod._group_state.get("written") or ()),
+        }
+
+    def restore_checkpoint_state(self, state: Mapping[str, Any]) -> None:
+        """Inverse of :meth:`checkpoint_state`; call after :meth:`start_session`."""
+
+        for name, value in (state.get("fields") or {}).items():
+            setattr(self, name, copy.deepcopy(value))
+        self._rng.setstate(state["rng"])
+        rule_state = state.get("rule_engine")
+        if rule_state and self.rule_engine is not None:
+            self.rule_engine.state.rules = copy.deepcopy(rule_state["rules"])
+            self.rule_engine._group_seq = int(rule_state.get("group_seq", 0))
+        _journal_mod._group_state["written"] = set(state.get("explain_groups") or ())
+
     def snapshot_state(self) -> Dict[str, Any]:
         if self._session_started:
             try:
@@ -3584,6 +3612,9 @@ def _build_controller_strategy(spec: Dict[str, Any], strategy_base: type) -> Any
             self._spec = spec_dict
             self._armed = False
             self._last_point = None
+            # CrapsSim's own roll/settle phases, timed between the strategy hooks
+            self._t_roll = 0
+            self._t_settle = 0
 
         def _player_add_many(self, player, bets):
             bets = [b for b in bets if b is not None]
@@ -3635,29 +3666,43 @@ def _build_controller_strategy(spec: Dict[str, Any], strategy_base: type) -> Any
             return False
 
         def update_bets(self, player) -> None:
-            table = getattr(player, "table", None)
-            point = _point_value(table) if table is not None else None
-            comeout = point in (None, 0)
+            # the per-roll strategy hook is the adapter's share of a `run` roll
+            hotpath.stop("engine.settle", self._t_settle)
+            self._t_settle = 0
+            t0 = hotpath.start()
+            try:
+                table = getattr(player, "table", None)
+                point = _point_value(table) if table is not None else None
+                comeout = point in (None, 0)
 
-            if comeout or point != self._last_point:
-                self._armed = False
-                self._last_point = point
-                self._player_clear_bets(player)
+                if comeout or point != self._last_point:
+                    self._armed = False
+                    self._last_point = point
+                    self._player_clear_bets(player)
 
-            if comeout:
-                self._player_add_many(player, [_mk_pass(10)])
-                return
+                if comeout:
+                    self._player_add_many(player, [_mk_pass(10)])
+                    return
 
-            if not self._armed:
-                self._player_add_many(
-                    player,
-                    [
-                        _mk_place(6, 12),
-                        _mk_place(8, 12),
-                        _mk_field(5),
-                    ],
-                )
-                self._armed = True
+                if not self._armed:
+                    self._player_add_many(
+                        player,
+                        [
+                            _mk_place(6, 12),
+                            _mk_place(8, 12),
+                            _mk_field(5),
+                        ],
+                    )
+                    self._armed = True
+            finally:
+                hotpath.stop("adapter.update_bets", t0)
+                self._t_roll = hotpath.start()
+
+        def after_roll(self, player) -> None:
+            # dice are rolled, bets not yet settled
+            hotpath.stop("engine.roll", self._t_roll)
+            self._t_roll = 0
+            self._t_settle = hotpath.start()
 
         def completed(self, player) -> bool:  # pragma: no cover - interface shim
             return False
@@ -3865,11 +3910,6 @@ class CrapsSimAdapter(EngineAdapter):
     def start_session(self, spec: Dict[str, Any], seed: Optional[int] = None) -> None:
         if seed is None and isinstance(spec, dict):
             seed = spec.get("seed") or spec.get("run", {}).get("seed")
-        if seed is not None:
-            try:
-                random.seed(int(seed))
-            except Exception:
-                pass
         result = attach_engine(spec)
         self.table = result.table
         self.controller_player = result.controller_player
@@ -4069,6 +4109,8 @@ class CrapsSimAdapter(EngineAdapter):
         if table is None:
             return
         try:
+            if RngStreams(int(seed)).inject_dice(table):
+                return
             for meth in ("set_seed", "seed"):
                 fn = getattr(table, meth, None)
                 if callable(fn):
@@ -6,6 +6,7 @@ import math
 import re
 from types import MappingProxyType
 from typing import Any, Dict, Optional
+from . import hotpath
 
 # NOTE:
 # eval/exec used here are confined to sanitized inputs within internal sandbox context.
@@ -239,32 +240,36 @@ def evaluate(
       - 'variables' and 'event' appear as read-only mappings for documentation parity,
         but indexing/attribute access is blocked by design.
     """
-    ns = _build_namespace(state, event)
-
+    t_span = hotpath.start()
     try:
-        return _eval_expr(expr, ns)
-    except EvalError as err:
-        # If it's not a simple expression, allow a tiny subset of statements (assign/augassign)
+        ns = _build_namespace(state, event)
+
         try:
-            tree = ast.parse(expr, mode="exec")
-        except SyntaxError:
-            raise err
-
-        has_assignment = any(isinstance(n, (ast.Assign, ast.AugAssign)) for n in ast.walk(tree))
-        if not has_assignment:
-            raise err
-
-        _assert_allowed(tree, _ALLOWED_STMT_NODES)
-        code = compile(tree, "<safe-eval>", "exec")
-        exec(code, {"__builtins__": {}, **_SAFE_FUNCS}, ns)
-
-        # Propagate any new simple names back into state (best-effort)
-        state = state or {}
-        for k, v in ns.items():
-            if k in _SAFE_FUNCS or k in ("__builtins__", "variables", "event"):
-                continue
-            state[k] = v
-        return None
+            return _eval_expr(expr, ns)
+        except EvalError as err:
+            # If it's not a simple expression, allow a tiny subset of statements (assign/augassign)
+            try:
+                tree = ast.parse(expr, mode="exec")
+            except SyntaxError:
+                raise err
+
+            has_assignment = any(isinstance(n, (ast.Assign, ast.AugAssign)) for n in ast.walk(tree))
+            if not has_assignment:
+                raise err
+
+            _assert_allowed(tree, _ALLOWED_STMT_NODES)
+            code = compile(tree, "<safe-eval>", "exec")
+            exec(code, {"__builtins__": {}, **_SAFE_FUNCS}, ns)
+
+            # Propagate any new simple names back into state (best-effort)
+            state = state or {}
+            for k, v in ns.items():
+                if k in _SAFE_FUNCS or k in ("__builtins__", "variables", "event"):
+                    continue
+                state[k] = v
+            return None
+    finally:
+        hotpath.stop("eval.evaluate", t_span)
 
 
 def eval_num(
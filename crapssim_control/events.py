@@ -221,8 +221,32 @@ def canonicalize_event(ev: Optional[Dict[str, Any]]) -> Dict[str, Any]:
     }
 
 
+def event_for_roll(prev_point: Optional[int], result: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate an adapter ``step_roll`` result into a controller event."""
+
+    snapshot = result.get("snapshot") or {}
+    total = int(result.get("total") or 0)
+    point = snapshot.get("point_value")
+    if prev_point is None:
+        ev_type = POINT_ESTABLISHED if point else COMEOUT
+    elif total == 7:
+        ev_type = SEVEN_OUT
+    elif not point and total == prev_point:
+        # making the point turns it off
+        ev_type = POINT_MADE
+    else:
+        ev_type = ROLL
+    return {
+        "type": ev_type,
+        "roll": total,
+        "point": point,
+        "bankroll_after": snapshot.get("bankroll_after", snapshot.get("bankroll")),
+    }
+
+
 __all__ = [
     "derive_event",
+    "event_for_roll",
     "canonicalize_event",
     "COMEOUT",
     "POINT_ESTABLISHED",
@@ -1,10 +1,14 @@
 from typing import Any, Dict, Deque, Tuple, Iterable, Optional, Callable, List
 from collections import defaultdict, deque
+from contextlib import ExitStack
+from operator import itemgetter
+import heapq
+import itertools
+import json
 import threading
 import logging
 import time
 
-
 logger = logging.getLogger(__name__)
 
 
@@ -17,16 +21,21 @@ DEFAULT_LIMITS = {
 
 
 class RateLimiter:
+    """Token bucket on the monotonic clock (wall-clock jumps cannot refill or starve it)."""
+
+    __slots__ = ("tokens", "refill_seconds", "_available", "_last_refill")
+
     def __init__(self, tokens: int, refill_seconds: float) -> None:
         self.tokens = max(1, int(tokens))
         self.refill_seconds = float(refill_seconds)
         self._available = self.tokens
-        self._last_refill = time.time()
+        self._last_refill = time.monotonic()
 
     def allow(self) -> bool:
-        now = time.time()
-        if now - self._last_refill >= self.refill_seconds:
-            refill = int((now - self._last_refill) / self.refill_seconds)
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        if elapsed >= self.refill_seconds:
+            refill = int(elapsed / self.refill_seconds)
             if refill > 0:
                 self._available = min(self.tokens, self._available + refill)
                 self._last_refill = now
@@ -37,6 +46,8 @@ class RateLimiter:
 
 
 class CircuitBreaker:
+    __slots__ = ("max_rejects", "cool_down", "consecutive", "tripped_until")
+
     def __init__(self, max_rejects: int, cool_down: float) -> None:
         self.max_rejects = max(1, int(max_rejects))
         self.cool_down = float(cool_down)
@@ -52,12 +63,12 @@ class CircuitBreaker:
         else:
             self.consecutive += 1
             if self.consecutive >= self.max_rejects:
-                self.tripped_until = time.time() + self.cool_down
+                self.tripped_until = time.monotonic() + self.cool_down
                 return "trip"
         return None
 
     def allow(self) -> bool:
-        return time.time() >= self.tripped_until
+        return not self.tripped_until or time.monotonic() >= self.tripped_until
 
 
 REQUIRED_KEYS = {"run_id", "action", "args", "source", "correlation_id"}
@@ -71,21 +82,53 @@ ALLOWED_ACTIONS = {
 }
 
 
+def dedupe_key(source: str, action: str, args: Dict[str, Any]) -> Tuple[str, str, str]:
+    """Per-roll duplicate key ``(origin, action, canonical args)`` used by the controller."""
+
+    return (f"external:{source}", action, json.dumps(args, sort_keys=True, default=str))
+
+
+class _SourceLane:
+    """Per-source state: pending commands plus that source's limiter and breaker."""
+
+    __slots__ = ("lock", "pending", "limiter", "breaker")
+
+    def __init__(self, limiter: RateLimiter, breaker: CircuitBreaker) -> None:
+        self.lock = threading.Lock()
+        self.pending: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        self.limiter = limiter
+        self.breaker = breaker
+
+
 class CommandQueue:
+    """
+    Bounded intake for external commands.
+
+    Each source gets its own lane (lock, sub-queue, token bucket, circuit
+    breaker), so bursts from one source never wait on another's bookkeeping.
+    The shared lock only guards correlation-id dedupe, queue depth and stats.
+    Commands carry a global sequence number so :meth:`drain` returns them in
+    arrival order across sources. Rejection handlers run after locks are
+    released.
+    """
+
     def __init__(self, limits: Optional[Dict[str, Any]] = None):
         self.limits = self._merge_limits(limits)
-        self._q: Deque[Dict[str, Any]] = deque()
         self._seen: set[str] = set()
         self._lock = threading.Lock()
-        self._per_source_counts: Dict[str, int] = defaultdict(int)
-        self._rate_limiters: Dict[str, RateLimiter] = {}
-        self._circuit_breakers: Dict[str, CircuitBreaker] = {}
+        self._lanes: Dict[str, _SourceLane] = {}
+        self._depth = 0
+        self._seq = itertools.count()
         self.stats = {
             "enqueued": 0,
             "executed": 0,
             "rejected": defaultdict(int),
         }
         self._rejection_handlers: List[Callable[[Dict[str, Any]], None]] = []
+        self._queue_max = int(self.limits.get("queue_max_depth", DEFAULT_LIMITS["queue_max_depth"]))
+        self._per_source_max = int(
+            self.limits.get("per_source_quota", DEFAULT_LIMITS["per_source_quota"])
+        )
 
     @staticmethod
     def _merge_limits(limits: Optional[Dict[str, Any]]) -> Dict[str, Any]:
@@ -114,34 +157,42 @@ class CommandQueue:
                 result[key] = value
         return result
 
+    def _new_limiter(self) -> RateLimiter:
+        rate_cfg = self.limits.get("rate", {}) or {}
+        tokens = rate_cfg.get("tokens", DEFAULT_LIMITS["rate"]["tokens"])
+        refill_seconds = rate_cfg.get(
+            "refill_seconds",
+            DEFAULT_LIMITS["rate"]["refill_seconds"],
+        )
+        return RateLimiter(tokens, refill_seconds)
+
+    def _new_breaker(self) -> CircuitBreaker:
+        cb_cfg = self.limits.get("circuit_breaker", {}) or {}
+        max_rejects = cb_cfg.get(
+            "consecutive_rejects",
+            DEFAULT_LIMITS["circuit_breaker"]["consecutive_rejects"],
+        )
+        cool_down = cb_cfg.get(
+            "cool_down_seconds",
+            DEFAULT_LIMITS["circuit_breaker"]["cool_down_seconds"],
+        )
+        return CircuitBreaker(max_rejects, cool_down)
+
+    def _lane(self, source: str) -> _SourceLane:
+        lane = self._lanes.get(source)
+        if lane is None:
+            with self._lock:
+                lane = self._lanes.get(source)
+                if lane is None:
+                    lane = _SourceLane(self._new_limiter(), self._new_breaker())
+                    self._lanes[source] = lane
+        return lane
+
     def _get_limiter(self, source: str) -> RateLimiter:
-        limiter = self._rate_limiters.get(source)
-        if limiter is None:
-            rate_cfg = self.limits.get("rate", {}) or {}
-            tokens = rate_cfg.get("tokens", DEFAULT_LIMITS["rate"]["tokens"])
-            refill_seconds = rate_cfg.get(
-                "refill_seconds",
-                DEFAULT_LIMITS["rate"]["refill_seconds"],
-            )
-            limiter = RateLimiter(tokens, refill_seconds)
-            self._rate_limiters[source] = limiter
-        return limiter
+        return self._lane(source).limiter
 
     def _get_breaker(self, source: str) -> CircuitBreaker:
-        breaker = self._circuit_breakers.get(source)
-        if breaker is None:
-            cb_cfg = self.limits.get("circuit_breaker", {}) or {}
-            max_rejects = cb_cfg.get(
-                "consecutive_rejects",
-                DEFAULT_LIMITS["circuit_breaker"]["consecutive_rejects"],
-            )
-            cool_down = cb_cfg.get(
-                "cool_down_seconds",
-                DEFAULT_LIMITS["circuit_breaker"]["cool_down_seconds"],
-            )
-            breaker = CircuitBreaker(max_rejects, cool_down)
-            self._circuit_breakers[source] = breaker
-        return breaker
+        return self._lane(source).breaker
 
     def add_rejection_handler(self, handler: Callable[[Dict[str, Any]], None]) -> None:
         if handler not in self._rejection_handlers:
@@ -149,100 +200,174 @@ class CommandQueue:
 
     def _reject_locked(
         self,
+        lane: _SourceLane,
         source: str,
         reason: str,
+        rejections: List[Dict[str, Any]],
         *,
         update_breaker: bool = True,
         cmd: Optional[Dict[str, Any]] = None,
     ) -> Tuple[bool, str]:
+        # caller holds lane.lock
         if update_breaker:
-            breaker = self._get_breaker(source)
-            event = breaker.record(False)
+            event = lane.breaker.record(False)
             if event == "trip":
                 logger.warning("Command source '%s' tripped circuit breaker", source)
-        self.stats["rejected"][reason] += 1
-        payload = {
-            "source": source,
-            "reason": reason,
-            "command": cmd,
-        }
-        for handler in list(self._rejection_handlers):
-            try:
-                handler(payload)
-            except Exception:
-                logger.exception("Command rejection handler failed")
+        with self._lock:
+            self.stats["rejected"][reason] += 1
+        rejections.append({"source": source, "reason": reason, "command": cmd})
         return False, reason
 
-    def enqueue(self, cmd: Dict[str, Any]) -> Tuple[bool, str]:
-        with self._lock:
-            source_label = str(cmd.get("source", "external"))
-            cid = str(cmd.get("correlation_id", "")).strip()
-            if not cid:
-                return self._reject_locked(source_label, "missing:correlation_id", cmd=cmd)
+    def _notify_rejections(self, rejections: List[Dict[str, Any]]) -> None:
+        for payload in rejections:
+            for handler in list(self._rejection_handlers):
+                try:
+                    handler(payload)
+                except Exception:
+                    logger.exception("Command rejection handler failed")
 
-            missing = [k for k in REQUIRED_KEYS if k not in cmd]
-            if missing:
-                missing_key = str(sorted(missing)[0])
-                return self._reject_locked(source_label, f"missing:{missing_key}", cmd=cmd)
+    def _admit_locked(
+        self,
+        lane: _SourceLane,
+        source_label: str,
+        cmd: Dict[str, Any],
+        seq: int,
+        rejections: List[Dict[str, Any]],
+    ) -> Tuple[bool, str]:
+        # caller holds lane.lock
+        cid = str(cmd.get("correlation_id", "")).strip()
+        if not cid:
+            return self._reject_locked(
+                lane, source_label, "missing:correlation_id", rejections, cmd=cmd
+            )
 
-            action = cmd.get("action")
-            if action not in ALLOWED_ACTIONS:
-                return self._reject_locked(source_label, "unknown_action", cmd=cmd)
+        missing = [k for k in REQUIRED_KEYS if k not in cmd]
+        if missing:
+            missing_key = str(sorted(missing)[0])
+            return self._reject_locked(
+                lane, source_label, f"missing:{missing_key}", rejections, cmd=cmd
+            )
 
-            if cid in self._seen:
-                return self._reject_locked(source_label, "timing:duplicate_correlation_id", cmd=cmd)
+        action = cmd.get("action")
+        if action not in ALLOWED_ACTIONS:
+            return self._reject_locked(lane, source_label, "unknown_action", rejections, cmd=cmd)
 
-            replay_mode = bool(cmd.pop("_csc_replay", False))
+        # Lock-free pre-checks; both are re-verified when the command is committed.
+        if cid in self._seen:
+            return self._reject_locked(
+                lane, source_label, "timing:duplicate_correlation_id", rejections, cmd=cmd
+            )
 
-            if not replay_mode:
-                queue_max = int(
-                    self.limits.get("queue_max_depth", DEFAULT_LIMITS["queue_max_depth"])
-                )
-                if len(self._q) >= queue_max:
-                    return self._reject_locked(source_label, "queue_full", cmd=cmd)
+        replay_mode = bool(cmd.pop("_csc_replay", False))
 
-                per_source_max = int(
-                    self.limits.get("per_source_quota", DEFAULT_LIMITS["per_source_quota"])
+        if not replay_mode:
+            if self._depth >= self._queue_max:
+                return self._reject_locked(lane, source_label, "queue_full", rejections, cmd=cmd)
+            if len(lane.pending) >= self._per_source_max:
+                return self._reject_locked(
+                    lane, source_label, "per_source_quota", rejections, cmd=cmd
+                )
+            if not lane.limiter.allow():
+                return self._reject_locked(lane, source_label, "rate_limited", rejections, cmd=cmd)
+            if not lane.breaker.allow():
+                return self._reject_locked(
+                    lane,
+                    source_label,
+                    "circuit_breaker",
+                    rejections,
+                    update_breaker=False,
+                    cmd=cmd,
                 )
-                if self._per_source_counts[source_label] >= per_source_max:
-                    return self._reject_locked(source_label, "per_source_quota", cmd=cmd)
-
-                limiter = self._get_limiter(source_label)
-                if not limiter.allow():
-                    return self._reject_locked(source_label, "rate_limited", cmd=cmd)
-
-                breaker = self._get_breaker(source_label)
-                if not breaker.allow():
-                    return self._reject_locked(
-                        source_label,
-                        "circuit_breaker",
-                        update_breaker=False,
-                        cmd=cmd,
-                    )
+        # Replay injections bypass runtime rate/circuit enforcement but still
+        # participate in duplicate detection and queue stats.
+
+        raw_args = cmd.get("args", {}) or {}
+        payload = {
+            "run_id": str(cmd["run_id"]),
+            "action": str(action),
+            "args": raw_args,
+            "source": source_label,
+            "correlation_id": cid,
+            "dedupe_key": dedupe_key(
+                source_label, str(action), raw_args if isinstance(raw_args, dict) else {}
+            ),
+            "enqueued_at": time.time(),
+        }
+        reason = None
+        with self._lock:
+            if cid in self._seen:
+                reason = "timing:duplicate_correlation_id"
+            elif not replay_mode and self._depth >= self._queue_max:
+                reason = "queue_full"
             else:
-                # Replay injections bypass runtime rate/circuit enforcement but still
-                # participate in duplicate detection and queue stats.
-                breaker = self._get_breaker(source_label)
-
-            payload = {
-                "run_id": str(cmd["run_id"]),
-                "action": str(action),
-                "args": cmd.get("args", {}) or {},
-                "source": source_label,
-                "correlation_id": cid,
-            }
-            self._seen.add(cid)
-            self._q.append(payload)
-            self._per_source_counts[source_label] += 1
-            self.stats["enqueued"] += 1
-            return True, "accepted"
+                self._seen.add(cid)
+                self._depth += 1
+                self.stats["enqueued"] += 1
+        if reason is not None:
+            return self._reject_locked(lane, source_label, reason, rejections, cmd=cmd)
+        lane.pending.append((seq, payload))
+        return True, "accepted"
+
+    def enqueue(self, cmd: Dict[str, Any]) -> Tuple[bool, str]:
+        source_label = str(cmd.get("source", "external"))
+        lane = self._lane(source_label)
+        rejections: List[Dict[str, Any]] = []
+        with lane.lock:
+            result = self._admit_locked(lane, source_label, cmd, next(self._seq), rejections)
+        if rejections:
+            self._notify_rejections(rejections)
+        return result
+
+    def enqueue_many(self, cmds: Iterable[Dict[str, Any]]) -> List[Tuple[bool, str]]:
+        """
+        Admit a burst of commands, taking each source's lane lock once.
+
+        The burst holds the lane locks of all its sources (taken in name order)
+        while sequence numbers are drawn, as :meth:`enqueue` does for one lane,
+        so every lane stays sorted for :meth:`drain`'s merge and the burst
+        interleaves sources exactly as it was sent. Returns one ``(ok, reason)``
+        per command in input order.
+        """
+
+        items = list(cmds)
+        results: List[Tuple[bool, str]] = [(False, "")] * len(items)
+        admitted: List[Tuple[int, str, Dict[str, Any]]] = []
+        for idx, cmd in enumerate(items):
+            if not isinstance(cmd, dict):
+                results[idx] = (False, "missing:payload")
+                continue
+            admitted.append((idx, str(cmd.get("source", "external")), cmd))
+        lanes = {source_label: self._lane(source_label) for _, source_label, _ in admitted}
+        rejections: List[Dict[str, Any]] = []
+        with ExitStack() as stack:
+            for source_label in sorted(lanes):
+                stack.enter_context(lanes[source_label].lock)
+            for idx, source_label, cmd in admitted:
+                lane = lanes[source_label]
+                results[idx] = self._admit_locked(
+                    lane, source_label, cmd, next(self._seq), rejections
+                )
+        if rejections:
+            self._notify_rejections(rejections)
+        return results
 
     def drain(self) -> Iterable[Dict[str, Any]]:
+        batches = []
+        drained = 0
+        for lane in list(self._lanes.values()):
+            if not lane.pending:
+                continue
+            with lane.lock:
+                pending, lane.pending = lane.pending, deque()
+            drained += len(pending)
+            batches.append(pending)
+        if not drained:
+            return []
         with self._lock:
-            items = list(self._q)
-            self._q.clear()
-            self._per_source_counts = defaultdict(int)
-        return items
+            self._depth -= drained
+        if len(batches) == 1:
+            return [payload for _, payload in batches[0]]
+        return [payload for _, payload in heapq.merge(*batches, key=itemgetter(0))]
 
     def record_outcome(
         self,
@@ -252,17 +377,19 @@ class CommandQueue:
         rejection_reason: Optional[str] = None,
     ) -> Dict[str, Any]:
         reset = False
-        with self._lock:
-            breaker = self._get_breaker(source)
+        lane = self._lane(source)
+        with lane.lock:
             if executed:
-                event = breaker.record(True)
+                event = lane.breaker.record(True)
                 if event == "reset":
                     reset = True
-                self.stats["executed"] += 1
             else:
-                event = breaker.record(False)
+                event = lane.breaker.record(False)
                 if event == "trip":
                     logger.warning("Command source '%s' tripped circuit breaker", source)
-                if rejection_reason:
-                    self.stats["rejected"][rejection_reason] += 1
+        with self._lock:
+            if executed:
+                self.stats["executed"] += 1
+            elif rejection_reason:
+                self.stats["rejected"][rejection_reason] += 1
         return {"circuit_breaker_reset": reset}
@@ -1,16 +1,118 @@
-"""Command tape recorder for external command auditing and replay."""
+"""Command tape recorder for external command auditing and replay.
+
+The tape is an append-only JSONL data file plus a binary sidecar index
+(``<tape>.idx``). Each index record is ``(hand_id, roll_in_hand, journal_seq,
+offset, length)`` for one data line, so replay can walk commands in key order
+or jump to a hand by binary search and only decode the lines it needs.
+Tapes recorded without an index get one built (or extended) on first read.
+"""
 
 from __future__ import annotations
 
 import json
+import os
+import struct
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Any, Dict, Optional, Iterator
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+INDEX_SUFFIX = ".idx"
+INDEX_MAGIC = b"CSCTIDX1"
+_INDEX_RECORD = struct.Struct("<qqqQI")  # hand_id, roll_in_hand, journal_seq, offset, length
+_NO_POSITION = -1  # missing hand_id / roll_in_hand sort first (recorded before any hand)
+_NO_SEQ = (1 << 63) - 1  # rows without a journal_seq sort after their hand/roll peers
+
+
+def index_path(path: str | Path) -> Path:
+    return Path(str(path) + INDEX_SUFFIX)
+
+
+def _key_int(value: Any, missing: int) -> int:
+    if isinstance(value, bool):
+        return missing
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(float(value))
+        except ValueError:
+            return missing
+    return missing
+
+
+def _index_record(payload: Dict[str, Any], offset: int, length: int) -> bytes:
+    return _INDEX_RECORD.pack(
+        _key_int(payload.get("hand_id"), _NO_POSITION),
+        _key_int(payload.get("roll_in_hand"), _NO_POSITION),
+        _key_int(payload.get("journal_seq"), _NO_SEQ),
+        offset,
+        length,
+    )
 
 
 class CommandTape:
-    def __init__(self, path: str | Path) -> None:
+    """
+    Append-only tape writer.
+
+    Data and index files are opened once, on the first append, and kept open
+    behind buffered writers. Appends flush immediately unless they happen
+    inside :meth:`buffered`, which flushes once when the outermost block exits.
+    """
+
+    def __init__(self, path: str | Path, *, index: bool = True) -> None:
         self.path = str(path)
+        self.index = bool(index)
+        self._lock = threading.Lock()
+        self._data: Optional[BinaryIO] = None
+        self._idx: Optional[BinaryIO] = None
+        self._offset = 0
+        self._batch_depth = 0
+
+    def _open(self) -> None:
+        dest = Path(self.path)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if self.index:
+            # bring a missing or stale sidecar up to date before appending to it
+            ensure_index(dest)
+        self._data = dest.open("ab")
+        self._data.seek(0, os.SEEK_END)
+        self._offset = self._data.tell()
+        if self.index:
+            self._idx = index_path(dest).open("ab")
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """Defer flushing until the outermost block exits (one write per batch)."""
+
+        with self._lock:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if not self._batch_depth:
+                    self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._data is not None:
+            self._data.flush()
+        if self._idx is not None:
+            self._idx.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            for handle in (self._data, self._idx):
+                if handle is not None:
+                    handle.close()
+            self._data = self._idx = None
 
     def append(
         self,
@@ -45,10 +147,184 @@ class CommandTape:
         if seq is not None:
             payload["journal_seq"] = seq
 
-        dest = Path(self.path)
-        dest.parent.mkdir(parents=True, exist_ok=True)
-        with dest.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(payload) + "\n")
+        line = (json.dumps(payload) + "\n").encode("utf-8")
+        with self._lock:
+            if self._data is None:
+                self._open()
+            self._data.write(line)
+            if self._idx is not None:
+                self._idx.write(_index_record(payload, self._offset, len(line)))
+            self._offset += len(line)
+            if not self._batch_depth:
+                self._flush_locked()
+
+
+# ---------------------------------------------------------------------------
+# Index maintenance + reading
+# ---------------------------------------------------------------------------
+
+
+def _scan_lines(path: Path, start: int) -> bytes:
+    """Index records for every data line at or after byte ``start``."""
+
+    out = bytearray()
+    with path.open("rb") as fh:
+        fh.seek(start)
+        offset = start
+        for raw in fh:
+            length = len(raw)
+            if raw.endswith(b"\n"):
+                try:
+                    payload = json.loads(raw)
+                except ValueError:
+                    payload = None
+                if isinstance(payload, dict):
+                    out += _index_record(payload, offset, length)
+            offset += length
+    return bytes(out)
+
+
+def _indexed_end(idx: bytes) -> int:
+    """Byte offset just past the last data line covered by ``idx``."""
+
+    body = len(idx) - len(INDEX_MAGIC)
+    if body < _INDEX_RECORD.size:
+        return 0
+    last = len(INDEX_MAGIC) + (body // _INDEX_RECORD.size - 1) * _INDEX_RECORD.size
+    _, _, _, offset, length = _INDEX_RECORD.unpack_from(idx, last)
+    return offset + length
+
+
+def _valid_index(idx: bytes, data_size: int) -> bool:
+    if not idx.startswith(INDEX_MAGIC):
+        return False
+    if (len(idx) - len(INDEX_MAGIC)) % _INDEX_RECORD.size:
+        return False
+    return _indexed_end(idx) <= data_size
+
+
+def ensure_index(path: str | Path) -> Optional[bytes]:
+    """
+    Make ``<path>.idx`` cover every complete line of the tape.
+
+    A missing or inconsistent index is rebuilt; one that stops short (lines
+    appended by an older writer) is extended from its last covered line.
+    Returns the index bytes, or ``None`` when the tape does not exist. If the
+    sidecar cannot be written the index is still returned in memory.
+    """
+
+    data = Path(path)
+    if not data.exists():
+        return None
+    size = data.stat().st_size
+    side = index_path(data)
+    try:
+        idx = side.read_bytes()
+    except OSError:
+        idx = b""
+    if not _valid_index(idx, size):
+        idx = INDEX_MAGIC + _scan_lines(data, 0)
+        mode = "wb"
+        extra = idx
+    else:
+        extra = _scan_lines(data, _indexed_end(idx)) if _indexed_end(idx) < size else b""
+        mode = "ab"
+        idx += extra
+    if extra:
+        try:
+            with side.open(mode) as fh:
+                fh.write(extra)
+        except OSError:
+            pass
+    return idx
+
+
+class CommandTapeReader:
+    """
+    Streams tape records in ``(hand_id, roll_in_hand, journal_seq)`` order.
+
+    An index that is already in key order (the usual case) is walked in place
+    and :meth:`position_of_hand` binary-searches it; otherwise only the index
+    keys are sorted, never the JSON lines.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        idx = ensure_index(self.path)
+        self._index: Any = b"" if idx is None else idx
+        self._count = max(0, (len(self._index) - len(INDEX_MAGIC)) // _INDEX_RECORD.size)
+        self._order: Optional[List[int]] = None
+        if not self._in_key_order():
+            self._order = sorted(range(self._count), key=lambda i: (self._key(i), i))
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _unpack(self, i: int) -> Tuple[int, int, int, int, int]:
+        return _INDEX_RECORD.unpack_from(self._index, len(INDEX_MAGIC) + i * _INDEX_RECORD.size)
+
+    def _key(self, i: int) -> Tuple[int, int, int]:
+        return self._unpack(i)[:3]
+
+    def _in_key_order(self) -> bool:
+        prev: Optional[Tuple[int, int, int]] = None
+        for rec in _INDEX_RECORD.iter_unpack(self._index[len(INDEX_MAGIC) :]):
+            key = rec[:3]
+            if prev is not None and key < prev:
+                return False
+            prev = key
+        return True
+
+    def _record_at(self, position: int) -> Tuple[int, int, int, int, int]:
+        return self._unpack(self._order[position] if self._order is not None else position)
+
+    def position_of_hand(self, hand_id: int) -> int:
+        """First position (in key order) whose ``hand_id`` is ``>= hand_id``."""
+
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._record_at(mid)[0] < hand_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def entries(
+        self, *, from_hand: Optional[int] = None, start: int = 0
+    ) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Yield ``(position, record)`` in key order.
+
+        ``from_hand`` skips straight to the first command of that hand;
+        ``start`` skips that many positions (e.g. to resume a replay cursor).
+        """
+
+        pos = max(0, int(start))
+        if from_hand is not None:
+            pos = max(pos, self.position_of_hand(int(from_hand)))
+        if pos >= self._count:
+            return
+        with self.path.open("rb") as fh:
+            for position in range(pos, self._count):
+                _, _, _, offset, length = self._record_at(position)
+                if fh.tell() != offset:
+                    fh.seek(offset)
+                raw = fh.read(length)
+                try:
+                    data = json.loads(raw)
+                except ValueError:
+                    continue
+                if isinstance(data, dict):
+                    data.setdefault("args", {})
+                    data.setdefault("source", "replay")
+                    yield position, data
+
+    def iter_records(
+        self, *, from_hand: Optional[int] = None, start: int = 0
+    ) -> Iterator[Dict[str, Any]]:
+        for _, record in self.entries(from_hand=from_hand, start=start):
+            yield record
 
 
 TAPE_SCHEMA_VERSION = "1.0"
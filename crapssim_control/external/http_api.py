@@ -17,13 +17,13 @@ from urllib import request as urllib_request
 from pathlib import Path
 
 from .command_channel import CommandQueue, ALLOWED_ACTIONS
+from crapssim_control import hotpath
 from crapssim_control.engine_adapter import (
     PolicyRegistry,
     VerbRegistry,
     validate_effect_summary,
 )
 
-
 logger = logging.getLogger("CSC.HTTP")
 
 
@@ -93,6 +93,72 @@ def ingest_command(
     return 202, {"status": "queued"}
 
 
+def ingest_batch(
+    body: Any, queue: CommandQueue, active_run_id_supplier: Callable[[], str]
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Handle ``POST /commands:batch``.
+
+    ``body`` is either a list of commands or ``{"run_id", "source", "commands": [...]}``
+    whose top-level ``run_id``/``source`` fill in commands that omit them. The
+    whole burst is admitted with one :meth:`CommandQueue.enqueue_many` call.
+    Responds 202 when at least one command was queued, otherwise 400, with a
+    per-command ``results`` list in request order.
+    """
+
+    defaults: Dict[str, Any] = {}
+    if isinstance(body, dict):
+        commands = body.get("commands")
+        defaults = {k: body[k] for k in ("run_id", "source") if k in body}
+    else:
+        commands = body
+    if not isinstance(commands, list) or not commands:
+        return 400, {"status": "rejected", "reason": "missing:commands"}
+
+    active = active_run_id_supplier()
+    results: list = [None] * len(commands)
+    admitted: list = []
+    slots: list = []
+    for idx, raw in enumerate(commands):
+        if not isinstance(raw, dict):
+            results[idx] = {"status": "rejected", "reason": "missing:payload"}
+            continue
+        cmd = {**defaults, **raw} if defaults else raw
+        corr = cmd.get("correlation_id")
+        if not cmd.get("run_id") or cmd.get("run_id") != active:
+            results[idx] = {
+                "correlation_id": corr,
+                "status": "rejected",
+                "reason": "run_id_mismatch",
+            }
+        elif cmd.get("action") not in ALLOWED_ACTIONS:
+            results[idx] = {
+                "correlation_id": corr,
+                "status": "rejected",
+                "reason": "unknown_action",
+            }
+        else:
+            admitted.append(cmd)
+            slots.append(idx)
+
+    accepted = 0
+    for idx, cmd, (ok, reason) in zip(slots, admitted, queue.enqueue_many(admitted)):
+        corr = cmd.get("correlation_id")
+        if ok:
+            accepted += 1
+            results[idx] = {"correlation_id": corr, "status": "queued"}
+        else:
+            results[idx] = {"correlation_id": corr, "status": "rejected", "reason": reason}
+
+    payload = {
+        "status": "queued" if accepted else "rejected",
+        "accepted": accepted,
+        "rejected": len(commands) - accepted,
+        "results": results,
+    }
+    return (202 if accepted else 400), payload
+
+
 # Optional FastAPI surface (used if dependency exists)
 def register_diagnostics(
     app,
@@ -114,6 +180,10 @@ def register_diagnostics(
     def health(_request=None):
         return JSONResponse({"status": "ok"})
 
+    @app.get("/profile/hotpath")
+    def profile_hotpath(_request=None):
+        return JSONResponse(hotpath.summary())
+
     @app.get("/run_id")
     def run_id(_request=None):
         rid = active_run_id_supplier() or ""
@@ -190,6 +260,12 @@ def create_app(
         code, payload = ingest_command(body, queue, active_run_id_supplier)
         return JSONResponse(payload, status_code=code)
 
+    @app.post("/commands:batch")
+    async def post_commands_batch(req: Request):
+        body = await req.json()
+        code, payload = ingest_batch(body, queue, active_run_id_supplier)
+        return JSONResponse(payload, status_code=code)
+
     return app
 
 
@@ -204,9 +280,13 @@ def serve_commands(
     build_hash_supplier: Optional[Callable[[], str]] = None,
     tag_supplier: Optional[Callable[[], str]] = None,
 ):
-    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 
     class Handler(BaseHTTPRequestHandler):
+        def log_message(self, fmt: str, *args: Any) -> None:
+            # per-request stderr writes would dominate small-command latency
+            logger.debug("%s - %s", self.address_string(), fmt % args)
+
         def _write_json(self, code: int, payload: Dict[str, Any]) -> None:
             self.send_response(code)
             self.send_header("Content-Type", "application/json")
@@ -258,10 +338,17 @@ def serve_commands(
             if self.path == "/capabilities":
                 self._write_json(200, get_capabilities())
                 return
+            if self.path == "/profile/hotpath":
+                self._write_json(200, hotpath.summary())
+                return
             self._write_json(404, {"status": "not_found"})
 
         def do_POST(self):
-            if self.path != "/commands":
+            if self.path == "/commands":
+                ingest = ingest_command
+            elif self.path == "/commands:batch":
+                ingest = ingest_batch
+            else:
                 self._write_json(404, {"status": "not_found"})
                 return
             length = int(self.headers.get("Content-Length", "0"))
@@ -271,10 +358,12 @@ def serve_commands(
             except Exception:
                 self._write_json(400, {"status": "rejected", "reason": "missing:payload"})
                 return
-            code, payload = ingest_command(data, queue, active_run_id_supplier)
+            code, payload = ingest(data, queue, active_run_id_supplier)
             self._write_json(code, payload)
 
-    httpd = HTTPServer((host, port), Handler)
+    # one thread per connection so concurrent sources only contend on their own lane
+    httpd = ThreadingHTTPServer((host, port), Handler)
+    httpd.daemon_threads = True
     return httpd  # caller decides threading/lifecycle
 
 
@@ -0,0 +1,207 @@
+"""
+hotpath.py -- low-overhead span timing for the per-roll hot path.
+
+Spans are recorded into fixed-bucket latency histograms keyed by name. The
+module-level :data:`PROFILER` is disabled by default; every entry point checks
+a single boolean first so instrumented code pays only a call + attribute read
+when profiling is off. Per-roll code times itself with explicit
+:func:`start`/:func:`stop` pairs at the call site, so a disabled profiler adds
+no wrapper frame; :func:`timed` is a convenience for code off the hot path.
+
+Usage:
+    t0 = hotpath.start()
+    ...
+    hotpath.stop("adapter.rule_eval", t0)
+
+    with hotpath.span("adapter.snapshot"):
+        ...
+
+    @hotpath.timed("report.build")
+    def build_report(...): ...
+
+Enable with ``crapssim-ctl run --profile-hotpath`` (or ``run.profile_hotpath``
+in the spec). Summaries land under ``report.json["hotpath"]`` and are served by
+``GET /profile/hotpath`` on the command HTTP API.
+"""
+
+from __future__ import annotations
+
+import functools
+from bisect import bisect_left
+from contextlib import contextmanager
+from threading import Lock
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+HOTPATH_SCHEMA_VERSION = "1.0"
+
+# Upper bucket bounds in nanoseconds: 1-2-5 steps from 1µs to 10s, then overflow.
+BUCKET_BOUNDS_NS: tuple[int, ...] = tuple(
+    mult * scale
+    for scale in (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000, 1_000_000_000)
+    for mult in (1, 2, 5)
+) + (10_000_000_000,)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class SpanHistogram:
+    """Fixed-bucket latency histogram for one span name."""
+
+    __slots__ = ("counts", "count", "total_ns", "max_ns")
+
+    def __init__(self) -> None:
+        self.counts: List[int] = [0] * (len(BUCKET_BOUNDS_NS) + 1)
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def observe(self, elapsed_ns: int) -> None:
+        self.counts[bisect_left(BUCKET_BOUNDS_NS, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+
+    def percentile_ns(self, q: float) -> int:
+        """Upper bound of the bucket holding quantile ``q`` (capped at the observed max)."""
+
+        if self.count == 0:
+            return 0
+        rank = max(1, int(q * self.count + 0.999999))
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                if idx >= len(BUCKET_BOUNDS_NS):
+                    return self.max_ns
+                return min(BUCKET_BOUNDS_NS[idx], self.max_ns)
+        return self.max_ns
+
+    def summary(self) -> Dict[str, Any]:
+        mean = (self.total_ns / self.count) if self.count else 0.0
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_us": round(mean / 1e3, 3),
+            "p50_us": round(self.percentile_ns(0.50) / 1e3, 3),
+            "p99_us": round(self.percentile_ns(0.99) / 1e3, 3),
+            "max_us": round(self.max_ns / 1e3, 3),
+        }
+
+
+class HotPathProfiler:
+    """Collects span histograms; a no-op until :meth:`enable` is called."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._spans: Dict[str, SpanHistogram] = {}
+        self._lock = Lock()
+
+    def enable(self, enabled: bool = True) -> None:
+        self.enabled = bool(enabled)
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._spans = {}
+
+    def record(self, name: str, elapsed_ns: int) -> None:
+        hist = self._spans.get(name)
+        if hist is None:
+            with self._lock:
+                hist = self._spans.setdefault(name, SpanHistogram())
+        hist.observe(elapsed_ns)
+
+    def summary(self) -> Dict[str, Any]:
+        spans = {name: hist.summary() for name, hist in sorted(self._spans.items())}
+        return {
+            "schema_version": HOTPATH_SCHEMA_VERSION,
+            "enabled": self.enabled,
+            "spans": spans,
+        }
+
+
+PROFILER = HotPathProfiler()
+
+
+def enabled() -> bool:
+    return PROFILER.enabled
+
+
+def start() -> int:
+    """Return a start timestamp, or 0 when profiling is disabled."""
+
+    return perf_counter_ns() if PROFILER.enabled else 0
+
+
+def stop(name: str, t0: int) -> None:
+    """Record the span started at ``t0``; ignores the disabled sentinel 0."""
+
+    if t0:
+        PROFILER.record(name, perf_counter_ns() - t0)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    t0 = perf_counter_ns() if PROFILER.enabled else 0
+    try:
+        yield
+    finally:
+        if t0:
+            PROFILER.record(name, perf_counter_ns() - t0)
+
+
+def timed(name: str) -> Callable[[F], F]:
+    """
+    Decorator form of :func:`span` for whole functions/methods.
+
+    The wrapper checks the flag on every call and costs a frame even when the
+    profiler is off; per-roll code uses :func:`start`/:func:`stop` instead.
+    """
+
+    def deco(fn: F) -> F:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not PROFILER.enabled:
+                return fn(*args, **kwargs)
+            t0 = perf_counter_ns()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                PROFILER.record(name, perf_counter_ns() - t0)
+
+        return wrapper  # type: ignore[return-value]
+
+    return deco
+
+
+def configure_from_spec(spec: Optional[Dict[str, Any]]) -> bool:
+    """Enable the profiler when ``run.profile_hotpath`` is truthy; returns the new state."""
+
+    run_blk = (spec or {}).get("run") if isinstance(spec, dict) else None
+    if isinstance(run_blk, dict) and bool(run_blk.get("profile_hotpath", False)):
+        PROFILER.enable()
+    return PROFILER.enabled
+
+
+def summary() -> Dict[str, Any]:
+    return PROFILER.summary()
+
+
+__all__ = [
+    "BUCKET_BOUNDS_NS",
+    "HOTPATH_SCHEMA_VERSION",
+    "HotPathProfiler",
+    "PROFILER",
+    "SpanHistogram",
+    "configure_from_spec",
+    "enabled",
+    "span",
+    "start",
+    "stop",
+    "summary",
+    "timed",
+]
@@ -9,6 +9,10 @@ Config (table_cfg dict; all optional):
   - place_410_increment: int (default 5)  # increment for place 4/10 (some houses use 10)
   - max_odds_multiple: float (default 3.0)# cap odds at N x base line bet
 
+``table_cfg`` may also be a compiled ``table_policy.TablePolicy``; its merged
+config and place increments are then used as-is instead of being rebuilt, and
+odds are capped at its per-point multiple (``table_rules`` odds profile).
+
 Public:
   - legalize_amount(bet_type, raw_amount, table_cfg, point=None, base_line_bet=None)
   - cap_odds_amount(base_line_bet, raw_odds, max_multiple)
@@ -16,7 +20,7 @@ Public:
 
 from __future__ import annotations
 
-from typing import Dict, Tuple, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 _PLACE_INCREMENTS = {
     6: 6,
@@ -28,13 +32,19 @@ _PLACE_INCREMENTS = {
 }
 
 
-def _cfg(table_cfg: Optional[Dict]) -> Dict:
-    cfg = {
-        "bubble": False,
-        "level": 10,
-        "place_410_increment": 5,
-        "max_odds_multiple": 3.0,
-    }
+LEGALIZE_DEFAULTS: Dict[str, Any] = {
+    "bubble": False,
+    "level": 10,
+    "place_410_increment": 5,
+    "max_odds_multiple": 3.0,
+}
+
+
+def _cfg(table_cfg: Optional[Dict]) -> Mapping[str, Any]:
+    compiled = getattr(table_cfg, "legalize_cfg", None)
+    if compiled is not None:
+        return compiled
+    cfg = dict(LEGALIZE_DEFAULTS)
     if table_cfg:
         cfg.update(table_cfg)
     return cfg
@@ -75,7 +85,8 @@ def legalize_amount(
     Flags:
       - {"clamped": bool, "reason": str|None}
     """
-    cfg = _cfg(table_cfg or {})
+    cfg = _cfg(table_cfg)
+    place_steps = getattr(table_cfg, "place_steps", None)
     flags = {"clamped": False, "reason": None}
 
     bt = str(bet_type)
@@ -123,7 +134,9 @@ def legalize_amount(
             num = int(bt.split("_", 1)[1])
         except Exception:
             return 0, flags
-        if bubble:
+        if place_steps is not None:
+            step = place_steps.get(num, 1)
+        elif bubble:
             step = 1
         else:
             step_cfg = _PLACE_INCREMENTS.get(num)
@@ -148,12 +161,17 @@ def legalize_amount(
     # Odds: odds_{point}_pass or odds_{point}_dont
     if bt.startswith("odds_"):
         parts = bt.split("_")
+        odds_point = None
         if len(parts) >= 3:
             try:
-                odds_point = int(parts[1])  # noqa: F841 (reserved for future validation)
+                odds_point = int(parts[1])
             except Exception:
-                odds_point = None  # noqa: F841
-        max_mult = float(cfg.get("max_odds_multiple", 3.0))
+                odds_point = None
+        odds_multiple = getattr(table_cfg, "odds_multiple", None)
+        if callable(odds_multiple):
+            max_mult = float(odds_multiple(odds_point))
+        else:
+            max_mult = float(cfg.get("max_odds_multiple", 3.0))
         base = float(base_line_bet or 0.0)
         capped = cap_odds_amount(base, amt, max_mult)
         if capped < amt:
@@ -1,9 +1,11 @@
+import hashlib
 import importlib.util
+import os
 import sys
 import threading
 import time
 from dataclasses import dataclass
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from types import ModuleType
 import builtins
 from .registry import PluginSpec
@@ -16,12 +18,37 @@ class SandboxPolicy:
     deny_modules: List[str]
     init_timeout: float = 1.0
 
+    def cache_key(self) -> Tuple[Tuple[str, ...], Tuple[str, ...], float]:
+        return tuple(self.allowed_modules), tuple(self.deny_modules), float(self.init_timeout)
+
+
+# Per-process cache of validated capability modules, keyed by
+# (manifest path, module path, module sha256, sandbox policy). Runs share the
+# imported module but always get a fresh instance from ``instantiate``.
+_MODULE_CACHE: Dict[Tuple[object, ...], ModuleType] = {}
+_MODULE_CACHE_LOCK = threading.Lock()
+
+
+def clear_plugin_cache() -> None:
+    """Forget every cached plugin module (the next load imports again)."""
+    with _MODULE_CACHE_LOCK:
+        _MODULE_CACHE.clear()
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
 
 class PluginLoader:
     """Loads plugin modules with a lightweight sandbox."""
 
-    def __init__(self, policy: SandboxPolicy):
+    def __init__(self, policy: SandboxPolicy, *, use_cache: bool = True):
         self.policy = policy
+        self.use_cache = use_cache
 
     def _sandbox_builtins(self) -> dict:
         safe_builtins = {}
@@ -137,6 +164,9 @@ class PluginLoader:
     def load_capability(self, spec, kind: str, cap_name: str, version: str) -> types.ModuleType:
         """
         Load the module backing the specific capability from a PluginSpec.
+
+        With ``use_cache`` a module that imported cleanly under this policy is
+        reused while its file content is unchanged; failures are never cached.
         """
         # Find capability
         cap = None
@@ -152,6 +182,22 @@ class PluginLoader:
         # entry looks like "path/to/file.py:ClassName"
         entry = cap.entry
         mod_path, _, _ = entry.partition(":")
+        if not self.use_cache:
+            return self._import_capability(spec, mod_path)
+        digest = _file_digest(mod_path)
+        if digest is None:
+            return self._import_capability(spec, mod_path)
+        key = (spec.path, os.path.abspath(mod_path), digest, self.policy.cache_key())
+        with _MODULE_CACHE_LOCK:
+            cached = _MODULE_CACHE.get(key)
+        if cached is not None:
+            return cached
+        module = self._import_capability(spec, mod_path)
+        with _MODULE_CACHE_LOCK:
+            _MODULE_CACHE[key] = module
+        return module
+
+    def _import_capability(self, spec, mod_path: str) -> types.ModuleType:
         # Reuse sandboxed 'load' logic but load the path we want.
         # Clone of load() but using this entry path:
         plugin_name = spec.name.replace(".", "_")
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import os
 import re
+import threading
 from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Optional, Tuple
 
@@ -11,6 +12,30 @@ import yaml
 
 SEMVER_PATTERN = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:[-+].*)?$")
 
+# Per-process discovery cache: base path -> (stat stamps, parsed manifests in walk order).
+# The stamps cover every walked directory and manifest, so adding or removing a
+# plugin (directory mtime) or editing a manifest invalidates the entry.
+_Stamps = Tuple[Tuple[str, int], ...]
+_DISCOVERY_CACHE: Dict[str, Tuple[_Stamps, List["PluginSpec"]]] = {}
+_DISCOVERY_LOCK = threading.Lock()
+
+
+def clear_discovery_cache() -> None:
+    """Forget cached manifest scans (the next ``discover`` walks again)."""
+    with _DISCOVERY_LOCK:
+        _DISCOVERY_CACHE.clear()
+
+
+def _mtime_ns(path: str) -> int:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return -1
+
+
+def _stamps_current(stamps: _Stamps) -> bool:
+    return all(_mtime_ns(path) == mtime for path, mtime in stamps)
+
 
 @dataclass
 class Capability:
@@ -58,19 +83,37 @@ class PluginRegistry:
         for base in paths:
             if not base or not os.path.isdir(base):
                 continue
-            for root, _, files in os.walk(base):
-                if "plugin.yaml" not in files:
-                    continue
-                manifest_path = os.path.join(root, "plugin.yaml")
-                with open(manifest_path, "r", encoding="utf-8") as stream:
-                    data = yaml.safe_load(stream) or {}
-                spec = self._parse_manifest(data, manifest_path)
+            for spec in self._scan(base):
                 if self.validate(spec):
                     self.register(spec)
                     found.append(spec)
         found.sort(key=lambda s: (s.name, s.version))
         return found
 
+    def _scan(self, base: str) -> List[PluginSpec]:
+        """Parsed manifests under ``base`` in walk order, reused while unchanged."""
+
+        key = os.path.abspath(base)
+        with _DISCOVERY_LOCK:
+            cached = _DISCOVERY_CACHE.get(key)
+        if cached is not None and _stamps_current(cached[0]):
+            return cached[1]
+
+        stamps: List[Tuple[str, int]] = []
+        specs: List[PluginSpec] = []
+        for root, _, files in os.walk(base):
+            stamps.append((root, _mtime_ns(root)))
+            if "plugin.yaml" not in files:
+                continue
+            manifest_path = os.path.join(root, "plugin.yaml")
+            stamps.append((manifest_path, _mtime_ns(manifest_path)))
+            with open(manifest_path, "r", encoding="utf-8") as stream:
+                data = yaml.safe_load(stream) or {}
+            specs.append(self._parse_manifest(data, manifest_path))
+        with _DISCOVERY_LOCK:
+            _DISCOVERY_CACHE[key] = (tuple(stamps), specs)
+        return specs
+
     def _parse_manifest(self, data: Dict[str, object], path: str) -> PluginSpec:
         """Parse manifest dict into :class:`PluginSpec`."""
 
@@ -168,4 +211,4 @@ class PluginRegistry:
         return list(seen.values())
 
 
-__all__ = ["Capability", "PluginSpec", "PluginRegistry"]
+__all__ = ["Capability", "PluginSpec", "PluginRegistry", "clear_discovery_cache"]
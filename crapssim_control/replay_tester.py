@@ -3,40 +3,57 @@
 from __future__ import annotations
 
 import time
-from typing import List, Tuple
+from typing import Iterator, Tuple
 
 from crapssim_control.engine_adapter import VanillaAdapter
+from crapssim_control.testing.parity_stream import ParityResult, stream_parity
 
 
 def run_replay_parity(seed: int = 42, rolls: int = 200) -> bool:
+    """Replay a live run's dice in lockstep and compare full canonical snapshots.
+
+    Memory stays O(1): each roll's snapshot pair is compared and dropped. The
+    detailed result (first divergent roll, diff) is available via
+    :func:`run_replay_parity_report`.
+    """
+
+    return run_replay_parity_report(seed=seed, rolls=rolls).ok
+
+
+def run_replay_parity_report(seed: int = 42, rolls: int = 200) -> ParityResult:
     live = VanillaAdapter()
     live.start_session({"seed": seed})
-    dice_seq: List[Tuple[int, int]] = []
-    live_snapshots = []
-    for _ in range(rolls):
-        result = live.step_roll()
-        dice = result.get("dice", (0, 0))
-        if isinstance(dice, (tuple, list)):
+    replay = VanillaAdapter()
+    replay.start_session({"seed": seed})
+
+    def _live_dice() -> Iterator[Tuple[int, int]]:
+        for _ in range(rolls):
+            result = live.step_roll()
+            dice = result.get("dice", (0, 0))
             try:
-                die_a = int(dice[0])
-                die_b = int(dice[1])
+                yield int(dice[0]), int(dice[1])
             except Exception:
-                die_a, die_b = 0, 0
-        else:
-            die_a, die_b = 0, 0
-        dice_seq.append((die_a, die_b))
-        live_snapshots.append(live.snapshot_state())
+                yield 0, 0
 
-    replay = VanillaAdapter()
-    replay.start_session({"seed": seed})
-    replay_snaps = []
-    for dice in dice_seq:
-        replay.step_roll(dice=dice)
-        replay_snaps.append(replay.snapshot_state())
-
-    digest_live = sum(float(s.get("bankroll", 0)) for s in live_snapshots)
-    digest_replay = sum(float(s.get("bankroll", 0)) for s in replay_snaps)
-    return abs(digest_live - digest_replay) < 1e-6
+    # The live adapter is stepped by the dice generator; the "engine_a" side of
+    # the lockstep only reads its post-roll snapshot.
+    return stream_parity(
+        _SnapshotOnly(live),
+        replay,
+        _live_dice(),
+        snapshot=lambda engine, _result: engine.snapshot_state(),
+    )
+
+
+class _SnapshotOnly:
+    def __init__(self, adapter: VanillaAdapter) -> None:
+        self._adapter = adapter
+
+    def step_roll(self, dice: Tuple[int, int] | None = None) -> None:
+        return None
+
+    def snapshot_state(self):
+        return self._adapter.snapshot_state()
 
 
 def run_perf_test(rolls: int = 5000, seed: int = 42):
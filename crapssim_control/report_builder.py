@@ -4,6 +4,8 @@ from __future__ import annotations
 
 from typing import Any, Dict, Iterable, Optional
 
+from . import hotpath
+
 TRACE_SCHEMA_VERSION = "1.0"
 
 
@@ -31,6 +33,14 @@ def attach_trace_metadata(
     report["trace_schema_version"] = TRACE_SCHEMA_VERSION
 
 
+def attach_hotpath_metadata(report: Dict[str, Any]) -> None:
+    """Attach hot-path span latency summaries when profiling is enabled."""
+
+    if not hotpath.enabled():
+        return
+    report["hotpath"] = hotpath.summary()
+
+
 def attach_manifest_risk_overrides(
     manifest: Dict[str, Any],
     adapter: Optional[Any],
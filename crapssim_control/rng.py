@@ -0,0 +1,192 @@
+"""
+rng.py -- explicit, spawnable random streams for runs, sweep items and dice.
+
+A root seed becomes a NumPy ``SeedSequence``; every consumer gets its own
+stream spawned from it by a fixed key instead of sharing (or re-seeding)
+global ``random``/``numpy.random`` state:
+
+* ``RngStreams(seed).item(i)`` -- the stream for batch/sweep item ``i``.
+  Keys are positional, not draw-order based, so an item's seed is the same
+  whichever worker runs it and in whatever order.
+* ``RngStreams(seed).stream("sample")`` -- a named side stream, independent
+  of the dice (the sweep sampler draws its candidates from ``"sample"``).
+* ``RngStreams(seed).dice()`` -- the dice generator, injected into the table
+  with :meth:`RngStreams.bind_table`. For a root stream this is exactly
+  ``numpy.random.default_rng(seed)``, so seeded runs keep their dice.
+
+Without NumPy, child seeds are derived with SHA-256 and ``dice()`` returns
+``None`` (tables are then seeded through their own hooks).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import random
+import zlib
+from typing import Any, Optional, Tuple
+
+log = logging.getLogger("csc.rng")
+
+SEED_BITS = 31
+# Spawn-key namespaces, so item indices never collide with named streams.
+_ITEM = 0
+_STREAM = 1
+
+
+def draw_seed() -> int:
+    """A fresh root seed from OS entropy (recorded so the run can be replayed)."""
+
+    return random.SystemRandom().randrange(1 << SEED_BITS)
+
+
+class RngStreams:
+    """A root seed plus a spawn key; children are derived, never drawn."""
+
+    __slots__ = ("seed", "spawn_key")
+
+    def __init__(self, seed: Optional[int] = None, spawn_key: Tuple[int, ...] = ()) -> None:
+        self.seed = int(seed) if seed is not None else draw_seed()
+        self.spawn_key = tuple(int(k) for k in spawn_key)
+
+    def __repr__(self) -> str:
+        return f"RngStreams(seed={self.seed}, spawn_key={self.spawn_key})"
+
+    # -- derivation --------------------------------------------------------
+    def _child(self, *key: int) -> "RngStreams":
+        return RngStreams(self.seed, self.spawn_key + key)
+
+    def item(self, index: int) -> "RngStreams":
+        """Stream for batch/sweep item ``index`` (independent of scheduling)."""
+
+        return self._child(_ITEM, int(index))
+
+    def stream(self, name: str) -> "RngStreams":
+        """Named side stream, e.g. ``"sample"`` for sweep candidate draws."""
+
+        return self._child(_STREAM, zlib.crc32(name.encode("utf-8")))
+
+    def seed_sequence(self) -> Any:
+        import numpy as np  # type: ignore
+
+        return np.random.SeedSequence(self.seed, spawn_key=self.spawn_key)
+
+    def state(self, words: int = 4) -> Tuple[int, ...]:
+        """``words`` 32-bit words of this stream's seed material."""
+
+        try:
+            return tuple(int(w) for w in self.seed_sequence().generate_state(words))
+        except ImportError:
+            material = f"{self.seed}:{self.spawn_key}".encode("ascii")
+            digest = hashlib.sha256(material).digest()
+            return tuple(int.from_bytes(digest[4 * i : 4 * i + 4], "little") for i in range(words))
+
+    def int_seed(self) -> int:
+        """A plain integer seed for this stream (what run records store)."""
+
+        if not self.spawn_key:
+            return self.seed
+        return self.state(1)[0] & ((1 << SEED_BITS) - 1)
+
+    def item_seed(self, index: int) -> int:
+        return self.item(index).int_seed()
+
+    # -- generators ----------------------------------------------------------
+    def dice(self) -> Any:
+        """NumPy ``Generator`` for the dice, or ``None`` without NumPy."""
+
+        try:
+            import numpy as np  # type: ignore
+        except ImportError:
+            return None
+        return np.random.default_rng(self.seed_sequence())
+
+    def python_random(self) -> random.Random:
+        """A private ``random.Random`` on this stream (never the global one)."""
+
+        words = self.state(4)
+        return random.Random(sum(w << (32 * i) for i, w in enumerate(words)))
+
+    def inject_dice(self, table: Any) -> bool:
+        """Replace a CrapsSim ``table.dice.rng`` Generator with this stream's dice."""
+
+        dice = getattr(table, "dice", None)
+        if not hasattr(getattr(dice, "rng", None), "bit_generator"):
+            return False
+        gen = self.dice()
+        if gen is None:
+            return False
+        dice.rng = gen
+        return True
+
+    def bind_table(self, table: Any) -> bool:
+        """
+        Give ``table`` this stream's dice; returns False if no RNG was found.
+
+        CrapsSim tables get their ``dice.rng`` replaced outright; other
+        shapes go through their seeding hooks with :meth:`int_seed`.
+        """
+
+        return self.inject_dice(table) or seed_table_hooks(table, self.int_seed())
+
+
+def seed_table_hooks(table: Any, seed: int) -> bool:
+    """
+    Seed a table whose RNG is not a CrapsSim ``dice.rng`` through the hooks it exposes.
+    Handles:
+      • objects exposing .set_seed(...) or .seed(...)
+      • objects carrying a Python random.Random in .random / ._random
+      • objects carrying a NumPy Generator in .rng / ._rng (default_rng)
+      • 'dice' containers that themselves have an inner .rng / .random
+    Never raises; logs at DEBUG on best-effort failures.
+    """
+
+    def _try_seed_leaf(obj: Any) -> bool:
+        # Direct seeding hooks
+        try:
+            if callable(getattr(obj, "set_seed", None)):
+                obj.set_seed(seed)
+                return True
+            if callable(getattr(obj, "seed", None)):
+                obj.seed(seed)
+                return True
+        except Exception:
+            pass
+
+        # random.Random instances living on the object
+        for attr in ("random", "_random"):
+            r = getattr(obj, attr, None)
+            if isinstance(r, random.Random):
+                r.seed(seed)
+                return True
+
+        # NumPy Generator: replace with a freshly seeded one
+        for attr in ("rng", "_rng"):
+            g = getattr(obj, attr, None)
+            if g is not None and hasattr(g, "bit_generator"):
+                try:
+                    import numpy as np  # type: ignore
+
+                    setattr(obj, attr, np.random.default_rng(seed))
+                    return True
+                except Exception:
+                    pass
+        return False
+
+    # Common attachment points on the table, then on a game/engine member
+    holders = [table] + [
+        getattr(table, name, None) for name in ("game", "engine", "_engine", "_game")
+    ]
+    for holder in holders:
+        if holder is None:
+            continue
+        for attr in ("dice", "_dice", "rng", "_rng"):
+            obj = getattr(holder, attr, None)
+            if obj is not None and _try_seed_leaf(obj):
+                return True
+
+    log.debug("Could not locate dice/rng on table to seed")
+    return False
+
+
+__all__ = ["RngStreams", "draw_seed", "seed_table_hooks"]
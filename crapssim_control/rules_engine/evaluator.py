@@ -1,10 +1,21 @@
-"""Deterministic evaluator for whitelisted rule expressions."""
+"""
+Deterministic evaluator for whitelisted rule expressions.
+
+:func:`compile_ruleset` validates and compiles ``when``/``guard`` once into
+closures that read a fixed slot layout of :data:`SAFE_VARS`;
+:meth:`CompiledRuleset.evaluate` then costs one slot fill per call and only
+allocates records for rules that fired or errored. :func:`evaluate_rules`
+keeps the one-record-per-rule contract on top of the same compiled form.
+"""
 
 from __future__ import annotations
 
 import ast
 import operator
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .. import hotpath
 
 SAFE_OPS = {
     ast.Add: operator.add,
@@ -39,99 +50,236 @@ SAFE_VARS = {
 }
 
 
-def _eval_expr(expr: str, context: Dict[str, Any]) -> Any:
-    """Evaluate a simple expression safely using whitelisted names."""
+# ---------------------------------------------------------------------------
+# Compiled form
+# ---------------------------------------------------------------------------
 
-    safe_context = {k: context[k] for k in context if k in SAFE_VARS}
-
-    def _eval(node: ast.AST) -> Any:
-        if isinstance(node, ast.Constant):
-            return node.value
-        if isinstance(node, ast.Num):  # pragma: no cover - Py<3.8 compatibility
-            return node.n
-        if isinstance(node, ast.Name):
-            if node.id not in SAFE_VARS:
-                raise ValueError(f"Unknown var: {node.id}")
-            if node.id not in safe_context:
-                raise ValueError(f"Unknown var: {node.id}")
-            return safe_context[node.id]
-        if isinstance(node, ast.UnaryOp):
-            op = SAFE_OPS.get(type(node.op))
-            if op is None:
-                raise ValueError(f"Unsupported unary op: {ast.dump(node)}")
-            return op(_eval(node.operand))
-        if isinstance(node, ast.BinOp):
-            op = SAFE_OPS.get(type(node.op))
-            if op is None:
-                raise ValueError(f"Unsupported binary op: {ast.dump(node.op)}")
-            return op(_eval(node.left), _eval(node.right))
-        if isinstance(node, ast.BoolOp):
-            values = [_eval(v) for v in node.values]
-            if isinstance(node.op, ast.And):
-                return all(values)
-            if isinstance(node.op, ast.Or):
-                return any(values)
-            raise ValueError(f"Unsupported boolean op: {ast.dump(node.op)}")
-        if isinstance(node, ast.Subscript):
-            base = _eval(node.value)
-            if isinstance(node.slice, ast.Constant):
-                key = node.slice.value
-            elif hasattr(ast, "Index") and isinstance(node.slice, ast.Index):  # pragma: no cover
-                key = _eval(node.slice.value)
-            else:
-                raise ValueError(f"Unsupported subscript: {ast.dump(node.slice)}")
+SLOT_NAMES: Tuple[str, ...] = tuple(sorted(SAFE_VARS))
+SLOT_INDEX: Dict[str, int] = {name: i for i, name in enumerate(SLOT_NAMES)}
+
+_MISSING = object()
+
+Slots = Sequence[Any]
+Predicate = Callable[[Slots], Any]
+
+
+def fill_slots(context: Dict[str, Any]) -> List[Any]:
+    """Project ``context`` onto :data:`SLOT_NAMES`; absent or ``None`` values are missing."""
+
+    get = context.get
+    slots = [get(name) for name in SLOT_NAMES]
+    return [_MISSING if v is None else v for v in slots]
+
+
+def _compile_node(node: ast.AST) -> Predicate:
+    # Evaluation order matches the original tree-walking interpreter: BoolOp
+    # operands are all evaluated, Compare stops at the first false link.
+    if isinstance(node, ast.Constant):
+        value = node.value
+        return lambda slots: value
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name not in SAFE_VARS:
+            raise ValueError(f"Unknown var: {name}")
+        idx = SLOT_INDEX[name]
+
+        def _load(slots: Slots) -> Any:
+            value = slots[idx]
+            if value is _MISSING:
+                raise ValueError(f"Unknown var: {name}")
+            return value
+
+        return _load
+    if isinstance(node, ast.UnaryOp):
+        op = SAFE_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported unary op: {ast.dump(node)}")
+        operand = _compile_node(node.operand)
+        return lambda slots: op(operand(slots))
+    if isinstance(node, ast.BinOp):
+        op = SAFE_OPS.get(type(node.op))
+        if op is None:
+            raise ValueError(f"Unsupported binary op: {ast.dump(node.op)}")
+        left, right = _compile_node(node.left), _compile_node(node.right)
+        return lambda slots: op(left(slots), right(slots))
+    if isinstance(node, ast.BoolOp):
+        parts = tuple(_compile_node(v) for v in node.values)
+        if isinstance(node.op, ast.And):
+            return lambda slots: all([p(slots) for p in parts])
+        if isinstance(node.op, ast.Or):
+            return lambda slots: any([p(slots) for p in parts])
+        raise ValueError(f"Unsupported boolean op: {ast.dump(node.op)}")
+    if isinstance(node, ast.Subscript):
+        base_fn = _compile_node(node.value)
+        if isinstance(node.slice, ast.Constant):
+            key = node.slice.value
+        else:
+            raise ValueError(f"Unsupported subscript: {ast.dump(node.slice)}")
+
+        def _subscript(slots: Slots) -> Any:
+            base = base_fn(slots)
             if isinstance(base, (list, tuple)):
                 return base[int(key)]
             if isinstance(base, dict):
                 return base[key]
             raise ValueError("Subscript base must be list, tuple, or dict")
-        if isinstance(node, ast.Compare):
-            left = _eval(node.left)
-            for op_node, right_node in zip(node.ops, node.comparators):
-                op = SAFE_OPS.get(type(op_node))
-                if op is None:
-                    raise ValueError(f"Unsupported comparator: {ast.dump(op_node)}")
-                right = _eval(right_node)
+
+        return _subscript
+    if isinstance(node, ast.Compare):
+        first = _compile_node(node.left)
+        links = []
+        for op_node, right_node in zip(node.ops, node.comparators):
+            op = SAFE_OPS.get(type(op_node))
+            if op is None:
+                raise ValueError(f"Unsupported comparator: {ast.dump(op_node)}")
+            links.append((op, _compile_node(right_node)))
+        if len(links) == 1:
+            ((op, right),) = links
+            if isinstance(node.comparators[0], ast.Constant):
+                value = node.comparators[0].value
+                return lambda slots: op(first(slots), value)
+            return lambda slots: op(first(slots), right(slots))
+
+        def _chain(slots: Slots) -> bool:
+            left = first(slots)
+            for op, right_fn in links:
+                right = right_fn(slots)
                 if not op(left, right):
                     return False
                 left = right
             return True
-        raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
+        return _chain
+    raise ValueError(f"Unsupported expression: {ast.dump(node)}")
+
+
+@lru_cache(maxsize=4096)
+def compile_expr(expr: str) -> Predicate:
+    """
+    Parse and validate ``expr`` once; returns a closure over a slot list.
+
+    Raises ``ValueError`` for syntax errors, unknown names and unsupported
+    nodes. Results are cached per expression text, so macro-expanded rules
+    sharing a ``when`` share one closure.
+    """
 
     try:
         expr_ast = ast.parse(expr, mode="eval")
     except SyntaxError as exc:
         raise ValueError(str(exc)) from exc
+    return _compile_node(expr_ast.body)
 
-    return _eval(expr_ast.body)
-
-
-def evaluate_rules(rules: List[Dict[str, Any]], context: Dict[str, Any]) -> List[Dict[str, Any]]:
-    """Return list of rule evaluations with fired=True/False."""
 
-    results: List[Dict[str, Any]] = []
-    safe_context = {k: context[k] for k in context if k in SAFE_VARS and context[k] is not None}
+class CompiledRule:
+    __slots__ = ("rule_id", "rule", "enabled", "when", "guard", "error")
 
-    for rule in rules or []:
-        rule_id = rule.get("id")
-        if not rule.get("enabled", True):
-            results.append({"rule_id": rule_id, "fired": False, "reason": "disabled"})
-            continue
+    def __init__(self, rule: Dict[str, Any]) -> None:
+        self.rule = rule
+        self.rule_id = rule.get("id")
+        self.enabled = bool(rule.get("enabled", True))
+        self.when: Optional[Predicate] = None
+        self.guard: Optional[Predicate] = None
+        self.error: Optional[str] = None
+        if not self.enabled:
+            return
         try:
-            when_expr = str(rule.get("when", "False"))
-            when_val = bool(_eval_expr(when_expr, safe_context))
-            guard_val = True
+            self.when = compile_expr(str(rule.get("when", "False")))
             guard_expr = rule.get("guard")
             if guard_expr:
-                guard_val = bool(_eval_expr(str(guard_expr), safe_context))
-            fired = bool(when_val and guard_val)
-            results.append(
-                {
-                    "rule_id": rule_id,
-                    "fired": fired,
-                    "vars": {k: safe_context.get(k) for k in SAFE_VARS if k in safe_context},
-                }
+                self.guard = compile_expr(str(guard_expr))
+        except Exception as exc:  # noqa: BLE001 - reported on every evaluation, as before
+            self.error = str(exc)
+
+
+class CompiledRuleset:
+    """A validated, closure-compiled ruleset evaluated against one slot fill per call."""
+
+    __slots__ = ("rules", "by_id", "_active")
+
+    def __init__(self, rules: Sequence[Dict[str, Any]]) -> None:
+        self.rules: Tuple[CompiledRule, ...] = tuple(
+            CompiledRule(rule) for rule in rules or [] if isinstance(rule, dict)
+        )
+        self.by_id: Dict[str, Dict[str, Any]] = {
+            str(c.rule_id): c.rule for c in self.rules if c.rule_id is not None
+        }
+        self._active = tuple(c for c in self.rules if c.enabled)
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{c.rule_id}: {c.error}" for c in self.rules if c.error]
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def evaluate(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Records for the rules that fired or errored, in rule order."""
+
+        t_span = hotpath.start()
+        try:
+            slots = fill_slots(context)
+            out: List[Dict[str, Any]] = []
+            for c in self._active:
+                if c.error is not None:
+                    out.append({"rule_id": c.rule_id, "fired": False, "error": c.error})
+                    continue
+                try:
+                    fired = bool(c.when(slots))
+                    if c.guard is not None:
+                        fired = bool(c.guard(slots)) and fired
+                except Exception as exc:  # noqa: BLE001 - deterministic logging of errors
+                    out.append({"rule_id": c.rule_id, "fired": False, "error": str(exc)})
+                    continue
+                if fired:
+                    out.append({"rule_id": c.rule_id, "fired": True, "vars": _slot_vars(slots)})
+            return out
+        finally:
+            hotpath.stop("eval.internal_rules", t_span)
+
+    def evaluate_all(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """One record per rule (disabled, idle, fired or errored), in rule order."""
+
+        slots = fill_slots(context)
+        out: List[Dict[str, Any]] = []
+        for c in self.rules:
+            if not c.enabled:
+                out.append({"rule_id": c.rule_id, "fired": False, "reason": "disabled"})
+                continue
+            if c.error is not None:
+                out.append({"rule_id": c.rule_id, "fired": False, "error": c.error})
+                continue
+            try:
+                when_val = bool(c.when(slots))
+                guard_val = bool(c.guard(slots)) if c.guard is not None else True
+            except Exception as exc:  # noqa: BLE001 - deterministic logging of errors
+                out.append({"rule_id": c.rule_id, "fired": False, "error": str(exc)})
+                continue
+            out.append(
+                {"rule_id": c.rule_id, "fired": when_val and guard_val, "vars": _slot_vars(slots)}
             )
-        except Exception as exc:  # noqa: BLE001 - deterministic logging of errors
-            results.append({"rule_id": rule_id, "fired": False, "error": str(exc)})
-    return results
+        return out
+
+
+def _slot_vars(slots: Slots) -> Dict[str, Any]:
+    return {name: v for name, v in zip(SLOT_NAMES, slots) if v is not _MISSING}
+
+
+def _eval_expr(expr: str, context: Dict[str, Any]) -> Any:
+    """Evaluate a simple expression safely using whitelisted names."""
+
+    slots = [context.get(name, _MISSING) for name in SLOT_NAMES]
+    return compile_expr(expr)(slots)
+
+
+def compile_ruleset(rules: Sequence[Dict[str, Any]]) -> CompiledRuleset:
+    return CompiledRuleset(rules)
+
+
+def evaluate_rules(rules: List[Dict[str, Any]], context: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Return list of rule evaluations with fired=True/False."""
+
+    t_span = hotpath.start()
+    try:
+        return CompiledRuleset(rules).evaluate_all(context)
+    finally:
+        hotpath.stop("eval.internal_rules", t_span)
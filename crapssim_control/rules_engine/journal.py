@@ -1,15 +1,122 @@
 """
 Decision Journal & Safeties (v1)
 Records all rule/action events with cooldown and scope protections.
+
+The journal keeps live :class:`JournalMetrics` counters (lines, DSL traces,
+external commands executed/rejected) as it appends, and persists them
+atomically to ``<journal>.metrics.json`` so reports never rescan the file.
 """
 
 import json
+import os
+import threading
 import time
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
+from crapssim_control import hotpath
 from crapssim_control.engine_adapter import validate_effect_summary
 
+METRICS_SUFFIX = ".metrics.json"
+METRICS_PERSIST_EVERY = 1024
+
+
+def metrics_path(journal_path: Any) -> str:
+    """Sidecar holding the persisted :class:`JournalMetrics` of ``journal_path``."""
+
+    return f"{journal_path}{METRICS_SUFFIX}"
+
+
+@dataclass(slots=True)
+class JournalMetrics:
+    """
+    Run counters over a journal file, valid for its first ``journal_bytes`` bytes.
+
+    Counters only describe the file when ``journal_bytes`` equals its size;
+    anything else (foreign writers, a crash between append and persist) is
+    resolved by :meth:`scan`.
+    """
+
+    path: str = ""
+    journal_bytes: int = 0
+    journal_lines: int = 0
+    dsl_traces: int = 0
+    external_executed: int = 0
+    external_rejected: int = 0
+    valid: bool = True
+
+    def observe(self, entry: Dict[str, Any], nbytes: int) -> None:
+        self.journal_bytes += nbytes
+        self.journal_lines += 1
+        self._classify(entry)
+
+    def _classify(self, entry: Dict[str, Any]) -> None:
+        if entry.get("type") == "dsl_trace":
+            self.dsl_traces += 1
+        if str(entry.get("origin") or "").startswith("external:"):
+            if entry.get("executed"):
+                self.external_executed += 1
+            else:
+                self.external_rejected += 1
+
+    def describes(self, path: Any) -> bool:
+        """True when these counters cover the whole current file at ``path``."""
+
+        if not self.valid or self.path != str(path):
+            return False
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        return size == self.journal_bytes
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Atomically write the counters to the journal's sidecar (fail-open)."""
+
+        target = path or metrics_path(self.path)
+        tmp = f"{target}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(asdict(self), f, sort_keys=True)
+            os.replace(tmp, target)
+        except OSError:
+            pass
+
+    @classmethod
+    def load(cls, journal_path: Any) -> Optional["JournalMetrics"]:
+        try:
+            with open(metrics_path(journal_path), "r", encoding="utf-8") as f:
+                data = json.load(f)
+            known = {f.name for f in fields(cls)}
+            metrics = cls(**{k: v for k, v in data.items() if k in known})
+        except (OSError, ValueError, TypeError):
+            return None
+        metrics.path = str(journal_path)
+        return metrics
+
+    @classmethod
+    def scan(cls, journal_path: Any) -> "JournalMetrics":
+        """Recovery path: stream the journal once and count it from scratch."""
+
+        metrics = cls(path=str(journal_path))
+        try:
+            with open(journal_path, "rb") as f:
+                for raw in f:
+                    metrics.journal_bytes += len(raw)
+                    if not raw.strip():
+                        continue
+                    metrics.journal_lines += 1
+                    try:
+                        entry = json.loads(raw)
+                    except ValueError:
+                        continue
+                    if isinstance(entry, dict):
+                        metrics._classify(entry)
+        except OSError:
+            pass
+        return metrics
+
 
 @dataclass
 class JournalWriter:
@@ -57,6 +164,11 @@ class DecisionJournal:
         self.scope_flags = set()
         self._seq = 0
         self.entries: List[Dict[str, Any]] = []
+        # buffered(): pending lines and the thread that owns them
+        self._buffer: Optional[List[str]] = None
+        self._buffer_owner: Optional[int] = None
+        # live counters for self.path; (re)synced on the first record after a path change
+        self.metrics: Optional[JournalMetrics] = None
 
     # --- SAFETIES ------------------------------------------------------------
 
@@ -91,46 +203,134 @@ class DecisionJournal:
         controller: Optional[Any] = None,
     ) -> Dict[str, Any]:
         """Append a decision record as JSON."""
-        normalized = dict(entry or {})
-        self._seq += 1
-        normalized["seq"] = self._seq
-        if timestamp is None:
-            timestamp = normalized.get("timestamp")
-        if timestamp is None:
-            timestamp = time.time()
-        normalized["timestamp"] = float(timestamp)
-        if controller and hasattr(controller, "adapter"):
-            adapter = getattr(controller, "adapter", None)
-            effect = getattr(adapter, "last_effect", None)
-            if effect and "effect_summary" not in normalized:
-                validate_effect_summary(effect, schema="1.0")
-                normalized["effect_summary"] = effect
-        origin = normalized.get("origin")
-        normalized["origin"] = str(origin) if origin is not None else "unknown"
-        action = normalized.get("action")
-        normalized["action"] = str(action) if action is not None else "unknown"
-        args = normalized.get("args")
-        if isinstance(args, dict):
-            normalized["args"] = args
-        else:
-            normalized["args"] = {}
-        executed = normalized.get("executed")
-        normalized["executed"] = bool(executed)
-        if "rejection_reason" not in normalized or normalized["rejection_reason"] is None:
-            normalized["rejection_reason"] = None
-        else:
-            normalized["rejection_reason"] = str(normalized["rejection_reason"])
-        if "correlation_id" in normalized:
-            corr = normalized["correlation_id"]
-            normalized["correlation_id"] = str(corr) if corr is not None else None
-        else:
-            normalized["correlation_id"] = None
-        with open(self.path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(normalized) + "\n")
-        if "effect_summary" not in normalized:
-            normalized["effect_summary"] = None
-        self.entries.append(normalized)
-        return normalized
+        t_span = hotpath.start()
+        try:
+            normalized = dict(entry or {})
+            self._seq += 1
+            normalized["seq"] = self._seq
+            if timestamp is None:
+                timestamp = normalized.get("timestamp")
+            if timestamp is None:
+                timestamp = time.time()
+            normalized["timestamp"] = float(timestamp)
+            if controller and hasattr(controller, "adapter"):
+                adapter = getattr(controller, "adapter", None)
+                effect = getattr(adapter, "last_effect", None)
+                if effect and "effect_summary" not in normalized:
+                    validate_effect_summary(effect, schema="1.0")
+                    normalized["effect_summary"] = effect
+            origin = normalized.get("origin")
+            normalized["origin"] = str(origin) if origin is not None else "unknown"
+            action = normalized.get("action")
+            normalized["action"] = str(action) if action is not None else "unknown"
+            args = normalized.get("args")
+            if isinstance(args, dict):
+                normalized["args"] = args
+            else:
+                normalized["args"] = {}
+            executed = normalized.get("executed")
+            normalized["executed"] = bool(executed)
+            if "rejection_reason" not in normalized or normalized["rejection_reason"] is None:
+                normalized["rejection_reason"] = None
+            else:
+                normalized["rejection_reason"] = str(normalized["rejection_reason"])
+            if "correlation_id" in normalized:
+                corr = normalized["correlation_id"]
+                normalized["correlation_id"] = str(corr) if corr is not None else None
+            else:
+                normalized["correlation_id"] = None
+            line = json.dumps(normalized) + "\n"
+            metrics = self.metrics
+            if metrics is None or metrics.path != str(self.path):
+                metrics = self._sync_metrics()
+            buffering = self._buffer is not None and self._buffer_owner == threading.get_ident()
+            if buffering:
+                self._buffer.append(line)
+            else:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            # json.dumps escapes non-ASCII, so characters == bytes
+            metrics.observe(normalized, len(line))
+            if (
+                not buffering
+                and metrics.valid
+                and metrics.journal_lines % METRICS_PERSIST_EVERY == 0
+            ):
+                metrics.save()
+            if "effect_summary" not in normalized:
+                normalized["effect_summary"] = None
+            self.entries.append(normalized)
+            return normalized
+        finally:
+            hotpath.stop("journal.decision_record", t_span)
+
+    @contextmanager
+    def buffered(self) -> Iterator[None]:
+        """
+        Collect this thread's records and append them in a single write on exit.
+
+        Records from other threads (e.g. HTTP rejection handlers) keep writing
+        straight through. Nested calls join the outer buffer.
+        """
+        if self._buffer is not None:
+            yield
+            return
+        self._buffer, self._buffer_owner = [], threading.get_ident()
+        try:
+            yield
+        finally:
+            lines, self._buffer, self._buffer_owner = self._buffer, None, None
+            if lines:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(lines))
+
+    # --- RUN METRICS ---------------------------------------------------------
+
+    def _sync_metrics(self) -> JournalMetrics:
+        """Start counters for ``self.path``, continuing persisted ones when they still match."""
+        path = str(self.path)
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            size = 0
+        metrics = JournalMetrics(path=path)
+        if size:
+            saved = JournalMetrics.load(path)
+            if saved is not None and saved.valid and saved.journal_bytes == size:
+                metrics = saved
+            else:
+                # pre-existing content we have not counted; report_metrics() recovers
+                metrics.valid = False
+        self.metrics = metrics
+        return metrics
+
+    def report_metrics(self) -> JournalMetrics:
+        """
+        Counters describing the whole journal file, persisted to its sidecar.
+
+        Uses the live counters (or the persisted ones) when they match the
+        file's size and falls back to :meth:`recount_metrics` otherwise.
+        """
+        path = str(self.path)
+        metrics = self.metrics
+        if metrics is None or not metrics.describes(path):
+            saved = JournalMetrics.load(path)
+            if saved is not None and saved.describes(path):
+                metrics = saved
+            else:
+                return self.recount_metrics()
+        self.metrics = metrics
+        if os.path.exists(path):
+            metrics.save()
+        return metrics
+
+    def recount_metrics(self) -> JournalMetrics:
+        """Explicit recovery: rebuild the counters with one streaming pass over the file."""
+        metrics = JournalMetrics.scan(self.path)
+        self.metrics = metrics
+        if os.path.exists(metrics.path):
+            metrics.save()
+        return metrics
 
     def writer(self, base_fields: Optional[Dict[str, Any]] = None) -> JournalWriter:
         return JournalWriter(self, base_fields=base_fields)
@@ -0,0 +1,101 @@
+"""
+artifacts.py -- artifact profiles shared by cli.run, run_single, batch and sweep.
+
+``full`` keeps every per-run file (journals, traces, report, bundle zip),
+``standard`` keeps the per-run summary/manifest/report without the heavy
+journals and bundles, and ``metrics-only`` writes no per-run directory at all:
+each run appends one compact record to a shared :data:`RUN_METRICS_NAME`
+file. Every record carries the seed and rolls, so a run's full artifacts can
+be regenerated by re-running its spec with ``artifacts="full"``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, Mapping, Optional
+
+ARTIFACT_LEVELS = ("full", "standard", "metrics-only")
+RUN_METRICS_NAME = "run_metrics.jsonl"
+
+_APPEND_LOCK = threading.Lock()
+
+
+def normalize_artifact_level(value: Any, default: str = "full") -> str:
+    """Validated artifact level; ``None``/empty means ``default``."""
+
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return default
+    level = str(value).strip().lower().replace("_", "-")
+    if level not in ARTIFACT_LEVELS:
+        raise ValueError(f"artifacts must be one of {ARTIFACT_LEVELS}, got {value!r}")
+    return level
+
+
+def artifact_level_from_spec(spec: Any, default: str = "full") -> str:
+    """``run.artifacts`` of ``spec``; unknown values fall back to ``default``."""
+
+    run_blk = spec.get("run") if isinstance(spec, dict) else None
+    raw = run_blk.get("artifacts") if isinstance(run_blk, dict) else None
+    try:
+        return normalize_artifact_level(raw, default)
+    except ValueError:
+        return default
+
+
+def append_run_metrics(path: str | Path, record: Mapping[str, Any]) -> Path:
+    """
+    Append ``record`` as one compact JSON line to the shared metrics file.
+
+    Each record is written with a single ``write`` under a process-wide lock,
+    so concurrent runs in one process never interleave lines.
+    """
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+    with _APPEND_LOCK:
+        with open(target, "a", encoding="utf-8") as handle:
+            handle.write(line + "\n")
+    return target
+
+
+def iter_run_metrics(path: str | Path) -> Iterator[Dict[str, Any]]:
+    """Records of a shared metrics file; unreadable lines are skipped."""
+
+    if not os.path.isfile(path):
+        return
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                yield record
+
+
+def find_run_metrics(path: str | Path, run_id: str) -> Optional[Dict[str, Any]]:
+    """The last record for ``run_id`` (re-runs append, the newest wins)."""
+
+    found = None
+    for record in iter_run_metrics(path):
+        if record.get("run_id") == run_id:
+            found = record
+    return found
+
+
+__all__ = [
+    "ARTIFACT_LEVELS",
+    "RUN_METRICS_NAME",
+    "append_run_metrics",
+    "artifact_level_from_spec",
+    "find_run_metrics",
+    "iter_run_metrics",
+    "normalize_artifact_level",
+]
@@ -0,0 +1,1433 @@
+"""
+batched.py -- many independent stub sessions of one spec, advanced as arrays.
+
+Bankroll-ruin studies need thousands of sessions of the same spec. Driving
+each one through its own ``VanillaAdapter`` + ``ControlStrategy`` repeats the
+same Python dispatch per session per roll. :class:`BatchedSessions` keeps S
+sessions as NumPy arrays instead (cash, point, hand/roll counters, bet
+amounts per bet, mode index, variables) and advances all of them one roll at
+a time:
+
+* point and payout bookkeeping is vectorized over the sessions;
+* spec rules, setvars and mode templates are compiled once into masked array
+  expressions with the controller's semantics: the same event typing, eval
+  namespace, switch/setvar ordering, template diff and per-bet action merge;
+* sessions drop out when they bust or can no longer bet
+  (``run.stop_on_bankrupt`` / ``run.stop_on_unactionable``).
+
+The stub engine pays nothing, so bets are settled with a small shared model:
+pass/don't pass, field and place 4-10 at standard odds, place bets off on
+the come-out. Bet changes from one event are applied together and increases
+are skipped when the cash cannot cover them. :func:`run_scalar_session` is
+the reference. It drives the real ``ControlStrategy`` one event at a time
+with the same model, and the batched engine is checked against it.
+
+Specs outside the supported subset (odds and other bet types, rules on events
+the stub never emits, DSL, plugins, brain, risk-cap or external-command features,
+assignment expressions, undeclared setvar targets) are rejected by :func:`compile_spec` with ``ValueError``.
+
+    result = BatchedSessions(spec, sessions=10_000, seed=7).run(rolls=500)
+    result.summary()["ruined"], result.session(0)
+"""
+
+from __future__ import annotations
+
+import ast
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..actions import (
+    ACTION_CLEAR,
+    ACTION_PRESS,
+    ACTION_REDUCE,
+    ACTION_SET,
+    ACTION_SETVAR,
+    ACTION_SWITCH_MODE,
+    ALLOWED_ACTIONS,
+)
+from ..config import get_stop_options
+from ..eval import _ALLOWED_EXPR_NODES, EvalError, _assert_allowed
+from ..events import COMEOUT, POINT_ESTABLISHED, POINT_MADE, ROLL, SEVEN_OUT, event_for_roll
+from ..rng import RngStreams
+from ..rules_engine import _parse_step_string
+from ..table_policy import DEFAULT_TABLE_POLICY, compile_table_policy
+
+DEFAULT_BANKROLL = 1000.0
+
+BET_KINDS: Tuple[str, ...] = (
+    "pass_line",
+    "dont_pass",
+    "field",
+    "place_4",
+    "place_5",
+    "place_6",
+    "place_8",
+    "place_9",
+    "place_10",
+)
+_BET_INDEX = {name: i for i, name in enumerate(BET_KINDS)}
+_PASS, _DONT, _FIELD = 0, 1, 2
+_BOX = (4, 5, 6, 8, 9, 10)
+# Place payouts as (numerator, denominator) of the winnings per unit staked.
+_PLACE_PAYS = {4: (9, 5), 5: (7, 5), 6: (7, 6), 8: (7, 6), 9: (7, 5), 10: (9, 5)}
+_FIELD_PAYS = {2: 2, 12: 2, 3: 1, 4: 1, 9: 1, 10: 1, 11: 1}
+
+# The same model as lookup tables indexed by the dice total (0..12).
+_TOTALS = np.arange(13)
+_IS_BOX = np.isin(_TOTALS, _BOX)
+_PASS_COMEOUT_WIN = np.isin(_TOTALS, (7, 11))
+_PASS_COMEOUT_LOSE = np.isin(_TOTALS, (2, 3, 12))
+_DONT_COMEOUT_WIN = np.isin(_TOTALS, (2, 3))
+_DONT_COMEOUT_LOSE = _PASS_COMEOUT_WIN
+_FIELD_MULT = np.array([_FIELD_PAYS.get(t, 0) for t in range(13)], dtype=np.float64)
+_PLACE_ROW = np.array([3 + _BOX.index(t) if t in _BOX else -1 for t in range(13)], dtype=np.intp)
+_PLACE_NUM = np.array([_PLACE_PAYS.get(t, (0, 1))[0] for t in range(13)], dtype=np.float64)
+_PLACE_DEN = np.array([_PLACE_PAYS.get(t, (0, 1))[1] for t in range(13)], dtype=np.float64)
+
+_EVENT_TYPES = (COMEOUT, POINT_ESTABLISHED, ROLL, SEVEN_OUT, POINT_MADE)
+_EV_COMEOUT, _EV_POINT, _EV_ROLL, _EV_SEVEN, _EV_MADE = range(len(_EVENT_TYPES))
+
+STOP_BANKRUPT = "bankroll_exhausted"
+STOP_UNACTIONABLE = "unactionable_bankroll"
+_STOP_REASONS = ("", STOP_BANKRUPT, STOP_UNACTIONABLE)
+
+# Names the controller state or the event always override in the eval namespace.
+_SHADOWED = frozenset(
+    ("point", "rolls_since_point", "on_comeout", "mode", "type", "event", "roll")
+    + ("natural", "craps", "point_on", "bankroll_after", "variables")
+)
+
+_UNSUPPORTED_SPEC_KEYS = ("internal_brain", "use_plugins")
+_UNSUPPORTED_RUN_KEYS = ("dsl", "demo_fallbacks", "risk", "external")
+
+
+# ----------------------------------------------------------------------------
+# Shared payout model (scalar form; BatchedSessions._settle is the array form)
+# ----------------------------------------------------------------------------
+
+
+def settle_bets(bets: Dict[str, float], cash: float, point: Optional[int], total: int) -> float:
+    """Resolve ``bets`` (mutated) for one roll at table ``point``; returns the new cash."""
+
+    a = bets.get("pass_line", 0.0)
+    if a:
+        if point is None:
+            if total in (7, 11):
+                cash += a * 2
+            if total in (2, 3, 7, 11, 12):
+                bets.pop("pass_line")
+        elif total in (point, 7):
+            if total == point:
+                cash += a * 2
+            bets.pop("pass_line")
+
+    a = bets.get("dont_pass", 0.0)
+    if a:
+        if point is None:
+            if total in (2, 3):
+                cash += a * 2
+            if total in (2, 3, 7, 11):
+                bets.pop("dont_pass")
+        elif total in (point, 7):
+            if total == 7:
+                cash += a * 2
+            bets.pop("dont_pass")
+
+    a = bets.pop("field", 0.0)
+    if a and total in _FIELD_PAYS:
+        cash += a + a * _FIELD_PAYS[total]
+
+    if point is not None:
+        for number in _BOX:
+            name = f"place_{number}"
+            a = bets.get(name, 0.0)
+            if not a:
+                continue
+            if total == number:
+                num, den = _PLACE_PAYS[number]
+                cash += a * num / den
+            elif total == 7:
+                bets.pop(name)
+    return cash
+
+
+def apply_bet_changes(
+    bets: Dict[str, float], cash: float, new: Dict[str, float]
+) -> Tuple[Dict[str, float], float]:
+    """
+    Apply one event's target amounts at once.
+
+    When the added stakes exceed ``cash`` only the decreases are applied.
+    """
+
+    def _delta(target: Dict[str, float]) -> float:
+        total = 0.0
+        for name in BET_KINDS:
+            total = total + (target.get(name, 0.0) - bets.get(name, 0.0))
+        return total
+
+    target = dict(bets)
+    target.update({name: (amt if amt > 0 else 0.0) for name, amt in new.items()})
+    total = _delta(target)
+    if total > cash:
+        target = {name: min(amt, bets.get(name, 0.0)) for name, amt in target.items()}
+        total = _delta(target)
+    return {k: v for k, v in target.items() if v > 0}, cash - total
+
+
+def _targets_from_actions(
+    bets: Dict[str, float], actions: Sequence[Dict[str, Any]]
+) -> Dict[str, float]:
+    """Target amount per bet from merged controller actions (one per bet)."""
+
+    new: Dict[str, float] = {}
+    for act in actions:
+        verb = str(act.get("action") or "").lower()
+        name = act.get("bet_type")
+        if name not in _BET_INDEX:
+            continue
+        cur = bets.get(name, 0.0)
+        amount = act.get("amount")
+        if verb == ACTION_CLEAR:
+            new[name] = 0.0
+        elif amount is None:
+            continue
+        elif verb == ACTION_SET:
+            new[name] = float(amount)
+        elif verb == ACTION_PRESS:
+            new[name] = cur + float(amount)
+        elif verb == ACTION_REDUCE:
+            new[name] = cur - float(amount)
+    return new
+
+
+def _stop_reason(
+    bets: Dict[str, float], cash: float, point_on: bool, stops: Dict[str, Any], min_bet: Any
+) -> str:
+    if any(v > 0 for v in bets.values()):
+        return ""
+    if stops["stop_on_bankrupt"] and cash <= 0.01:
+        return STOP_BANKRUPT
+    if stops["stop_on_unactionable"] and cash < min_bet(point_on=point_on):
+        return STOP_UNACTIONABLE
+    return ""
+
+
+def run_scalar_session(
+    spec: Dict[str, Any], dice: Sequence[Sequence[int]], *, bankroll: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Reference session: the real ``ControlStrategy`` on stub point bookkeeping.
+
+    ``dice`` is one ``(d1, d2)`` pair per roll. The result has the same shape
+    as :meth:`BatchedResult.session`.
+    """
+
+    from ..controller import ControlStrategy
+
+    compiled = compile_spec(spec)
+    policy = compiled.policy
+    stops = compiled.stops
+    # The reference never serves diagnostics; runs share the default port otherwise.
+    run_cfg = dict(spec.get("run") or {})
+    run_cfg["http_commands"] = {"enabled": False}
+    ctrl = ControlStrategy({**spec, "run": run_cfg})
+    cash = float(compiled.bankroll if bankroll is None else bankroll)
+    bets: Dict[str, float] = {}
+    point: Optional[int] = None
+    hand_id = 0
+    reason = ""
+    played = 0
+    for d1, d2 in dice:
+        total = int(d1) + int(d2)
+        played += 1
+        cash = settle_bets(bets, cash, point, total)
+        prev_point = point
+        if point is None:
+            if total in _BOX:
+                point = total
+        elif total in (point, 7):
+            point = None
+            hand_id += 1
+        result = {"total": total, "snapshot": {"point_value": point, "bankroll_after": cash}}
+        event = event_for_roll(prev_point, result)
+        current = {name: {"amount": amt} for name, amt in bets.items()}
+        actions = ctrl.handle_event(event, current)
+        bets, cash = apply_bet_changes(bets, cash, _targets_from_actions(bets, actions))
+        reason = _stop_reason(bets, cash, point is not None, stops, policy.min_bet)
+        if reason:
+            break
+
+    variables = dict(spec.get("variables") or {})
+    variables.update(ctrl.memory)
+    return {
+        "bankroll": cash,
+        "bets": {name: bets[name] for name in BET_KINDS if name in bets},
+        "point": point or 0,
+        "hands": hand_id,
+        "rolls": played,
+        "mode": ctrl.mode,
+        "variables": {name: variables.get(name) for name in compiled.var_names},
+        "stop_reason": reason,
+    }
+
+
+# ----------------------------------------------------------------------------
+# Expression compiler: eval.py expressions -> masked array functions
+# ----------------------------------------------------------------------------
+
+_NUM, _CAT, _ERR = "num", "cat", "err"
+_TRUE_STRS = {"1", "true", "yes", "y", "on", "t"}
+_FALSE_STRS = {"0", "false", "no", "n", "off", "f"}
+
+# A compiled expression maps an env (name -> value) to ``(value, err)``.
+# Values are float64 arrays/scalars (``NaN`` standing in for ``None``), bool
+# arrays, or ``_Cat`` string codes; ``err`` is ``False`` or a bool mask of
+# sessions where the scalar evaluator would have raised ``EvalError``.
+Fn = Callable[[Dict[str, Any]], Tuple[Any, Any]]
+
+
+class _Cat:
+    """String-valued operand (mode, event type, string constants) as vocabulary codes."""
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes: Any) -> None:
+        self.codes = codes
+
+
+class _Strings:
+    """Spec-wide string vocabulary; codes index the truthiness tables."""
+
+    def __init__(self) -> None:
+        self.names: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self.py_truth = np.zeros(0, dtype=bool)
+        self.bool_truth = np.zeros(0, dtype=bool)
+
+    def code(self, name: str) -> int:
+        if name not in self._codes:
+            self._codes[name] = len(self.names)
+            self.names.append(name)
+        return self._codes[name]
+
+    def freeze(self) -> None:
+        def _eval_bool(s: str) -> bool:
+            s = s.strip().lower()
+            return s in _TRUE_STRS or (s not in _FALSE_STRS and bool(s))
+
+        # Code -1 (no value) indexes the trailing False.
+        self.py_truth = np.array([bool(s) for s in self.names] + [False])
+        self.bool_truth = np.array([_eval_bool(s) for s in self.names] + [False])
+
+
+def _any(*errs: Any) -> Any:
+    out: Any = False
+    for e in errs:
+        if e is False:
+            continue
+        out = e if out is False else (out | e)
+    return out
+
+
+def _isnan(v: Any) -> Any:
+    dtype = getattr(v, "dtype", None)
+    if dtype is not None and dtype.kind == "f":
+        return np.isnan(v)
+    return False
+
+
+def _isinf(v: Any) -> Any:
+    dtype = getattr(v, "dtype", None)
+    if dtype is not None and dtype.kind == "f":
+        return np.isinf(v)
+    return False
+
+
+def _f(v: Any) -> Any:
+    """Numeric view of a num value (numpy refuses arithmetic on bools)."""
+
+    dtype = getattr(v, "dtype", None)
+    if dtype is not None and dtype.kind == "b":
+        return np.asarray(v, dtype=np.float64)
+    return v
+
+
+def _codes(v: Any) -> Any:
+    return v.codes if isinstance(v, _Cat) else -1
+
+
+class _Compiler:
+    """Compile eval.py expressions against a static name -> kind map."""
+
+    def __init__(self, strings: _Strings, kinds: Dict[str, str]) -> None:
+        self.strings = strings
+        self.kinds = kinds
+
+    # -- entry points ------------------------------------------------------
+    def expr(self, src: Any) -> Tuple[Fn, str]:
+        if isinstance(src, (bool, int, float)):
+            return self._const(float(src))
+        text = str(src)
+        try:
+            tree = ast.parse(text, mode="eval")
+            _assert_allowed(tree, _ALLOWED_EXPR_NODES)
+        except (SyntaxError, EvalError):
+            try:
+                stmt = ast.parse(text, mode="exec")
+            except SyntaxError:
+                return self._error()
+            if any(isinstance(n, (ast.Assign, ast.AugAssign)) for n in ast.walk(stmt)):
+                raise ValueError(f"assignment expressions are not supported: {text!r}")
+            return self._error()
+        return self._node(tree.body)
+
+    # -- leaves ------------------------------------------------------------
+    @staticmethod
+    def _error() -> Tuple[Fn, str]:
+        return (lambda env: (np.float64(0.0), True)), _ERR
+
+    def _const(self, value: Any) -> Tuple[Fn, str]:
+        if isinstance(value, str):
+            cat = _Cat(self.strings.code(value))
+            return (lambda env: (cat, False)), _CAT
+        if value is None:
+            num = np.float64(np.nan)
+        elif isinstance(value, (bool, int, float)):
+            num = np.float64(value)
+        else:
+            raise ValueError(f"unsupported constant {value!r}")
+        return (lambda env: (num, False)), _NUM
+
+    def _name(self, name: str) -> Tuple[Fn, str]:
+        kind = self.kinds.get(name)
+        if kind is None:
+            return self._error()
+
+        def fn(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            return env[name], False
+
+        return fn, kind
+
+    # -- nodes -------------------------------------------------------------
+    def _node(self, node: ast.AST) -> Tuple[Fn, str]:
+        if isinstance(node, ast.Constant):
+            return self._const(node.value)
+        if isinstance(node, ast.Name):
+            return self._name(node.id)
+        if isinstance(node, ast.UnaryOp):
+            return self._unary(node)
+        if isinstance(node, ast.BinOp):
+            return self._binop(node)
+        if isinstance(node, ast.Compare):
+            return self._compare(node)
+        if isinstance(node, ast.BoolOp):
+            return self._boolop(node)
+        if isinstance(node, ast.IfExp):
+            return self._ifexp(node)
+        if isinstance(node, ast.Call):
+            return self._call(node)
+        raise ValueError(f"unsupported expression: {ast.unparse(node)!r}")
+
+    def truthy(self, value: Any, kind: str, *, eval_bool: bool = False) -> Any:
+        if kind == _CAT:
+            table = self.strings.bool_truth if eval_bool else self.strings.py_truth
+            return table[value.codes]
+        value = _f(value)
+        return (value != 0) & ~_isnan(value)
+
+    def _unify(self, *kinds: str) -> str:
+        real = {k for k in kinds if k != _ERR}
+        if len(real) > 1:
+            raise ValueError("expressions mixing strings and numbers are not supported")
+        return real.pop() if real else _ERR
+
+    @staticmethod
+    def _pick(mask: Any, a: Any, b: Any, kind: str) -> Any:
+        if kind == _CAT:
+            return _Cat(np.where(mask, _codes(a), _codes(b)))
+        return np.where(mask, _f(a), _f(b))
+
+    def _unary(self, node: ast.UnaryOp) -> Tuple[Fn, str]:
+        inner, kind = self._node(node.operand)
+        if isinstance(node.op, ast.Not):
+
+            def fn_not(env: Dict[str, Any]) -> Tuple[Any, Any]:
+                v, e = inner(env)
+                return ~np.asarray(self.truthy(v, kind)), e
+
+            return fn_not, _NUM
+        if kind == _CAT:
+            raise ValueError("unary operators on strings are not supported")
+        neg = isinstance(node.op, ast.USub)
+
+        def fn(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            v, e = inner(env)
+            v = _f(v)
+            return (-v if neg else +v), _any(e, _isnan(v))
+
+        return fn, _NUM
+
+    def _binop(self, node: ast.BinOp) -> Tuple[Fn, str]:
+        left, lk = self._node(node.left)
+        right, rk = self._node(node.right)
+        if _CAT in (lk, rk):
+            raise ValueError("arithmetic on strings is not supported")
+        op = type(node.op)
+        if op not in (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow):
+            raise ValueError(f"unsupported operator {op.__name__}")
+
+        def fn(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            a, ea = left(env)
+            b, eb = right(env)
+            a, b = _f(a), _f(b)
+            err = _any(ea, eb, _isnan(a), _isnan(b))
+            if op is ast.Add:
+                return a + b, err
+            if op is ast.Sub:
+                return a - b, err
+            if op is ast.Mult:
+                return a * b, err
+            if op is ast.Pow:
+                out = np.power(np.float64(a) if np.isscalar(a) else a, b)
+                bad = (a == 0) & (b < 0)
+                finite = np.isfinite(a) & np.isfinite(b)
+                return out, _any(err, bad, finite & ~np.isfinite(out))
+            err = _any(err, b == 0)
+            if op is ast.Div:
+                return a / b, err
+            if op is ast.FloorDiv:
+                return np.floor_divide(a, b), err
+            return np.mod(a, b), err
+
+        return fn, _NUM
+
+    def _cmp(self, op: ast.cmpop, a: Any, ak: str, b: Any, bk: str) -> Tuple[Any, Any]:
+        """One comparison; returns ``(bool mask, err)``."""
+
+        if isinstance(op, (ast.Eq, ast.NotEq)):
+            if ak == _CAT and bk == _CAT:
+                eq = a.codes == b.codes
+            elif _CAT in (ak, bk):
+                eq = np.False_
+            else:
+                a, b = _f(a), _f(b)
+                eq = (a == b) | (_isnan(a) & _isnan(b))
+            return (eq if isinstance(op, ast.Eq) else ~eq), False
+        if _CAT in (ak, bk):
+            if ak == bk:
+                raise ValueError("ordering comparisons on strings are not supported")
+            return np.False_, True
+        a, b = _f(a), _f(b)
+        err = _any(_isnan(a), _isnan(b))
+        if isinstance(op, ast.Lt):
+            return a < b, err
+        if isinstance(op, ast.LtE):
+            return a <= b, err
+        if isinstance(op, ast.Gt):
+            return a > b, err
+        return a >= b, err
+
+    def _compare(self, node: ast.Compare) -> Tuple[Fn, str]:
+        left = self._node(node.left)
+        steps: List[Tuple[ast.cmpop, Any]] = []
+        for op, comp in zip(node.ops, node.comparators):
+            if isinstance(op, (ast.In, ast.NotIn)):
+                if not isinstance(comp, ast.Tuple):
+                    raise ValueError("'in' is only supported with tuple literals")
+                steps.append((op, [self._node(elt) for elt in comp.elts]))
+            elif isinstance(op, (ast.Is, ast.IsNot)):
+                raise ValueError("'is' comparisons are not supported")
+            else:
+                steps.append((op, self._node(comp)))
+
+        def fn(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            a, err = left[0](env)
+            ak = left[1]
+            result: Any = np.True_
+            live: Any = ~np.asarray(err) if err is not False else np.True_
+            for op, operand in steps:
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    hit: Any = np.False_
+                    step_err: Any = False
+                    for elt_fn, elt_kind in operand:
+                        v, e = elt_fn(env)
+                        eq, _ = self._cmp(ast.Eq(), a, ak, v, elt_kind)
+                        hit = hit | eq
+                        step_err = _any(step_err, e)
+                    c = hit if isinstance(op, ast.In) else ~hit
+                    b, bk = a, ak
+                else:
+                    b, step_err = operand[0](env)
+                    bk = operand[1]
+                    c, ce = self._cmp(op, a, ak, b, bk)
+                    step_err = _any(step_err, ce)
+                if step_err is not False:
+                    err = _any(err, live & step_err)
+                    live = live & ~step_err
+                result = result & c
+                live = live & c
+                a, ak = b, bk
+            return result, err
+
+        return fn, _NUM
+
+    def _boolop(self, node: ast.BoolOp) -> Tuple[Fn, str]:
+        parts = [self._node(v) for v in node.values]
+        kind = self._unify(*(k for _, k in parts))
+        is_and = isinstance(node.op, ast.And)
+
+        def fn(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            value, err = parts[0][0](env)
+            value_kind = parts[0][1]
+            for part_fn, part_kind in parts[1:]:
+                t = self.truthy(value, value_kind) if value_kind != _ERR else np.False_
+                go_on = t if is_and else ~np.asarray(t)
+                nxt, e = part_fn(env)
+                if e is not False:
+                    ok = ~np.asarray(err) if err is not False else np.True_
+                    err = _any(err, go_on & ok & e)
+                value = self._pick(go_on, nxt, value, kind)
+                value_kind = kind
+            return value, err
+
+        return fn, kind
+
+    def _ifexp(self, node: ast.IfExp) -> Tuple[Fn, str]:
+        test, tk = self._node(node.test)
+        body, bk = self._node(node.body)
+        orelse, ok = self._node(node.orelse)
+        kind = self._unify(bk, ok)
+
+        def fn(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            t, et = test(env)
+            mask = self.truthy(t, tk) if tk != _ERR else np.False_
+            b, eb = body(env)
+            o, eo = orelse(env)
+            branch_err = np.where(mask, eb, eo) if (eb is not False or eo is not False) else False
+            return self._pick(mask, b, o, kind), _any(et, branch_err)
+
+        return fn, kind
+
+    def _call(self, node: ast.Call) -> Tuple[Fn, str]:
+        name = node.func.id  # _assert_allowed guarantees a whitelisted Name
+        if node.keywords:
+            raise ValueError(f"keyword arguments to {name}() are not supported")
+        args = [self._node(a) for a in node.args]
+        if any(k == _CAT for _, k in args):
+            raise ValueError(f"string arguments to {name}() are not supported")
+        n = len(args)
+        if name in ("min", "max"):
+            if n < 2:
+                return self._error()
+            reduce = np.minimum if name == "min" else np.maximum
+
+            def fn_minmax(env: Dict[str, Any]) -> Tuple[Any, Any]:
+                vals, errs = zip(*(a(env) for a, _ in args))
+                vals = [_f(v) for v in vals]
+                out = vals[0]
+                for v in vals[1:]:
+                    out = reduce(out, v)
+                return out, _any(*errs, *(_isnan(v) for v in vals))
+
+            return fn_minmax, _NUM
+        if name == "round":
+            if n == 2 and not isinstance(node.args[1], ast.Constant):
+                raise ValueError("round() digits must be a constant")
+            if n not in (1, 2):
+                return self._error()
+            digits = int(node.args[1].value) if n == 2 else 0
+
+            def fn_round(env: Dict[str, Any]) -> Tuple[Any, Any]:
+                v, e = args[0][0](env)
+                v = _f(v)
+                err = _any(e, _isnan(v), _isinf(v) if n == 1 else False)
+                return np.round(v, digits), err
+
+            return fn_round, _NUM
+        if name == "log" and n == 2:
+
+            def fn_logb(env: Dict[str, Any]) -> Tuple[Any, Any]:
+                x, ex = args[0][0](env)
+                b, eb = args[1][0](env)
+                x, b = _f(x), _f(b)
+                bad = _any(_isnan(x), _isnan(b), x <= 0, b <= 0, b == 1)
+                return np.log(x) / np.log(b), _any(ex, eb, bad)
+
+            return fn_logb, _NUM
+        if n != 1:
+            return self._error()
+        arg = args[0][0]
+        ops: Dict[str, Tuple[Callable[[Any], Any], Callable[[Any], Any]]] = {
+            "abs": (np.abs, _isnan),
+            "int": (np.trunc, lambda v: _any(_isnan(v), _isinf(v))),
+            "float": (lambda v: np.asarray(v, dtype=np.float64), _isnan),
+            "floor": (np.floor, lambda v: _any(_isnan(v), _isinf(v))),
+            "ceil": (np.ceil, lambda v: _any(_isnan(v), _isinf(v))),
+            "sqrt": (np.sqrt, lambda v: _any(_isnan(v), v < 0)),
+            "log": (np.log, lambda v: _any(_isnan(v), v <= 0)),
+            "log10": (np.log10, lambda v: _any(_isnan(v), v <= 0)),
+        }
+        if name not in ops:  # pragma: no cover - guarded by _SAFE_FUNCS
+            raise ValueError(f"unsupported function {name}()")
+        apply, invalid = ops[name]
+
+        def fn_unary(env: Dict[str, Any]) -> Tuple[Any, Any]:
+            v, e = arg(env)
+            v = _f(v)
+            return apply(v), _any(e, invalid(v))
+
+        return fn_unary, _NUM
+
+
+# ----------------------------------------------------------------------------
+# Spec compilation
+# ----------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class _Step:
+    kind: str  # "switch", "setvar" or a bet verb
+    target: int = -1  # mode code, variable row or bet index
+    fn: Optional[Fn] = None
+    fn_kind: str = _NUM
+
+
+@dataclass(slots=True)
+class _Rule:
+    event: int
+    when: Optional[Tuple[Fn, str]]
+    steps: List[_Step]
+
+
+@dataclass(slots=True)
+class _TemplateBet:
+    bet: int
+    fn: Fn
+    kind: str
+
+
+@dataclass(slots=True)
+class CompiledSpec:
+    """A spec reduced to array-ready rules, templates and constants."""
+
+    rules: List[_Rule]
+    templates: Dict[int, List[_TemplateBet]]
+    var_names: List[str]
+    var_init: List[float]
+    constants: Dict[str, Any]
+    strings: _Strings
+    default_mode: int
+    bankroll: float
+    seed: Optional[int]
+    stops: Dict[str, Any]
+    policy: Any
+    rule_compiler: _Compiler = field(repr=False)
+    # Bet rows any template or rule can touch, in BET_KINDS order; the rest stay 0.
+    used: Tuple[int, ...] = ()
+
+
+def _name_kind(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return _CAT
+    if value is None or isinstance(value, (bool, int, float)):
+        return _NUM
+    return None
+
+
+def _const_value(value: Any, strings: _Strings) -> Any:
+    if isinstance(value, str):
+        return _Cat(strings.code(value))
+    return np.float64(np.nan if value is None else value)
+
+
+def _bet_index(name: Any) -> int:
+    idx = _BET_INDEX.get(str(name))
+    if idx is None:
+        raise ValueError(f"bet {name!r} is not supported by batched sessions")
+    return idx
+
+
+def _compile_step(
+    step: Any, compiler: _Compiler, strings: _Strings, var_rows: Dict[str, int]
+) -> Optional[_Step]:
+    """Mirror of ``rules_engine._step_to_envelope`` + the controller's setvar path."""
+
+    if isinstance(step, dict):
+        action = str(step.get("action", "")).strip().lower()
+        if action not in ALLOWED_ACTIONS:
+            return None
+        if action == ACTION_SETVAR:
+            var = step.get("var") or step.get("name")
+            if "value" in step:
+                value = step.get("value")
+            elif "amount" in step:
+                value = step.get("amount")
+            else:
+                value = step.get("notes")
+            return _setvar_step(var, value, compiler, var_rows)
+        if action == ACTION_SWITCH_MODE:
+            notes = (step.get("notes") or "").strip()
+            target = str(step.get("mode") or notes or "").strip()
+            return _Step("switch", strings.code(target)) if target else None
+        bet = step.get("bet")
+        if bet is None:
+            bet = step.get("bet_type")
+        if bet is None:
+            return None
+        if action == ACTION_CLEAR:
+            return _Step(action, _bet_index(bet))
+        amount = step.get("amount")
+        if amount is None:
+            return None
+        return _amount_step(action, bet, amount, compiler)
+
+    if not isinstance(step, str):
+        return None
+    action, key, arg = _parse_step_string(step)
+    if action == ACTION_SWITCH_MODE:
+        return _Step("switch", strings.code(str(arg or "").strip())) if arg else None
+    if action == ACTION_SETVAR:
+        return _setvar_step(key, arg if arg is not None else "", compiler, var_rows)
+    if action not in (ACTION_SET, ACTION_CLEAR, ACTION_PRESS, ACTION_REDUCE) or not key:
+        return None
+    if action == ACTION_CLEAR:
+        return _Step(action, _bet_index(key))
+    if arg is None or str(arg).strip() == "":
+        return None
+    return _amount_step(action, key, str(arg), compiler)
+
+
+def _amount_step(action: str, bet: Any, amount: Any, compiler: _Compiler) -> _Step:
+    fn, kind = compiler.expr(amount if isinstance(amount, (int, float)) else str(amount))
+    if kind == _CAT:  # eval_num rejects (non-numeric) strings
+        fn, kind = compiler._error()
+    return _Step(action, _bet_index(bet), fn, kind)
+
+
+def _setvar_step(
+    var: Any, value: Any, compiler: _Compiler, var_rows: Dict[str, int]
+) -> Optional[_Step]:
+    if not isinstance(var, str) or not var.strip():
+        return None
+    row = var_rows[var.strip()]  # targets were validated by compile_spec
+    if isinstance(value, (int, float, bool)):
+        fn, kind = compiler.expr(value)
+    else:
+        fn, kind = compiler.expr(str(value))
+    if kind == _CAT:
+        raise ValueError(f"setvar {var!r} must evaluate to a number")
+    return _Step("setvar", row, fn, kind)
+
+
+def _setvar_targets(rules: Any) -> List[str]:
+    names: List[str] = []
+    for rule in rules if isinstance(rules, list) else []:
+        steps = rule.get("do") if isinstance(rule, dict) else None
+        for step in steps if isinstance(steps, list) else []:
+            var: Any = None
+            if isinstance(step, dict):
+                if str(step.get("action", "")).strip().lower() == ACTION_SETVAR:
+                    var = step.get("var") or step.get("name")
+            elif isinstance(step, str):
+                action, key, _ = _parse_step_string(step)
+                var = key if action == ACTION_SETVAR else None
+            if isinstance(var, str) and var.strip() and var.strip() not in names:
+                names.append(var.strip())
+    return names
+
+
+def compile_spec(spec: Dict[str, Any]) -> CompiledSpec:
+    """Compile ``spec`` for :class:`BatchedSessions`; ``ValueError`` if unsupported."""
+
+    if not isinstance(spec, dict):
+        raise ValueError("spec must be a mapping")
+    for key in _UNSUPPORTED_SPEC_KEYS:
+        if spec.get(key):
+            raise ValueError(f"spec.{key} is not supported by batched sessions")
+    run = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+    for key in _UNSUPPORTED_RUN_KEYS:
+        if run.get(key):
+            raise ValueError(f"run.{key} is not supported by batched sessions")
+
+    strings = _Strings()
+    for ev in _EVENT_TYPES:
+        strings.code(ev)
+    modes = spec.get("modes") or {}
+    if not isinstance(modes, dict):
+        raise ValueError("spec.modes must be a mapping")
+    for name in modes:
+        strings.code(str(name))
+    default_mode = "Main" if "Main" in modes else (next(iter(modes)) if modes else "Main")
+
+    table = spec.get("table") or {}
+    variables = spec.get("variables") or {}
+    var_names = _setvar_targets(spec.get("rules"))
+    var_rows: Dict[str, int] = {}
+    var_init: List[float] = []
+    for name in var_names:
+        value = variables.get(name) if isinstance(variables, dict) else None
+        if name not in variables or _name_kind(value) != _NUM:
+            raise ValueError(f"setvar target {name!r} must be a declared numeric variable")
+        if name in _SHADOWED:
+            raise ValueError(f"setvar target {name!r} is shadowed by a built-in name")
+        var_rows[name] = len(var_init)
+        var_init.append(np.nan if value is None else float(value))
+
+    # State names in controller precedence order: table cfg < variables < controller.
+    constants: Dict[str, Any] = {}
+    kinds: Dict[str, str] = {}
+    for source in (table, variables):
+        if not isinstance(source, dict):
+            continue
+        for name, value in source.items():
+            kind = _name_kind(value)
+            if kind is None:
+                kinds.pop(name, None)
+                constants.pop(name, None)
+                continue
+            kinds[name] = kind
+            if name not in var_rows:
+                constants[name] = _const_value(value, strings)
+    for name in var_rows:
+        kinds[name] = _NUM
+    for name in ("point", "rolls_since_point", "on_comeout"):
+        kinds[name] = _NUM
+    kinds["mode"] = _CAT
+    event_kinds = {"type": _CAT, "roll": _NUM, "point": _NUM, "natural": _NUM, "craps": _NUM}
+    event_kinds.update(on_comeout=_NUM, point_on=_NUM)
+    rule_kinds = {**kinds, **event_kinds, "bankroll_after": _NUM}
+    template_kinds = {**kinds, **event_kinds}
+    # ``variables`` and ``event`` are read-only mappings in eval.py; any use errors here.
+    for reserved in ("variables", "event"):
+        rule_kinds.pop(reserved, None)
+        template_kinds.pop(reserved, None)
+    rule_compiler = _Compiler(strings, rule_kinds)
+    template_compiler = _Compiler(strings, template_kinds)
+
+    rules: List[_Rule] = []
+    raw_rules = spec.get("rules")
+    for rule in raw_rules if isinstance(raw_rules, list) else []:
+        if not isinstance(rule, dict) or not isinstance(rule.get("on") or {}, dict):
+            continue
+        want = str((rule.get("on") or {}).get("event", "")).strip().lower()
+        steps_raw = rule.get("do")
+        if want and want not in _EVENT_TYPES:
+            raise ValueError(f"event {want!r} is not supported by batched sessions")
+        if not want or not isinstance(steps_raw, list):
+            continue
+        when = rule.get("when")
+        steps = [_compile_step(s, rule_compiler, strings, var_rows) for s in steps_raw]
+        rules.append(
+            _Rule(
+                event=_EVENT_TYPES.index(want),
+                when=rule_compiler.expr(str(when)) if when is not None else None,
+                steps=[s for s in steps if s is not None],
+            )
+        )
+
+    templates: Dict[int, List[_TemplateBet]] = {}
+    for mode_name, mode in modes.items():
+        tmpl = (mode.get("template") or {}) if isinstance(mode, dict) else {}
+        templates[strings.code(str(mode_name))] = _compile_template(tmpl, template_compiler)
+
+    strings.freeze()
+    used = {tb.bet for bets in templates.values() for tb in bets}
+    used.update(s.target for r in rules for s in r.steps if s.kind not in ("switch", "setvar"))
+    bankroll = run.get("bankroll", DEFAULT_BANKROLL)
+    seed = run.get("seed", spec.get("seed"))
+    return CompiledSpec(
+        rules=rules,
+        templates=templates,
+        var_names=var_names,
+        var_init=var_init,
+        constants=constants,
+        strings=strings,
+        default_mode=strings.code(default_mode),
+        bankroll=float(bankroll if bankroll is not None else DEFAULT_BANKROLL),
+        seed=int(seed) if seed is not None else None,
+        stops=get_stop_options(spec),
+        policy=compile_table_policy(spec),
+        rule_compiler=rule_compiler,
+        used=tuple(sorted(used)),
+    )
+
+
+def _compile_template(tmpl: Any, compiler: _Compiler) -> List[_TemplateBet]:
+    """Mirror of ``templates.render_template`` for the supported bets."""
+
+    if not isinstance(tmpl, dict):
+        return []
+    if tmpl.get("odds"):
+        raise ValueError("template odds are not supported by batched sessions")
+
+    def _amount(value: Any) -> Tuple[Fn, str]:
+        if isinstance(value, (int, float)):
+            return compiler.expr(value)
+        if isinstance(value, str):
+            return compiler.expr(value)
+        return compiler.expr(0)
+
+    out: List[_TemplateBet] = []
+    for key, bet in (("pass", "pass_line"), ("dont_pass", "dont_pass"), ("field", "field")):
+        if key in tmpl:
+            out.append(_TemplateBet(_BET_INDEX[bet], *_amount(tmpl[key])))
+    place = tmpl.get("place")
+    if isinstance(place, dict):
+        for num_str, value in place.items():
+            try:
+                num = int(num_str)
+            except Exception:
+                continue
+            out.append(_TemplateBet(_bet_index(f"place_{num}"), *_amount(value)))
+    return out
+
+
+def _legalize(bet: int, amount: Any) -> Any:
+    """Array form of ``legalize_amount`` under ``DEFAULT_TABLE_POLICY`` (as templates use)."""
+
+    positive = amount > 0
+    if bet in (_PASS, _DONT):
+        level = float(int(DEFAULT_TABLE_POLICY.legalize_cfg.get("level", 10)))
+        legal = np.maximum(np.floor(amount), level)
+    elif bet == _FIELD:
+        legal = np.floor(amount)
+    else:
+        number = int(BET_KINDS[bet].split("_", 1)[1])
+        step = float(DEFAULT_TABLE_POLICY.place_step(number))
+        legal = np.floor_divide(amount, step) * step
+    return np.where(positive, legal, 0.0)
+
+
+# ----------------------------------------------------------------------------
+# Batched engine
+# ----------------------------------------------------------------------------
+
+
+@dataclass(slots=True)
+class BatchedResult:
+    """Final per-session state; index ``i`` is session ``i``."""
+
+    seed: Optional[int]
+    rolls: int
+    bankroll: np.ndarray
+    bets: Dict[str, np.ndarray]
+    point: np.ndarray
+    hands: np.ndarray
+    rolls_played: np.ndarray
+    mode: np.ndarray
+    variables: Dict[str, np.ndarray]
+    stop_reason: np.ndarray
+    elapsed_s: float = 0.0
+
+    @property
+    def sessions(self) -> int:
+        return int(self.bankroll.shape[0])
+
+    def session(self, i: int) -> Dict[str, Any]:
+        """Session ``i`` in the shape :func:`run_scalar_session` returns."""
+
+        return {
+            "bankroll": float(self.bankroll[i]),
+            "bets": {k: float(v[i]) for k, v in self.bets.items() if v[i] > 0},
+            "point": int(self.point[i]),
+            "hands": int(self.hands[i]),
+            "rolls": int(self.rolls_played[i]),
+            "mode": str(self.mode[i]),
+            "variables": {
+                k: (None if np.isnan(v[i]) else float(v[i])) for k, v in self.variables.items()
+            },
+            "stop_reason": str(self.stop_reason[i]),
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        session_rolls = int(self.rolls_played.sum())
+        stopped = self.stop_reason != ""
+        return {
+            "sessions": self.sessions,
+            "rolls": self.rolls,
+            "seed": self.seed,
+            "ruined": int(stopped.sum()),
+            "ruin_rate": float(stopped.mean()) if self.sessions else 0.0,
+            "mean_bankroll": float(self.bankroll.mean()) if self.sessions else 0.0,
+            "session_rolls": session_rolls,
+            "session_rolls_per_sec": session_rolls / self.elapsed_s if self.elapsed_s else None,
+        }
+
+
+class BatchedSessions:
+    """
+    ``sessions`` independent stub sessions of one spec as struct-of-arrays.
+
+    Dice come from ``RngStreams(seed).dice()`` (one draw of every session's
+    dice per roll, so a session's dice do not depend on when others drop
+    out) unless :meth:`run` is given an explicit ``(rolls, S, 2)`` array.
+    Each roll, the sessions are grouped by event type and every group runs
+    only its own rules on its own rows.
+    """
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        sessions: int,
+        *,
+        bankroll: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.compiled = compile_spec(spec)
+        self.sessions = int(sessions)
+        self.bankroll = float(self.compiled.bankroll if bankroll is None else bankroll)
+        self.streams = RngStreams(seed if seed is not None else self.compiled.seed)
+        c = self.compiled
+        self._rules_by_event = [
+            [r for r in c.rules if r.event == ev] for ev in range(len(_EVENT_TYPES))
+        ]
+        self._used = np.array(c.used, dtype=np.intp)
+        self._places = np.array([b for b in c.used if b > _FIELD], dtype=np.intp)
+
+    def dice_rows(self, rolls: int) -> Iterator[np.ndarray]:
+        """The per-roll ``(S, 2)`` dice :meth:`run` draws for this seed."""
+
+        gen = self.streams.dice()
+        for _ in range(rolls):
+            yield gen.integers(1, 7, size=(2, self.sessions), dtype=np.int8).T
+
+    def run(self, rolls: int, *, dice: Optional[np.ndarray] = None) -> BatchedResult:
+        c = self.compiled
+        n = self.sessions
+        if dice is not None:
+            dice = np.asarray(dice)
+            if dice.shape[1:] != (n, 2) or dice.shape[0] < rolls:
+                raise ValueError(f"dice must have shape (>= {rolls}, {n}, 2)")
+            rows: Iterator[np.ndarray] = iter(dice[:rolls])
+        else:
+            rows = self.dice_rows(rolls)
+
+        st = _State.fresh(n, self.bankroll, c)
+        out = _State.fresh(n, self.bankroll, c)
+        out_rolls = np.full(n, rolls, dtype=np.int64)
+        out_reason = np.zeros(n, dtype=np.int8)
+        started = time.perf_counter()
+        with np.errstate(all="ignore"):
+            for r, row in enumerate(rows):
+                if st.ids.size == 0:
+                    break
+                total = (row[:, 0] + row[:, 1]).astype(np.int8)
+                reason = self._step(st, total if st.ids.size == n else total[st.ids])
+                stopped = np.flatnonzero((reason > 0) & st.alive)
+                if stopped.size:
+                    out.store(st, stopped)
+                    out_reason[st.ids[stopped]] = reason[stopped]
+                    out_rolls[st.ids[stopped]] = r + 1
+                    st.alive[stopped] = False
+                    if (~st.alive).sum() * 8 > st.ids.size:
+                        st.compact()
+        elapsed = time.perf_counter() - started
+        out.store(st, np.flatnonzero(st.alive))
+
+        names = np.array(c.strings.names, dtype=object)
+        return BatchedResult(
+            seed=self.streams.seed,
+            rolls=rolls,
+            bankroll=out.cash,
+            bets={name: out.bets[i] for i, name in enumerate(BET_KINDS)},
+            point=out.point.astype(np.int64),
+            hands=out.hand,
+            rolls_played=out_rolls,
+            mode=names[out.mode],
+            variables={name: out.vars[i] for i, name in enumerate(c.var_names)},
+            stop_reason=np.array(_STOP_REASONS, dtype=object)[out_reason],
+            elapsed_s=elapsed,
+        )
+
+    # -- one roll ----------------------------------------------------------
+    def _step(self, st: "_State", total: np.ndarray) -> np.ndarray:
+        pt = st.point
+        comeout = pt == 0
+        self._settle(st, comeout, pt, total)
+
+        box = _IS_BOX[total]
+        resolved = ~comeout & ((total == pt) | (total == 7))
+        st.point = np.where(comeout, np.where(box, total, 0), np.where(resolved, 0, pt)).astype(
+            np.int8
+        )
+        ev = np.where(
+            comeout,
+            box.astype(np.int8),
+            np.where(total == 7, _EV_SEVEN, np.where(total == pt, _EV_MADE, _EV_ROLL)),
+        )
+        st.hand += resolved
+        st.rsp = np.where(ev == _EV_ROLL, st.rsp + 1, 0)
+
+        counts = np.bincount(ev, minlength=len(_EVENT_TYPES))
+        for code in range(len(_EVENT_TYPES)):
+            if not counts[code]:
+                continue
+            if not self._rules_by_event[code] and (code != _EV_POINT or not self._used.size):
+                continue
+            rows = ev == code
+            self._decide(st, code, rows if counts[code] == ev.size else np.flatnonzero(rows), total)
+        return self._stops(st)
+
+    def _decide(self, st: "_State", code: int, rows: Any, total: np.ndarray) -> None:
+        """Controller decisions and bet changes for the ``rows`` that saw event ``code``."""
+
+        c = self.compiled
+        whole = rows.dtype == bool  # every live row is in this group
+        take = (lambda a: a) if whole else (lambda a: a[..., rows])
+        used = self._used
+        mode = take(st.mode)
+        variables = take(st.vars)
+        point = take(st.point)
+        cash = take(st.cash)
+        point_f = np.where(point > 0, point, np.nan).astype(np.float64)
+
+        env: Dict[str, Any] = dict(c.constants)
+        for i, name in enumerate(c.var_names):
+            env[name] = variables[i]
+        env.update(
+            rolls_since_point=take(st.rsp),
+            mode=_Cat(mode),
+            type=_Cat(np.int64(code)),  # event types are the first vocabulary codes
+            roll=take(total).astype(np.float64),
+            point=point_f,
+            natural=np.float64(0.0),
+            craps=np.float64(0.0),
+            on_comeout=np.bool_(code == _EV_COMEOUT),
+            point_on=point > 0,
+            bankroll_after=cash,
+        )
+
+        size = cash.size
+        switches: List[Tuple[Any, int]] = []
+        setvars: List[Tuple[Any, _Step]] = []
+        bet_steps: List[Tuple[Any, _Step, Any]] = []
+        compiler = c.rule_compiler
+        for rule in self._rules_by_event[code]:
+            fire = np.ones(size, dtype=bool)
+            if rule.when is not None:
+                fn, kind = rule.when
+                v, e = fn(env)
+                fire &= compiler.truthy(v, kind, eval_bool=True)
+                if e is not False:
+                    fire &= ~e
+                if not fire.any():
+                    continue
+            for step in rule.steps:
+                if step.kind == "switch":
+                    switches.append((fire, step.target))
+                elif step.kind == "setvar":
+                    setvars.append((fire, step))
+                elif step.kind == ACTION_CLEAR:
+                    bet_steps.append((fire, step, None))
+                else:
+                    v, e = step.fn(env)
+                    v = _f(v)
+                    ok = fire & ~np.asarray(_any(e, _isnan(v)))
+                    bet_steps.append((ok, step, v))
+
+        for fire, target in switches:
+            mode = np.where(fire, target, mode)
+        if switches:
+            env["mode"] = _Cat(mode)
+            st.mode[rows] = mode
+        for fire, step in setvars:
+            v, e = step.fn(env)
+            ok = fire & ~np.asarray(_any(e))
+            variables[step.target] = np.where(ok, _f(v), variables[step.target])
+            env[c.var_names[step.target]] = variables[step.target]
+        if setvars and not whole:
+            st.vars[:, rows] = variables
+
+        if not used.size or (code != _EV_POINT and not bet_steps):
+            return
+        cur = st.bets[used][:, rows] if not whole else st.bets[used]
+        new = cur.copy()
+        if code == _EV_POINT:
+            self._apply_templates(env, mode, point_f, cur, new)
+        slot = {int(b): i for i, b in enumerate(used)}
+        for fire, step, amount in bet_steps:
+            i = slot[step.target]
+            if step.kind == ACTION_SET:
+                target = amount
+            elif step.kind == ACTION_CLEAR:
+                target = 0.0
+            elif step.kind == ACTION_PRESS:
+                target = cur[i] + amount
+            else:
+                target = cur[i] - amount
+            new[i] = np.where(fire, target, new[i])
+
+        new = np.where(new > 0, new, 0.0)
+        delta = _sum_rows(new - cur)
+        short = delta > cash
+        if short.any():
+            new = np.where(short, np.minimum(new, cur), new)
+            delta = _sum_rows(new - cur)
+        if whole:
+            st.bets[used] = new
+            st.cash = cash - delta
+        else:
+            st.bets[np.ix_(used, rows)] = new
+            st.cash[rows] = cash - delta
+
+    def _settle(self, st: "_State", comeout: Any, pt: Any, total: Any) -> None:
+        """Array form of :func:`settle_bets`, in the same order."""
+
+        used = self.compiled.used
+        bets = st.bets
+        cash = st.cash
+        seven = total == 7
+        if _PASS in used:
+            a = bets[_PASS]
+            win = np.where(comeout, _PASS_COMEOUT_WIN[total], total == pt)
+            lose = np.where(comeout, _PASS_COMEOUT_LOSE[total], seven)
+            cash = cash + np.where(win, a * 2, 0.0)
+            bets[_PASS] = np.where(win | lose, 0.0, a)
+        if _DONT in used:
+            a = bets[_DONT]
+            win = np.where(comeout, _DONT_COMEOUT_WIN[total], seven)
+            lose = np.where(comeout, _DONT_COMEOUT_LOSE[total], total == pt)
+            cash = cash + np.where(win, a * 2, 0.0)
+            bets[_DONT] = np.where(win | lose, 0.0, a)
+        if _FIELD in used:
+            a = bets[_FIELD]
+            mult = _FIELD_MULT[total]
+            cash = cash + np.where(mult > 0, a + a * mult, 0.0)
+            bets[_FIELD] = 0.0
+        if self._places.size:
+            point_on = ~comeout
+            hit = np.flatnonzero(point_on & (_PLACE_ROW[total] >= 0))
+            if hit.size:
+                t = total[hit]
+                a = bets[_PLACE_ROW[t], hit]
+                cash[hit] = cash[hit] + a * _PLACE_NUM[t] / _PLACE_DEN[t]
+            out = np.flatnonzero(point_on & seven)
+            if out.size:
+                bets[np.ix_(self._places, out)] = 0.0
+        st.cash = cash
+
+    def _apply_templates(
+        self,
+        env: Dict[str, Any],
+        mode: np.ndarray,
+        point_f: np.ndarray,
+        cur: np.ndarray,
+        new: np.ndarray,
+    ) -> None:
+        """Template diff on point establishment: the book becomes the legal template amounts."""
+
+        c = self.compiled
+        pe = _Cat(np.int64(_EV_POINT))
+        tenv = dict(env)
+        # The synthetic template event has no bankroll_after.
+        tenv.pop("bankroll_after", None)
+        if "bankroll_after" in c.constants:
+            tenv["bankroll_after"] = c.constants["bankroll_after"]
+        tenv.update(type=pe, roll=np.float64(0.0), point=point_f)
+        tenv.update(on_comeout=np.False_, point_on=np.True_)
+        slot = {int(b): i for i, b in enumerate(self._used)}
+        size = mode.size
+        for code in np.unique(mode):
+            in_mode = mode == code
+            desired = np.zeros_like(cur)
+            for tb in c.templates.get(int(code), []):
+                v, e = tb.fn(tenv)
+                if tb.kind == _CAT:
+                    amount: Any = np.float64(0.0)
+                else:
+                    v = _f(v)
+                    amount = np.where(np.asarray(_any(e, _isnan(v))), 0.0, v)
+                desired[slot[tb.bet]] = np.broadcast_to(_legalize(tb.bet, amount), (size,))
+            keep = (desired > 0) & (desired == np.trunc(cur))
+            new[:] = np.where(in_mode, np.where(keep, cur, desired), new)
+
+    def _stops(self, st: "_State") -> np.ndarray:
+        c = self.compiled
+        empty = ~(st.bets[self._used] > 0).any(axis=0)
+        reason = np.zeros(st.ids.size, dtype=np.int8)
+        if c.stops["stop_on_unactionable"]:
+            min_bet = np.where(
+                st.point > 0, c.policy.min_bet(point_on=True), c.policy.min_bet(point_on=False)
+            )
+            reason[empty & (st.cash < min_bet)] = 2
+        if c.stops["stop_on_bankrupt"]:
+            reason[empty & (st.cash <= 0.01)] = 1
+        return reason
+
+
+def _sum_rows(m: np.ndarray) -> np.ndarray:
+    """Row sum in bet order (matches the scalar path's float accumulation)."""
+
+    total = np.zeros(m.shape[1])
+    for row in m:
+        total = total + row
+    return total
+
+
+@dataclass(slots=True)
+class _State:
+    """Live session rows; ``ids`` maps rows back to session indices."""
+
+    ids: np.ndarray
+    alive: np.ndarray
+    cash: np.ndarray
+    bets: np.ndarray
+    point: np.ndarray
+    hand: np.ndarray
+    rsp: np.ndarray
+    mode: np.ndarray
+    vars: np.ndarray
+
+    @classmethod
+    def fresh(cls, n: int, bankroll: float, c: CompiledSpec) -> "_State":
+        return cls(
+            ids=np.arange(n),
+            alive=np.ones(n, dtype=bool),
+            cash=np.full(n, bankroll, dtype=np.float64),
+            bets=np.zeros((len(BET_KINDS), n), dtype=np.float64),
+            point=np.zeros(n, dtype=np.int8),
+            hand=np.zeros(n, dtype=np.int64),
+            rsp=np.zeros(n, dtype=np.int64),
+            mode=np.full(n, c.default_mode, dtype=np.int64),
+            vars=np.array(c.var_init, dtype=np.float64).reshape(-1, 1).repeat(n, axis=1),
+        )
+
+    def store(self, src: "_State", rows: np.ndarray) -> None:
+        """Copy ``src`` rows into this (full-size) state at their session ids."""
+
+        ids = src.ids[rows]
+        self.cash[ids] = src.cash[rows]
+        self.bets[:, ids] = src.bets[:, rows]
+        self.point[ids] = src.point[rows]
+        self.hand[ids] = src.hand[rows]
+        self.rsp[ids] = src.rsp[rows]
+        self.mode[ids] = src.mode[rows]
+        self.vars[:, ids] = src.vars[:, rows]
+
+    def compact(self) -> None:
+        keep = self.alive
+        self.ids = self.ids[keep]
+        self.cash = self.cash[keep]
+        self.bets = self.bets[:, keep]
+        self.point = self.point[keep]
+        self.hand = self.hand[keep]
+        self.rsp = self.rsp[keep]
+        self.mode = self.mode[keep]
+        self.vars = self.vars[:, keep]
+        self.alive = np.ones(self.ids.size, dtype=bool)
+
+
+__all__ = [
+    "BET_KINDS",
+    "BatchedResult",
+    "BatchedSessions",
+    "CompiledSpec",
+    "apply_bet_changes",
+    "compile_spec",
+    "run_scalar_session",
+    "settle_bets",
+]
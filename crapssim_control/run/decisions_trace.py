@@ -1,6 +1,9 @@
 import csv
 import pathlib
-from typing import Mapping, Optional
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+
+from .. import hotpath
+from .flight_recorder import DEFAULT_CAPACITY, DEFAULT_POST_TRIGGER, FlightRecorder
 
 FIELDS = [
     "roll",
@@ -16,9 +19,103 @@ FIELDS = [
     "roll_in_hand",
 ]
 
+TRACE_MODES = ("full", "flight", "sample")
+
+RowPredicate = Callable[[Mapping[str, Any]], bool]
+
+
+def is_error_reason(reason: Any) -> bool:
+    """Rule/apply failures carry reasons like ``WHEN_EVAL_ERROR`` or ``APPLY_ERROR``."""
+
+    return isinstance(reason, str) and reason.endswith("ERROR")
+
+
+def sampled_roll(roll: Any, every: int) -> bool:
+    """1-in-``every`` roll sampling; rows without an integer roll index are always kept."""
+
+    if every <= 1 or isinstance(roll, bool):
+        return True
+    try:
+        return int(roll) % every == 0
+    except (TypeError, ValueError):
+        return True
+
+
+def trace_options(journal_cfg: Any) -> Dict[str, Any]:
+    """
+    Read ``run.journal.trace`` into ``DecisionsTrace`` keyword options.
+
+        run:
+          journal:
+            dsl_trace: true
+            trace:
+              mode: flight          # full (default) | flight | sample
+              capacity: 4096        # flight: rows kept in memory
+              post_trigger: 256     # flight: rows written after a trigger
+              drawdown: 250         # flight: trigger when bankroll falls this far from peak
+              trigger_when: "bankroll < 500"   # flight: DSL expression over the row
+              sample_every: 10      # sample: keep rows for 1 roll in N
+    """
+
+    cfg = journal_cfg.get("trace") if isinstance(journal_cfg, Mapping) else None
+    if not isinstance(cfg, Mapping):
+        return {}
+    opts: Dict[str, Any] = {}
+    mode = str(cfg.get("mode") or "full").strip().lower()
+    if mode not in TRACE_MODES:
+        raise ValueError(f"run.journal.trace.mode must be one of {', '.join(TRACE_MODES)}")
+    opts["mode"] = mode
+    for key in ("capacity", "post_trigger", "sample_every"):
+        if cfg.get(key) is not None:
+            opts[key] = int(cfg[key])
+    if cfg.get("drawdown") is not None:
+        opts["drawdown"] = float(cfg["drawdown"])
+    expr = cfg.get("trigger_when")
+    if isinstance(expr, str) and expr.strip():
+        opts["predicate"] = expression_predicate(expr)
+    return opts
+
+
+def expression_predicate(expr: str) -> RowPredicate:
+    """Compile a DSL ``when``-style expression into a row predicate (errors count as false)."""
+
+    from ..behavior.evaluator import _eval_bool
+
+    def _check(row: Mapping[str, Any]) -> bool:
+        try:
+            return _eval_bool(expr, dict(row))
+        except Exception:
+            return False
+
+    return _check
+
 
 class DecisionsTrace:
-    def __init__(self, folder):
+    """
+    Writes ``decisions.csv``.
+
+    ``mode="full"`` writes every row as it arrives. ``mode="sample"`` keeps rows
+    for one roll in ``sample_every``. ``mode="flight"`` holds the last
+    ``capacity`` rows in memory and only writes them -- plus the next
+    ``post_trigger`` rows -- when a trigger fires: a row whose reason is an
+    error, the bankroll dropping ``drawdown`` below its peak, ``predicate(row)``
+    returning true, or an explicit :meth:`trigger` call. Each dump is preceded by
+    a ``flight_recorder`` marker row naming the trigger.
+    """
+
+    def __init__(
+        self,
+        folder,
+        *,
+        mode: str = "full",
+        capacity: int = DEFAULT_CAPACITY,
+        post_trigger: int = DEFAULT_POST_TRIGGER,
+        sample_every: int = 1,
+        drawdown: Optional[float] = None,
+        predicate: Optional[RowPredicate] = None,
+    ):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"mode must be one of {', '.join(TRACE_MODES)}")
         self.output_dir = pathlib.Path(folder)
         path = self.output_dir / "decisions.csv"
         self._fp = open(path, "w", newline="", encoding="utf-8")
@@ -28,16 +125,110 @@ class DecisionsTrace:
         self._rows_written = 0
         self._closed = False
 
+        self.mode = mode
+        self.sample_every = max(1, int(sample_every)) if mode == "sample" else 1
+        self.rows_seen = 0
+        self._drawdown = float(drawdown) if drawdown is not None else None
+        self._predicate = predicate
+        self._peak: Optional[float] = None
+        self._in_drawdown = False
+        self._recorder: Optional[FlightRecorder] = None
+        if mode == "flight":
+            self._recorder = FlightRecorder(
+                self._write_rows,
+                capacity=capacity,
+                post_trigger=post_trigger,
+                is_trigger=self._row_trigger,
+            )
+
+    def __enter__(self) -> "DecisionsTrace":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.trigger(f"exception:{exc_type.__name__}")
+        self.close()
+
     @property
     def rows_written(self) -> int:
         return self._rows_written
 
+    @property
+    def triggers(self) -> list:
+        return list(self._recorder.triggers) if self._recorder is not None else []
+
     def write(self, row: dict):
+        t_span = hotpath.start()
+        try:
+            if self._closed:
+                raise ValueError("DecisionsTrace is closed")
+            self.rows_seen += 1
+            if self._recorder is not None:
+                self._recorder.record(row)
+                return
+            if self.sample_every > 1 and not sampled_roll(row.get("roll"), self.sample_every):
+                return
+            self._w.writerow({k: row.get(k, "") for k in FIELDS})
+            self._fp.flush()
+            self._rows_written += 1
+        finally:
+            hotpath.stop("journal.decisions_trace", t_span)
+
+    def trigger(self, reason: str, row: Optional[Mapping[str, Any]] = None) -> int:
+        """Flight mode: dump buffered rows now (e.g. on an exception). Returns rows dumped."""
+
+        if self._closed or self._recorder is None:
+            return 0
+        if row is not None:
+            self._recorder.record(row)
+        return self._recorder.trigger(reason)
+
+    def _row_trigger(self, row: Mapping[str, Any]) -> Optional[str]:
+        reason = row.get("reason")
+        if is_error_reason(reason):
+            return f"rule_error:{reason}"
+        if self._drawdown is not None:
+            try:
+                bankroll = float(row.get("bankroll"))
+            except (TypeError, ValueError):
+                bankroll = None
+            if bankroll is not None:
+                if self._peak is None or bankroll > self._peak:
+                    self._peak = bankroll
+                below = self._peak - bankroll >= self._drawdown
+                # Edge-triggered: fire when crossing the threshold, re-arm on recovery.
+                crossed = below and not self._in_drawdown
+                self._in_drawdown = below
+                if crossed:
+                    return "drawdown"
+        if self._predicate is not None and self._predicate(row):
+            return "predicate"
+        return None
+
+    def _write_rows(self, rows: Sequence[Mapping[str, Any]], reason: Optional[str]) -> None:
         if self._closed:
-            raise ValueError("DecisionsTrace is closed")
-        self._w.writerow({k: row.get(k, "") for k in FIELDS})
+            return
+        if reason is not None:
+            last = rows[-1] if rows else {}
+            rows = [
+                {
+                    "roll": last.get("roll", ""),
+                    "window": "flight_recorder",
+                    "rule_id": "trigger",
+                    "when_expr": "",
+                    "evaluated_true": True,
+                    "applied": False,
+                    "reason": reason,
+                    "bankroll": last.get("bankroll", ""),
+                    "point_on": "",
+                    "hand_id": last.get("hand_id", ""),
+                    "roll_in_hand": last.get("roll_in_hand", ""),
+                },
+                *rows,
+            ]
+        self._w.writerows({k: r.get(k, "") for k in FIELDS} for r in rows)
         self._fp.flush()
-        self._rows_written += 1
+        self._rows_written += len(rows)
 
     def ensure_summary_row(self, summary: Optional[Mapping[str, object]] = None) -> None:
         """Ensure at least one data row exists, inserting a run_complete summary if needed."""
@@ -62,20 +253,24 @@ class DecisionsTrace:
                 bankroll_value = bankroll
 
         try:
-            self.write(
-                {
-                    "roll": roll_value,
-                    "window": "run_complete",
-                    "rule_id": "summary",
-                    "when_expr": "true",
-                    "evaluated_true": True,
-                    "applied": False,
-                    "reason": "RUN_COMPLETE",
-                    "bankroll": bankroll_value,
-                    "point_on": "",
-                    "hand_id": "",
-                    "roll_in_hand": "",
-                }
+            # Bypass sampling/buffering: the summary row must always land on disk.
+            self._write_rows(
+                [
+                    {
+                        "roll": roll_value,
+                        "window": "run_complete",
+                        "rule_id": "summary",
+                        "when_expr": "true",
+                        "evaluated_true": True,
+                        "applied": False,
+                        "reason": "RUN_COMPLETE",
+                        "bankroll": bankroll_value,
+                        "point_on": "",
+                        "hand_id": "",
+                        "roll_in_hand": "",
+                    }
+                ],
+                None,
             )
         except Exception:
             # Fail open; an empty decisions.csv is preferable to raising during finalization.
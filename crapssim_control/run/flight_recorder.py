@@ -0,0 +1,99 @@
+"""
+flight_recorder.py -- bounded in-memory trace buffer that only hits disk on a trigger.
+
+A :class:`FlightRecorder` keeps the last ``capacity`` records in a preallocated
+ring. Nothing is written until a trigger fires -- either a record the
+``is_trigger`` callback flags (rule error, drawdown, user predicate) or an
+explicit :meth:`FlightRecorder.trigger` call (e.g. on an exception). A trigger
+hands the buffered records to ``sink(records, reason)`` oldest-first and then
+passes the next ``post_trigger`` records straight through as
+``sink((record,), None)``, so the dump covers what led up to the event and
+what followed it.
+
+    rec = FlightRecorder(write_rows, capacity=4096, post_trigger=256, is_trigger=check)
+    rec.record(row)            # buffered
+    rec.trigger("exception")   # dump ring, start post-trigger window
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_CAPACITY = 4096
+DEFAULT_POST_TRIGGER = 256
+
+Sink = Callable[[Sequence[Any], Optional[str]], None]
+TriggerCheck = Callable[[Any], Optional[str]]
+
+
+class FlightRecorder:
+    def __init__(
+        self,
+        sink: Sink,
+        *,
+        capacity: int = DEFAULT_CAPACITY,
+        post_trigger: int = DEFAULT_POST_TRIGGER,
+        is_trigger: Optional[TriggerCheck] = None,
+    ) -> None:
+        if int(capacity) <= 0:
+            raise ValueError("capacity must be > 0")
+        self.capacity = int(capacity)
+        self.post_trigger = max(0, int(post_trigger))
+        self._sink = sink
+        self._is_trigger = is_trigger
+        self._ring: List[Any] = [None] * self.capacity
+        self._head = 0  # next slot to overwrite
+        self._size = 0
+        self._post_remaining = 0
+        self.recorded = 0
+        self.dropped = 0  # records overwritten before any trigger dumped them
+        self.triggers: List[Dict[str, Any]] = []
+
+    @property
+    def buffered(self) -> int:
+        return self._size
+
+    def record(self, item: Any) -> None:
+        self.recorded += 1
+        if self._post_remaining:
+            self._post_remaining -= 1
+            self._sink((item,), None)
+        else:
+            if self._size == self.capacity:
+                self.dropped += 1
+            else:
+                self._size += 1
+            self._ring[self._head] = item
+            self._head = (self._head + 1) % self.capacity
+        if self._is_trigger is not None:
+            reason = self._is_trigger(item)
+            if reason:
+                self.trigger(reason)
+
+    def trigger(self, reason: str) -> int:
+        """Dump the buffered records to the sink and open a post-trigger window."""
+
+        items = self.drain()
+        self._sink(items, str(reason))
+        self.triggers.append({"reason": str(reason), "at_record": self.recorded})
+        self._post_remaining = self.post_trigger
+        return len(items)
+
+    def drain(self) -> List[Any]:
+        """Return the buffered records oldest-first and empty the ring."""
+
+        n = self._size
+        if not n:
+            return []
+        start = (self._head - n) % self.capacity
+        if start + n <= self.capacity:
+            items = self._ring[start : start + n]
+        else:
+            items = self._ring[start:] + self._ring[: self._head]
+        # Keep the preallocated list; stale slots are overwritten before they are read again.
+        self._head = 0
+        self._size = 0
+        return items
+
+
+__all__ = ["DEFAULT_CAPACITY", "DEFAULT_POST_TRIGGER", "FlightRecorder"]
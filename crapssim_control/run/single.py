@@ -0,0 +1,441 @@
+"""
+single.py -- programmatic single-run entry point with warm per-process state.
+
+:func:`run_single` runs one spec on the CrapsSim table and writes its
+artifacts under ``out_dir``. The work is done by a :class:`RunWorker`. The
+worker keeps the process-wide pieces warm across calls: the resolved engine
+adapter class (and with it the CrapsSim import), the table driver helpers,
+one adapter instance and, per spec fingerprint, the validation result and the
+compiled run policy (risk policy, policy engine, policy and stop options).
+The fingerprint is taken before the per-run seed/rolls/artifacts are
+injected, so reruns of one spec with different seeds hit the same entry; the
+cache is a bounded LRU. Each ``attach`` builds a fresh table, which resets
+the session state. Batch and
+sweep workers that call :func:`run_single` repeatedly share the module's
+default worker, so they spend their time simulating instead of bootstrapping.
+
+The ``artifacts`` profile (see :mod:`crapssim_control.run.artifacts`) decides
+what a run leaves behind; ``metrics-only`` creates no per-run directory and
+appends one compact record to a shared ``run_metrics.jsonl``. Runs without a
+seed draw one, so every record can be re-run with ``artifacts="full"``. The
+seed is bound to the run's own table as an :class:`~crapssim_control.rng.RngStreams`
+dice stream; no process-global RNG is seeded, so runs sharing a process (or
+spread over workers) cannot disturb each other's dice.
+
+    result = run_single(spec, "out/run1", seed=7, rolls=500)
+    result.status, result.bankroll_final, result.report_path
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..rng import RngStreams, draw_seed
+from ..utils.dna_conveyor import canonicalize_json
+from ..utils.io_atomic import write_json_atomic
+from .artifacts import (
+    ARTIFACT_LEVELS,
+    RUN_METRICS_NAME,
+    append_run_metrics,
+    normalize_artifact_level,
+)
+
+DEFAULT_ARTIFACTS = "standard"
+DEFAULT_ROLLS = 1000
+PREPARED_CACHE_SIZE = 256
+
+
+@dataclass(slots=True)
+class SingleRunResult:
+    """Structured outcome of :func:`run_single`."""
+
+    run_id: str
+    status: str  # "ok" | "invalid" | "engine_unavailable" | "error"
+    artifacts_dir: Optional[str]
+    artifacts: str = DEFAULT_ARTIFACTS
+    source: Optional[str] = None
+    rolls: int = 0
+    seed: Optional[int] = None
+    bankroll_start: Optional[float] = None
+    bankroll_final: Optional[float] = None
+    hands: Optional[int] = None
+    report_path: Optional[str] = None
+    metrics_path: Optional[str] = None
+    errors: List[str] = field(default_factory=list)
+    elapsed_s: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _coerce_int(value: Any) -> Optional[int]:
+    if value is None or isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _spec_fingerprint(spec: Dict[str, Any]) -> str:
+    return hashlib.sha256(canonicalize_json(spec).encode("utf-8")).hexdigest()
+
+
+@dataclass(slots=True)
+class _PreparedSpec:
+    """Spec-derived pieces compiled once per fingerprint and shared by its runs."""
+
+    errors: List[str]
+    risk_policy: Any = None
+    policy_engine: Any = None
+    policy_opts: Dict[str, Any] = field(default_factory=dict)
+    stop_opts: Dict[str, Any] = field(default_factory=dict)
+
+
+class RunWorker:
+    """Process-local warm state shared by many :func:`run_single` calls."""
+
+    def __init__(self) -> None:
+        self._engine_cls: Optional[type] = None
+        self._engine_reason: Optional[str] = None
+        self._engine_resolved = False
+        self._adapter: Any = None
+        self._helpers: Optional[Dict[str, Callable[..., Any]]] = None
+        self._prepared: "OrderedDict[str, _PreparedSpec]" = OrderedDict()
+        self.runs = 0
+
+    # -- warm pieces -------------------------------------------------------
+    def _engine(self) -> Tuple[Optional[type], Optional[str]]:
+        if not self._engine_resolved:
+            from ..engine_adapter import resolve_engine_adapter
+
+            try:
+                self._engine_cls, self._engine_reason = resolve_engine_adapter()
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self._engine_cls, self._engine_reason = None, str(exc)
+            self._engine_resolved = True
+        return self._engine_cls, self._engine_reason
+
+    def _table_helpers(self) -> Dict[str, Callable[..., Any]]:
+        if self._helpers is None:
+            from .. import cli
+
+            self._helpers = {"run_table_rolls": cli._run_table_rolls}
+        return self._helpers
+
+    def validate(self, spec: Dict[str, Any]) -> List[str]:
+        """Hard validation errors for ``spec``, cached by its canonical fingerprint."""
+
+        return list(self._prepare(_spec_fingerprint(spec), spec).errors)
+
+    def _prepare(self, key: str, spec: Dict[str, Any]) -> _PreparedSpec:
+        prepared = self._prepared.get(key)
+        if prepared is not None:
+            self._prepared.move_to_end(key)
+            return prepared
+        from ..spec_validation import validate_spec
+
+        try:
+            errors = list(validate_spec(spec))
+        except Exception as exc:
+            errors = [f"Validation logic unavailable: {exc!r}"]
+        prepared = _PreparedSpec(errors=errors)
+        if not errors:
+            from ..config import get_policy_options, get_stop_options
+            from ..policy_engine import PolicyEngine
+            from ..risk_schema import load_risk_policy
+
+            prepared.risk_policy = load_risk_policy(spec)
+            prepared.policy_engine = PolicyEngine(prepared.risk_policy)
+            prepared.policy_opts = get_policy_options(spec)
+            prepared.stop_opts = get_stop_options(spec)
+        self._prepared[key] = prepared
+        if len(self._prepared) > PREPARED_CACHE_SIZE:
+            self._prepared.popitem(last=False)
+        return prepared
+
+    # -- running -----------------------------------------------------------
+    def run(
+        self,
+        spec_path_or_dict: Any,
+        out_dir: str | Path,
+        *,
+        seed: Optional[int] = None,
+        rolls: Optional[int] = None,
+        artifacts: str = DEFAULT_ARTIFACTS,
+        metrics_path: Optional[str | Path] = None,
+        run_id: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> SingleRunResult:
+        artifacts = normalize_artifact_level(artifacts, DEFAULT_ARTIFACTS)
+        started = time.perf_counter()
+        spec = self._resolve_spec(spec_path_or_dict)
+        # keyed before seed/rolls/artifacts go in, so reseeded reruns share it
+        key = _spec_fingerprint(spec)
+        run_blk = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+        seed_int = _coerce_int(seed)
+        if seed_int is None:
+            seed_int = _coerce_int(run_blk.get("seed", spec.get("seed")))
+        if seed_int is None:
+            # an explicit seed is what makes the run reproducible later
+            seed_int = draw_seed()
+        n_rolls = _coerce_int(rolls)
+        if n_rolls is None:
+            n_rolls = _coerce_int(run_blk.get("rolls")) or DEFAULT_ROLLS
+        spec.setdefault("run", {})["seed"] = seed_int
+        spec["run"]["rolls"] = n_rolls
+        spec["run"]["artifacts"] = artifacts
+
+        out = Path(out_dir)
+        lean = artifacts == "metrics-only"
+        if not lean:
+            out.mkdir(parents=True, exist_ok=True)
+        if source is None and not isinstance(spec_path_or_dict, dict):
+            source = str(spec_path_or_dict)
+        result = SingleRunResult(
+            run_id=run_id or _spec_fingerprint(spec)[:16],
+            status="ok",
+            artifacts_dir=None if lean else str(out),
+            artifacts=artifacts,
+            source=source,
+            seed=seed_int,
+        )
+        prepared = self._prepare(key, spec)
+        if prepared.errors:
+            result.status, result.errors = "invalid", list(prepared.errors)
+        else:
+            try:
+                self._simulate(spec, prepared, result, n_rolls)
+            except Exception as exc:
+                result.status = "error"
+                result.errors.append(f"{type(exc).__name__}: {exc}")
+        result.elapsed_s = time.perf_counter() - started
+        self.runs += 1
+        if lean:
+            target = Path(metrics_path) if metrics_path else out / RUN_METRICS_NAME
+            result.metrics_path = str(append_run_metrics(target, metrics_record(result)))
+        else:
+            self._write_artifacts(out, spec, result)
+        return result
+
+    def _resolve_spec(self, spec_path_or_dict: Any) -> Dict[str, Any]:
+        if isinstance(spec_path_or_dict, dict):
+            return copy.deepcopy(spec_path_or_dict)
+        from ..spec_loader import load_spec_file
+
+        spec, _ = load_spec_file(spec_path_or_dict)
+        spec = dict(spec)
+        spec["_csc_spec_path"] = str(spec_path_or_dict)
+        return spec
+
+    def _simulate(
+        self,
+        spec: Dict[str, Any],
+        prepared: _PreparedSpec,
+        result: SingleRunResult,
+        rolls: int,
+    ) -> None:
+        engine_cls, reason = self._engine()
+        if engine_cls is None:
+            result.status = "engine_unavailable"
+            result.errors.append(str(reason or "missing or incompatible engine"))
+            return
+        helpers = self._table_helpers()
+        if self._adapter is None:
+            self._adapter = engine_cls()
+        adapter = self._adapter
+        # attach() builds a fresh table and strategy: that is the per-run reset
+        table = adapter.attach(spec).table
+        adapter._risk_policy = prepared.risk_policy
+        adapter._policy_engine = prepared.policy_engine
+        adapter._policy_opts = dict(prepared.policy_opts)
+        adapter._stop_opts = dict(prepared.stop_opts)
+        adapter._policy_overrides = {}
+        # the run's dice stream goes to this table only; no global RNG is touched
+        RngStreams(result.seed).bind_table(table)
+
+        player = (getattr(table, "players", None) or [None])[0]
+        result.bankroll_start = _bankroll_of(player)
+        rolls_before = _dice_rolls(table)
+        if not _run_quietly(table, rolls):
+            ok, detail = helpers["run_table_rolls"](table, rolls)
+            if not ok:
+                raise RuntimeError(f"Could not run {rolls} rolls. {detail}.")
+        rolls_after = _dice_rolls(table)
+        if rolls_before is None or rolls_after is None:
+            result.rolls = rolls
+        else:
+            # a stop condition can end the run before the requested count
+            result.rolls = rolls_after - rolls_before
+        result.bankroll_final = _bankroll_of(player)
+        result.hands = _coerce_int(getattr(table, "n_shooters", None))
+
+    def _write_artifacts(self, out: Path, spec: Dict[str, Any], result: SingleRunResult) -> None:
+        report_path = out / "report.json"
+        result.report_path = str(report_path)
+        report = {
+            "run_id": result.run_id,
+            "identity": {"run_id": result.run_id, "seed": result.seed},
+            "summary": _summary_block(result),
+            "artifacts": result.artifacts,
+        }
+        if result.errors:
+            report["errors"] = list(result.errors)
+        write_json_atomic(report_path, report)
+        write_json_atomic(out / "summary.json", result.to_dict())
+        if result.artifacts == "full":
+            spec_out = {k: v for k, v in spec.items() if not str(k).startswith("_csc_")}
+            write_json_atomic(out / "spec.json", spec_out)
+
+
+def _summary_block(result: SingleRunResult) -> Dict[str, Any]:
+    return {
+        "result": result.status,
+        "bankroll_start": result.bankroll_start,
+        "bankroll_final": result.bankroll_final,
+        "rolls": result.rolls,
+        "hands_played": result.hands,
+    }
+
+
+def metrics_record(result: SingleRunResult) -> Dict[str, Any]:
+    """The compact per-run record written by the ``metrics-only`` profile."""
+
+    record: Dict[str, Any] = {
+        "run_id": result.run_id,
+        "source": result.source,
+        "status": result.status,
+        "seed": result.seed,
+        "rolls": result.rolls,
+        "summary": _summary_block(result),
+        "elapsed_s": round(result.elapsed_s, 6),
+    }
+    if result.errors:
+        record["errors"] = list(result.errors)
+    return record
+
+
+def _run_quietly(table: Any, rolls: int) -> bool:
+    """``table.run(rolls, verbose=False)`` when the engine supports it."""
+
+    run = getattr(table, "run", None)
+    if not callable(run):
+        return False
+    try:
+        run(rolls, verbose=False)
+    except TypeError:
+        return False
+    return True
+
+
+def _dice_rolls(table: Any) -> Optional[int]:
+    """Rolls thrown so far by the table's dice, when the engine counts them."""
+
+    dice = getattr(table, "dice", None)
+    return _coerce_int(getattr(dice, "n_rolls", None))
+
+
+def _bankroll_of(player: Any) -> Optional[float]:
+    value = getattr(player, "bankroll", None)
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+_DEFAULT_WORKER: Optional[RunWorker] = None
+
+
+def default_worker() -> RunWorker:
+    """The process-wide :class:`RunWorker` used when none is passed."""
+
+    global _DEFAULT_WORKER
+    if _DEFAULT_WORKER is None:
+        _DEFAULT_WORKER = RunWorker()
+    return _DEFAULT_WORKER
+
+
+def run_single(
+    spec_path_or_dict: Any,
+    out_dir: str | Path,
+    *,
+    seed: Optional[int] = None,
+    rolls: Optional[int] = None,
+    artifacts: str = DEFAULT_ARTIFACTS,
+    worker: Optional[RunWorker] = None,
+    metrics_path: Optional[str | Path] = None,
+    run_id: Optional[str] = None,
+    source: Optional[str] = None,
+) -> SingleRunResult:
+    """
+    Run one spec (dict or path) in-process and write its artifacts to ``out_dir``.
+
+    ``seed``/``rolls`` override ``run.seed``/``run.rolls``. ``artifacts`` is
+    one of :data:`ARTIFACT_LEVELS`: ``standard`` writes ``report.json`` and
+    ``summary.json``, ``full`` also keeps the resolved ``spec.json`` and
+    ``metrics-only`` appends a :func:`metrics_record` to ``metrics_path``
+    (default ``out_dir/run_metrics.jsonl``) without creating ``out_dir``.
+    ``run_id``/``source`` override the identity recorded for the run. Never
+    raises for spec or engine problems; check :attr:`SingleRunResult.status`.
+    """
+
+    return (worker or default_worker()).run(
+        spec_path_or_dict,
+        out_dir,
+        seed=seed,
+        rolls=rolls,
+        artifacts=artifacts,
+        metrics_path=metrics_path,
+        run_id=run_id,
+        source=source,
+    )
+
+
+def rerun_full(
+    record: Dict[str, Any],
+    out_dir: str | Path,
+    *,
+    spec: Optional[Dict[str, Any]] = None,
+    worker: Optional[RunWorker] = None,
+) -> SingleRunResult:
+    """
+    Regenerate full artifacts for a ``metrics-only`` record.
+
+    Re-runs ``spec`` (default: the record's ``source`` path) with the stored
+    seed and rolls, so the engine replays the same dice.
+    """
+
+    target = spec if spec is not None else record.get("source")
+    if target is None:
+        raise ValueError("record has no source; pass the spec explicitly")
+    return run_single(
+        target,
+        out_dir,
+        seed=record.get("seed"),
+        rolls=record.get("rolls"),
+        artifacts="full",
+        worker=worker,
+        run_id=record.get("run_id"),
+        source=record.get("source"),
+    )
+
+
+__all__ = [
+    "ARTIFACT_LEVELS",
+    "RunWorker",
+    "SingleRunResult",
+    "default_worker",
+    "metrics_record",
+    "rerun_full",
+    "run_single",
+]
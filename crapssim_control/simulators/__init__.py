@@ -1,5 +1,5 @@
 """Simulation helpers for integration harnesses."""
 
-from .node_red_sim import NodeRedSimulator
+from .node_red_sim import LoadProfile, NodeRedSimulator
 
-__all__ = ["NodeRedSimulator"]
+__all__ = ["LoadProfile", "NodeRedSimulator"]
@@ -0,0 +1,123 @@
+"""
+load_harness.py -- end-to-end command-channel load run against a stub-engine controller.
+
+Starts a :class:`~crapssim_control.controller.ControlStrategy` on the stub
+engine, serves its command queue over the stdlib ``/commands`` endpoint on an
+ephemeral port, rolls the table on a fixed cadence in a background thread and
+points :meth:`NodeRedSimulator.run_load` at it. The returned report carries the
+simulator's throughput/rejection/latency summary plus the queue's own stats.
+
+    report = run_command_load(LoadProfile(rate=200, duration=5), workdir="out/load")
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from .node_red_sim import LoadProfile, NodeRedSimulator
+
+
+def _stub_spec(seed: int, workdir: Path, limits: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    external: Dict[str, Any] = {"mode": "live", "tape_path": str(workdir / "command_tape.jsonl")}
+    if limits:
+        external["limits"] = limits
+    return {
+        "table": {"bubble": False, "level": 10},
+        "variables": {"units": 10},
+        "modes": {"Main": {"template": {"pass": "units", "place": {"6": 12, "8": 12}}}},
+        "rules": [],
+        "run": {
+            "seed": seed,
+            "bankroll": 1_000_000,
+            "stop_on_bankrupt": False,
+            "stop_on_unactionable": False,
+            "http_commands": {"enabled": False},
+            "webhooks": {"enabled": False},
+            "external": external,
+        },
+    }
+
+
+def run_command_load(
+    profile: Optional[LoadProfile] = None,
+    *,
+    workdir: str | Path,
+    roll_interval: float = 0.01,
+    limits: Optional[Dict[str, Any]] = None,
+    seed: int = 4242,
+    settle: float = 0.25,
+) -> Dict[str, Any]:
+    """
+    Drive ``profile`` through the command channel of a live stub session.
+
+    ``roll_interval`` is the pause between rolls (commands are drained once per
+    roll), ``limits`` overrides ``run.external.limits`` and ``settle`` is how
+    long rolling continues after the last response so queued commands drain.
+    """
+
+    from crapssim_control.events import event_for_roll
+    from crapssim_control.controller import ControlStrategy
+    from crapssim_control.engine_adapter import VanillaAdapter
+    from crapssim_control.external.http_api import serve_commands
+
+    out = Path(workdir)
+    out.mkdir(parents=True, exist_ok=True)
+    spec = _stub_spec(seed, out, limits)
+    adapter = VanillaAdapter()
+    adapter.start_session(spec)
+    ctrl = ControlStrategy(spec)
+    journal_path = out / "decision_journal.jsonl"
+    journal_path.unlink(missing_ok=True)
+    ctrl.journal.path = str(journal_path)
+
+    httpd = serve_commands(ctrl.command_queue, lambda: ctrl.run_id, host="127.0.0.1", port=0)
+    http_thread = threading.Thread(target=httpd.serve_forever, name="csc-load-httpd", daemon=True)
+    http_thread.start()
+
+    stop = threading.Event()
+    rolls = {"count": 0}
+
+    def _roll_loop() -> None:
+        prev_point = None
+        while not stop.is_set():
+            result = adapter.step_roll()
+            ctrl.handle_event(event_for_roll(prev_point, result), adapter.bets)
+            prev_point = (result.get("snapshot") or {}).get("point_value")
+            rolls["count"] += 1
+            stop.wait(roll_interval)
+
+    roller = threading.Thread(target=_roll_loop, name="csc-load-roller", daemon=True)
+    roller.start()
+
+    host, port = httpd.server_address[:2]
+    sim = NodeRedSimulator(command_url=f"http://{host}:{port}/commands", source="load")
+    try:
+        sim.run_load(profile, run_id=ctrl.run_id)
+        time.sleep(max(settle, 2 * roll_interval))
+    finally:
+        stop.set()
+        roller.join(timeout=5.0)
+        httpd.shutdown()
+        httpd.server_close()
+        try:
+            ctrl.stop()
+        except Exception:
+            pass
+
+    report = sim.load_report(journal_path)
+    stats = ctrl.command_queue.stats
+    report["queue"] = {
+        "enqueued": stats.get("enqueued", 0),
+        "executed": stats.get("executed", 0),
+        "rejected": dict(stats.get("rejected", {})),
+        "limits": ctrl.command_queue.limits,
+    }
+    report["rolls"] = rolls["count"]
+    report["journal_path"] = str(journal_path)
+    return report
+
+
+__all__ = ["run_command_load"]
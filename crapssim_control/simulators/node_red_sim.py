@@ -1,14 +1,22 @@
-"""In-process Node-RED simulator used by the Phase 6 baseline harness."""
+"""In-process Node-RED simulator used by the Phase 6 baseline harness.
+
+Besides the webhook-driven baseline patterns, :meth:`NodeRedSimulator.run_load`
+fires commands at an open-loop rate from many simulated sources and
+:meth:`NodeRedSimulator.load_report` correlates them with the decision journal
+by ``correlation_id`` to split send -> enqueue -> execute -> journal latency.
+"""
 
 from __future__ import annotations
 
 import json
 import threading
 import time
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
 from queue import Queue, Empty
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 from urllib import error as urlerror
 from urllib import request as urlrequest
 
@@ -23,6 +31,87 @@ class CommandResult:
     reason: Optional[str] = None
 
 
+# Rotated through by run_load(); every verb is accepted by the command channel.
+DEFAULT_LOAD_MIX: Tuple[Tuple[str, Dict[str, object]], ...] = (
+    ("press", {"pattern": "mid-stairs"}),
+    ("regress", {"pattern": "half-press"}),
+    ("martingale", {"step_key": "field", "delta": 1, "max_level": 4}),
+    ("same_bet", {}),
+    ("press", {"pattern": "mid-stairs"}),
+    ("switch_profile", {"target": "Recovery"}),
+)
+
+LATENCY_SEGMENTS = (
+    "ack",
+    "send_to_enqueue",
+    "enqueue_to_execute",
+    "execute_to_journal",
+    "end_to_end",
+)
+
+
+@dataclass
+class LoadProfile:
+    """Shape of an open-loop load run."""
+
+    rate: float = 50.0  # commands per second, all sources combined
+    duration: float = 5.0  # seconds of sending
+    sources: int = 8  # simulated Node-RED flows, used round-robin
+    concurrency: int = 16  # HTTP sender threads
+    batch: int = 1  # >1 posts that many commands per request to /commands:batch
+    mix: Tuple[Tuple[str, Dict[str, object]], ...] = DEFAULT_LOAD_MIX
+
+
+@dataclass(slots=True)
+class LoadSample:
+    """Wall-clock timeline of one load command, keyed by ``correlation_id``."""
+
+    correlation_id: str
+    source: str
+    action: str
+    sent_at: float
+    acked_at: Optional[float] = None
+    status: int = 0
+    reason: Optional[str] = None
+    enqueued_at: Optional[float] = None
+    executed_at: Optional[float] = None
+    journaled_at: Optional[float] = None
+    executed: Optional[bool] = None
+    rejection_reason: Optional[str] = None
+
+
+def rejection_bucket(reason: Optional[str]) -> str:
+    """Group a command-channel rejection reason for load reports."""
+
+    text = str(reason or "")
+    if text == "rate_limited":
+        return "rate_limit"
+    if text in ("queue_full", "per_source_quota"):
+        return "backpressure"
+    if text in ("circuit_breaker", "duplicate_roll", "transport"):
+        return text
+    if text.startswith("timing:"):
+        return "timing"
+    return "other"
+
+
+def _percentile(sorted_vals: Sequence[float], q: float) -> float:
+    # nearest-rank, matching bench._percentile
+    if not sorted_vals:
+        return 0.0
+    idx = min(len(sorted_vals) - 1, max(0, int(q * len(sorted_vals) + 0.999999) - 1))
+    return sorted_vals[idx]
+
+
+def _latency_summary(values_s: List[float]) -> Dict[str, object]:
+    vals = sorted(v * 1e3 for v in values_s)
+    out: Dict[str, object] = {"count": len(vals)}
+    for label, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+        out[label] = round(_percentile(vals, q), 3)
+    out["max"] = round(vals[-1], 3) if vals else 0.0
+    return out
+
+
 class NodeRedSimulator:
     """Tiny deterministic HTTP simulator for the Phase 6 baseline harness."""
 
@@ -77,6 +166,10 @@ class NodeRedSimulator:
 
         self._rate_limit_pause = 2.8
 
+        self._load_samples: Dict[str, LoadSample] = {}
+        self._load_profile: Optional[LoadProfile] = None
+        self._load_counter = 0
+
     # ------------------------------------------------------------------ server
     def start(self) -> None:
         """Start the webhook listener in a background thread."""
@@ -330,37 +423,276 @@ class NodeRedSimulator:
             "source": self.source,
             "correlation_id": correlation_id,
         }
+        status, reason = self._send(payload)
+
+        with self._lock:
+            self._results.append(
+                CommandResult(
+                    action=action,
+                    correlation_id=correlation_id,
+                    status=status,
+                    reason=reason,
+                )
+            )
+
+    # -------------------------------------------------------------------- load
+    def run_load(
+        self,
+        profile: Optional[LoadProfile] = None,
+        *,
+        run_id: Optional[str] = None,
+    ) -> Dict[str, object]:
+        """
+        Fire ``profile.rate`` commands/second for ``profile.duration`` seconds.
+
+        The schedule is open-loop: command ``i`` is due at ``start + i / rate``
+        whatever the endpoint is doing, and its send time is the due time, so a
+        backed-up sender pool shows up as latency instead of silently lowering
+        the offered rate. Blocks until every response is in and returns
+        :meth:`load_report` without journal correlation.
+        """
+
+        profile = profile or LoadProfile()
+        if profile.rate <= 0:
+            raise ValueError("rate must be > 0")
+        if run_id:
+            with self._lock:
+                self._run_id = run_id
+        with self._lock:
+            active_run = self._run_id
+        if not active_run:
+            raise RuntimeError("run_load needs a run_id (pass one or wait for a webhook)")
+        mix = tuple(profile.mix) or DEFAULT_LOAD_MIX
+        batch_size = max(1, int(profile.batch))
+        pending: List[Tuple[LoadSample, Dict[str, object]]] = []
+        sources = [f"{self.source}-{k}" for k in range(max(1, int(profile.sources)))]
+        total = max(0, int(profile.rate * profile.duration))
+        interval = 1.0 / profile.rate
+        self._load_profile = profile
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, int(profile.concurrency)), thread_name_prefix="node-red-load"
+        ) as pool:
+            wall0 = time.time()
+            mono0 = time.perf_counter()
+            for i in range(total):
+                due = i * interval
+                wait = due - (time.perf_counter() - mono0)
+                if wait > 0:
+                    time.sleep(wait)
+                with self._lock:
+                    self._load_counter += 1
+                    seq = self._load_counter
+                action, args = mix[i % len(mix)]
+                sample = LoadSample(
+                    correlation_id=f"{self.source}-load-{seq:06d}",
+                    source=sources[i % len(sources)],
+                    action=str(action),
+                    sent_at=wall0 + due,
+                )
+                with self._lock:
+                    self._load_samples[sample.correlation_id] = sample
+                if batch_size <= 1:
+                    pool.submit(self._post_load, sample, active_run, dict(args))
+                    continue
+                pending.append((sample, dict(args)))
+                if len(pending) >= batch_size:
+                    pool.submit(self._post_load_batch, pending, active_run)
+                    pending = []
+            if pending:
+                pool.submit(self._post_load_batch, pending, active_run)
+        return self.load_report()
+
+    def _post_load_batch(
+        self, items: List[Tuple[LoadSample, Dict[str, object]]], run_id: str
+    ) -> None:
+        url = self.command_url.rstrip("/") + ":batch"
+        status, body = self._post_json(
+            url,
+            {
+                "run_id": run_id,
+                "commands": [
+                    {
+                        "action": sample.action,
+                        "args": args,
+                        "source": sample.source,
+                        "correlation_id": sample.correlation_id,
+                    }
+                    for sample, args in items
+                ],
+            },
+        )
+        acked = time.time()
+        results = body.get("results") if isinstance(body, dict) else None
+        if not isinstance(results, list) or len(results) != len(items):
+            results = [{} for _ in items]
+        for (sample, _), result in zip(items, results):
+            sample.acked_at = acked
+            if not status:
+                sample.reason = "transport"
+                continue
+            queued = isinstance(result, dict) and result.get("status") == "queued"
+            # per-command outcome mapped onto the single-command status codes
+            sample.status = 202 if queued else 400
+            if not queued:
+                sample.reason = str((result or {}).get("reason") or status)
+
+    def _post_load(self, sample: LoadSample, run_id: str, args: Dict[str, object]) -> None:
+        status, reason = self._send(
+            {
+                "run_id": run_id,
+                "action": sample.action,
+                "args": args,
+                "source": sample.source,
+                "correlation_id": sample.correlation_id,
+            }
+        )
+        sample.acked_at = time.time()
+        sample.status = status
+        sample.reason = reason if status else "transport"
+
+    @property
+    def load_samples(self) -> Tuple[LoadSample, ...]:
+        with self._lock:
+            return tuple(self._load_samples.values())
+
+    def correlate_journal(self, journal_path: str | Path) -> int:
+        """
+        Fill enqueue/execute/journal stamps from a decision journal (JSONL).
+
+        Rows are matched on ``correlation_id``; a row carrying ``executed_at``
+        (written when the controller dispatched the command) wins over the
+        rejection row journaled at enqueue time. Returns the number of samples
+        matched.
+        """
+
+        with self._lock:
+            samples = dict(self._load_samples)
+        matched = set()
+        try:
+            handle = Path(journal_path).open("r", encoding="utf-8")
+        except OSError:
+            return 0
+        with handle:
+            for line in handle:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                sample = samples.get(str(row.get("correlation_id")))
+                if sample is None:
+                    continue
+                if sample.executed_at is not None and row.get("executed_at") is None:
+                    continue
+                sample.enqueued_at = row.get("enqueued_at", sample.enqueued_at)
+                sample.executed_at = row.get("executed_at", sample.executed_at)
+                sample.journaled_at = row.get("timestamp")
+                sample.executed = bool(row.get("executed"))
+                sample.rejection_reason = row.get("rejection_reason")
+                matched.add(sample.correlation_id)
+        return len(matched)
+
+    def load_report(self, journal_path: Optional[str | Path] = None) -> Dict[str, object]:
+        """
+        Summarize the load run: throughput, rejection breakdown and latency percentiles.
+
+        With ``journal_path`` the controller-side stamps are correlated first so
+        execute-time rejections (``duplicate_roll``, ``timing:*``) and the
+        enqueue/execute/journal segments are included. All stamps are
+        ``time.time()`` values, so the endpoint must share this host's clock.
+        """
+
+        if journal_path is not None:
+            self.correlate_journal(journal_path)
+        samples = self.load_samples
+        accepted = executed = 0
+        rejected: Dict[str, int] = {}
+        reasons: Dict[str, int] = {}
+        segments: Dict[str, List[float]] = {name: [] for name in LATENCY_SEGMENTS}
+        first_sent: Optional[float] = None
+        last_done: Optional[float] = None
+        for sample in samples:
+            if first_sent is None or sample.sent_at < first_sent:
+                first_sent = sample.sent_at
+            done = sample.journaled_at or sample.acked_at
+            if done is not None and (last_done is None or done > last_done):
+                last_done = done
+            if sample.acked_at is not None:
+                segments["ack"].append(sample.acked_at - sample.sent_at)
+            if sample.status == 202:
+                accepted += 1
+                reason = sample.rejection_reason if sample.executed is False else None
+            else:
+                reason = sample.reason or str(sample.status)
+            if sample.executed:
+                executed += 1
+            if reason:
+                reasons[reason] = reasons.get(reason, 0) + 1
+                bucket = rejection_bucket(reason)
+                rejected[bucket] = rejected.get(bucket, 0) + 1
+            if sample.enqueued_at is not None:
+                segments["send_to_enqueue"].append(sample.enqueued_at - sample.sent_at)
+                if sample.executed_at is not None:
+                    segments["enqueue_to_execute"].append(sample.executed_at - sample.enqueued_at)
+            if sample.executed_at is not None and sample.journaled_at is not None:
+                segments["execute_to_journal"].append(sample.journaled_at - sample.executed_at)
+                segments["end_to_end"].append(sample.journaled_at - sample.sent_at)
+
+        elapsed = (last_done - first_sent) if first_sent is not None and last_done else 0.0
+        profile = self._load_profile
+
+        def _per_s(n: int) -> float:
+            return round(n / elapsed, 3) if elapsed > 0 else 0.0
+
+        return {
+            "profile": asdict(profile) if profile is not None else None,
+            "attempted": len(samples),
+            "accepted": accepted,
+            "executed": executed,
+            "elapsed_s": round(elapsed, 3),
+            "throughput": {
+                "offered_per_s": float(profile.rate) if profile is not None else 0.0,
+                "sent_per_s": _per_s(len(samples)),
+                "accepted_per_s": _per_s(accepted),
+                "executed_per_s": _per_s(executed),
+            },
+            "rejected": rejected,
+            "rejected_reasons": reasons,
+            "latency_ms": {name: _latency_summary(vals) for name, vals in segments.items()},
+        }
+
+    def _post_json(self, url: str, payload: object) -> Tuple[int, object]:
+        """POST JSON; returns ``(status, decoded body)`` with status 0 on transport errors."""
+
         data = json.dumps(payload).encode("utf-8")
         req = urlrequest.Request(
-            self.command_url,
+            url,
             data=data,
             headers={"Content-Type": "application/json"},
             method="POST",
         )
-
-        status = 0
-        reason: Optional[str] = None
         try:
             with urlrequest.urlopen(req, timeout=self.timeout) as resp:
-                resp.read()
+                raw = resp.read()
                 status = resp.getcode()
         except urlerror.HTTPError as exc:  # pragma: no cover - exercised in harness
             status = exc.code
             try:
-                body = exc.read().decode("utf-8")
-                decoded = json.loads(body) if body else {}
-                reason = str(decoded.get("reason")) if isinstance(decoded, dict) else None
+                raw = exc.read()
             except Exception:
-                reason = None
+                raw = b""
         except Exception:  # pragma: no cover - network issue
-            status = 0
+            return 0, None
+        try:
+            return status, json.loads(raw.decode("utf-8")) if raw else None
+        except Exception:
+            return status, None
 
-        with self._lock:
-            self._results.append(
-                CommandResult(
-                    action=action,
-                    correlation_id=correlation_id,
-                    status=status,
-                    reason=reason,
-                )
-            )
+    def _send(self, payload: Dict[str, object]) -> Tuple[int, Optional[str]]:
+        """POST one command; returns ``(status, reason)`` with status 0 on transport errors."""
+
+        status, body = self._post_json(self.command_url, payload)
+        reason: Optional[str] = None
+        if status and status != 202 and isinstance(body, dict) and "reason" in body:
+            reason = str(body.get("reason"))
+        return status, reason
@@ -1,12 +1,17 @@
 import itertools
 import json
+import math
 import os
 import re
 from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 # Reuse the C1 batch runner
 from . import batch_runner
+from .aggregator import collect_rows
+from .comparator import make_leaderboard
+from .rng import RngStreams
+from .run.artifacts import RUN_METRICS_NAME, normalize_artifact_level
 
 
 # Optional YAML dependency; fall back to JSON
@@ -51,10 +56,16 @@ def _name_from_vars(base: str, kvs: Dict[str, Any]) -> str:
     return "__".join(parts) + ".json"
 
 
+def _overlay(base_spec: Dict[str, Any], overrides: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # Shallow insert of vars at top-level keys; nested values stay shared with the template
+    return {**base_spec, **(overrides or {})}
+
+
 @dataclass
 class ExpandedItem:
     path: str  # filesystem path to spec (or original .zip path)
     input_type: str  # "spec" or "zip"
+    overrides: Optional[Dict[str, Any]] = None  # grid items: top-level keys laid over the template
 
 
 def _expand_explicit(plan: Dict[str, Any]) -> Tuple[List[ExpandedItem], str]:
@@ -69,60 +80,203 @@ def _expand_explicit(plan: Dict[str, Any]) -> Tuple[List[ExpandedItem], str]:
     return items, out_dir
 
 
-def _expand_grid(plan: Dict[str, Any]) -> Tuple[List[ExpandedItem], str]:
+class GridExpansion(Sequence[ExpandedItem]):
+    """
+    Lazy cartesian product of a grid plan's ``vars``.
+
+    Items are produced on demand (``len`` and indexing decode the product
+    without building it). Each item is an override map over the one shared
+    template spec; :meth:`spec_for` lays it over the template without
+    copying the rest. ``path`` is where the spec is written only when the
+    plan asks for ``write_specs``; :meth:`source_for` is what a run records
+    as its origin (the written spec, else the template path).
+    """
+
+    def __init__(
+        self,
+        base_spec: Dict[str, Any],
+        vars_map: Dict[str, List[Any]],
+        sweep_root: str,
+        base_name: str,
+        template_path: Optional[str] = None,
+    ) -> None:
+        self.base_spec = base_spec
+        self.keys = list(vars_map.keys())
+        self.values = [list(vars_map[k]) for k in self.keys]
+        self.sweep_root = sweep_root
+        self.base_name = base_name
+        self.template_path = template_path
+        self.specs_written = False
+
+    def __len__(self) -> int:
+        n = 1
+        for vals in self.values:
+            n *= len(vals)
+        return n
+
+    def _item(self, combo: Tuple[Any, ...]) -> ExpandedItem:
+        kv = dict(zip(self.keys, combo))
+        path = os.path.join(self.sweep_root, _name_from_vars(self.base_name, kv))
+        return ExpandedItem(path=path, input_type="spec", overrides=kv)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError(index)
+        combo = []
+        for vals in reversed(self.values):
+            index, digit = divmod(index, len(vals))
+            combo.append(vals[digit])
+        return self._item(tuple(reversed(combo)))
+
+    def __iter__(self) -> Iterator[ExpandedItem]:
+        for combo in itertools.product(*self.values):
+            yield self._item(combo)
+
+    def spec_for(self, item: ExpandedItem) -> Dict[str, Any]:
+        return _overlay(self.base_spec, item.overrides)
+
+    def source_for(self, item: ExpandedItem) -> str:
+        return item.path if self.specs_written else (self.template_path or item.path)
+
+    def write_spec(self, item: ExpandedItem) -> str:
+        _dump_json(item.path, self.spec_for(item))
+        return item.path
+
+
+class SampledExpansion(Sequence[ExpandedItem]):
+    """
+    ``n`` sampled override maps over the template (``sample:`` block of a plan).
+
+    ``method: random`` draws each var independently; ``method: lhs`` is a
+    Latin hypercube: every var's range is cut into ``n`` strata and each
+    stratum is used exactly once. A var is either a list of choices or a
+    ``{low, high}`` range (integers when both bounds are integers).
+    """
+
+    def __init__(
+        self,
+        base_spec: Dict[str, Any],
+        vars_map: Dict[str, Any],
+        sample: Dict[str, Any],
+        sweep_root: str,
+        base_name: str,
+        template_path: Optional[str] = None,
+    ) -> None:
+        self.base_spec = base_spec
+        self.sweep_root = sweep_root
+        self.base_name = base_name
+        self.template_path = template_path
+        self.specs_written = False
+        method = str(sample.get("method", "random")).lower()
+        if method not in ("random", "lhs"):
+            raise ValueError(f"Unsupported sample method: {method}")
+        n = int(sample.get("n", 10))
+        rng = RngStreams(sample.get("seed")).stream("sample").python_random()
+        columns = {}
+        for key, domain in vars_map.items():
+            if method == "lhs":
+                strata = list(range(n))
+                rng.shuffle(strata)
+                points = [(k + rng.random()) / n for k in strata]
+            else:
+                points = [rng.random() for _ in range(n)]
+            columns[key] = [_sample_value(domain, u) for u in points]
+        self.combos = [{k: col[i] for k, col in columns.items()} for i in range(n)]
+
+    def __len__(self) -> int:
+        return len(self.combos)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        kv = self.combos[index]
+        path = os.path.join(self.sweep_root, _name_from_vars(self.base_name, kv))
+        return ExpandedItem(path=path, input_type="spec", overrides=kv)
+
+    def spec_for(self, item: ExpandedItem) -> Dict[str, Any]:
+        return _overlay(self.base_spec, item.overrides)
+
+    def source_for(self, item: ExpandedItem) -> str:
+        return item.path if self.specs_written else (self.template_path or item.path)
+
+    def write_spec(self, item: ExpandedItem) -> str:
+        _dump_json(item.path, self.spec_for(item))
+        return item.path
+
+
+def _sample_value(domain: Any, u: float) -> Any:
+    """Map ``u`` in [0, 1) onto a list of choices or a ``{low, high}`` range."""
+
+    if isinstance(domain, dict):
+        low, high = domain["low"], domain["high"]
+        if isinstance(low, int) and isinstance(high, int):
+            return min(high, low + int(u * (high - low + 1)))
+        return low + u * (high - low)
+    choices = list(domain)
+    return choices[min(len(choices) - 1, int(u * len(choices)))]
+
+
+def _expand_grid(plan: Dict[str, Any]) -> Tuple[Sequence[ExpandedItem], str]:
     """
-    Grid expansion: cartesian product of listed vars; write temp spec copies with substituted values.
+    Grid expansion: lazy cartesian product of listed vars over the template spec
+    (or ``sample.n`` random/LHS draws from them when the plan has a ``sample`` block).
+    Spec files are written under ``sweep_root`` only with ``write_specs: true``.
     We do NOT mutate .zip inputs in grid mode; only template-driven spec expansion is supported here.
     """
     out_dir = plan.get("out_dir", "exports")
     template_path = plan["template"]
     vars_map: Dict[str, List[Any]] = plan.get("vars", {})
-    # Safety limit
-    max_items = int(plan.get("max_items", 200))
-    keys = list(vars_map.keys())
-    values_product = list(itertools.product(*[vars_map[k] for k in keys])) if keys else [()]
-    if len(values_product) > max_items and not plan.get("force", False):
-        raise ValueError(
-            f"Grid expansion ({len(values_product)}) exceeds max_items={max_items}. Use force:true to override."
-        )
 
     # Load template spec
     with open(template_path, "r", encoding="utf-8") as f:
         base_spec = json.load(f)
 
-    # Write expanded specs under a temp dir colocated with out_dir for determinism and cleanup
     sweep_root = plan.get("sweep_root") or os.path.join(out_dir, "_sweep_specs")
-    os.makedirs(sweep_root, exist_ok=True)
-
     # Determine a readable base name
     base_name = os.path.splitext(os.path.basename(template_path))[0]
-    expanded: List[ExpandedItem] = []
-    for combo in values_product:
-        kv = {k: v for k, v in zip(keys, combo)}
-        spec = json.loads(json.dumps(base_spec))  # deep copy
-        # Shallow insert of vars at top-level keys; advanced templating can come later
-        for k, v in kv.items():
-            spec[k] = v
-        fn = _name_from_vars(base_name, kv)
-        out_spec_path = os.path.join(sweep_root, fn)
-        _dump_json(out_spec_path, spec)
-        expanded.append(ExpandedItem(path=out_spec_path, input_type="spec"))
-    return expanded, out_dir
-
-
-def expand_plan(plan_path: str) -> Tuple[List[ExpandedItem], str, Dict[str, Any]]:
+    grid: Union[GridExpansion, SampledExpansion]
+    if isinstance(plan.get("sample"), dict):
+        grid = SampledExpansion(
+            base_spec, vars_map, plan["sample"], sweep_root, base_name, template_path
+        )
+    else:
+        grid = GridExpansion(base_spec, vars_map, sweep_root, base_name, template_path)
+
+    # Safety limit: only binding when specs go to disk, or when the plan sets it
+    write_specs = bool(plan.get("write_specs", False))
+    if "max_items" in plan or write_specs:
+        max_items = int(plan.get("max_items", 200))
+        if len(grid) > max_items and not plan.get("force", False):
+            raise ValueError(
+                f"Grid expansion ({len(grid)}) exceeds max_items={max_items}. Use force:true to override."
+            )
+    if write_specs:
+        for item in grid:
+            grid.write_spec(item)
+        grid.specs_written = True
+    return grid, out_dir
+
+
+def expand_plan(plan_path: str) -> Tuple[Sequence[ExpandedItem], str, Dict[str, Any]]:
     plan = _load_struct(plan_path)
     mode = (plan.get("mode") or "explicit").lower()
     if mode == "explicit":
         items, out_dir = _expand_explicit(plan)
-    elif mode == "grid":
+    elif mode in ("grid", "halving"):
         items, out_dir = _expand_grid(plan)
     else:
         raise ValueError(f"Unsupported sweep mode: {mode}")
     return items, out_dir, plan
 
 
-def _to_batch_plan(items: List[ExpandedItem], out_dir: str, base: Dict[str, Any]) -> Dict[str, Any]:
+def _to_batch_plan(
+    items: Sequence[ExpandedItem], out_dir: str, base: Dict[str, Any]
+) -> Dict[str, Any]:
     bp = {
         "items": [{"path": it.path} for it in items],
         "out_dir": out_dir,
@@ -132,15 +286,215 @@ def _to_batch_plan(items: List[ExpandedItem], out_dir: str, base: Dict[str, Any]
         bp["engine_version"] = base["engine_version"]
     if "csc_version" in base:
         bp["csc_version"] = base["csc_version"]
+    if base.get("artifacts"):
+        bp["artifacts"] = base["artifacts"]
     return bp
 
 
-def run_sweep(plan_path: str) -> str:
+def _run_grid(
+    grid: Union[GridExpansion, SampledExpansion],
+    out_dir: str,
+    base: Dict[str, Any],
+    plan_path: str,
+    artifacts: Optional[str],
+) -> str:
+    """Stream grid items straight into the batch runner; the manifest is written as runs finish."""
+
+    level = normalize_artifact_level(artifacts or base.get("artifacts"), "standard")
+    os.makedirs(out_dir, exist_ok=True)
+    header: Dict[str, Any] = {
+        "plan": os.path.basename(plan_path),
+        "out_dir": out_dir,
+        "artifacts": level,
+    }
+    if level == "metrics-only":
+        header["metrics_path"] = os.path.join(out_dir, RUN_METRICS_NAME)
+    streams = RngStreams(base["seed"]) if base.get("seed") is not None else None
+    if streams is not None:
+        header["seed"] = streams.seed
+    writer = batch_runner.BatchManifestWriter(os.path.join(out_dir, "batch_manifest.json"), header)
+    try:
+        for index, item in enumerate(grid):
+            rec = batch_runner.run_spec_item(
+                grid.spec_for(item),
+                grid.source_for(item),
+                out_dir,
+                engine_version=base.get("engine_version", "engine-unknown"),
+                csc_version=base.get("csc_version", "csc-unknown"),
+                artifacts=level,
+                default_seed=streams.item_seed(index) if streams is not None else None,
+            )
+            rec["overrides"] = item.overrides
+            writer.add(rec)
+    finally:
+        writer.close()
+    return writer.path
+
+
+# ---------------------------------------------------------------------------
+# Successive halving
+# ---------------------------------------------------------------------------
+
+
+def _halving_eta(cfg: Dict[str, Any]) -> int:
+    eta = int(cfg.get("eta", 3))
+    if eta < 2:
+        raise ValueError(f"halving.eta must be at least 2, got {eta}")
+    return eta
+
+
+def _halving_rungs(cfg: Dict[str, Any]) -> List[int]:
+    """Roll budget per rung: ``rolls: [...]``, else ``min_rolls`` x ``eta``^k up to ``max_rolls``."""
+
+    eta = _halving_eta(cfg)
+    if cfg.get("rolls"):
+        rungs = [int(r) for r in cfg["rolls"]]
+        if rungs[0] <= 0 or any(b <= a for a, b in zip(rungs, rungs[1:])):
+            raise ValueError(f"halving.rolls must be positive and increasing, got {rungs}")
+        return rungs
+    budget = int(cfg.get("min_rolls", 100))
+    if budget <= 0:
+        raise ValueError(f"halving.min_rolls must be positive, got {budget}")
+    max_rolls = int(cfg.get("max_rolls", budget * eta * eta))
+    if max_rolls < budget:
+        raise ValueError(f"halving.max_rolls ({max_rolls}) is below min_rolls ({budget})")
+    rungs = []
+    while budget < max_rolls:
+        rungs.append(budget)
+        budget *= eta
+    rungs.append(max_rolls)
+    return rungs
+
+
+def _with_rolls(spec: Dict[str, Any], rolls: int) -> Dict[str, Any]:
+    run = dict(spec["run"]) if isinstance(spec.get("run"), dict) else {}
+    run["rolls"] = rolls
+    return {**spec, "run": run}
+
+
+def _run_halving(
+    candidates: Sequence[ExpandedItem],
+    out_dir: str,
+    base: Dict[str, Any],
+    plan_path: str,
+    artifacts: Optional[str],
+) -> str:
+    """
+    Successive halving over the expanded candidates.
+
+    Every candidate runs at the first rung's roll budget; the runs are ranked
+    with :func:`comparator.make_leaderboard` on ``halving.metric`` and the top
+    ``1/eta`` go on to the next (larger) budget. With ``same_dice`` (default)
+    a candidate keeps its seed, so each rung replays the previous rung's dice
+    and extends them. Survivors are rerun from roll 0 (live-engine runs cannot
+    be checkpointed), so a candidate reaching rung k costs the sum of the
+    budgets up to k, not just the last one. Lower rungs are ``metrics-only``;
+    the last rung uses the plan's artifact profile and its records are the
+    manifest ``items``.
+    """
+
+    cfg = base.get("halving") or {}
+    metric = cfg.get("metric", "ROI")
+    eta = _halving_eta(cfg)
+    rungs = _halving_rungs(cfg)
+    same_dice = bool(cfg.get("same_dice", True))
+    base_seed = cfg.get("seed", base.get("seed"))
+    streams = RngStreams(base_seed)
+    level = normalize_artifact_level(artifacts or base.get("artifacts"), "standard")
+    engine_version = base.get("engine_version", "engine-unknown")
+    csc_version = base.get("csc_version", "csc-unknown")
+    os.makedirs(out_dir, exist_ok=True)
+
+    survivors = list(range(len(candidates)))
+    rung_log: List[Dict[str, Any]] = []
+    records: List[Dict[str, Any]] = []
+    for rung, rolls in enumerate(rungs):
+        last = rung == len(rungs) - 1
+        rung_level = level if last else "metrics-only"
+        records = []
+        for idx in survivors:
+            item = candidates[idx]
+            seed = streams.item(idx).item_seed(0 if same_dice else rung)
+            rec = batch_runner.run_spec_item(
+                _with_rolls(candidates.spec_for(item), rolls),  # type: ignore[attr-defined]
+                candidates.source_for(item),  # type: ignore[attr-defined]
+                out_dir,
+                engine_version=engine_version,
+                csc_version=csc_version,
+                artifacts=rung_level,
+                seed={"seed": seed},
+            )
+            rec.update({"overrides": item.overrides, "candidate": idx, "rung": rung})
+            records.append(rec)
+
+        rows, _ = collect_rows(out_dir, records, use_index=False)
+        for row, rec in zip(rows, records):
+            row["candidate"] = rec["candidate"]
+        keep = len(rows) if last else max(1, math.ceil(len(survivors) / eta))
+        ranked = make_leaderboard(rows, metric, top_k=keep)
+        rung_log.append(
+            {
+                "rung": rung,
+                "rolls": rolls,
+                "artifacts": rung_level,
+                "candidates": len(survivors),
+                "kept": [row["candidate"] for row in ranked] if not last else [],
+                "results": [
+                    {
+                        "candidate": row["candidate"],
+                        "run_id": row["run_id"],
+                        "overrides": rec["overrides"],
+                        "status": row["status"],
+                        metric: row.get(metric),
+                        "error": row.get("error"),
+                    }
+                    for row, rec in zip(rows, records)
+                ],
+            }
+        )
+        survivors = [row["candidate"] for row in ranked]
+        if not survivors:
+            break
+
+    manifest: Dict[str, Any] = {
+        "plan": os.path.basename(plan_path),
+        "out_dir": out_dir,
+        "artifacts": level,
+        "mode": "halving",
+        "halving": {
+            "metric": metric,
+            "eta": eta,
+            "same_dice": same_dice,
+            "seed": streams.seed,
+            "rungs": rung_log,
+            "leaders": survivors,
+        },
+        "items": records,
+    }
+    if level == "metrics-only" or len(rungs) > 1:
+        manifest["metrics_path"] = os.path.join(out_dir, RUN_METRICS_NAME)
+    manifest_path = os.path.join(out_dir, "batch_manifest.json")
+    _dump_json(manifest_path, manifest)
+    return manifest_path
+
+
+def run_sweep(plan_path: str, *, artifacts: Optional[str] = None) -> str:
     """
     Expand the sweep plan, write a transient batch plan, call batch runner, and return path to batch_manifest.json.
+
+    ``mode: halving`` runs a successive-halving search (see :func:`_run_halving`).
+    Grid plans are streamed item by item without spec files or a derived batch
+    plan (unless ``write_specs: true``), so memory stays flat at any grid size.
+    ``artifacts`` overrides the plan's ``artifacts`` profile (full|standard|metrics-only).
     """
     items, out_dir, base = expand_plan(plan_path)
+    if (base.get("mode") or "").lower() == "halving":
+        return _run_halving(items, out_dir, base, plan_path, artifacts)
+    if isinstance(items, (GridExpansion, SampledExpansion)) and not base.get("write_specs", False):
+        return _run_grid(items, out_dir, base, plan_path, artifacts)
     batch_plan = _to_batch_plan(items, out_dir, base)
+    if artifacts:
+        batch_plan["artifacts"] = artifacts
     # Serialize the derived batch plan next to the input sweep plan for traceability
     derived_batch_plan_path = os.path.join(out_dir, "derived_batch_plan.json")
     os.makedirs(out_dir, exist_ok=True)
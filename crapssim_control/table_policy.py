@@ -0,0 +1,192 @@
+"""
+table_policy.py -- compiled, immutable table/risk policy.
+
+The spec's ``table`` block, ``run.table_mins``, the optional ``table_rules``
+profile and the ``run.risk`` policy are merged once per session into a
+:class:`TablePolicy`. Per-roll consumers (legalizer, template
+renderer, early-stop checks) then consult precomputed fields instead of
+re-merging dicts on every call.
+
+Public:
+  - TablePolicy
+  - compile_table_policy(spec, *, risk_policy=None)
+  - DEFAULT_TABLE_POLICY
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional
+
+from .config import get_table_mins
+from .legalize import LEGALIZE_DEFAULTS, _PLACE_INCREMENTS
+from .risk_schema import RiskPolicy
+from .table_rules import get_table_rules
+
+_EMPTY: Mapping[Any, Any] = MappingProxyType({})
+
+# Standard 3-4-5x odds table keyed by point number.
+_ODDS_3_4_5X = {4: 3.0, 10: 3.0, 5: 4.0, 9: 4.0, 6: 5.0, 8: 5.0}
+
+
+@dataclass(frozen=True)
+class TablePolicy:
+    """Immutable per-session view of table limits, increments and risk caps."""
+
+    # Legalizer config (defaults merged with spec.table); passed straight to
+    # ``legalize_amount`` in place of a dict.
+    legalize_cfg: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    bubble: bool = False
+    place_steps: Mapping[int, int] = field(default_factory=lambda: _EMPTY)
+    odds_multiples: Mapping[int, float] = field(default_factory=lambda: _EMPTY)
+
+    # Minimum-bet thresholds (run.table_mins) reduced to the three situations
+    # the early-stop check cares about.
+    table_mins: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    min_comeout: float = 0.0
+    min_point: float = 0.0
+    min_point_with_odds: float = 0.0
+
+    # Risk caps
+    max_heat: Optional[float] = None
+    max_drawdown_pct: Optional[float] = None
+    has_bet_caps: bool = False
+    max_bet_cap: float = float("-inf")
+    bet_caps: Mapping[str, float] = field(default_factory=lambda: _EMPTY)
+
+    # Resolved table_rules profile (informational) and the risk policy the
+    # caps were read from
+    table_rules: Mapping[str, Any] = field(default_factory=lambda: _EMPTY)
+    risk_policy: Optional[RiskPolicy] = None
+
+    def place_step(self, number: int) -> int:
+        return self.place_steps.get(number, 1)
+
+    def odds_multiple(self, point: Optional[int] = None) -> float:
+        if point is not None:
+            mult = self.odds_multiples.get(point)
+            if mult is not None:
+                return mult
+        return float(self.legalize_cfg.get("max_odds_multiple", 3.0))
+
+    def min_bet(self, *, point_on: bool, has_flat_line: bool = False) -> float:
+        """Smallest legal wager given the current table state."""
+
+        if not point_on:
+            return self.min_comeout
+        return self.min_point_with_odds if has_flat_line else self.min_point
+
+    def drawdown_exceeded(self, bankroll: float, peak: float) -> bool:
+        """Mirror of ``PolicyEngine.check_drawdown`` (inverted)."""
+
+        if not self.max_drawdown_pct or peak <= 0:
+            return False
+        return ((peak - bankroll) / peak) * 100 > self.max_drawdown_pct
+
+    def caps_allow(self, amount: float) -> bool:
+        """True when no caps are configured or at least one cap admits ``amount``."""
+
+        if not self.has_bet_caps:
+            return True
+        return self.max_bet_cap >= amount
+
+
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _compile_odds_multiples(rules: Mapping[str, Any]) -> Dict[int, float]:
+    odds_cfg = ((rules.get("max") or {}) if isinstance(rules, Mapping) else {}).get("odds")
+    if not isinstance(odds_cfg, Mapping):
+        return {}
+    typ = odds_cfg.get("type")
+    if typ == "3_4_5x":
+        return dict(_ODDS_3_4_5X)
+    if typ == "flat":
+        mult = _as_float(odds_cfg.get("multiplier"))
+        if mult is not None and mult > 0:
+            return {pt: mult for pt in _ODDS_3_4_5X}
+    return {}
+
+
+def compile_table_policy(
+    spec: Optional[Dict[str, Any]],
+    *,
+    risk_policy: Optional[RiskPolicy] = None,
+) -> TablePolicy:
+    """
+    Merge table config, table_rules and risk policy into a TablePolicy.
+
+    When ``risk_policy`` is None, heat and caps fall back to the raw
+    ``run.risk`` block (mirroring how the adapter behaves without a
+    PolicyEngine attached) and drawdown checks are disabled.
+    """
+    spec = spec if isinstance(spec, dict) else {}
+    table = spec.get("table") if isinstance(spec.get("table"), dict) else {}
+
+    cfg = dict(LEGALIZE_DEFAULTS)
+    cfg.update(table)
+    bubble = bool(cfg.get("bubble", False))
+
+    place_steps: Dict[int, int] = {}
+    for num, step_cfg in _PLACE_INCREMENTS.items():
+        if bubble:
+            place_steps[num] = 1
+        elif step_cfg == "cfg_410":
+            place_steps[num] = int(cfg.get("place_410_increment", 5))
+        else:
+            place_steps[num] = int(step_cfg or 1)
+
+    rules = get_table_rules(spec)
+    mins = get_table_mins(spec)
+    place_unit = mins.get("place_unit") or {}
+    place_min = min(float(place_unit[str(n)]) for n in _PLACE_INCREMENTS)
+    line_min = float(mins["line"])
+    field_min = float(mins["field"])
+    odds_min = float(mins["odds_unit"])
+
+    run_cfg = spec.get("run") if isinstance(spec.get("run"), dict) else {}
+    raw_risk = run_cfg.get("risk") if isinstance(run_cfg.get("risk"), dict) else {}
+
+    max_heat: Optional[float] = None
+    if risk_policy is not None:
+        max_heat = risk_policy.max_heat
+    if max_heat is None:
+        max_heat = _as_float(raw_risk.get("max_heat"))
+
+    if risk_policy is not None and isinstance(risk_policy.bet_caps, dict):
+        raw_caps: Mapping[str, Any] = risk_policy.bet_caps
+    elif isinstance(raw_risk.get("bet_caps"), dict):
+        raw_caps = raw_risk["bet_caps"]
+    else:
+        raw_caps = {}
+    caps: Dict[str, float] = {}
+    for key, value in raw_caps.items():
+        cap = _as_float(value)
+        if cap is not None:
+            caps[str(key)] = cap
+
+    return TablePolicy(
+        legalize_cfg=MappingProxyType(cfg),
+        bubble=bubble,
+        place_steps=MappingProxyType(place_steps),
+        odds_multiples=MappingProxyType(_compile_odds_multiples(rules)),
+        table_mins=MappingProxyType(mins),
+        min_comeout=min(line_min, field_min),
+        min_point=min(field_min, place_min),
+        min_point_with_odds=min(field_min, place_min, odds_min),
+        max_heat=max_heat,
+        max_drawdown_pct=risk_policy.max_drawdown_pct if risk_policy is not None else None,
+        has_bet_caps=bool(raw_caps),
+        max_bet_cap=max(caps.values()) if caps else float("-inf"),
+        bet_caps=MappingProxyType(caps),
+        table_rules=MappingProxyType(rules),
+        risk_policy=risk_policy,
+    )
+
+
+DEFAULT_TABLE_POLICY = compile_table_policy({})
@@ -34,6 +34,7 @@ from typing import Dict, List, Optional, Any
 
 from .eval import try_eval
 from .legalize import legalize_amount
+from .table_policy import DEFAULT_TABLE_POLICY, TablePolicy
 from .actions import make_action  # Action Envelope helper
 
 
@@ -51,18 +52,6 @@ def _bool(x: Any, default: bool = False) -> bool:
     return default
 
 
-def _cfg(table_cfg: Optional[Dict]) -> Dict:
-    cfg = {
-        "bubble": False,
-        "level": 10,
-        "place_410_increment": 5,
-        "max_odds_multiple": 3.0,
-    }
-    if table_cfg:
-        cfg.update(table_cfg)
-    return cfg
-
-
 def _coerce_float(val: Any) -> float:
     if isinstance(val, (int, float)):
         return float(val)
@@ -95,12 +84,15 @@ def render_template(
     template: Dict,
     state: Dict,
     event: Dict,
-    table_cfg: Optional[Dict] = None,
+    table_cfg: Optional[Dict | TablePolicy] = None,
 ) -> Dict[str, Dict]:
     """
     Evaluate a template into canonical desired_bets (already legalized).
+
+    ``table_cfg`` may be a raw table dict or a compiled TablePolicy; with
+    neither, the precompiled default policy is used.
     """
-    cfg = _cfg(table_cfg or {})
+    cfg = table_cfg or DEFAULT_TABLE_POLICY
     desired: Dict[str, Dict[str, Any]] = {}
     point = event.get("point") or state.get("point")
     on_comeout = bool(event.get("on_comeout", state.get("on_comeout", False)))
@@ -1,6 +1,8 @@
 from __future__ import annotations
 from typing import Iterable, Tuple, List, Dict, Any
 
+from .parity_stream import ParityResult, stream_parity
+
 
 def run_parity_test(
     inprocess_engine,
@@ -33,3 +35,19 @@ def run_parity_test(
         )
 
     return results
+
+
+def run_parity_stream(
+    inprocess_engine,
+    http_engine,
+    dice_stream: Iterable[Tuple[int, int]],
+    steps: int,
+) -> ParityResult:
+    """
+    Streaming counterpart of :func:`run_parity_test` for long dice streams.
+
+    Thin wrapper over :func:`~crapssim_control.testing.parity_stream.stream_parity`:
+    memory stays constant in ``steps`` and the result carries the rolling digest,
+    plus the first divergent roll and its leaf-level diff when the engines disagree.
+    """
+    return stream_parity(inprocess_engine, http_engine, dice_stream, steps=steps)
@@ -0,0 +1,216 @@
+"""
+http_engine_stub.py -- minimal local stand-in for the remote engine HTTP API.
+
+Speaks the endpoint set used by :class:`crapssim_control.transport.HTTPTransport`
+(``session``, ``action``, ``roll``, ``snapshot``, ``version``, ``capabilities``)
+plus the one-round-trip ``step`` (apply + roll + snapshot) and ``roll_many``
+endpoints used by ``KeepAliveHTTPTransport``, with seeded dice and a tiny
+pass-line state machine. It exists so benchmarks and tests can exercise the
+HTTP transports without a real engine service. Pass ``combined=False`` to
+emulate an engine that only has the single-call endpoints.
+
+    server, base_url = serve_stub_engine()
+    transport = HTTPTransport(base_url=base_url)
+    ...
+    server.shutdown()
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import socket
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from uuid import uuid4
+
+STUB_ENGINE_VERSION = "stub-http-1.0"
+BASE_PATH = "/api/engine"
+
+
+class _StubSession:
+    def __init__(self, seed: Optional[int]) -> None:
+        self.session_id = uuid4().hex
+        self.rng = random.Random(seed)
+        self.bankroll = 1000.0
+        self.point: Optional[int] = None
+        self.hand_id = 1
+        self.roll_in_hand = 0
+        self.bets: Dict[str, float] = {}
+        self.actions = 0
+
+    def apply(self, verb: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        self.actions += 1
+        amount = args.get("amount") if isinstance(args, dict) else None
+        try:
+            amt = float(amount) if amount is not None else 0.0
+        except (TypeError, ValueError):
+            amt = 0.0
+        if amt > 0:
+            self.bets[str(verb)] = self.bets.get(str(verb), 0.0) + amt
+            self.bankroll -= amt
+        return {"verb": verb, "args": args, "status": "ok", "applied": amt > 0}
+
+    def roll(self, dice: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+        if dice is None:
+            dice = (self.rng.randint(1, 6), self.rng.randint(1, 6))
+        d1, d2 = int(dice[0]), int(dice[1])
+        total = d1 + d2
+        self.roll_in_hand += 1
+        if self.point is None:
+            if total in (4, 5, 6, 8, 9, 10):
+                self.point = total
+        elif total == self.point:
+            self.point = None
+        elif total == 7:
+            self.point = None
+            self.bets.clear()
+            self.hand_id += 1
+            self.roll_in_hand = 0
+        return {"dice": [d1, d2], "total": total, "snapshot": self.snapshot()}
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "session_id": self.session_id,
+            "bankroll": self.bankroll,
+            "point_on": self.point is not None,
+            "point_value": self.point,
+            "bets": dict(self.bets),
+            "hand_id": self.hand_id,
+            "roll_in_hand": self.roll_in_hand,
+        }
+
+
+class StubEngineServer(ThreadingHTTPServer):
+    """Threaded HTTP server holding stub sessions; ``requests`` counts handled calls."""
+
+    daemon_threads = True
+
+    def __init__(self, addr: Tuple[str, int], *, combined: bool = True) -> None:
+        super().__init__(addr, _StubEngineHandler)
+        self.combined = bool(combined)
+        self.sessions: Dict[str, _StubSession] = {}
+        self.last_session: Optional[_StubSession] = None
+        self.requests = 0
+        self.connections = 0
+        self.lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{BASE_PATH}"
+
+
+class _StubEngineHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StubEngineServer
+
+    def log_message(self, fmt: str, *args: Any) -> None:  # pragma: no cover - quiet
+        return
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def _send(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _endpoint(self) -> Optional[str]:
+        path = self.path.split("?", 1)[0]
+        if not path.startswith(BASE_PATH):
+            return None
+        return path[len(BASE_PATH) :].strip("/")
+
+    def _read_json(self) -> Dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length <= 0:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(length).decode("utf-8"))
+        except Exception:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _session(self, payload: Dict[str, Any]) -> Optional[_StubSession]:
+        sid = payload.get("session_id")
+        if sid:
+            return self.server.sessions.get(str(sid))
+        return self.server.last_session
+
+    def do_GET(self) -> None:  # noqa: N802
+        endpoint = self._endpoint()
+        with self.server.lock:
+            self.server.requests += 1
+            if endpoint == "version":
+                self._send(200, {"engine": "stub-http", "version": STUB_ENGINE_VERSION})
+            elif endpoint == "capabilities":
+                self._send(200, {"verbs": ["pass_line", "place_bet", "odds"], "stub": True})
+            elif endpoint == "snapshot":
+                query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+                sess = self._session({"session_id": (query.get("session_id") or [None])[0]})
+                self._send(200, sess.snapshot() if sess else {})
+            else:
+                self._send(404, {"error": "not_found", "path": self.path})
+
+    def do_POST(self) -> None:  # noqa: N802
+        endpoint = self._endpoint()
+        payload = self._read_json()
+        with self.server.lock:
+            self.server.requests += 1
+            if endpoint == "session":
+                spec = payload.get("spec") if isinstance(payload.get("spec"), dict) else {}
+                seed = payload.get("seed")
+                if seed is None:
+                    run_blk = spec.get("run") if isinstance(spec, dict) else None
+                    seed = run_blk.get("seed") if isinstance(run_blk, dict) else None
+                sess = _StubSession(seed)
+                self.server.sessions[sess.session_id] = sess
+                self.server.last_session = sess
+                self._send(200, {"session_id": sess.session_id, "snapshot": sess.snapshot()})
+                return
+            sess = self._session(payload)
+            if sess is None:
+                self._send(400, {"error": "unknown_session"})
+            elif endpoint == "action":
+                args = payload.get("args") if isinstance(payload.get("args"), dict) else {}
+                self._send(200, sess.apply(str(payload.get("verb", "")), args))
+            elif endpoint == "roll":
+                dice = payload.get("dice")
+                self._send(200, sess.roll(tuple(dice) if dice else None))
+            elif endpoint == "step" and self.server.combined:
+                results = [
+                    sess.apply(str(a.get("verb", "")), a.get("args") or {})
+                    for a in payload.get("actions") or []
+                    if isinstance(a, dict)
+                ]
+                dice = payload.get("dice")
+                roll = sess.roll(tuple(dice) if dice else None)
+                self._send(200, {"actions": results, "roll": roll, "snapshot": sess.snapshot()})
+            elif endpoint == "roll_many" and self.server.combined:
+                rolls = [sess.roll(tuple(d)) for d in payload.get("dice") or []]
+                self._send(200, {"rolls": rolls, "snapshot": sess.snapshot()})
+            else:
+                self._send(404, {"error": "not_found", "path": self.path})
+
+
+def serve_stub_engine(
+    host: str = "127.0.0.1", port: int = 0, *, combined: bool = True
+) -> Tuple[StubEngineServer, str]:
+    """Start a stub engine on a background thread; returns ``(server, base_url)``."""
+
+    server = StubEngineServer((host, port), combined=combined)
+    thread = threading.Thread(target=server.serve_forever, name="csc-stub-engine", daemon=True)
+    thread.start()
+    return server, server.base_url
+
+
+__all__ = ["STUB_ENGINE_VERSION", "StubEngineServer", "serve_stub_engine"]
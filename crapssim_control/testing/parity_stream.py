@@ -0,0 +1,386 @@
+"""
+parity_stream.py -- streaming engine parity with rolling snapshot digests.
+
+Two engines are stepped in lockstep over one dice stream. Each roll's snapshot
+is reduced to canonical JSON bytes (:func:`canonical_snapshot_bytes`) and folded
+into a BLAKE2b hash chain, so memory stays O(1) no matter how many rolls are
+checked. The first mismatch stops the run and reports a minimal leaf-level diff
+of the two snapshots.
+
+For runs too large to repeat side by side, :func:`record_digest_chain` stores a
+sparse chain (one 16-byte digest every ``every`` rolls) in a fixed-width binary
+file. :func:`verify_against_chain` checks a fresh run against it, and
+:func:`locate_divergence` narrows a mismatching window down to the exact roll by
+re-running a reference engine over just that window. Two stored chains can be
+compared with :func:`first_divergent_checkpoint` in O(log n) seeks, since a hash
+chain that diverges once never re-converges.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import struct
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+Dice = Tuple[int, int]
+
+# Keys that identify a process/session rather than game state.
+DEFAULT_IGNORE_KEYS = frozenset({"session_id", "raw", "identity", "timestamp", "ts", "engine_info"})
+
+DIGEST_SIZE = 16
+CHAIN_MAGIC = b"CSCCHAIN"
+CHAIN_VERSION = 1
+_HEADER = struct.Struct("<8sHI")  # magic, version, every
+_RECORD = struct.Struct(f"<Q{DIGEST_SIZE}s")  # rolls completed at checkpoint, chain digest
+GENESIS = b"\x00" * DIGEST_SIZE
+
+
+_SCALARS = (str, int, bool, type(None))
+
+
+def _canon_float(value: float) -> Any:
+    if value == 0:
+        return 0.0  # also folds -0.0
+    if value.is_integer():
+        return value
+    if value != value:  # NaN
+        return "nan"
+    rounded = round(value, 6)
+    return 0.0 if rounded == 0 else rounded
+
+
+def _canon(value: Any, ignore: frozenset) -> Any:
+    # Exact-type checks first: snapshots are mostly flat dicts of floats/ints.
+    kind = type(value)
+    if kind is float:
+        return _canon_float(value)
+    if kind in _SCALARS:
+        return value
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            if v is None:
+                continue
+            key = k if type(k) is str else str(k)
+            if key in ignore:
+                continue
+            vk = type(v)
+            if vk is float:
+                out[key] = 0.0 if v == 0 else _canon_float(v)
+            elif vk is int or vk is str or vk is bool:
+                out[key] = v
+            else:
+                out[key] = _canon(v, ignore)
+        return out
+    if isinstance(value, (list, tuple)):
+        return [_canon(v, ignore) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(_canon(v, ignore) for v in value)
+    if isinstance(value, float):
+        return _canon_float(value)
+    return value
+
+
+def canonical_snapshot(snapshot: Any, ignore: Iterable[str] = DEFAULT_IGNORE_KEYS) -> Any:
+    """Normalize a snapshot: drop volatile keys and ``None`` values, round floats, list tuples."""
+
+    return _canon(snapshot, frozenset(ignore))
+
+
+_ENCODER = json.JSONEncoder(sort_keys=True, separators=(",", ":"), default=str)
+
+
+def canonical_snapshot_bytes(snapshot: Any, ignore: Iterable[str] = DEFAULT_IGNORE_KEYS) -> bytes:
+    return _ENCODER.encode(canonical_snapshot(snapshot, ignore)).encode("utf-8")
+
+
+def chain_step(prev: bytes, payload: bytes) -> bytes:
+    return hashlib.blake2b(prev + payload, digest_size=DIGEST_SIZE).digest()
+
+
+def snapshot_diff(a: Any, b: Any, path: str = "") -> Dict[str, Tuple[Any, Any]]:
+    """Return ``{dotted.path: (a_value, b_value)}`` for every differing leaf."""
+
+    if isinstance(a, dict) and isinstance(b, dict):
+        out: Dict[str, Tuple[Any, Any]] = {}
+        for key in sorted(set(a) | set(b), key=str):
+            sub = f"{path}.{key}" if path else str(key)
+            if key not in a:
+                out[sub] = (None, b[key])
+            elif key not in b:
+                out[sub] = (a[key], None)
+            else:
+                out.update(snapshot_diff(a[key], b[key], sub))
+        return out
+    if isinstance(a, list) and isinstance(b, list) and len(a) == len(b):
+        out = {}
+        for idx, (va, vb) in enumerate(zip(a, b)):
+            out.update(snapshot_diff(va, vb, f"{path}[{idx}]"))
+        return out
+    return {} if a == b else {path or "$": (a, b)}
+
+
+def _default_snapshot(engine: Any, result: Any) -> Any:
+    if isinstance(result, dict) and isinstance(result.get("snapshot"), dict):
+        return result["snapshot"]
+    getter = getattr(engine, "snapshot_state", None)
+    return getter() if callable(getter) else result
+
+
+SnapshotFn = Callable[[Any, Any], Any]
+
+
+@dataclass
+class ParityResult:
+    ok: bool
+    rolls: int
+    digest: str
+    first_divergence: Optional[int] = None  # 0-based roll index
+    dice: Optional[Dice] = None
+    diff: Dict[str, Tuple[Any, Any]] = field(default_factory=dict)
+    window: Optional[Tuple[int, int]] = None  # (lo, hi]: rolls-completed bounds of a mismatch
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "ok": self.ok,
+            "rolls": self.rolls,
+            "digest": self.digest,
+            "first_divergence": self.first_divergence,
+            "dice": list(self.dice) if self.dice else None,
+            "diff": {k: list(v) for k, v in self.diff.items()},
+            "window": list(self.window) if self.window else None,
+        }
+
+
+class _Stepper:
+    """Steps one engine and yields canonical snapshot bytes per roll."""
+
+    def __init__(self, engine: Any, snapshot: SnapshotFn, ignore: frozenset) -> None:
+        self.engine = engine
+        self.snapshot = snapshot
+        self.ignore = ignore
+
+    def step(self, dice: Dice) -> Tuple[Any, bytes]:
+        result = self.engine.step_roll(dice=dice)
+        canon = canonical_snapshot(self.snapshot(self.engine, result), self.ignore)
+        return canon, _ENCODER.encode(canon).encode("utf-8")
+
+
+def stream_parity(
+    engine_a: Any,
+    engine_b: Any,
+    dice_stream: Iterable[Dice],
+    *,
+    steps: Optional[int] = None,
+    snapshot: SnapshotFn = _default_snapshot,
+    ignore: Iterable[str] = DEFAULT_IGNORE_KEYS,
+    start_index: int = 0,
+) -> ParityResult:
+    """Step both engines in lockstep; stop at the first differing canonical snapshot."""
+
+    ign = frozenset(ignore)
+    step_a = _Stepper(engine_a, snapshot, ign)
+    step_b = _Stepper(engine_b, snapshot, ign)
+    digest = GENESIS
+    rolls = 0
+    dice_iter: Iterator[Dice] = iter(dice_stream)
+    if steps is not None:
+        dice_iter = islice(dice_iter, int(steps))
+    for dice in dice_iter:
+        canon_a, bytes_a = step_a.step(dice)
+        canon_b, bytes_b = step_b.step(dice)
+        if bytes_a != bytes_b:
+            return ParityResult(
+                ok=False,
+                rolls=rolls,
+                digest=digest.hex(),
+                first_divergence=start_index + rolls,
+                dice=(int(dice[0]), int(dice[1])),
+                diff=snapshot_diff(canon_a, canon_b),
+            )
+        digest = chain_step(digest, bytes_a)
+        rolls += 1
+    return ParityResult(ok=True, rolls=rolls, digest=digest.hex())
+
+
+# ---------------------------------------------------------------------------
+# Stored digest chains
+# ---------------------------------------------------------------------------
+
+
+class DigestChainFile:
+    """Random-access reader over a stored sparse digest chain."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as fh:
+            magic, version, every = _HEADER.unpack(fh.read(_HEADER.size))
+        if magic != CHAIN_MAGIC or version != CHAIN_VERSION:
+            raise ValueError(f"{self.path} is not a v{CHAIN_VERSION} digest chain")
+        self.every = int(every)
+        size = self.path.stat().st_size - _HEADER.size
+        self.count = size // _RECORD.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def checkpoint(self, index: int) -> Tuple[int, bytes]:
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        with self.path.open("rb") as fh:
+            fh.seek(_HEADER.size + index * _RECORD.size)
+            return _RECORD.unpack(fh.read(_RECORD.size))
+
+    def __iter__(self) -> Iterator[Tuple[int, bytes]]:
+        with self.path.open("rb") as fh:
+            fh.seek(_HEADER.size)
+            while chunk := fh.read(_RECORD.size):
+                if len(chunk) < _RECORD.size:
+                    return
+                yield _RECORD.unpack(chunk)
+
+
+def record_digest_chain(
+    engine: Any,
+    dice_stream: Iterable[Dice],
+    path: str | Path,
+    *,
+    steps: Optional[int] = None,
+    every: int = 1024,
+    snapshot: SnapshotFn = _default_snapshot,
+    ignore: Iterable[str] = DEFAULT_IGNORE_KEYS,
+) -> Dict[str, Any]:
+    """Run ``engine`` over ``dice_stream`` and store a checkpoint digest every ``every`` rolls."""
+
+    every = max(1, int(every))
+    stepper = _Stepper(engine, snapshot, frozenset(ignore))
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    digest = GENESIS
+    rolls = 0
+    dice_iter: Iterator[Dice] = iter(dice_stream)
+    if steps is not None:
+        dice_iter = islice(dice_iter, int(steps))
+    with target.open("wb") as fh:
+        fh.write(_HEADER.pack(CHAIN_MAGIC, CHAIN_VERSION, every))
+        for dice in dice_iter:
+            _canon_val, payload = stepper.step(dice)
+            digest = chain_step(digest, payload)
+            rolls += 1
+            if rolls % every == 0:
+                fh.write(_RECORD.pack(rolls, digest))
+        if rolls % every:
+            fh.write(_RECORD.pack(rolls, digest))
+    return {"path": str(target), "rolls": rolls, "every": every, "digest": digest.hex()}
+
+
+def verify_against_chain(
+    engine: Any,
+    dice_stream: Iterable[Dice],
+    path: str | Path,
+    *,
+    snapshot: SnapshotFn = _default_snapshot,
+    ignore: Iterable[str] = DEFAULT_IGNORE_KEYS,
+) -> ParityResult:
+    """Replay ``engine`` against a stored chain; on mismatch report the (lo, hi] window."""
+
+    chain = DigestChainFile(path)
+    stepper = _Stepper(engine, snapshot, frozenset(ignore))
+    dice_iter = iter(dice_stream)
+    digest = GENESIS
+    rolls = 0
+    lo = 0
+    for expected_rolls, expected in chain:
+        while rolls < expected_rolls:
+            dice = next(dice_iter, None)
+            if dice is None:
+                return ParityResult(
+                    ok=False, rolls=rolls, digest=digest.hex(), window=(lo, expected_rolls)
+                )
+            _canon_val, payload = stepper.step(dice)
+            digest = chain_step(digest, payload)
+            rolls += 1
+        if digest != expected:
+            return ParityResult(ok=False, rolls=rolls, digest=digest.hex(), window=(lo, rolls))
+        lo = rolls
+    return ParityResult(ok=True, rolls=rolls, digest=digest.hex())
+
+
+def first_divergent_checkpoint(a: str | Path, b: str | Path) -> Optional[int]:
+    """Binary-search two stored chains for the first differing checkpoint index."""
+
+    chain_a, chain_b = DigestChainFile(a), DigestChainFile(b)
+    if chain_a.every != chain_b.every:
+        raise ValueError("chains were recorded with different checkpoint spacing")
+    n = min(len(chain_a), len(chain_b))
+    lo, hi = 0, n
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if chain_a.checkpoint(mid) == chain_b.checkpoint(mid):
+            lo = mid + 1
+        else:
+            hi = mid
+    if lo < n:
+        return lo
+    return None if len(chain_a) == len(chain_b) else n
+
+
+def locate_divergence(
+    path: str | Path,
+    make_candidate: Callable[[], Any],
+    make_dice: Callable[[], Iterable[Dice]],
+    *,
+    make_reference: Optional[Callable[[], Any]] = None,
+    snapshot: SnapshotFn = _default_snapshot,
+    ignore: Iterable[str] = DEFAULT_IGNORE_KEYS,
+) -> ParityResult:
+    """Find where a fresh candidate run departs from a stored chain.
+
+    The stored checkpoints bound the divergence to one window. When
+    ``make_reference`` is given, both engines are fast-forwarded to the window
+    start and compared roll by roll inside it, yielding the exact roll and diff.
+    """
+
+    coarse = verify_against_chain(
+        make_candidate(), make_dice(), path, snapshot=snapshot, ignore=ignore
+    )
+    if coarse.ok or make_reference is None or coarse.window is None:
+        return coarse
+    lo, hi = coarse.window
+    candidate, reference = make_candidate(), make_reference()
+    dice_iter = iter(make_dice())
+    for dice in islice(dice_iter, lo):
+        candidate.step_roll(dice=dice)
+        reference.step_roll(dice=dice)
+    fine = stream_parity(
+        reference,
+        candidate,
+        dice_iter,
+        steps=hi - lo,
+        snapshot=snapshot,
+        ignore=ignore,
+        start_index=lo,
+    )
+    fine.window = (lo, hi)
+    fine.rolls += lo
+    return fine
+
+
+__all__ = [
+    "DEFAULT_IGNORE_KEYS",
+    "DigestChainFile",
+    "ParityResult",
+    "canonical_snapshot",
+    "canonical_snapshot_bytes",
+    "chain_step",
+    "first_divergent_checkpoint",
+    "locate_divergence",
+    "record_digest_chain",
+    "snapshot_diff",
+    "stream_parity",
+    "verify_against_chain",
+]
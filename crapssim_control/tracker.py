@@ -1,13 +1,99 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List, DefaultDict
+from typing import Dict, Any, Callable, Mapping, Optional, List, DefaultDict, Tuple
 from collections import defaultdict
 
 INSIDE_SET = {5, 6, 8, 9}
 OUTSIDE_SET = {4, 10}
 
 
+@dataclass(slots=True)
+class RollRecord:
+    """
+    One roll as observers see it, parsed once by :meth:`Tracker.on_roll`.
+
+    The tracker reuses a single instance, so observers must copy fields they
+    want to keep past the callback.
+    """
+
+    total: Optional[int] = None  # None when the caller passed something unparseable
+    roll_index: int = 0  # shooter roll count before this roll
+    is_comeout: bool = True
+    point: int = 0  # 0 means off
+    shooter_id: Any = None
+
+
+class TrackerObserver:
+    """
+    Base class for tracker extensions (histograms, bet attribution, ledger).
+
+    Override only the hooks you need: ``Tracker.register_observer`` binds just the
+    overridden ones into flat per-event tuples, so unused hooks cost nothing per
+    roll. ``contribute`` runs only when ``Tracker.snapshot()`` is called.
+    """
+
+    name: str = ""
+
+    def on_roll(self, rec: RollRecord) -> None:
+        pass
+
+    def on_seven_out(self) -> None:
+        pass
+
+    def on_point_established(self, point: int) -> None:
+        pass
+
+    def on_point_made(self) -> None:
+        pass
+
+    def on_bet_placed(self, event: Dict[str, Any]) -> None:
+        pass
+
+    def on_bet_resolved(self, event: Dict[str, Any]) -> None:
+        pass
+
+    def on_bet_cleared(self, event: Dict[str, Any]) -> None:
+        pass
+
+    def on_intent_created(self, event: Dict[str, Any]) -> Optional[int]:
+        return None
+
+    def on_intent_canceled(self, intent_id: int, reason: Optional[str] = None) -> None:
+        pass
+
+    def contribute(self, snap: Dict[str, Any]) -> None:
+        pass
+
+
+_OBSERVER_HOOKS: Tuple[str, ...] = (
+    "on_roll",
+    "on_seven_out",
+    "on_point_established",
+    "on_point_made",
+    "on_bet_placed",
+    "on_bet_resolved",
+    "on_bet_cleared",
+    "on_intent_created",
+    "on_intent_canceled",
+    "contribute",
+)
+
+
+def _coerce_total(value: Any) -> Optional[int]:
+    # Accept on_roll(6), on_roll(6.0) and on_roll({"total": 6}).
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value)
+    if isinstance(value, Mapping) and "total" in value:
+        try:
+            return int(value["total"])
+        except Exception:
+            return None
+    return None
+
+
 @dataclass
 class _RollState:
     last_roll: Optional[int] = None
@@ -53,6 +139,10 @@ class Tracker:
     Game telemetry tracker. All counters are opt-in via config {"enabled": True}.
     Batch-4 adds optional bankroll deep-dive metrics behind config key:
       {"bankroll_extras_enabled": True}
+
+    Extensions subclass :class:`TrackerObserver` and are added with
+    :meth:`register_observer`; they see events whether or not the core counters
+    are enabled.
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None) -> None:
@@ -71,19 +161,67 @@ class Tracker:
         self._current_hand_pnl: float = 0.0
         self._pnl_log: List[float] = []  # per-hand deltas, only exposed when extras flag is on
 
+        self.shooter_id: Any = None
+        self._observers: Dict[str, TrackerObserver] = {}
+        self._hooks: Dict[str, Tuple[Callable[..., Any], ...]] = {h: () for h in _OBSERVER_HOOKS}
+        self._roll_hooks: Tuple[Callable[[RollRecord], None], ...] = ()
+        self._roll_rec = RollRecord()
+
+    # -----------------------------
+    # Observers
+    # -----------------------------
+    def register_observer(self, observer: TrackerObserver) -> TrackerObserver:
+        """Add ``observer`` (replacing one with the same name) and rebuild dispatch tuples."""
+        name = observer.name or type(observer).__name__
+        self._observers.pop(name, None)
+        self._observers[name] = observer
+        self._rebuild_hooks()
+        return observer
+
+    def unregister_observer(self, name: str) -> Optional[TrackerObserver]:
+        observer = self._observers.pop(name, None)
+        if observer is not None:
+            self._rebuild_hooks()
+        return observer
+
+    def observer(self, name: str) -> Optional[TrackerObserver]:
+        return self._observers.get(name)
+
+    def _rebuild_hooks(self) -> None:
+        hooks: Dict[str, List[Callable[..., Any]]] = {h: [] for h in _OBSERVER_HOOKS}
+        for obs in self._observers.values():
+            cls = type(obs)
+            for hook in _OBSERVER_HOOKS:
+                if getattr(cls, hook) is not getattr(TrackerObserver, hook):
+                    hooks[hook].append(getattr(obs, hook))
+        self._hooks = {h: tuple(fns) for h, fns in hooks.items()}
+        self._roll_hooks = self._hooks["on_roll"]
+
     # -----------------------------
     # Public API (events)
     # -----------------------------
-    def on_roll(self, total: int, *, is_comeout: Optional[bool] = None) -> None:
-        if not self.enabled:
+    def on_roll(self, total: Any, *, is_comeout: Optional[bool] = None) -> None:
+        if type(total) is not int:
+            total = _coerce_total(total)
+        # comeout accounting (derive if not provided)
+        comeout = bool(is_comeout) if is_comeout is not None else (self.point.point == 0)
+
+        if self._roll_hooks:
+            rec = self._roll_rec
+            rec.total = total
+            rec.roll_index = self.roll.shooter_rolls
+            rec.is_comeout = comeout
+            rec.point = self.point.point
+            rec.shooter_id = self.shooter_id
+            for hook in self._roll_hooks:
+                hook(rec)
+
+        if not self.enabled or total is None:
             return
 
         self.roll.last_roll = total
         self.hits[total] += 1
 
-        # comeout accounting (derive if not provided)
-        comeout = bool(is_comeout) if is_comeout is not None else (self.point.point == 0)
-
         if comeout:
             self.roll.comeout_rolls += 1
             if total in (7, 11):
@@ -105,6 +243,8 @@ class Tracker:
         self.roll.shooter_rolls += 1
 
     def on_point_established(self, point: int) -> None:
+        for hook in self._hooks["on_point_established"]:
+            hook(point)
         if not self.enabled:
             return
         # Set point and reset since-point counters
@@ -114,6 +254,8 @@ class Tracker:
         self._reset_since_point_buckets()
 
     def on_point_made(self) -> None:
+        for hook in self._hooks["on_point_made"]:
+            hook()
         if not self.enabled:
             return
         # Point turns off, but shooter keeps shooting (same hand).
@@ -124,6 +266,8 @@ class Tracker:
         # Do NOT finalize hand here.
 
     def on_seven_out(self) -> None:
+        for hook in self._hooks["on_seven_out"]:
+            hook()
         if not self.enabled:
             return
         # PSO detection: seven-out on first roll after point established
@@ -177,10 +321,43 @@ class Tracker:
                 # define as 0.0 when there's no drawdown yet
                 self.bankroll.recovery_factor = 0.0
 
+    # -----------------------------
+    # Bet / intent events (dispatched to observers only)
+    # -----------------------------
+    def on_bet_placed(self, event: Dict[str, Any]) -> None:
+        for hook in self._hooks["on_bet_placed"]:
+            hook(event)
+
+    def on_bet_resolved(self, event: Dict[str, Any]) -> None:
+        for hook in self._hooks["on_bet_resolved"]:
+            hook(event)
+
+    def on_bet_cleared(self, event: Dict[str, Any]) -> None:
+        for hook in self._hooks["on_bet_cleared"]:
+            hook(event)
+
+    def on_intent_created(self, event: Dict[str, Any]) -> Optional[int]:
+        result: Optional[int] = None
+        for hook in self._hooks["on_intent_created"]:
+            ret = hook(event)
+            if result is None:
+                result = ret
+        return result
+
+    def on_intent_canceled(self, intent_id: int, reason: Optional[str] = None) -> None:
+        for hook in self._hooks["on_intent_canceled"]:
+            hook(intent_id, reason)
+
     # -----------------------------
     # Snapshots
     # -----------------------------
     def snapshot(self) -> Dict[str, Any]:
+        out = self._core_snapshot()
+        for hook in self._hooks["contribute"]:
+            hook(out)
+        return out
+
+    def _core_snapshot(self) -> Dict[str, Any]:
         if not self.enabled:
             return {}
         out = {
@@ -1,167 +1,95 @@
 # tracker_histograms.py
 from __future__ import annotations
+from array import array
 from typing import Any, Dict, Optional
 
+from .tracker import RollRecord, Tracker, TrackerObserver
+
 INSIDE_SET = {5, 6, 8, 9}
 OUTSIDE_SET = {4, 10, 6, 8}  # maintained for parity with prior language; 6/8 overlap by design
 
 
-def _read_total_from_args(*args, **kwargs) -> Optional[int]:
-    """
-    Be liberal in what we accept:
-      - on_roll(total: int)
-      - on_roll(event: dict with {"total": int})
-      - on_roll(..., total=int)
-    """
-    if "total" in kwargs and isinstance(kwargs["total"], (int, float)):
-        return int(kwargs["total"])
-    if args:
-        # args[0] might be an int OR a dict/event with 'total'
-        a0 = args[0]
-        if isinstance(a0, (int, float)):
-            return int(a0)
-        if isinstance(a0, dict) and "total" in a0:
-            try:
-                return int(a0["total"])
-            except Exception:
-                return None
-    return None
-
-
-def _new_hist_dict() -> Dict[int, int]:
-    # 2..12 inclusive
-    return {n: 0 for n in range(2, 13)}
-
-
-def attach_histograms(tracker: Any, enabled: Optional[bool] = None) -> None:
+def _new_hist() -> array:
+    # index == dice total; slots 0 and 1 stay zero
+    return array("q", bytes(8 * 13))
+
+
+def _render(hist: array) -> Dict[str, int]:
+    return {str(n): hist[n] for n in range(2, 13)}
+
+
+def _count(hist: array, totals: Any) -> int:
+    return sum(hist[n] for n in totals)
+
+
+class HistogramObserver(TrackerObserver):
     """
-    Batch 8 shim:
-      - Tracks per-hand and per-shooter histograms of dice totals.
+    Batch 8 histograms:
+      - Tracks per-hand, per-shooter and per-session histograms of dice totals.
       - Resets hand histogram on seven-out.
-      - Resets shooter histogram when shooter_id changes.
+      - Resets shooter histogram when the tracker's shooter_id changes.
       - Exposes under snapshot()["history"] without breaking existing fields.
 
-    Adds (attributes on tracker):
-      _hist_enabled: bool
-      _hand_hits: dict[int,int]
-      _shooter_hits: dict[int,int]
-      _session_hits: dict[int,int]  # created here if missing; we won't override an existing one
-      _hand_inside_hits, _hand_outside_hits: int
-      _shooter_inside_hits, _shooter_outside_hits: int
-      _hist_last_shooter_id: any
-
-    Wraps:
-      on_roll(...)
-      on_seven_out()           (if present)
-      snapshot()
+    Counts live in arrays indexed by dice total; the inside/outside mirrors are
+    derived from them when a snapshot is taken.
+    """
+
+    name = "histograms"
+
+    def __init__(self, shooter_id: Any = None) -> None:
+        self.hand_hits = _new_hist()
+        self.shooter_hits = _new_hist()
+        self.session_hits = _new_hist()
+        self._last_shooter_id = shooter_id
+
+    def reset_hand(self) -> None:
+        self.hand_hits = _new_hist()
+
+    def reset_shooter(self) -> None:
+        self.shooter_hits = _new_hist()
+
+    def on_roll(self, rec: RollRecord) -> None:
+        # detect shooter change opportunistically (some engines only bump shooter_id outside hooks)
+        if rec.shooter_id != self._last_shooter_id:
+            self.reset_shooter()
+            self._last_shooter_id = rec.shooter_id
+
+        total = rec.total
+        if total is None or not 2 <= total <= 12:
+            return
+        self.hand_hits[total] += 1
+        self.shooter_hits[total] += 1
+        self.session_hits[total] += 1
+
+    def on_seven_out(self) -> None:
+        self.reset_hand()
+
+    def contribute(self, snap: Dict[str, Any]) -> None:
+        snap.setdefault("history", {})
+        snap["history"].update(
+            {
+                "hand_hits": _render(self.hand_hits),
+                "shooter_hits": _render(self.shooter_hits),
+                "session_hits": _render(self.session_hits),
+                "hand_inside_hits": _count(self.hand_hits, INSIDE_SET),
+                "hand_outside_hits": _count(self.hand_hits, OUTSIDE_SET),
+                "shooter_inside_hits": _count(self.shooter_hits, INSIDE_SET),
+                "shooter_outside_hits": _count(self.shooter_hits, OUTSIDE_SET),
+            }
+        )
+
+
+def attach_histograms(tracker: Tracker, enabled: Optional[bool] = None) -> None:
+    """
+    Register a :class:`HistogramObserver` on ``tracker``.
+
+    ``enabled=None`` reads ``hand_histograms_enabled`` (default True) from
+    ``tracker.config`` when present; disabling removes a previously attached one.
     """
-    # enablement
     if enabled is None:
         cfg = getattr(tracker, "config", {}) or {}
         enabled = bool(cfg.get("hand_histograms_enabled", True))
-    tracker._hist_enabled = bool(enabled)
-
-    # init counters
-    if not hasattr(tracker, "_hand_hits"):
-        tracker._hand_hits = _new_hist_dict()
-    if not hasattr(tracker, "_shooter_hits"):
-        tracker._shooter_hits = _new_hist_dict()
-    # don't clobber an existing session-wide dict if you already maintain one
-    if not hasattr(tracker, "_session_hits"):
-        tracker._session_hits = _new_hist_dict()
-
-    tracker._hand_inside_hits = getattr(tracker, "_hand_inside_hits", 0)
-    tracker._hand_outside_hits = getattr(tracker, "_hand_outside_hits", 0)
-    tracker._shooter_inside_hits = getattr(tracker, "_shooter_inside_hits", 0)
-    tracker._shooter_outside_hits = getattr(tracker, "_shooter_outside_hits", 0)
-
-    tracker._hist_last_shooter_id = getattr(tracker, "shooter_id", None)
-
-    # ---- helpers to reset layers ------------------------------------------
-    def _reset_hand_layer():
-        tracker._hand_hits = _new_hist_dict()
-        tracker._hand_inside_hits = 0
-        tracker._hand_outside_hits = 0
-
-    def _reset_shooter_layer():
-        tracker._shooter_hits = _new_hist_dict()
-        tracker._shooter_inside_hits = 0
-        tracker._shooter_outside_hits = 0
-
-    tracker.reset_hand_hist = _reset_hand_layer
-    tracker.reset_shooter_hist = _reset_shooter_layer
-
-    # ---- wrap on_roll -------------------------------------------------------
-    prev_on_roll = getattr(tracker, "on_roll", None)
-
-    def on_roll_wrapper(*args, **kwargs):
-        if tracker._hist_enabled:
-            # detect shooter change opportunistically (some engines only bump shooter_id outside explicit hooks)
-            current_sid = getattr(tracker, "shooter_id", None)
-            if current_sid != tracker._hist_last_shooter_id:
-                _reset_shooter_layer()
-                tracker._hist_last_shooter_id = current_sid
-
-            total = _read_total_from_args(*args, **kwargs)
-            if isinstance(total, int) and 2 <= total <= 12:
-                # increment three layers (session assumed safe here)
-                tracker._hand_hits[total] = tracker._hand_hits.get(total, 0) + 1
-                tracker._shooter_hits[total] = tracker._shooter_hits.get(total, 0) + 1
-                # if the host has its own session counters, prefer those; else maintain our local
-                if hasattr(tracker, "hits") and isinstance(tracker.hits, dict):
-                    tracker.hits[total] = tracker.hits.get(total, 0) + 1
-                else:
-                    tracker._session_hits[total] = tracker._session_hits.get(total, 0) + 1
-
-                # inside/outside mirrors
-                if total in INSIDE_SET:
-                    tracker._hand_inside_hits += 1
-                    tracker._shooter_inside_hits += 1
-                if total in OUTSIDE_SET:
-                    tracker._hand_outside_hits += 1
-                    tracker._shooter_outside_hits += 1
-
-        if callable(prev_on_roll):
-            return prev_on_roll(*args, **kwargs)
-
-    if callable(prev_on_roll):
-        setattr(tracker, "on_roll", on_roll_wrapper)
-
-    # ---- wrap seven-out reset if available ---------------------------------
-    for seven_hook_name in ("on_seven_out", "on_point_seven_out", "on_hand_end"):
-        prev = getattr(tracker, seven_hook_name, None)
-        if callable(prev):
-
-            def make_wrapper(prev_func):
-                def _wrap(*a, **k):
-                    if tracker._hist_enabled:
-                        _reset_hand_layer()
-                    return prev_func(*a, **k)
-
-                return _wrap
-
-            setattr(tracker, seven_hook_name, make_wrapper(prev))
-
-    # ---- snapshot wrapper ---------------------------------------------------
-    prev_snapshot = getattr(tracker, "snapshot")
-
-    def snapshot_with_hist(*args, **kwargs):
-        snap = prev_snapshot(*args, **kwargs)
-        if tracker._hist_enabled:
-            # choose the best session dict to display
-            session_hits = tracker.hits if hasattr(tracker, "hits") else tracker._session_hits
-            snap.setdefault("history", {})
-            snap["history"].update(
-                {
-                    "hand_hits": {str(k): int(v) for k, v in tracker._hand_hits.items()},
-                    "shooter_hits": {str(k): int(v) for k, v in tracker._shooter_hits.items()},
-                    "session_hits": {str(k): int(v) for k, v in session_hits.items()},
-                    "hand_inside_hits": int(tracker._hand_inside_hits),
-                    "hand_outside_hits": int(tracker._hand_outside_hits),
-                    "shooter_inside_hits": int(tracker._shooter_inside_hits),
-                    "shooter_outside_hits": int(tracker._shooter_outside_hits),
-                }
-            )
-        return snap
-
-    setattr(tracker, "snapshot", snapshot_with_hist)
+    if not enabled:
+        tracker.unregister_observer(HistogramObserver.name)
+        return
+    tracker.register_observer(HistogramObserver(shooter_id=tracker.shooter_id))
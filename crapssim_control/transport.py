@@ -7,9 +7,14 @@ Provides a unified interface for CSC to communicate with CrapsSim or future API
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import http.client
 import importlib
 import json
+import select
+import socket
+import threading
+import urllib.parse
 import urllib.request
 from urllib.error import HTTPError, URLError
 
@@ -177,7 +182,394 @@ class HTTPTransport(EngineTransport):
         return self._get("capabilities")
 
 
+class _PipelineUnsupported(Exception):
+    """Raised when a pipelined response cannot be framed (no Content-Length, chunked, ...)."""
+
+
+class _StaleConnection(ConnectionError):
+    """Raised when a reused pooled connection failed while the request was being sent."""
+
+
+class _ConnectionPool:
+    """LIFO pool of idle keep-alive ``http.client`` connections to one host."""
+
+    def __init__(self, scheme: str, host: str, port: Optional[int], timeout: float, size: int):
+        self._factory = (
+            http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        )
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+        self._size = max(1, int(size))
+        self._idle: List[http.client.HTTPConnection] = []
+        self._lock = threading.Lock()
+        self.opened = 0
+
+    def acquire(self) -> http.client.HTTPConnection:
+        with self._lock:
+            while self._idle:
+                conn = self._idle.pop()
+                if not self._dropped(conn):
+                    return conn
+                conn.close()
+            self.opened += 1
+        return self._factory(self._host, self._port, timeout=self._timeout)
+
+    @staticmethod
+    def _dropped(conn: http.client.HTTPConnection) -> bool:
+        """True if the server closed (or wrote to) an idle connection."""
+
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+    @staticmethod
+    def connect(conn: http.client.HTTPConnection) -> None:
+        """Open ``conn`` if needed with Nagle disabled (small JSON writes, latency-bound)."""
+
+        if conn.sock is None:
+            conn.connect()
+            try:
+                conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except OSError:
+                pass
+
+    def release(self, conn: http.client.HTTPConnection, *, reuse: bool = True) -> None:
+        if reuse:
+            with self._lock:
+                if len(self._idle) < self._size:
+                    self._idle.append(conn)
+                    return
+        conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+
+def _read_framed_response(fp: Any) -> Tuple[int, bytes, bool]:
+    """Read one Content-Length framed HTTP/1.1 response; returns (status, body, keep_alive)."""
+
+    status_line = fp.readline(65537)
+    if not status_line:
+        raise ConnectionError("connection closed before response")
+    parts = status_line.decode("iso-8859-1").split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+        raise _PipelineUnsupported(f"bad status line: {status_line!r}")
+    status = int(parts[1])
+    length: Optional[int] = None
+    keep_alive = parts[0] == "HTTP/1.1"
+    while True:
+        line = fp.readline(65537)
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("iso-8859-1").partition(":")
+        key = name.strip().lower()
+        value = value.strip()
+        if key == "content-length":
+            length = int(value)
+        elif key == "transfer-encoding" and value.lower() != "identity":
+            raise _PipelineUnsupported("chunked responses cannot be pipelined")
+        elif key == "connection":
+            keep_alive = value.lower() == "keep-alive" or (keep_alive and value.lower() != "close")
+    if length is None:
+        raise _PipelineUnsupported("response without Content-Length")
+    body = fp.read(length)
+    if len(body) != length:
+        raise ConnectionError("short read on pipelined response")
+    return status, body, keep_alive
+
+
+class KeepAliveHTTPTransport(HTTPTransport):
+    """HTTPTransport over pooled keep-alive connections, built for one round trip per roll.
+
+    * Connections are reused from a small pool instead of one TCP handshake per call.
+    * With ``coalesce`` (default) :meth:`apply` queues actions locally; the next
+      :meth:`step` sends them together with the roll and a snapshot request in a
+      single combined ``POST step`` call, and :meth:`snapshot` is served from the
+      snapshot that call returned. Queued actions are only visible to the engine
+      after the next :meth:`step` or :meth:`flush`.
+    * :meth:`step_many` rolls a list of dice in one ``POST roll_many`` call.
+    * Engines without the combined endpoints are detected on first 404/405 and
+      served by pipelining the equivalent single calls on one connection (when
+      ``pipeline`` is on), so they still cost one round trip.
+    """
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:5000/api/engine",
+        timeout: int = 5,
+        *,
+        pool_size: int = 4,
+        pipeline: bool = True,
+        coalesce: bool = True,
+    ) -> None:
+        super().__init__(base_url=base_url, timeout=timeout)
+        parsed = urllib.parse.urlsplit(self.base_url)
+        self._base_path = parsed.path.rstrip("/")
+        self._pool = _ConnectionPool(
+            parsed.scheme or "http", parsed.hostname or "localhost", parsed.port, timeout, pool_size
+        )
+        self.pipeline = bool(pipeline)
+        self.coalesce = bool(coalesce)
+        self._pending: List[Dict[str, Any]] = []
+        self._last_snapshot: Optional[Dict[str, Any]] = None
+        self._combined_supported: Optional[bool] = None
+        self._roll_many_supported: Optional[bool] = None
+        self.round_trips = 0
+
+    # ----- wire helpers -----
+
+    def _path(self, endpoint: str) -> str:
+        return f"{self._base_path}/{endpoint.lstrip('/')}"
+
+    @staticmethod
+    def _decode(endpoint: str, status: int, body: bytes) -> Dict[str, Any]:
+        if status >= 400:
+            return {"error": f"HTTP Error {status}", "endpoint": endpoint, "status": status}
+        try:
+            data = json.loads(body.decode("utf-8")) if body else {}
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            return {"error": str(exc), "endpoint": endpoint}
+        return data if isinstance(data, dict) else {"result": data}
+
+    def _request(
+        self, method: str, endpoint: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        data = json.dumps(payload or {}).encode("utf-8") if method == "POST" else None
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        last_exc: Optional[BaseException] = None
+        # Only a reused connection that fails while sending is retried: the server closed it,
+        # so it never saw the request. Once the request is out (or on a fresh connection, or
+        # a timeout) the engine may already have rolled or bet, so the error is returned.
+        for _attempt in range(2):
+            conn = self._pool.acquire()
+            reused = conn.sock is not None
+            try:
+                self._pool.connect(conn)
+                conn.request(method, self._path(endpoint), body=data, headers=headers)
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                last_exc = exc
+                if reused and not isinstance(exc, TimeoutError):
+                    continue
+                break
+            try:
+                resp = conn.getresponse()
+                body = resp.read()
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                last_exc = exc
+                break
+            self._pool.release(conn, reuse=not resp.will_close)
+            self.round_trips += 1
+            return self._decode(endpoint, resp.status, body)
+        return {"error": str(last_exc), "endpoint": endpoint}
+
+    def _send_pipelined(
+        self,
+        conn: http.client.HTTPConnection,
+        calls: Sequence[Tuple[str, str, Optional[Dict[str, Any]]]],
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        self._pool.connect(conn)
+        host = conn.host if conn.port is None else f"{conn.host}:{conn.port}"
+        wire = bytearray()
+        for method, endpoint, payload in calls:
+            body = json.dumps(payload or {}).encode("utf-8") if method == "POST" else b""
+            head = f"{method} {self._path(endpoint)} HTTP/1.1\r\nHost: {host}\r\n"
+            if method == "POST":
+                head += f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+            wire += head.encode("ascii") + b"\r\n" + body
+        try:
+            conn.sock.sendall(bytes(wire))
+        except TimeoutError:
+            raise
+        except OSError as exc:
+            raise _StaleConnection(str(exc)) from exc
+        out: List[Dict[str, Any]] = []
+        reuse = True
+        with conn.sock.makefile("rb") as fp:
+            for _method, endpoint, _payload in calls:
+                status, body, keep_alive = _read_framed_response(fp)
+                reuse = reuse and keep_alive
+                out.append(self._decode(endpoint, status, body))
+        return out, reuse
+
+    def _pipelined(
+        self, calls: Sequence[Tuple[str, str, Optional[Dict[str, Any]]]]
+    ) -> List[Dict[str, Any]]:
+        """Send ``calls`` back-to-back on one connection, then read the responses in order."""
+
+        if not self.pipeline or len(calls) <= 1:
+            return [self._request(m, e, p) for m, e, p in calls]
+        last_exc: Optional[BaseException] = None
+        # As in _request, only a reused connection that fails while sending is retried;
+        # anything after the calls went out is reported, since POSTs are not idempotent.
+        for _attempt in range(2):
+            conn = self._pool.acquire()
+            reused = conn.sock is not None
+            try:
+                out, reuse = self._send_pipelined(conn, calls)
+            except _StaleConnection as exc:
+                conn.close()
+                last_exc = exc
+                if reused:
+                    continue
+                break
+            except _PipelineUnsupported as exc:
+                # The calls already reached the engine; fall back for later calls only.
+                conn.close()
+                self.pipeline = False
+                last_exc = exc
+                break
+            except (http.client.HTTPException, OSError) as exc:
+                conn.close()
+                last_exc = exc
+                break
+            self._pool.release(conn, reuse=reuse)
+            self.round_trips += 1
+            return out
+        return [{"error": str(last_exc), "endpoint": e} for _m, e, _p in calls]
+
+    def _post(self, endpoint: str, payload: Dict[str, Any] | None) -> Dict[str, Any]:
+        return self._request("POST", endpoint, payload)
+
+    def _get(self, endpoint: str) -> Dict[str, Any]:
+        return self._request("GET", endpoint)
+
+    def _snapshot_endpoint(self) -> str:
+        if not self.session_id:
+            return "snapshot"
+        return "snapshot?" + urllib.parse.urlencode({"session_id": self.session_id})
+
+    @staticmethod
+    def _unsupported(response: Dict[str, Any]) -> bool:
+        return response.get("status") in (404, 405)
+
+    def _roll_payload(self, dice: Optional[Tuple[int, int]], seed: Optional[int]) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"session_id": self.session_id}
+        if dice:
+            payload["dice"] = list(dice)
+        if seed is not None:
+            payload["seed"] = seed
+        return payload
+
+    # ----- EngineTransport -----
+
+    def start_session(self, spec: Dict[str, Any]) -> None:
+        self._pending = []
+        response = self._post("session", {"spec": spec})
+        self.session_id = response.get("session_id")
+        snap = response.get("snapshot")
+        self._last_snapshot = dict(snap) if isinstance(snap, dict) else None
+
+    def apply(self, verb: str, args: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.coalesce:
+            self._last_snapshot = None
+            return super().apply(verb, args)
+        self._pending.append({"verb": verb, "args": dict(args or {})})
+        return {"verb": verb, "args": args, "status": "queued"}
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """Send queued actions now (pipelined) and return their responses."""
+
+        pending, self._pending = self._pending, []
+        if not pending:
+            return []
+        calls = [("POST", "action", {**a, "session_id": self.session_id}) for a in pending]
+        calls.append(("GET", self._snapshot_endpoint(), None))
+        *results, snap = self._pipelined(calls)
+        self._last_snapshot = snap if "error" not in snap else None
+        return results
+
+    def step_with_actions(
+        self,
+        actions: Sequence[Dict[str, Any]] = (),
+        dice: Optional[Tuple[int, int]] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Apply ``actions``, roll and snapshot in one round trip.
+
+        Returns ``{"actions": [...], "roll": {...}, "snapshot": {...}}``.
+        """
+
+        acts = [{"verb": a.get("verb"), "args": dict(a.get("args") or {})} for a in actions]
+        roll_payload = self._roll_payload(dice, seed)
+        if self._combined_supported is not False:
+            response = self._post("step", {**roll_payload, "actions": acts, "snapshot": True})
+            if not self._unsupported(response):
+                self._combined_supported = True
+                snap = response.get("snapshot")
+                self._last_snapshot = dict(snap) if isinstance(snap, dict) else None
+                return response
+            self._combined_supported = False
+        calls: List[Tuple[str, str, Optional[Dict[str, Any]]]] = [
+            ("POST", "action", {**a, "session_id": self.session_id}) for a in acts
+        ]
+        calls.append(("POST", "roll", roll_payload))
+        calls.append(("GET", self._snapshot_endpoint(), None))
+        *action_results, roll, snap = self._pipelined(calls)
+        self._last_snapshot = snap if "error" not in snap else None
+        return {"actions": action_results, "roll": roll, "snapshot": snap}
+
+    def step(
+        self,
+        dice: Optional[Tuple[int, int]] = None,
+        seed: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        pending, self._pending = self._pending, []
+        response = self.step_with_actions(pending, dice, seed)
+        roll = response.get("roll")
+        return roll if isinstance(roll, dict) else response
+
+    def step_many(
+        self, dice_list: Sequence[Tuple[int, int]], seed: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Roll every entry of ``dice_list`` in one round trip; queued actions go first."""
+
+        if self._pending:
+            self.flush()
+        dice_payload = [list(d) for d in dice_list]
+        if not dice_payload:
+            return []
+        if self._roll_many_supported is not False:
+            payload: Dict[str, Any] = {"session_id": self.session_id, "dice": dice_payload}
+            if seed is not None:
+                payload["seed"] = seed
+            response = self._post("roll_many", payload)
+            if not self._unsupported(response):
+                self._roll_many_supported = True
+                snap = response.get("snapshot")
+                self._last_snapshot = dict(snap) if isinstance(snap, dict) else None
+                rolls = response.get("rolls")
+                return list(rolls) if isinstance(rolls, list) else [response]
+            self._roll_many_supported = False
+        calls = [("POST", "roll", self._roll_payload(tuple(d), seed)) for d in dice_payload]
+        calls.append(("GET", self._snapshot_endpoint(), None))
+        *rolls, snap = self._pipelined(calls)
+        self._last_snapshot = snap if "error" not in snap else None
+        return rolls
+
+    def snapshot(self) -> Dict[str, Any]:
+        if self._last_snapshot is not None:
+            return dict(self._last_snapshot)
+        snap = self._get(self._snapshot_endpoint())
+        if "error" not in snap:
+            self._last_snapshot = snap
+        return snap
+
+    def close(self) -> None:
+        self._pool.close()
+
+
 TRANSPORTS = {
     "local": LocalTransport,
     "http": HTTPTransport,
+    "http_keepalive": KeepAliveHTTPTransport,
 }
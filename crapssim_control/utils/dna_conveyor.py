@@ -10,6 +10,7 @@ __all__ = [
     "spec_seed_fingerprint",
     "unpack_bundle",
     "repack_with_artifacts",
+    "pack_spec_with_artifacts",
 ]
 
 
@@ -144,3 +145,22 @@ def repack_with_artifacts(
                 zout.write(abs_path, arcname=rel)
         for abs_path, arcname in artifact_entries:
             zout.write(abs_path, arcname=arcname)
+
+
+def pack_spec_with_artifacts(
+    spec: Dict[str, Any],
+    artifacts_dir: str,
+    output_zip_path: str,
+    artifacts_prefix: str = "artifacts/",
+) -> None:
+    """
+    Zip an in-memory spec as ``spec.json`` plus CSC artifacts under
+    `artifacts_prefix`. Used for sweep items that never exist as files.
+    """
+    with zipfile.ZipFile(output_zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zout:
+        zout.writestr("spec.json", json.dumps(spec, indent=2, sort_keys=True))
+        for root, _, files in os.walk(artifacts_dir):
+            for fn in files:
+                abs_path = os.path.join(root, fn)
+                rel = os.path.relpath(abs_path, artifacts_dir).replace("\\", "/")
+                zout.write(abs_path, arcname=artifacts_prefix + rel)
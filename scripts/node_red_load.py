@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""Size the external command channel with an open-loop Node-RED load run."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in os.sys.path:
+    os.sys.path.insert(0, str(ROOT))
+
+from crapssim_control.simulators import LoadProfile  # noqa: E402
+from crapssim_control.simulators.load_harness import run_command_load  # noqa: E402
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rate", type=float, default=50.0, help="Commands per second (all sources)."
+    )
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds of sending.")
+    parser.add_argument("--sources", type=int, default=8, help="Simulated Node-RED flows.")
+    parser.add_argument("--concurrency", type=int, default=16, help="HTTP sender threads.")
+    parser.add_argument("--batch", type=int, default=1, help="Commands per /commands:batch post.")
+    parser.add_argument("--roll-interval", type=float, default=0.01, help="Seconds between rolls.")
+    parser.add_argument("--limits", type=Path, help="JSON file overriding run.external.limits.")
+    parser.add_argument("--seed", type=int, default=4242)
+    parser.add_argument("--workdir", type=Path, default=ROOT / "out" / "node_red_load")
+    parser.add_argument("--out", type=Path, help="Write the report JSON here as well.")
+    args = parser.parse_args()
+
+    limits = json.loads(args.limits.read_text(encoding="utf-8")) if args.limits else None
+    profile = LoadProfile(
+        rate=args.rate,
+        duration=args.duration,
+        sources=args.sources,
+        concurrency=args.concurrency,
+        batch=args.batch,
+    )
+    report = run_command_load(
+        profile,
+        workdir=args.workdir,
+        roll_interval=args.roll_interval,
+        limits=limits,
+        seed=args.seed,
+    )
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(text + "\n", encoding="utf-8")
+    print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+import json
+import os
+import zipfile
+from pathlib import Path
+
+from crapssim_control.aggregator import METRICS_INDEX_NAME, _summarize_rows, aggregate
+
+
+def _write_json(path, obj):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, sort_keys=True)
+
+
+def _report(final, hands=50):
+    return {
+        "summary": {
+            "bankroll_start": 1000,
+            "bankroll_final": final,
+            "hands_played": hands,
+            "rolls": hands * 5,
+            "max_drawdown": 10,
+            "pso_count": 1,
+            "points_made": 4,
+        },
+        "by_bet_family": {"top_name": "pass_line"},
+    }
+
+
+def _mk_batch(out_dir, finals):
+    items = []
+    for i, final in enumerate(finals):
+        run_dir = out_dir / f"R{i:02d}"
+        _write_json(run_dir / "report.json", _report(final, hands=40 + i))
+        items.append(
+            {
+                "run_id": f"R{i:02d}",
+                "source": f"specs/{i}.json",
+                "input_type": "spec",
+                "status": "success",
+                "artifacts_dir": str(run_dir),
+                "output_zip": None,
+            }
+        )
+    _write_json(out_dir / "batch_manifest.json", {"out_dir": str(out_dir), "items": items})
+    return items
+
+
+def test_reaggregate_reads_only_new_or_changed_reports(tmp_path):
+    out_dir = tmp_path / "exports"
+    items = _mk_batch(out_dir, [1100, 900, 1000, 1250])
+
+    first = aggregate(str(out_dir), top_k=3, write_comparisons=True, workers=4)
+    assert first["reports_read"] == 4
+    assert os.path.isfile(out_dir / METRICS_INDEX_NAME)
+    first_aggs = json.loads(Path(first["aggregates_path"]).read_text("utf-8"))
+
+    second = aggregate(str(out_dir), top_k=3, write_comparisons=True, workers=4)
+    assert second["reports_read"] == 0
+    assert json.loads(Path(second["aggregates_path"]).read_text("utf-8")) == first_aggs
+
+    # Append a run, then change a single existing report.
+    _mk_batch(out_dir, [1100, 900, 1000, 1250, 800])
+    third = aggregate(str(out_dir), top_k=3, write_comparisons=True)
+    assert third["rows"] == 5 and third["reports_read"] >= 1
+
+    changed = Path(items[1]["artifacts_dir"]) / "report.json"
+    _write_json(changed, _report(700, hands=12))
+    st = changed.stat()
+    os.utime(changed, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    fourth = aggregate(str(out_dir), top_k=3)
+    assert fourth["reports_read"] == 1
+    index = json.loads(Path(fourth["index_path"]).read_text("utf-8"))
+    assert next(r for r in index if r["run_id"] == "R01")["hands"] == 12
+
+    # A cold aggregate without the index yields identical outputs.
+    cold = aggregate(str(out_dir), top_k=3, use_index=False, workers=1)
+    assert cold["reports_read"] == 5
+    assert Path(cold["aggregates_path"]).read_text("utf-8") == Path(
+        fourth["aggregates_path"]
+    ).read_text("utf-8")
+
+
+def test_running_summary_matches_sorted_top_k():
+    rows = [
+        {"run_id": "a", "ROI": 0.1},
+        {"run_id": "b", "ROI": 0.3},
+        {"run_id": "c", "ROI": None},
+        {"run_id": "d", "ROI": 0.3},
+        {"run_id": "e", "ROI": -0.2},
+    ]
+    agg = _summarize_rows(rows, "ROI", top_k=3)
+    assert agg["count"] == 4
+    assert agg["min"] == -0.2 and agg["max"] == 0.3
+    assert abs(agg["mean"] - 0.125) < 1e-12
+    assert [r["run_id"] for r in agg["top_k"]] == ["b", "d", "a"]
+
+
+def test_integer_metrics_keep_their_type():
+    rows = [{"run_id": "a", "hands": 40}, {"run_id": "b", "hands": 44}, {"run_id": "c"}]
+    agg = _summarize_rows(rows, "hands")
+    assert agg["min"] == 40 and type(agg["min"]) is int
+    assert agg["max"] == 44 and type(agg["max"]) is int
+    assert agg["mean"] == 42 and type(agg["mean"]) is int
+    assert _summarize_rows(rows + [{"run_id": "d", "hands": 41}], "hands")["mean"] == 125 / 3
+
+
+def test_corrupt_report_falls_back_to_output_zip(tmp_path):
+    out_dir = tmp_path / "exports"
+    items = _mk_batch(out_dir, [1100])
+    run_dir = Path(items[0]["artifacts_dir"])
+    zip_path = out_dir / "R00.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.writestr("artifacts/report.json", json.dumps(_report(1300)))
+    (run_dir / "report.json").write_text("{not json", encoding="utf-8")
+    items[0]["output_zip"] = str(zip_path)
+    _write_json(out_dir / "batch_manifest.json", {"out_dir": str(out_dir), "items": items})
+
+    for _ in range(2):
+        result = aggregate(str(out_dir))
+        (row,) = json.loads(Path(result["index_path"]).read_text("utf-8"))
+        assert row["bankroll_final"] == 1300 and row["error"] is None
@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from crapssim_control.aggregator import aggregate
+from crapssim_control.batch_runner import run_batch
+from crapssim_control.engine_adapter import resolve_engine_adapter
+from crapssim_control.run.artifacts import RUN_METRICS_NAME, iter_run_metrics
+
+pytestmark = pytest.mark.skipif(
+    resolve_engine_adapter()[0] is None, reason="CrapsSim engine not installed"
+)
+
+
+def _write_json(path, obj):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(obj, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _spec(units):
+    return {
+        "table": {},
+        "variables": {"units": units},
+        "modes": {"Main": {"template": {"pass": "units", "place_6": 12}}},
+        "rules": [],
+        "run": {"rolls": 40},
+    }
+
+
+def test_metrics_only_batch_writes_one_shared_record_per_run(tmp_path):
+    items = []
+    for i, units in enumerate((5, 10, 15)):
+        _write_json(tmp_path / f"s{i}" / "spec.json", _spec(units))
+        _write_json(tmp_path / f"s{i}" / "seed.json", {"seed": 100 + i})
+        items.append({"path": str(tmp_path / f"s{i}" / "spec.json")})
+    out_dir = tmp_path / "exports"
+    _write_json(tmp_path / "plan.json", {"items": items, "out_dir": str(out_dir)})
+
+    manifest = run_batch(str(tmp_path / "plan.json"), artifacts="metrics-only")
+
+    assert manifest["artifacts"] == "metrics-only"
+    assert sorted(p.name for p in out_dir.iterdir()) == ["batch_manifest.json", RUN_METRICS_NAME]
+    records = list(iter_run_metrics(out_dir / RUN_METRICS_NAME))
+    assert [r["seed"] for r in records] == [100, 101, 102]
+    assert [r["run_id"] for r in records] == [rec["run_id"] for rec in manifest["items"]]
+
+    out = aggregate(str(out_dir), top_k=3)
+    rows = json.loads(Path(out["index_path"]).read_text("utf-8"))
+    assert all(r["bankroll_final"] is not None and not r["error"] for r in rows)
+
+
+def _cli_run(tmp_path, *extra):
+    spec_path = tmp_path / "spec.json"
+    _write_json(spec_path, _spec(10))
+    env = dict(os.environ)
+    root = str(Path(__file__).resolve().parents[1])
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (root, env.get("PYTHONPATH")) if p)
+    result = subprocess.run(
+        [sys.executable, "-m", "csc", "run", "--spec", str(spec_path), "--rolls", "30", *extra],
+        cwd=tmp_path,
+        text=True,
+        capture_output=True,
+        env=env,
+    )
+    assert result.returncode == 0, result.stderr
+    return tmp_path / "artifacts"
+
+
+def test_cli_artifact_profiles(tmp_path):
+    standard = _cli_run(tmp_path / "std", "--seed", "7", "--artifacts", "standard")
+    (run_dir,) = [p for p in standard.iterdir() if p.is_dir()]
+    assert sorted(p.name for p in run_dir.iterdir()) == ["manifest.json", "summary.json"]
+    assert not (tmp_path / "std" / "export").exists()
+
+    lean = _cli_run(tmp_path / "lean", "--artifacts", "metrics-only")
+    assert [p.name for p in lean.iterdir()] == [RUN_METRICS_NAME]
+    (record,) = iter_run_metrics(lean / RUN_METRICS_NAME)
+    assert record["rolls"] == 30 and isinstance(record["seed"], int)
@@ -31,7 +31,18 @@ def _make_bundle(tmpdir):
     # create a bundle dir with spec + dna/meta
     bdir = os.path.join(tmpdir, "bundle")
     os.makedirs(bdir, exist_ok=True)
-    _write_json(os.path.join(bdir, "spec.json"), {"name": "bundle-demo", "bankroll": 777})
+    _write_json(
+        os.path.join(bdir, "spec.json"),
+        {
+            "name": "bundle-demo",
+            "bankroll": 777,
+            "table": {},
+            "variables": {"units": 10},
+            "modes": {"Main": {"template": {"pass": "units"}}},
+            "rules": [],
+            "run": {"rolls": 20},
+        },
+    )
     _write_json(os.path.join(bdir, "seed.json"), {"seed": 4242})
     Path(os.path.join(bdir, "dna")).mkdir(exist_ok=True)
     Path(os.path.join(bdir, "meta")).mkdir(exist_ok=True)
@@ -114,3 +125,13 @@ def test_zip_passthrough_preserves_bytes(tmp_path):
     orig_meta = read_entry(bundle_zip, "meta/marker.bin")
     out_meta = read_entry(out_zip, "meta/marker.bin")
     assert orig_meta == out_meta
+
+
+def test_invalid_spec_is_recorded_as_an_error(tmp_path):
+    spec_path, _ = _make_spec(tmp_path)
+    out_root = tmp_path / "exports"
+    for artifacts in ("standard", "metrics-only"):
+        rec = run_single_bundle_or_spec(str(spec_path), str(out_root), artifacts=artifacts)
+        assert rec["status"] == "error", artifacts
+        assert rec["run_status"] == "invalid"
+        assert rec["error"] and rec["error"] == "; ".join(rec["run_errors"])
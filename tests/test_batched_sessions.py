@@ -0,0 +1,104 @@
+import copy
+
+import numpy as np
+import pytest
+
+from crapssim_control.run.batched import BatchedSessions, compile_spec, run_scalar_session
+
+SPEC = {
+    "table": {"bubble": False, "level": 10},
+    "variables": {"units": 10, "streak": 0, "losses": 0, "made": 0},
+    "modes": {
+        "Main": {"template": {"pass": "units", "place": {"6": "units*1.2", "8": "units*1.2"}}},
+        "Press": {
+            "template": {
+                "pass": "units",
+                "field": "units/2",
+                "place": {"5": "units", "6": "units*2.4", "8": "units*2.4", "9": "units"},
+            }
+        },
+    },
+    "rules": [
+        {"on": {"event": "comeout"}, "do": ["set pass_line units"]},
+        {
+            "on": {"event": "roll"},
+            "when": "roll in (6, 8) and point != roll",
+            "do": [
+                "setvar streak streak+1",
+                {"action": "press", "bet": "place_6", "amount": "units if mode == 'Main' else 6"},
+            ],
+        },
+        {
+            "on": {"event": "seven_out"},
+            "do": ["setvar losses losses+1", "setvar streak 0", "switch_mode Main"],
+        },
+        {
+            "on": {"event": "roll"},
+            "when": "streak >= 3 and mode == 'Main'",
+            "do": ["switch_mode Press"],
+        },
+        {
+            "on": {"event": "point_established"},
+            "when": "point in (4, 10)",
+            "do": [{"action": "set", "bet": "field", "amount": "max(5, units/2)"}],
+        },
+        {
+            "on": {"event": "roll"},
+            "when": "rolls_since_point > 6",
+            "do": ["clear place_6", "reduce place_8 6"],
+        },
+        {"on": {"event": "comeout"}, "when": "bankroll_after < 200", "do": ["setvar units 5"]},
+        {
+            "on": {"event": "point_made"},
+            "when": "point_on == 0",
+            "do": ["setvar made made+1", {"action": "press", "bet": "place_8", "amount": "units"}],
+        },
+    ],
+    "run": {"bankroll": 300},
+}
+
+
+def test_batched_sessions_match_scalar_controller(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    sessions, rolls = 12, 150
+    dice = np.random.default_rng(3).integers(1, 7, size=(rolls, sessions, 2))
+
+    result = BatchedSessions(SPEC, sessions).run(rolls, dice=dice)
+
+    for i in range(sessions):
+        assert result.session(i) == run_scalar_session(SPEC, dice[:, i]), i
+    stopped = [i for i in range(sessions) if result.stop_reason[i]]
+    assert stopped and all(result.rolls_played[i] < rolls for i in stopped)
+    assert {result.session(i)["mode"] for i in range(sessions)} <= {"Main", "Press"}
+    assert any(result.session(i)["variables"]["made"] for i in range(sessions))
+
+
+def test_seeded_runs_are_reproducible_and_use_the_seed_stream():
+    first = BatchedSessions(SPEC, 64, seed=11)
+    a = first.run(40)
+    b = BatchedSessions(SPEC, 64, seed=11).run(40)
+    assert a.seed == 11
+    assert np.array_equal(a.bankroll, b.bankroll)
+    assert np.array_equal(a.stop_reason, b.stop_reason)
+
+    dice = np.stack(list(first.dice_rows(40)))
+    c = BatchedSessions(SPEC, 64).run(40, dice=dice)
+    assert np.array_equal(a.bankroll, c.bankroll)
+    assert a.summary()["session_rolls"] == int(a.rolls_played.sum())
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda s: s["modes"]["Main"]["template"].update(odds={"pass": 10}),
+        lambda s: s["rules"].append({"on": {"event": "roll"}, "do": ["setvar nope 1"]}),
+        lambda s: s["rules"].append({"on": {"event": "roll"}, "do": ["set hardway_6 5"]}),
+        lambda s: s["run"].update(dsl=True),
+        lambda s: s["rules"].append({"on": {"event": "bet_resolved"}, "do": ["clear field"]}),
+    ],
+)
+def test_unsupported_specs_are_rejected(change):
+    spec = copy.deepcopy(SPEC)
+    change(spec)
+    with pytest.raises(ValueError):
+        compile_spec(spec)
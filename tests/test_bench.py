@@ -0,0 +1,76 @@
+import json
+
+from crapssim_control.bench import SCENARIOS, compare_results, run_bench
+from crapssim_control.commands.bench_cmd import run as bench_run
+
+
+def _doc(**scenarios):
+    return {"scenarios": scenarios}
+
+
+def _rec(ops_per_sec, p99):
+    return {"status": "ok", "ops_per_sec": ops_per_sec, "latency_us": {"p99": p99}}
+
+
+def test_catalog_covers_required_workloads():
+    for name in (
+        "stub_rolls",
+        "live_engine",
+        "dsl_heavy",
+        "rule_heavy",
+        "journal_on",
+        "journal_off",
+        "command_channel",
+        "http_transport",
+        "batch_sweep",
+        "report_generation",
+    ):
+        assert name in SCENARIOS
+
+
+def test_run_bench_records_throughput_latency_and_allocations(tmp_path):
+    results = run_bench(["stub_rolls", "http_transport"], ops=15, workdir=tmp_path)
+    for name in ("stub_rolls", "http_transport"):
+        rec = results["scenarios"][name]
+        assert rec["status"] == "ok", rec
+        assert rec["ops"] == 15 and rec["ops_per_sec"] > 0
+        lat = rec["latency_us"]
+        assert lat["p50"] <= lat["p95"] <= lat["p99"] <= lat["max"]
+        assert "retained_blocks_per_op" in rec and "peak_traced_kib_per_op" in rec
+    json.dumps(results)
+
+
+def test_compare_flags_only_regressions_past_threshold():
+    base = _doc(a=_rec(1000, 100), b=_rec(1000, 100), c={"status": "skipped"})
+    cur = _doc(a=_rec(850, 140), b=_rec(700, 200), c=_rec(1, 1))
+    regs = compare_results(cur, base, max_throughput_drop=0.2, max_p99_growth=0.5)
+    assert {(r["scenario"], r["metric"]) for r in regs} == {
+        ("b", "ops_per_sec"),
+        ("b", "latency_us.p99"),
+    }
+
+
+def test_compare_flags_scenarios_that_crash_or_vanish():
+    base = _doc(a=_rec(1000, 100), b=_rec(1000, 100), c=_rec(1000, 100))
+    cur = _doc(a={"status": "error", "error": "Boom"}, c={"status": "skipped"})
+    regs = compare_results(cur, base)
+    assert {(r["scenario"], r["current"]) for r in regs} == {("a", "error"), ("b", "missing")}
+    # a --scenario run only answers for what it selected
+    assert compare_results({"selected": ["c"], "scenarios": {"c": _rec(1000, 100)}}, base) == []
+
+
+def test_bench_command_fails_on_regression(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    baseline = tmp_path / "baseline.json"
+    out = tmp_path / "latest.json"
+    assert (
+        bench_run(
+            ["stub_rolls"], ops=10, out=str(out), baseline=str(baseline), update_baseline=True
+        )
+        == 0
+    )
+    stored = json.loads(baseline.read_text())
+    stored["scenarios"]["stub_rolls"]["ops_per_sec"] *= 1000
+    baseline.write_text(json.dumps(stored))
+    assert bench_run(["stub_rolls"], ops=10, out=str(out), baseline=str(baseline)) == 1
+    assert bench_run(["nope"], ops=10, out=str(out)) == 2
@@ -0,0 +1,67 @@
+import pytest
+
+from crapssim_control.bet_ledger import BetLedger
+
+
+def test_history_cap_keeps_totals_and_recent_entries():
+    led = BetLedger(history_cap=3)
+    for i in range(10):
+        led.touch_roll(i)
+        led.place("pass", 10)
+        led.resolve("pass", result="win" if i % 2 else "lose", payout=20.0 if i % 2 else 0.0)
+
+    snap = led.snapshot()
+    assert snap["open_count"] == 0
+    assert snap["closed_count"] == 10
+    assert snap["realized_pnl"] == pytest.approx(0.0)
+    assert snap["by_category"]["realized"] == {"line": pytest.approx(0.0)}
+    assert snap["by_category"]["exposure"] == {}
+    assert [e["id"] for e in snap["closed"]] == [8, 9, 10]
+    assert [e["meta"]["roll_index_closed"] for e in snap["closed"]] == [7, 8, 9]
+
+    # Evicted entries are gone; retained ones are still addressable.
+    with pytest.raises(KeyError):
+        led._by_id(1)
+    assert led._by_id(10).result == "win"
+
+
+def test_intent_matching_and_explicit_resolve_by_id():
+    led = BetLedger()
+    i_six = led.create_intent(bet="place", number=6, stake=12)
+    i_eight = led.create_intent(bet="place", number=8, stake=12)
+    i_field = led.create_intent(bet="field", stake=5)
+    led.cancel_intent(i_field, reason="not needed")
+
+    e8 = led.place("place", 12, number=8)
+    led.place("place", 12, number=6)
+
+    snap = led.snapshot()["intents"]
+    assert snap["open_count"] == 0
+    assert snap["matched_count"] == 2
+    assert snap["canceled_count"] == 1
+    matched = {i["id"]: i["matched_entry_id"] for i in snap["matched"]}
+    assert matched[i_eight] == e8
+    assert i_six in matched
+
+    eid, pnl = led.resolve("place", result="lose", entry_id=e8, number=8)
+    assert (eid, pnl) == (e8, -12.0)
+    with pytest.raises(ValueError):
+        led.resolve("place", result="lose", entry_id=e8, number=8)
+    assert led.snapshot()["by_category"]["exposure"] == {"place": 12.0}
+
+
+def test_negative_history_cap_rejected():
+    with pytest.raises(ValueError):
+        BetLedger(history_cap=-1)
+
+
+def test_resolve_by_id_leaves_lifo_stack_consistent():
+    led = BetLedger()
+    first = led.place("place", 12, number=6)
+    second = led.place("place", 18, number=6)
+
+    led.resolve("place", result="win", payout=26.0, entry_id=second, number=6)
+    eid, _ = led.resolve("place", result="lose", number=6)
+    assert eid == first
+    with pytest.raises(KeyError):
+        led.resolve("place", result="lose", number=6)
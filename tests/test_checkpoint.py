@@ -0,0 +1,162 @@
+import json
+import zlib
+
+import pytest
+
+from crapssim_control.checkpoint import (
+    CheckpointError,
+    Checkpointer,
+    CheckpointSession,
+    fork_sessions,
+    read_checkpoint,
+    read_checkpoint_header,
+    run_checkpointed,
+    write_checkpoint,
+)
+from crapssim_control.cli import main
+
+
+def _spec(tmp_path, rolls=240):
+    return {
+        "table": {"bubble": False, "level": 10},
+        "variables": {"units": 10},
+        "modes": {"Main": {"template": {"pass": "units", "place_6": "units"}}},
+        "rules": [{"on": {"event": "point_established"}, "do": ["apply_template('Main')"]}],
+        "run": {
+            "seed": 21,
+            "rolls": rolls,
+            "stop_on_bankrupt": False,
+            "stop_on_unactionable": False,
+            "http_commands": {"enabled": False},
+            "webhooks": {"enabled": False},
+            "csv": {
+                "enabled": True,
+                "path": str(tmp_path / "journal.csv"),
+                "append": False,
+                "run_id": "ckpt-test",
+            },
+            "external": {"mode": "live", "tape_path": str(tmp_path / "tape.jsonl")},
+        },
+    }
+
+
+def _journal_rows(path):
+    # Drop the wall-clock ``ts`` column.
+    return [line.split(",", 1)[-1] for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def _final_state(session):
+    _header, state = session.capture()
+    return state["adapter"]["fields"], state["adapter"]["rng"], state["controller"]["fields"]
+
+
+def test_resume_after_crash_matches_uninterrupted(tmp_path):
+    straight_dir = tmp_path / "straight"
+    straight_dir.mkdir()
+    straight = CheckpointSession(_spec(straight_dir))
+    run_checkpointed(straight)
+
+    crash_dir = tmp_path / "crash"
+    crash_dir.mkdir()
+    ckpt = crash_dir / "run.ckpt"
+    first = CheckpointSession(_spec(crash_dir))
+    checkpointer = Checkpointer(ckpt, every_rolls=100)
+    while first.rolls_done < 170:  # dies 70 rolls after the last checkpoint
+        first.step()
+        checkpointer.maybe_write(first)
+    first.ctrl.stop()
+    assert read_checkpoint_header(ckpt)["rolls_done"] == 100
+
+    resumed = CheckpointSession.resume(ckpt)
+    assert resumed.rolls_done == 100
+    run_checkpointed(resumed)
+
+    a_fields, a_rng, a_ctrl = _final_state(straight)
+    b_fields, b_rng, b_ctrl = _final_state(resumed)
+    assert a_fields == b_fields and a_rng == b_rng
+    assert a_ctrl["_stats"] == b_ctrl["_stats"] and a_ctrl["mode"] == b_ctrl["mode"]
+    assert _journal_rows(straight_dir / "journal.csv") == _journal_rows(crash_dir / "journal.csv")
+
+
+def test_forks_leave_original_journal_untouched(tmp_path):
+    ckpt = tmp_path / "warm.ckpt"
+    session = CheckpointSession(_spec(tmp_path, rolls=60))
+    run_checkpointed(session, Checkpointer(ckpt, every_rolls=1000))
+    before = (tmp_path / "journal.csv").read_bytes()
+
+    variants = [
+        {"run": {"csv": {"path": str(tmp_path / f"fork{i}.csv")}}, "variables": {"units": u}}
+        for i, u in enumerate((5, 25))
+    ]
+    finals = []
+    for fork in fork_sessions(ckpt, variants):
+        fork.rolls_target = 120
+        finals.append(run_checkpointed(fork)["rolls"])
+    assert finals == [120, 120]
+    assert (tmp_path / "journal.csv").read_bytes() == before
+    assert (tmp_path / "fork0.csv").exists() and (tmp_path / "fork1.csv").exists()
+
+
+def test_checkpoint_body_is_plain_json(tmp_path):
+    ckpt = tmp_path / "run.ckpt"
+    session = CheckpointSession(_spec(tmp_path, rolls=30))
+    for _ in range(30):
+        session.step()
+    session.save(ckpt)
+
+    raw = ckpt.read_bytes()
+    head_len = int.from_bytes(raw[10:14], "little")
+    body = json.loads(zlib.decompress(raw[14 + head_len :]))
+    assert body["driver"]["prev_point"] == session._prev_point
+    # tuples (dice, RNG state) and sets come back as themselves
+    assert read_checkpoint(ckpt)[1] == session.capture()[1]
+    session.close()
+
+    with pytest.raises(CheckpointError):
+        write_checkpoint(tmp_path / "obj.ckpt", {}, {"handle": object()})
+
+
+def test_rejects_foreign_files(tmp_path):
+    bogus = tmp_path / "bogus.ckpt"
+    bogus.write_bytes(b"not a checkpoint at all")
+    with pytest.raises(CheckpointError):
+        CheckpointSession.resume(bogus)
+
+
+def test_cli_checkpoint_and_resume(tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    spec_path = tmp_path / "spec.json"
+    spec_path.write_text(json.dumps(_spec(tmp_path)), encoding="utf-8")
+    ckpt = tmp_path / "cli.ckpt"
+
+    assert (
+        main(
+            [
+                "run",
+                str(spec_path),
+                "--rolls",
+                "80",
+                "--checkpoint",
+                str(ckpt),
+                "--checkpoint-every",
+                "25",
+                "--engine",
+                "stub",
+            ]
+        )
+        == 0
+    )
+    assert read_checkpoint_header(ckpt)["rolls_done"] == 80
+    run_dir = tmp_path / "artifacts" / "ckpt-test"
+    assert json.loads((run_dir / "summary.json").read_text())["rolls"] == 80
+    assert (run_dir / "manifest.json").exists() and (run_dir / "journal.csv").exists()
+    assert main(["run", str(spec_path), "--checkpoint", str(tmp_path / "live.ckpt")]) == 2
+    assert not (tmp_path / "live.ckpt").exists()
+
+    export = tmp_path / "summary.csv"
+    assert main(["run", "--resume", str(ckpt), "--rolls", "150", "--export", str(export)]) == 0
+    out = capsys.readouterr().out
+    assert "Resuming" in out and "RESULT: rolls=150" in out
+    assert read_checkpoint_header(ckpt)["rolls_done"] == 150
+    assert json.loads((run_dir / "summary.json").read_text())["rolls"] == 150
+    assert export.read_text(encoding="utf-8").splitlines()[1].split(",")[1] == "150"
@@ -0,0 +1,149 @@
+import json
+import sys
+import threading
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from crapssim_control.controller import ControlStrategy
+from crapssim_control.events import COMEOUT, ROLL
+from crapssim_control.external.command_channel import CommandQueue
+from crapssim_control.external.http_api import create_app
+
+
+def _cmd(cid, source="nr", action="switch_profile", **args):
+    return {
+        "run_id": "r1",
+        "action": action,
+        "args": args,
+        "source": source,
+        "correlation_id": cid,
+    }
+
+
+def test_enqueue_many_keeps_submission_order_across_sources():
+    q = CommandQueue({"rate": {"tokens": 2, "refill_seconds": 1000.0}})
+    results = q.enqueue_many(
+        [_cmd("a1", "A"), _cmd("b1", "B"), _cmd("a2", "A"), _cmd("a3", "A"), _cmd("a1", "B")]
+    )
+
+    assert results == [
+        (True, "accepted"),
+        (True, "accepted"),
+        (True, "accepted"),
+        (False, "rate_limited"),
+        (False, "timing:duplicate_correlation_id"),
+    ]
+    drained = list(q.drain())
+    assert [c["correlation_id"] for c in drained] == ["a1", "b1", "a2"]
+    assert drained[0]["dedupe_key"] == ("external:A", "switch_profile", "{}")
+    assert q.stats["enqueued"] == 3
+    assert list(q.drain()) == []
+
+
+def test_concurrent_enqueue_keeps_each_lane_sorted():
+    q = CommandQueue(
+        {
+            "rate": {"tokens": 10_000, "refill_seconds": 1.0},
+            "queue_max_depth": 10_000,
+            "per_source_quota": 10_000,
+        }
+    )
+
+    def batches(tag):
+        for i in range(500):
+            q.enqueue_many([_cmd(f"{tag}{i}a", "A"), _cmd(f"{tag}{i}b", "B")])
+
+    def singles(tag):
+        for i in range(1000):
+            q.enqueue(_cmd(f"{tag}{i}", "A"))
+
+    workers = [
+        threading.Thread(target=fn, args=(tag,)) for fn, tag in [(batches, "m"), (singles, "s")]
+    ]
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    for lane in q._lanes.values():
+        seqs = [seq for seq, _ in lane.pending]
+        assert seqs == sorted(seqs)
+    assert len(list(q.drain())) == 2000
+
+
+def test_post_commands_batch():
+    q = CommandQueue()
+    client = TestClient(create_app(q, active_run_id_supplier=lambda: "r1"))
+
+    resp = client.post(
+        "/commands:batch",
+        json={
+            "run_id": "r1",
+            "source": "flow",
+            "commands": [
+                {"action": "press", "args": {}, "correlation_id": "c1"},
+                {"action": "explode", "args": {}, "correlation_id": "c2"},
+                {"action": "regress", "args": {}, "correlation_id": "c3", "run_id": "old"},
+            ],
+        },
+    )
+
+    assert resp.status_code == 202
+    body = resp.json()
+    assert (body["accepted"], body["rejected"]) == (1, 2)
+    assert [r["status"] for r in body["results"]] == ["queued", "rejected", "rejected"]
+    assert body["results"][1]["reason"] == "unknown_action"
+    assert body["results"][2]["reason"] == "run_id_mismatch"
+    assert [c["source"] for c in q.drain()] == ["flow"]
+
+    assert client.post("/commands:batch", json={"commands": []}).status_code == 400
+
+
+def test_drained_batch_journals_in_one_write(tmp_path, monkeypatch):
+    spec = {
+        "table": {"bubble": False, "level": 10},
+        "modes": {"Main": {"template": {}}},
+        "variables": {"units": 10},
+        "run": {
+            "webhooks": {"enabled": False},
+            "http_commands": {"enabled": False},
+            "external": {
+                "tape_path": str(tmp_path / "tape.jsonl"),
+                "limits": {"rate": {"tokens": 50, "refill_seconds": 0.001}},
+            },
+        },
+    }
+    ctrl = ControlStrategy(spec)
+    journal_path = tmp_path / "journal.jsonl"
+    ctrl.journal.path = str(journal_path)
+    ctrl.handle_event({"type": COMEOUT}, current_bets={})
+
+    cmds = [{**_cmd(f"c{i}", action="same_bet"), "run_id": ctrl.run_id} for i in range(6)]
+    cmds[3]["args"] = {"bet": "6"}
+    assert all(ok for ok, _ in ctrl.command_queue.enqueue_many(cmds))
+
+    opened = []
+    real_open = open
+
+    def counting_open(path, *args, **kwargs):
+        if str(path) == str(journal_path):
+            opened.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", counting_open)
+    ctrl.handle_event({"type": ROLL, "roll": 8, "point": None, "on_comeout": True}, {})
+    monkeypatch.undo()
+
+    rows = [json.loads(line) for line in journal_path.read_text(encoding="utf-8").splitlines()]
+    external = [r for r in rows if r.get("origin") == "external:nr"]
+    assert [r["correlation_id"] for r in external] == [f"c{i}" for i in range(6)]
+    assert [r["executed"] for r in external] == [True, False, False, True, False, False]
+    assert len(opened) == 1
+    tape = Path(spec["run"]["external"]["tape_path"]).read_text(encoding="utf-8").splitlines()
+    assert len(tape) == 6
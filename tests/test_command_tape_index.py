@@ -0,0 +1,79 @@
+import json
+
+from crapssim_control.external.command_tape import CommandTape, CommandTapeReader, index_path
+
+
+def _write(tape, rows):
+    with tape.buffered():
+        for hand, roll, seq in rows:
+            tape.append(
+                "run-1",
+                "nr",
+                "press",
+                {"n": seq},
+                True,
+                correlation_id=f"c{seq}",
+                hand_id=hand,
+                roll_in_hand=roll,
+                seq=seq,
+            )
+
+
+def test_reader_streams_in_key_order_and_seeks_to_hand(tmp_path):
+    path = tmp_path / "tape.jsonl"
+    tape = CommandTape(path)
+    # seq 5 was journaled by another thread before the batch containing seq 4 flushed
+    _write(tape, [(1, 0, 1), (1, 2, 2), (2, 1, 3), (2, 1, 5), (2, 1, 4), (3, 0, 6), (5, 2, 7)])
+    tape.close()
+
+    assert index_path(path).exists()
+    reader = CommandTapeReader(path)
+    assert len(reader) == 7
+    assert [r["journal_seq"] for r in reader.iter_records()] == [1, 2, 3, 4, 5, 6, 7]
+    assert [r["journal_seq"] for r in reader.iter_records(from_hand=2)] == [3, 4, 5, 6, 7]
+    assert [r["journal_seq"] for r in reader.iter_records(from_hand=4)] == [7]
+    assert list(reader.iter_records(from_hand=9)) == []
+    assert [pos for pos, _ in reader.entries(start=5)] == [5, 6]
+
+
+def test_legacy_tape_gets_index_built_and_extended(tmp_path):
+    path = tmp_path / "legacy.jsonl"
+    rows = [{"action": "press", "hand_id": h, "roll_in_hand": 0, "journal_seq": h} for h in (1, 2)]
+    path.write_text("".join(json.dumps(r) + "\n" for r in rows) + "not json\n", encoding="utf-8")
+
+    assert [r["hand_id"] for r in CommandTapeReader(path).iter_records()] == [1, 2]
+    assert index_path(path).exists()
+
+    tape = CommandTape(path)
+    _write(tape, [(3, 0, 3)])
+    tape.close()
+    with path.open("a", encoding="utf-8") as fh:  # appended by a writer without the index
+        fh.write(json.dumps({"action": "regress", "hand_id": 4, "journal_seq": 4}) + "\n")
+
+    records = list(CommandTapeReader(path).iter_records(from_hand=3))
+    assert [(r["hand_id"], r["source"]) for r in records] == [(3, "nr"), (4, "replay")]
+
+
+def test_controller_replay_starts_at_configured_hand(tmp_path):
+    from crapssim_control.controller import ControlStrategy
+
+    path = tmp_path / "tape.jsonl"
+    tape = CommandTape(path)
+    _write(tape, [(1, 0, 1), (2, 0, 2), (3, 1, 3)])
+    tape.close()
+    spec = {
+        "table": {"bubble": False, "level": 10},
+        "modes": {"base": {"template": {}}},
+        "variables": {"units": 10},
+        "run": {
+            "webhooks": {"enabled": False},
+            "http_commands": {"enabled": False},
+            "external": {"mode": "replay", "tape_path": str(path), "replay_from_hand": 2},
+        },
+    }
+
+    ctrl = ControlStrategy(spec)
+
+    assert ctrl.run_id == "run-1"
+    assert ctrl._peek_replay_command()["journal_seq"] == 2
+    assert ctrl._replay_position == 2
@@ -0,0 +1,170 @@
+"""Tests for the asyncio multiplexed HTTP engine adapter."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+
+import pytest
+
+httpx = pytest.importorskip("httpx")
+
+from crapssim_control.engine.http_api_async import AsyncHttpEngineAdapter, run_sessions
+from crapssim_control.engine.http_api_capabilities import (
+    clear_capabilities_cache,
+    fetch_capabilities,
+)
+
+BASE_URL = "http://engine.test"
+
+
+class FakeEngine:
+    """In-memory Engine API: sessions roll seeded dice after a small simulated latency."""
+
+    def __init__(self, latency: float = 0.005, fail_seed: int | None = None) -> None:
+        self.latency = latency
+        self.fail_seed = fail_seed
+        self.seeds: dict[str, int | None] = {}
+        self.sessions: dict[str, random.Random] = {}
+        self.capability_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/capabilities":
+            self.capability_calls += 1
+            return httpx.Response(200, json={"capabilities": {"verbs": ["pass_line"]}})
+        body = json.loads(request.content or b"{}")
+        if path == "/session/start":
+            sid = f"s{len(self.sessions)}"
+            self.sessions[sid] = random.Random(body.get("seed"))
+            self.seeds[sid] = body.get("seed")
+            return httpx.Response(
+                200, json={"session_id": sid, "snapshot": {"bankroll_after": 1000}}
+            )
+        if path == "/session/roll":
+            rng = self.sessions.get(body.get("session_id"))
+            if rng is None:
+                return httpx.Response(404, json={"code": "unknown_session"})
+            if self.fail_seed is not None and self.seeds[body["session_id"]] == self.fail_seed:
+                return httpx.Response(500, json={"code": "engine_crash", "message": "boom"})
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(self.latency)
+            self.in_flight -= 1
+            dice = body.get("dice") or [rng.randint(1, 6), rng.randint(1, 6)]
+            return httpx.Response(200, json={"snapshot": {"dice": dice, "bankroll_after": 1000}})
+        return httpx.Response(404, json={"code": "not_found"})
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_capabilities_cache()
+    yield
+    clear_capabilities_cache()
+
+
+def _client(engine: FakeEngine) -> httpx.AsyncClient:
+    return httpx.AsyncClient(base_url=BASE_URL, transport=httpx.MockTransport(engine))
+
+
+def test_sessions_interleave_and_stay_seeded():
+    engine = FakeEngine()
+
+    async def _main():
+        async with _client(engine) as client:
+            adapter = AsyncHttpEngineAdapter(BASE_URL, client=client)
+            return await adapter.run_sessions([1, 2, 1], rolls=5, concurrency=3)
+
+    results = asyncio.run(_main())
+    assert [r["rolls"] for r in results] == [5, 5, 5]
+    assert engine.max_in_flight > 1
+    assert results[0]["final_snapshot"]["dice"] == results[2]["final_snapshot"]["dice"]
+    assert results[0]["session_id"] != results[2]["session_id"]
+
+
+def test_capabilities_fetched_once_per_base_url():
+    engine = FakeEngine(latency=0)
+
+    async def _main():
+        async with _client(engine) as client:
+            for _ in range(3):
+                adapter = AsyncHttpEngineAdapter(BASE_URL, client=client)
+                caps = await adapter.ensure_capabilities()
+                assert caps == {"verbs": ["pass_line"]}
+                assert adapter.get_engine_info()["capabilities_source"] == "api"
+
+    asyncio.run(_main())
+    assert engine.capability_calls == 1
+
+    class _SyncClient:
+        def get(self, *a, **k):  # pragma: no cover - must not be reached
+            raise AssertionError("cache miss")
+
+    info, caps = fetch_capabilities(BASE_URL + "/", _SyncClient())
+    assert caps == {"verbs": ["pass_line"]} and info["base_url"] == BASE_URL
+
+
+def test_session_errors_are_captured_per_session():
+    engine = FakeEngine(latency=0)
+
+    async def _main():
+        async with _client(engine) as client:
+            adapter = AsyncHttpEngineAdapter(BASE_URL, client=client)
+            good = await adapter.run_session(1, 2)
+            engine.sessions.clear()
+            sess = adapter.session()
+            sess._session_id = "gone"
+            with pytest.raises(Exception) as excinfo:
+                await sess.step_roll()
+            return good, excinfo.value
+
+    good, err = asyncio.run(_main())
+    assert good["rolls"] == 2 and "error" not in good
+    assert getattr(err, "status", None) == 404 and err.code == "unknown_session"
+
+    results = run_sessions(BASE_URL, [1, 2, 3], 2, client=_client(FakeEngine(0, fail_seed=2)))
+    assert [r["rolls"] for r in results] == [2, 0, 2]
+    assert results[1]["error"]["code"] == "engine_crash"
+
+
+def test_one_failing_session_does_not_abort_the_batch():
+    engine = FakeEngine(latency=0)
+
+    def _on_roll(sess, snap):
+        if engine.seeds[sess.session_id] == 2:
+            raise ValueError("callback failed")
+
+    async def _main():
+        async with _client(engine) as client:
+            adapter = AsyncHttpEngineAdapter(BASE_URL, client=client)
+            return await adapter.run_sessions([1, 2, 3], rolls=2, on_roll=_on_roll)
+
+    results = asyncio.run(_main())
+    assert [r["rolls"] for r in results] == [2, 0, 2]
+    assert results[1]["error"] == {
+        "code": "ValueError",
+        "message": "callback failed",
+        "status": None,
+    }
+
+
+def test_injected_client_without_base_url():
+    engine = FakeEngine(latency=0)
+
+    async def _main():
+        async with httpx.AsyncClient(transport=httpx.MockTransport(engine)) as client:
+            adapter = AsyncHttpEngineAdapter(BASE_URL, client=client)
+            return await adapter.run_sessions([1, 2], rolls=3)
+
+    results = asyncio.run(_main())
+    assert [r["rolls"] for r in results] == [3, 3]
+    assert not any("error" in r for r in results)
+
+
+def test_run_sessions_blocking_helper():
+    engine = FakeEngine(latency=0)
+    results = run_sessions(BASE_URL, range(4), 3, client=_client(engine), concurrency=2)
+    assert len(results) == 4 and all(r["rolls"] == 3 for r in results)
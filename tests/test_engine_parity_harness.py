@@ -8,19 +8,21 @@ from fastapi.testclient import TestClient
 from crapssim_api.http import router
 
 from crapssim_control.engine.http_api_adapter import HttpEngineAdapter
-from crapssim_control.testing.engine_parity import run_parity_test
+from crapssim_control.testing.engine_parity import run_parity_stream, run_parity_test
 from crapssim_control.engine.factory import build_inprocess_engine_adapter
 from crapssim_control.config import RunConfig
 
 
-def test_parity_harness_runs_basic_sequence():
+def _client():
     app = FastAPI()
     app.include_router(router)
-    client = TestClient(app)
+    return TestClient(app)
+
 
+def test_parity_harness_runs_basic_sequence():
     http_adapter = HttpEngineAdapter(
         base_url="http://testserver",
-        client=client,
+        client=_client(),
     )
 
     inprocess = build_inprocess_engine_adapter(RunConfig())
@@ -36,3 +38,16 @@ def test_parity_harness_runs_basic_sequence():
     for entry in results:
         assert "inprocess" in entry
         assert "http_api" in entry
+
+
+def test_parity_stream_matches_on_fixed_dice():
+    http_adapter = HttpEngineAdapter(base_url="http://testserver", client=_client())
+    inprocess = build_inprocess_engine_adapter(RunConfig())
+    http_adapter.start_session({}, seed=123)
+    inprocess.start_session({}, seed=123)
+
+    dice_stream = [(1, 1), (3, 2), (4, 3), (6, 1), (2, 2)]
+    result = run_parity_stream(inprocess, http_adapter, dice_stream, steps=5)
+
+    assert result.ok, result.diff
+    assert result.rolls == 5 and result.first_divergence is None
@@ -1,2 +1,32 @@
-def test_placeholder():
-    assert True
+import pytest
+
+from crapssim_control.events import (
+    COMEOUT,
+    POINT_ESTABLISHED,
+    POINT_MADE,
+    ROLL,
+    SEVEN_OUT,
+    event_for_roll,
+)
+
+
+def _result(total, point):
+    return {"total": total, "snapshot": {"point_value": point, "bankroll_after": 300}}
+
+
+@pytest.mark.parametrize(
+    "prev_point,total,point,expected",
+    [
+        (None, 7, None, COMEOUT),
+        (None, 6, 6, POINT_ESTABLISHED),
+        (6, 8, 6, ROLL),
+        (6, 7, None, SEVEN_OUT),
+        (6, 6, None, POINT_MADE),
+    ],
+)
+def test_event_for_roll_types(prev_point, total, point, expected):
+    ev = event_for_roll(prev_point, _result(total, point))
+    assert ev["type"] == expected
+    assert ev["roll"] == total
+    assert ev["point"] == point
+    assert ev["bankroll_after"] == 300
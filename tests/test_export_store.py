@@ -0,0 +1,81 @@
+import hashlib
+import json
+import zipfile
+
+from crapssim_control.bundles.store import BlobStore
+from crapssim_control.controller import ControlStrategy
+
+
+def test_export_copy_links_blobs_and_reuses_versions(tmp_path, monkeypatch):
+    src = tmp_path / "journal.csv"
+    export_root = tmp_path / "exports"
+    store = BlobStore.for_export_root(export_root)
+
+    src.write_text("a,b\n1,2\n", encoding="utf-8")
+    first, copied, fp = ControlStrategy._export_copy(
+        src, export_root / "run1", store=store, link=True
+    )
+    assert copied and fp == hashlib.sha256(b"a,b\n1,2\n").hexdigest()
+    again, copied, _ = ControlStrategy._export_copy(
+        src, export_root / "run2", store=store, link=True
+    )
+    assert copied and again.stat().st_ino == first.stat().st_ino  # one blob, two links
+
+    src.write_text("a,b\n1,2\n3,4\n", encoding="utf-8")
+    v1, copied, _ = ControlStrategy._export_copy(src, export_root / "run1", store=store, link=True)
+    assert copied and v1.name == "journal-v1.csv"
+
+    # Reusing an older version is an index lookup: no file is re-hashed.
+    def _no_hash(*_a, **_k):
+        raise AssertionError("existing exports should not be re-hashed")
+
+    monkeypatch.setattr(hashlib, "sha256", _no_hash)
+    reused, copied, _ = ControlStrategy._export_copy(
+        src, export_root / "run1", store=store, link=True
+    )
+    assert (reused, copied) == (v1, False)
+    monkeypatch.undo()
+
+    def _blobs():
+        return [p for p in store.root.rglob("*") if p.is_file() and len(p.name) == 64]
+
+    assert len(_blobs()) == 2
+    v1.unlink()
+    assert store.gc() == 1 and len(_blobs()) == 1
+    store.close()
+
+
+def test_export_copy_defaults_to_writable_copies(tmp_path):
+    src = tmp_path / "journal.csv"
+    src.write_text("a,b\n1,2\n", encoding="utf-8")
+    export_root = tmp_path / "exports"
+    with BlobStore.for_export_root(export_root) as store:
+        dst, copied, _ = ControlStrategy._export_copy(src, export_root / "run1", store=store)
+        again, copied_again, _ = ControlStrategy._export_copy(
+            src, export_root / "run1", store=store
+        )
+        assert copied and (again, copied_again) == (dst, False)
+        assert not any(len(p.name) == 64 for p in store.root.rglob("*"))
+    assert dst.stat().st_nlink == 1
+    with dst.open("a", encoding="utf-8") as f:
+        f.write("3,4\n")
+    assert src.read_text(encoding="utf-8") == "a,b\n1,2\n"
+
+
+def test_zip_export_records_blob_digests(tmp_path):
+    csv_path = tmp_path / "journal.csv"
+    csv_path.write_text("roll\n1\n", encoding="utf-8")
+    spec = {
+        "modes": {"Main": {"template": {}}},
+        "variables": {"units": 10},
+        "run": {"csv": {"enabled": True, "path": str(csv_path), "append": True}},
+        "rules": [],
+    }
+    ctrl = ControlStrategy(spec)
+    zip_path = ctrl.export_bundle(tmp_path / "out", compress=True)
+    with zipfile.ZipFile(zip_path) as zf:
+        manifest = json.loads(zf.read("manifest.json"))
+        digest = manifest["fingerprints"]["csv"]
+        assert hashlib.sha256(zf.read("journal.csv")).hexdigest() == digest
+    assert not BlobStore.for_export_root(tmp_path / "out").blob_path(digest).exists()
+    assert [p.suffix for p in (tmp_path / "out").iterdir()] == [".zip"]
@@ -0,0 +1,128 @@
+import csv
+import json
+
+from crapssim_control.behavior.journal import DecisionAttempt, DecisionsJournal
+from crapssim_control.run.decisions_trace import DecisionsTrace, trace_options
+from crapssim_control.run.flight_recorder import FlightRecorder
+
+
+def _row(roll, reason="", bankroll=1000.0):
+    return {
+        "roll": roll,
+        "window": "comeout",
+        "rule_id": "r1",
+        "reason": reason,
+        "bankroll": bankroll,
+    }
+
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as fh:
+        return list(csv.DictReader(fh))
+
+
+def test_ring_keeps_last_n_and_post_window():
+    out = []
+    rec = FlightRecorder(
+        lambda items, reason: out.append((reason, list(items))), capacity=3, post_trigger=2
+    )
+    for i in range(5):
+        rec.record(i)
+    assert out == [] and rec.buffered == 3 and rec.dropped == 2
+
+    assert rec.trigger("manual") == 3
+    for i in range(5, 9):
+        rec.record(i)
+    assert out == [("manual", [2, 3, 4]), (None, [5]), (None, [6])]
+    assert rec.buffered == 2  # 7, 8 back in the ring
+
+
+def test_flight_trace_writes_nothing_until_rule_error(tmp_path):
+    trace = DecisionsTrace(tmp_path, mode="flight", capacity=4, post_trigger=1)
+    for roll in range(1, 50):
+        trace.write(_row(roll))
+    assert trace.rows_written == 0
+
+    trace.write(_row(50, reason="APPLY_ERROR"))
+    trace.write(_row(51))
+    trace.write(_row(52))
+    trace.close()
+
+    rows = _read(tmp_path / "decisions.csv")
+    assert rows[0]["window"] == "flight_recorder"
+    assert rows[0]["reason"] == "rule_error:APPLY_ERROR"
+    assert [r["roll"] for r in rows[1:]] == ["47", "48", "49", "50", "51"]
+    assert trace.triggers[0]["reason"] == "rule_error:APPLY_ERROR"
+
+
+def test_flight_trace_drawdown_predicate_and_exception(tmp_path):
+    opts = trace_options(
+        {
+            "trace": {
+                "mode": "flight",
+                "capacity": 2,
+                "post_trigger": 0,
+                "drawdown": 100,
+                "trigger_when": "roll == 30",
+            }
+        }
+    )
+    with DecisionsTrace(tmp_path, **opts) as trace:
+        bankrolls = [1000, 1050, 960, 940, 1100]  # crosses 100 below peak once, at 940
+        for roll, bank in enumerate(bankrolls, start=1):
+            trace.write(_row(roll, bankroll=bank))
+        for roll in range(6, 31):
+            trace.write(_row(roll, bankroll=1100))
+        reasons = [t["reason"] for t in trace.triggers]
+        assert reasons == ["drawdown", "predicate"]
+
+    rows = _read(tmp_path / "decisions.csv")
+    markers = [r["reason"] for r in rows if r["window"] == "flight_recorder"]
+    assert markers == ["drawdown", "predicate"]
+
+    boom = tmp_path / "boom"
+    boom.mkdir()
+    try:
+        with DecisionsTrace(boom, mode="flight") as trace:
+            trace.write(_row(1))
+            raise RuntimeError("engine died")
+    except RuntimeError:
+        pass
+    rows = _read(boom / "decisions.csv")
+    assert rows[0]["reason"] == "exception:RuntimeError"
+    assert rows[1]["roll"] == "1"
+
+
+def test_sample_mode_and_summary_row(tmp_path):
+    trace = DecisionsTrace(tmp_path, mode="sample", sample_every=10)
+    for roll in range(1, 101):
+        trace.write(_row(roll))
+    assert trace.rows_written == 10
+    trace.close()
+
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    trace = DecisionsTrace(empty, mode="flight")
+    trace.write(_row(1))
+    trace.close()
+    rows = _read(empty / "decisions.csv")
+    assert [r["window"] for r in rows] == ["run_complete"]
+
+
+def test_dsl_journal_flight_mode(tmp_path):
+    journal = DecisionsJournal(
+        str(tmp_path), verbose=True, mode="flight", capacity=2, post_trigger=0
+    )
+
+    def attempt(i, reason=None):
+        return DecisionAttempt(
+            i, "comeout", "r", "dsl", "true", False, "noop", {}, False, False, reason
+        )
+
+    for i in range(10):
+        journal.write(attempt(i))
+    assert not journal.path.exists()
+    journal.write(attempt(10, "WHEN_EVAL_ERROR"))
+    lines = [json.loads(line) for line in journal.path.read_text().splitlines()]
+    assert lines[0] == {"trigger": "rule_error:WHEN_EVAL_ERROR", "roll_index": 10}
+    assert [line["roll_index"] for line in lines[1:]] == [9, 10]
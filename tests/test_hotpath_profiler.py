@@ -0,0 +1,107 @@
+import argparse
+
+import pytest
+
+from crapssim_control import controller, eval as csc_eval, hotpath
+from crapssim_control.engine_adapter import CrapsSimAdapter, VanillaAdapter
+from crapssim_control.report_builder import attach_hotpath_metadata
+
+
+@pytest.fixture
+def profiler():
+    hotpath.PROFILER.reset()
+    hotpath.PROFILER.enable()
+    yield hotpath.PROFILER
+    hotpath.PROFILER.disable()
+    hotpath.PROFILER.reset()
+
+
+def test_disabled_profiler_records_nothing():
+    hotpath.PROFILER.reset()
+    assert not hotpath.enabled()
+    t0 = hotpath.start()
+    assert t0 == 0
+    hotpath.stop("noop", t0)
+    with hotpath.span("noop"):
+        pass
+    assert hotpath.summary()["spans"] == {}
+
+
+def test_histogram_percentiles_use_fixed_buckets():
+    hist = hotpath.SpanHistogram()
+    for _ in range(99):
+        hist.observe(1_500)  # 1.5µs -> 2µs bucket
+    hist.observe(3_000_000)  # 3ms outlier
+    out = hist.summary()
+    assert out["count"] == 100
+    assert out["p50_us"] == 2.0
+    assert out["p99_us"] == 2.0
+    assert out["max_us"] == 3000.0
+    assert len(hist.counts) == len(hotpath.BUCKET_BOUNDS_NS) + 1
+
+
+def test_adapter_step_roll_spans(profiler):
+    adapter = VanillaAdapter()
+    adapter.start_session({"run": {"seed": 7}})
+    for _ in range(20):
+        adapter.step_roll()
+    spans = hotpath.summary()["spans"]
+    for name in ("adapter.step_roll", "adapter.snapshot", "adapter.rule_eval", "adapter.stub_roll"):
+        assert spans[name]["count"] == 20
+        assert spans[name]["max_us"] >= spans[name]["p50_us"]
+
+
+def test_timed_decorator_and_report_attach(profiler):
+    @hotpath.timed("unit.fn")
+    def fn(x):
+        return x + 1
+
+    assert fn(1) == 2
+    report = {}
+    attach_hotpath_metadata(report)
+    assert report["hotpath"]["spans"]["unit.fn"]["count"] == 1
+    assert report["hotpath"]["schema_version"] == hotpath.HOTPATH_SCHEMA_VERSION
+
+
+def test_hot_functions_time_themselves_without_wrappers():
+    plain = csc_eval.evaluate
+    assert not hasattr(plain, "__wrapped__")
+    assert not hasattr(controller.ControlStrategy.handle_event, "__wrapped__")
+
+    hotpath.PROFILER.reset()
+    hotpath.PROFILER.enable()
+    try:
+        assert csc_eval.evaluate is plain and controller.evaluate is plain
+        assert csc_eval.evaluate("a + 1", {"a": 1}) == 2
+        assert hotpath.summary()["spans"]["eval.evaluate"]["count"] == 1
+    finally:
+        hotpath.PROFILER.disable()
+        hotpath.PROFILER.reset()
+
+
+def test_run_path_records_adapter_spans(profiler):
+    adapter = CrapsSimAdapter()
+    try:
+        table = adapter.attach({"run": {"bankroll": 300}}).table
+    except Exception as exc:
+        pytest.skip(f"CrapsSim engine not available: {exc}")
+    table.run(15, verbose=False)
+    spans = hotpath.summary()["spans"]
+    assert spans["adapter.update_bets"]["count"] >= 15
+    assert spans["engine.roll"]["count"] >= 15
+    assert spans["engine.settle"]["count"] >= 14  # the last settle has no next hook
+
+
+def test_report_attach_skipped_when_disabled():
+    report = {}
+    attach_hotpath_metadata(report)
+    assert "hotpath" not in report
+
+
+def test_cli_flag_sets_spec_switch():
+    from crapssim_control.cli import _build_parser, _merge_cli_run_flags
+
+    args = _build_parser().parse_args(["run", "spec.json", "--profile-hotpath"])
+    spec = {"run": {}}
+    _merge_cli_run_flags(spec, args)
+    assert spec["run"]["profile_hotpath"] is True
@@ -0,0 +1,53 @@
+import json
+
+from crapssim_control.rules_engine.journal import DecisionJournal, JournalMetrics, metrics_path
+
+
+def _fill(journal):
+    journal.record({"origin": "rule:R1", "action": "press", "executed": True})
+    journal.record({"type": "dsl_trace", "origin": "dsl", "action": "trace"})
+    with journal.buffered():
+        journal.record({"origin": "external:nr", "action": "press", "executed": True})
+        journal.record({"origin": "external:nr", "action": "regress", "rejection_reason": "x"})
+
+
+def _counts(m):
+    return (m.journal_lines, m.dsl_traces, m.external_executed, m.external_rejected)
+
+
+def test_live_counters_match_rescan_without_reading_journal(tmp_path, monkeypatch):
+    path = tmp_path / "decision_journal.jsonl"
+    journal = DecisionJournal(str(path))
+    _fill(journal)
+
+    def _no_scan(*_a, **_k):
+        raise AssertionError("report should not rescan the journal")
+
+    monkeypatch.setattr(JournalMetrics, "scan", classmethod(_no_scan))
+    live = journal.report_metrics()
+    monkeypatch.undo()
+
+    assert _counts(live) == (4, 1, 1, 1)
+    assert _counts(JournalMetrics.scan(str(path))) == _counts(live)
+    saved = json.loads(open(metrics_path(path), encoding="utf-8").read())
+    assert saved["journal_bytes"] == path.stat().st_size
+    assert saved["journal_lines"] == 4
+
+
+def test_persisted_counters_continue_and_stale_ones_are_recounted(tmp_path):
+    path = tmp_path / "decision_journal.jsonl"
+    first = DecisionJournal(str(path))
+    _fill(first)
+    first.report_metrics()
+
+    # A fresh journal on the same file continues from the sidecar.
+    second = DecisionJournal(str(path))
+    second.record({"origin": "external:nr", "action": "press", "executed": True})
+    assert second.metrics.valid
+    assert _counts(second.report_metrics()) == (5, 1, 2, 1)
+
+    # A foreign append invalidates the counters; the report recovers by rescanning.
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"origin": "external:x", "executed": False}) + "\n")
+    assert not second.metrics.describes(str(path))
+    assert _counts(second.report_metrics()) == (6, 1, 2, 2)
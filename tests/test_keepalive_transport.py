@@ -0,0 +1,119 @@
+import pytest
+
+from crapssim_control.engine_adapter import VanillaAdapter
+from crapssim_control.testing.http_engine_stub import serve_stub_engine
+from crapssim_control.transport import TRANSPORTS, KeepAliveHTTPTransport
+
+
+@pytest.fixture(params=[True, False], ids=["combined", "pipelined"])
+def engine(request):
+    server, base_url = serve_stub_engine(combined=request.param)
+    transport = KeepAliveHTTPTransport(base_url=base_url)
+    yield server, transport
+    transport.close()
+    server.shutdown()
+    server.server_close()
+
+
+def test_registry_entry():
+    assert TRANSPORTS["http_keepalive"] is KeepAliveHTTPTransport
+
+
+def test_adapter_roll_is_one_round_trip_on_one_connection(engine):
+    server, transport = engine
+    adapter = VanillaAdapter(transport)
+    adapter.start_session({"run": {"seed": 5}})
+    adapter.step_roll()  # endpoint discovery costs one extra round trip on old engines
+    start = transport.round_trips
+    for _ in range(25):
+        adapter.step_roll()
+    assert transport.round_trips - start == 25
+    assert server.connections == 1
+
+
+def test_queued_actions_ride_along_with_the_roll(engine):
+    server, transport = engine
+    transport.start_session({"run": {"seed": 1}})
+    assert transport.apply("pass_line", {"amount": 10})["status"] == "queued"
+    assert server.last_session.actions == 0
+    roll = transport.step(dice=(2, 2))
+    assert roll["total"] == 4
+    assert server.last_session.actions == 1
+    snap = transport.snapshot()
+    assert snap["point_value"] == 4 and snap["bankroll"] == 990.0
+
+
+def test_step_many_matches_single_steps(engine):
+    server, transport = engine
+    dice = [(3, 4), (2, 2), (5, 1), (2, 2)]
+    transport.start_session({"run": {"seed": 1}})
+    transport.step_many([(1, 1)])  # endpoint discovery
+    transport.start_session({"run": {"seed": 1}})
+    before = transport.round_trips
+    batched = transport.step_many(dice)
+    assert transport.round_trips - before == 1
+    assert [r["total"] for r in batched] == [7, 4, 6, 4]
+
+    transport.start_session({"run": {"seed": 1}})
+    singles = [transport.step(dice=d) for d in dice]
+    assert [r["snapshot"]["point_value"] for r in singles] == [
+        r["snapshot"]["point_value"] for r in batched
+    ]
+
+
+def test_flush_and_non_coalescing_mode(engine):
+    server, transport = engine
+    transport.start_session({})
+    transport.apply("place_6", {"amount": 12})
+    results = transport.flush()
+    assert results[0]["status"] == "ok"
+    assert transport.snapshot()["bets"] == {"place_6": 12.0}
+
+    eager = KeepAliveHTTPTransport(base_url=server.base_url, coalesce=False)
+    eager.start_session({})
+    assert eager.apply("place_8", {"amount": 12})["status"] == "ok"
+    assert eager.snapshot()["bets"] == {"place_8": 12.0}
+    eager.close()
+
+
+def test_unreachable_engine_reports_error():
+    transport = KeepAliveHTTPTransport(base_url="http://127.0.0.1:9/api/engine", timeout=1)
+    assert "error" in transport.version()
+    assert all("error" in r for r in transport.step_many([(1, 1), (2, 2)]))
+
+
+def test_request_the_engine_may_have_seen_is_not_resent():
+    import socket
+    import threading
+
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    seen = []
+
+    def serve():
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            seen.append(conn.recv(65536))
+            conn.close()  # read the request, then drop it without a response
+
+    threading.Thread(target=serve, daemon=True).start()
+    port = listener.getsockname()[1]
+    transport = KeepAliveHTTPTransport(base_url=f"http://127.0.0.1:{port}/api/engine", timeout=2)
+    try:
+        assert "error" in transport.step(dice=(3, 4))
+        assert len(seen) == 1
+    finally:
+        transport.close()
+        listener.close()
+
+
+def test_idle_connection_dropped_by_the_engine_is_replaced(engine):
+    server, transport = engine
+    transport.start_session({"run": {"seed": 2}})
+    for conn in list(transport._pool._idle):
+        conn.sock.shutdown(2)  # as if the server had timed the idle connection out
+    assert "error" not in transport.version()
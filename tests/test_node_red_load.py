@@ -0,0 +1,64 @@
+from crapssim_control.simulators import LoadProfile, NodeRedSimulator
+from crapssim_control.simulators.load_harness import run_command_load
+from crapssim_control.simulators.node_red_sim import LoadSample, rejection_bucket
+
+
+def test_rejection_buckets():
+    assert rejection_bucket("rate_limited") == "rate_limit"
+    assert rejection_bucket("queue_full") == "backpressure"
+    assert rejection_bucket("circuit_breaker") == "circuit_breaker"
+    assert rejection_bucket("duplicate_roll") == "duplicate_roll"
+    assert rejection_bucket("timing:point_comeout_only") == "timing"
+    assert rejection_bucket("unknown_action") == "other"
+
+
+def test_load_report_correlates_journal(tmp_path):
+    sim = NodeRedSimulator()
+    sim._load_samples = {
+        "a": LoadSample("a", "s0", "press", sent_at=10.0, acked_at=10.002, status=202),
+        "b": LoadSample("b", "s1", "press", sent_at=10.01, acked_at=10.012, status=202),
+        "c": LoadSample(
+            "c", "s0", "regress", sent_at=10.02, acked_at=10.021, status=400, reason="rate_limited"
+        ),
+    }
+    journal = tmp_path / "decision_journal.jsonl"
+    journal.write_text(
+        '{"correlation_id": "c", "timestamp": 10.021, "executed": false,'
+        ' "rejection_reason": "rate_limited"}\n'
+        '{"correlation_id": "a", "timestamp": 10.05, "executed": true,'
+        ' "enqueued_at": 10.001, "executed_at": 10.04}\n'
+        '{"correlation_id": "b", "timestamp": 10.06, "executed": false,'
+        ' "rejection_reason": "duplicate_roll", "enqueued_at": 10.011, "executed_at": 10.055}\n',
+        encoding="utf-8",
+    )
+
+    report = sim.load_report(journal)
+
+    assert report["attempted"] == 3
+    assert report["accepted"] == 2
+    assert report["executed"] == 1
+    assert report["rejected"] == {"rate_limit": 1, "duplicate_roll": 1}
+    latency = report["latency_ms"]
+    assert latency["ack"]["count"] == 3
+    assert latency["end_to_end"]["count"] == 2
+    assert abs(latency["end_to_end"]["max"] - 50.0) < 1e-6
+    assert abs(latency["enqueue_to_execute"]["p50"] - 39.0) < 1e-6
+
+
+def test_run_command_load_end_to_end(tmp_path):
+    report = run_command_load(
+        LoadProfile(rate=200, duration=0.3, sources=3, concurrency=4),
+        workdir=tmp_path,
+        roll_interval=0.005,
+    )
+
+    assert report["attempted"] == 60
+    # default token buckets admit 3 commands per source per refill window
+    assert report["accepted"] == report["queue"]["enqueued"] == 9
+    assert report["rejected"]["rate_limit"] == 51
+    decided = report["executed"] + report["rejected"].get("duplicate_roll", 0)
+    decided += report["rejected"].get("timing", 0)
+    assert decided == 9
+    e2e = report["latency_ms"]["end_to_end"]
+    assert e2e["count"] == 9
+    assert 0 < e2e["p50"] <= e2e["p99"] <= e2e["max"]
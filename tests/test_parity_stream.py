@@ -0,0 +1,120 @@
+import random
+
+from crapssim_control.engine_adapter import VanillaAdapter
+from crapssim_control.replay_tester import run_replay_parity_report
+from crapssim_control.testing.engine_parity import run_parity_stream, run_parity_test
+from crapssim_control.testing.parity_stream import (
+    DigestChainFile,
+    canonical_snapshot_bytes,
+    first_divergent_checkpoint,
+    locate_divergence,
+    record_digest_chain,
+    snapshot_diff,
+    stream_parity,
+    verify_against_chain,
+)
+
+
+def _adapter(seed=11):
+    adapter = VanillaAdapter()
+    adapter.start_session({"seed": seed})
+    return adapter
+
+
+def _dice(seed=5, n=400):
+    rng = random.Random(seed)
+    return [(rng.randint(1, 6), rng.randint(1, 6)) for _ in range(n)]
+
+
+class _Drifting:
+    """Adapter wrapper that corrupts bankroll from roll ``at`` onward."""
+
+    def __init__(self, at, seed=11):
+        self.inner = _adapter(seed)
+        self.at = at
+        self.rolls = 0
+
+    def step_roll(self, dice=None):
+        res = self.inner.step_roll(dice=dice)
+        self.rolls += 1
+        return res
+
+    def snapshot_state(self):
+        snap = self.inner.snapshot_state()
+        if self.rolls > self.at:
+            snap["bankroll"] = float(snap.get("bankroll") or 0.0) + 1.0
+        return snap
+
+
+def _snap(engine, _result):
+    return engine.snapshot_state()
+
+
+def test_canonical_bytes_ignore_volatile_and_float_noise():
+    a = {"bankroll": 100.0000001, "dice": (3, 4), "session_id": "x", "z": -0.0}
+    b = {"z": 0.0, "dice": [3, 4], "bankroll": 100.0, "session_id": "y"}
+    assert canonical_snapshot_bytes(a) == canonical_snapshot_bytes(b)
+    assert snapshot_diff({"a": {"b": 1, "c": 2}}, {"a": {"b": 1, "c": 3}}) == {"a.c": (2, 3)}
+
+
+def test_stream_parity_identical_and_divergent():
+    dice = _dice()
+    ok = stream_parity(_adapter(), _adapter(), dice, snapshot=_snap)
+    assert ok.ok and ok.rolls == len(dice)
+
+    bad = stream_parity(_adapter(), _Drifting(at=137), dice, snapshot=_snap)
+    assert not bad.ok
+    assert bad.first_divergence == 137
+    assert bad.dice == dice[137]
+    assert list(bad.diff) == ["bankroll"]
+
+
+def test_run_parity_test_keeps_step_list_and_stream_variant_is_definite():
+    dice = _dice()
+    steps = run_parity_test(_adapter(), _adapter(), dice, steps=50)
+    assert [s["index"] for s in steps] == list(range(50))
+    assert all(s["dice"] == dice[s["index"]] for s in steps)
+    assert all(s["inprocess"] == s["http_api"] for s in steps)
+
+    same = run_parity_stream(_adapter(), _adapter(), dice, steps=50)
+    assert same.ok and same.rolls == 50 and same.first_divergence is None
+    assert same.digest == stream_parity(_adapter(), _adapter(), dice[:50]).digest
+
+    other = run_parity_stream(_adapter(), _adapter(seed=12), dice, steps=50)
+    assert not other.ok and other.first_divergence == 0
+    assert other.diff == {"rng_seed": (11, 12)}
+
+
+def test_digest_chain_record_verify_and_bisect(tmp_path):
+    dice = _dice(n=300)
+    ref = tmp_path / "ref.chain"
+    info = record_digest_chain(_adapter(), dice, ref, every=32, snapshot=_snap)
+    chain = DigestChainFile(ref)
+    assert info["rolls"] == 300 and len(chain) == 10  # 9 full checkpoints + tail
+    assert chain.checkpoint(len(chain) - 1)[0] == 300
+
+    assert verify_against_chain(_adapter(), dice, ref, snapshot=_snap).ok
+
+    drift = tmp_path / "drift.chain"
+    record_digest_chain(_Drifting(at=200), dice, drift, every=32, snapshot=_snap)
+    assert first_divergent_checkpoint(ref, drift) == 200 // 32
+    assert first_divergent_checkpoint(ref, ref) is None
+
+    coarse = verify_against_chain(_Drifting(at=200), dice, ref, snapshot=_snap)
+    assert not coarse.ok and coarse.window == (192, 224)
+
+    fine = locate_divergence(
+        ref,
+        lambda: _Drifting(at=200),
+        lambda: iter(dice),
+        make_reference=_adapter,
+        snapshot=_snap,
+    )
+    assert fine.first_divergence == 200
+    assert fine.window == (192, 224)
+    assert "bankroll" in fine.diff
+
+
+def test_replay_parity_compares_full_snapshots():
+    result = run_replay_parity_report(seed=3, rolls=250)
+    assert result.ok and result.rolls == 250
@@ -62,3 +62,27 @@ def test_namespace_unique(tmp_path):
     m2 = loader.load(spec)
     assert m1 is not m2
     assert m1.__name__ != m2.__name__
+
+
+def test_capability_module_is_cached_per_content_and_policy(tmp_path):
+    code = "import math\nLOADS = [1]\nclass Toy:\n    def __init__(self): self.n = len(LOADS)"
+    spec = make_toy_plugin(tmp_path, code)
+    spec.capabilities[0].entry += ":Toy"
+    policy = SandboxPolicy(["math"], ["os"], init_timeout=1)
+
+    a = PluginLoader(policy).instantiate(spec, "verb", "toy", "1.0.0")
+    b = PluginLoader(policy).instantiate(spec, "verb", "toy", "1.0.0")
+    assert a is not b and type(a) is type(b)
+
+    strict = PluginLoader(SandboxPolicy(["time"], ["os", "math"], init_timeout=1))
+    with pytest.raises(ImportError):
+        strict.load_capability(spec, "verb", "toy", "1.0.0")
+
+    (tmp_path / "toy.py").write_text(code.replace("[1]", "[1, 2]"))
+    c = PluginLoader(policy).instantiate(spec, "verb", "toy", "1.0.0")
+    assert type(c) is not type(a) and c.n == 2
+
+    cached = PluginLoader(policy).load_capability(spec, "verb", "toy", "1.0.0")
+    assert cached is PluginLoader(policy).load_capability(spec, "verb", "toy", "1.0.0")
+    uncached = PluginLoader(policy, use_cache=False)
+    assert uncached.load_capability(spec, "verb", "toy", "1.0.0") is not cached
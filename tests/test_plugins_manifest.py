@@ -76,3 +76,26 @@ def test_resolve(tmp_path):
     spec = reg.resolve("verb", "roll_strategy", "1.0.0")
     assert spec is not None
     assert spec.name == "author.sample"
+
+
+def test_discovery_is_cached_until_a_directory_changes(tmp_path, monkeypatch):
+    from crapssim_control.plugins import registry as registry_mod
+
+    make_manifest(tmp_path)
+    first = PluginRegistry().discover([str(tmp_path)])
+
+    def no_parse(*_args, **_kwargs):
+        raise AssertionError("manifest re-read")
+
+    monkeypatch.setattr(registry_mod.yaml, "safe_load", no_parse)
+    again = PluginRegistry().discover([str(tmp_path)])
+    assert [s.name for s in again] == [s.name for s in first]
+    monkeypatch.undo()
+
+    other = tmp_path / "pluginB"
+    other.mkdir()
+    (other / "plugin.yaml").write_text(
+        (tmp_path / "pluginA" / "plugin.yaml").read_text().replace("author.sample", "author.other")
+    )
+    names = [s.name for s in PluginRegistry().discover([str(tmp_path)])]
+    assert names == ["author.other", "author.sample"]
@@ -0,0 +1,80 @@
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from crapssim_control import batch_runner
+from crapssim_control.engine_adapter import resolve_engine_adapter
+from crapssim_control.rng import RngStreams
+
+
+def test_root_stream_matches_default_rng_and_children_are_positional():
+    root = RngStreams(42)
+    assert root.int_seed() == 42
+    assert list(root.dice().integers(1, 7, 20)) == list(
+        np.random.default_rng(42).integers(1, 7, 20)
+    )
+
+    # a child's seed depends only on its key, never on what was drawn before
+    later = [RngStreams(42).item_seed(i) for i in (3, 2, 1, 0)]
+    assert later[::-1] == [root.item_seed(i) for i in range(4)]
+    assert len({root.item_seed(i) for i in range(100)}) == 100
+    assert root.stream("policy").int_seed() not in {root.item_seed(i) for i in range(100)}
+    assert root.stream("policy").python_random().random() == (
+        RngStreams(42).stream("policy").python_random().random()
+    )
+
+
+def test_bind_table_replaces_dice_generator_without_global_state():
+    class Dice:
+        def __init__(self):
+            self.rng = np.random.default_rng(0)
+
+    class Table:
+        dice = Dice()
+
+    table = Table()
+    state = random.getstate()
+    assert RngStreams(9).bind_table(table)
+    assert random.getstate() == state
+    assert table.dice.rng.integers(1, 7) == np.random.default_rng(9).integers(1, 7)
+
+
+def _write_json(path, obj):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(obj, indent=2, sort_keys=True), encoding="utf-8")
+
+
+@pytest.mark.skipif(resolve_engine_adapter()[0] is None, reason="CrapsSim engine not installed")
+def test_batch_items_are_identical_in_any_order(tmp_path):
+    paths = []
+    for i, units in enumerate((5, 10, 15, 20)):
+        spec = {
+            "table": {},
+            "variables": {"units": units},
+            "modes": {"Main": {"template": {"pass": "units", "place_6": 12}}},
+            "rules": [],
+            "run": {"rolls": 60},
+        }
+        _write_json(tmp_path / f"s{i}" / "spec.json", spec)
+        paths.append(str(tmp_path / f"s{i}" / "spec.json"))
+    plan = {"items": [{"path": p} for p in paths], "out_dir": str(tmp_path / "seq"), "seed": 77}
+    _write_json(tmp_path / "plan.json", plan)
+
+    manifest = batch_runner.run_batch(str(tmp_path / "plan.json"), artifacts="metrics-only")
+    sequential = {rec["source"]: (rec["seed"], rec["summary"]) for rec in manifest["items"]}
+
+    # Reversed "scheduling", with global RNG noise between runs
+    streams = RngStreams(77)
+    for index in reversed(range(len(paths))):
+        random.seed(index)
+        np.random.seed(index)
+        rec = batch_runner.run_single_bundle_or_spec(
+            paths[index],
+            str(tmp_path / "rev"),
+            artifacts="metrics-only",
+            default_seed=streams.item_seed(index),
+        )
+        assert (rec["seed"], rec["summary"]) == sequential[paths[index]]
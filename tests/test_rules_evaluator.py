@@ -42,3 +42,36 @@ def test_disabled_rule_skips():
     ctx = {"bankroll_after": 100}
     res = evaluate_rules(rules, ctx)
     assert res[0]["reason"] == "disabled"
+
+
+def test_compiled_ruleset_only_reports_fired_or_errored():
+    from crapssim_control.rules_engine.evaluator import compile_ruleset
+
+    rules = [
+        {"id": f"R{i}", "when": f"bankroll_after < {i * 100}", "enabled": True} for i in range(1, 8)
+    ]
+    rules.append({"id": "BAD", "when": "open('x')", "enabled": True})
+    rules.append({"id": "MISSING", "when": "dc_wins > 1", "enabled": True})
+    rules.append({"id": "OFF", "when": "True", "enabled": False})
+    compiled = compile_ruleset(rules)
+    assert [e.split(":")[0] for e in compiled.errors] == ["BAD"]
+
+    ctx = {"bankroll_after": 550, "point_on": False, "dc_wins": None}
+    res = compiled.evaluate(ctx)
+    assert [r["rule_id"] for r in res] == ["R6", "R7", "BAD", "MISSING"]
+    assert res[0]["fired"] and res[0]["vars"] == {"bankroll_after": 550, "point_on": False}
+    assert res[3]["error"] == "Unknown var: dc_wins"
+
+    full = evaluate_rules(rules, ctx)
+    assert len(full) == len(rules)
+    assert [r["rule_id"] for r in full if r["fired"]] == ["R6", "R7"]
+    assert full[-1]["reason"] == "disabled"
+
+
+def test_compiled_expressions_match_semantics():
+    from crapssim_control.rules_engine.evaluator import _eval_expr
+
+    ctx = {"box_hits": {"6": 2}, "last_roll_total": 8, "point_on": True}
+    assert _eval_expr("box_hits['6'] >= 2 and 4 < last_roll_total <= 8", ctx) is True
+    assert _eval_expr("not point_on or last_roll_total % 2 == 1", ctx) is False
+    assert _eval_expr("-last_roll_total + 10", ctx) == 2
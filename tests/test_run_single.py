@@ -0,0 +1,106 @@
+import json
+
+import pytest
+
+from crapssim_control.run.artifacts import RUN_METRICS_NAME
+from crapssim_control.run.single import RunWorker, rerun_full, run_single
+
+
+def _spec(**run):
+    return {
+        "table": {},
+        "variables": {"units": 10},
+        "modes": {"Main": {"template": {"pass": "units", "place_6": 12, "place_8": 12}}},
+        "rules": [],
+        "run": dict(run),
+    }
+
+
+def test_warm_worker_runs_specs_and_respects_artifact_levels(tmp_path):
+    worker = RunWorker()
+    full = run_single(_spec(), tmp_path / "full", seed=7, rolls=60, artifacts="full", worker=worker)
+    if full.status == "engine_unavailable":
+        pytest.skip("CrapsSim engine not installed")
+    assert full.ok and full.rolls == 60 and full.seed == 7
+    adapter = worker._adapter
+    assert {p.name for p in (tmp_path / "full").iterdir()} == {
+        "report.json",
+        "summary.json",
+        "spec.json",
+    }
+    report = json.loads((tmp_path / "full" / "report.json").read_text("utf-8"))
+    assert report["summary"]["bankroll_final"] == full.bankroll_final
+
+    again = run_single(_spec(), tmp_path / "again", seed=7, rolls=60, worker=worker)
+    shared = tmp_path / RUN_METRICS_NAME
+    lean = run_single(
+        _spec(),
+        tmp_path / "lean",
+        seed=8,
+        rolls=60,
+        artifacts="metrics-only",
+        metrics_path=shared,
+        worker=worker,
+    )
+    assert worker.runs == 3 and worker._adapter is adapter
+    assert again.bankroll_final == full.bankroll_final
+    assert {p.name for p in (tmp_path / "again").iterdir()} == {"report.json", "summary.json"}
+    assert lean.ok and lean.artifacts_dir is None
+    assert not (tmp_path / "lean").exists()
+    (record,) = [json.loads(line) for line in shared.read_text("utf-8").splitlines()]
+    assert record["seed"] == 8 and record["rolls"] == 60
+    assert record["summary"]["bankroll_final"] == lean.bankroll_final
+
+    # The compact record is enough to regenerate the full artifact set.
+    full_again = rerun_full(record, tmp_path / "rerun", spec=_spec(), worker=worker)
+    assert full_again.bankroll_final == lean.bankroll_final
+    assert (tmp_path / "rerun" / "spec.json").is_file()
+
+
+def test_invalid_spec_and_artifact_level(tmp_path):
+    result = run_single({"rules": []}, tmp_path / "bad", worker=RunWorker())
+    assert result.status == "invalid" and result.errors
+    assert result.bankroll_final is None
+    assert json.loads((tmp_path / "bad" / "report.json").read_text("utf-8"))["errors"]
+
+    with pytest.raises(ValueError):
+        run_single(_spec(), tmp_path / "x", artifacts="everything")
+
+
+class _ShortDice:
+    def __init__(self):
+        self.n_rolls = 0
+
+
+class _ShortTable:
+    """Stands in for a table whose stop condition ends the run after 5 rolls."""
+
+    def __init__(self):
+        self.dice = _ShortDice()
+        self.players = []
+
+    def run(self, rolls, verbose=True):
+        self.dice.n_rolls += min(rolls, 5)
+
+
+class _ShortAdapter:
+    def attach(self, spec):
+        return type("Attached", (), {"table": _ShortTable()})()
+
+
+def test_reseeded_runs_share_prepared_spec_and_report_rolls_played(tmp_path, monkeypatch):
+    monkeypatch.setattr("crapssim_control.run.single.PREPARED_CACHE_SIZE", 2)
+    worker = RunWorker()
+    worker._engine_cls, worker._engine_resolved = _ShortAdapter, True
+
+    first = run_single(_spec(), tmp_path / "a", seed=1, rolls=60, worker=worker)
+    second = run_single(_spec(), tmp_path / "b", seed=2, rolls=80, worker=worker)
+    assert first.ok and second.ok
+    assert first.rolls == second.rolls == 5
+    assert len(worker._prepared) == 1
+
+    for units in (5, 20, 30):
+        spec = _spec()
+        spec["variables"]["units"] = units
+        run_single(spec, tmp_path / f"u{units}", seed=1, rolls=10, worker=worker)
+    assert len(worker._prepared) == 2
@@ -0,0 +1,100 @@
+import json
+import random
+import statistics
+import tracemalloc
+
+import pytest
+
+from crapssim_control.analytics.streaming import P2Quantile, QuantileSketch, RunningStats
+from crapssim_control.controller import iter_journal_dice, replay_run, simulate_rounds
+from crapssim_control.engine_adapter import VanillaAdapter
+
+
+def test_running_stats_matches_exact():
+    rng = random.Random(7)
+    xs = [1000 + rng.gauss(0, 50) for _ in range(5000)]
+    stats = RunningStats().extend(xs)
+
+    assert stats.count == len(xs)
+    assert (stats.first, stats.last) == (xs[0], xs[-1])
+    assert (stats.peak, stats.trough) == (max(xs), min(xs))
+    assert stats.mean == pytest.approx(statistics.fmean(xs))
+    assert stats.stddev == pytest.approx(statistics.stdev(xs))
+
+    running_peak, worst = xs[0], 0.0
+    for x in xs:
+        running_peak = max(running_peak, x)
+        worst = max(worst, running_peak - x)
+    assert stats.max_drawdown == pytest.approx(worst)
+
+
+def test_p2_quantiles_track_sorted_values():
+    rng = random.Random(11)
+    xs = [rng.uniform(0, 1000) for _ in range(20000)]
+    sketch = QuantileSketch((0.05, 0.5, 0.95))
+    for x in xs:
+        sketch.push(x)
+    ordered = sorted(xs)
+    for label, q in (("p05", 0.05), ("p50", 0.5), ("p95", 0.95)):
+        exact = ordered[int(q * len(ordered))]
+        assert sketch.summary()[label] == pytest.approx(exact, abs=15.0)
+
+    small = P2Quantile(0.5)
+    for x in (3, 1, 2):
+        small.push(x)
+    assert small.value() == 2
+
+
+def _stub_adapter():
+    adapter = VanillaAdapter()
+    adapter.start_session({"run": {"adapter": {"live_engine": False}}})
+    return adapter
+
+
+class _CountingAdapter:
+    """Minimal step_roll source so the memory check measures simulate_rounds itself."""
+
+    def __init__(self):
+        self.n = 0
+
+    def step_roll(self, dice=None):
+        self.n += 1
+        bankroll = 1000.0 + (self.n % 37) - 18
+        return {
+            "dice": (3, 4),
+            "total": 7,
+            "pso": self.n % 50 == 0,
+            "snapshot": {"bankroll_after": bankroll, "point_value": None},
+        }
+
+
+def test_simulate_and_replay_stream_with_flat_memory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def peak_bytes(rolls):
+        tracemalloc.start()
+        simulate_rounds(_CountingAdapter(), rolls=rolls, seed=None, outfile_prefix=f"r{rolls}")
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak
+
+    small, large = peak_bytes(2_000), peak_bytes(40_000)
+    assert large < small * 1.5  # no per-roll accumulation
+
+    result = simulate_rounds(_stub_adapter(), rolls=300, seed=9, quantiles=(0.5,))
+    summary = result["summary"]
+    assert summary["psos"] == summary["hands"]
+    assert summary["bankroll_trough"] <= summary["bankroll_mean"] <= summary["bankroll_peak"]
+    assert set(summary["bankroll_quantiles"]) == {"p50"}
+    on_disk = json.loads((tmp_path / "baselines" / "baseline_run_summary.json").read_text())
+    assert on_disk["bankroll_max_drawdown"] == summary["bankroll_max_drawdown"]
+
+    journal = tmp_path / "baselines" / "baseline_run_journal.csv"
+    dice = iter_journal_dice(str(journal))
+    assert next(dice) in {(a, b) for a in range(1, 7) for b in range(1, 7)}
+    dice.close()
+
+    replay = replay_run(_stub_adapter(), str(journal))
+    assert replay["rolls"] == 300
+    assert replay["bankroll_end"] == pytest.approx(summary["bankroll_end"])
+    assert replay["bankroll_peak"] == pytest.approx(summary["bankroll_peak"])
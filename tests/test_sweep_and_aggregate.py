@@ -86,6 +86,52 @@ def test_grid_expansion_counts(tmp_path):
     assert len(items) == 3 * 2  # 3 bankrolls × 2 table_min
 
 
+def test_grid_expansion_is_lazy_without_spec_files(tmp_path):
+    template = _mk_template_spec(tmp_path)
+    plan = {
+        "mode": "grid",
+        "out_dir": str(tmp_path / "exports"),
+        "template": template,
+        "vars": {"bankroll": list(range(1000)), "table_min": list(range(1000))},
+    }
+    plan_path = tmp_path / "big.json"
+    _write_json(plan_path, plan)
+
+    items, _, _ = expand_plan(str(plan_path))
+    assert len(items) == 1_000_000
+    last = items[-1]
+    assert last.overrides == {"bankroll": 999, "table_min": 999}
+    assert items[1234].overrides == {"bankroll": 1, "table_min": 234}
+    spec = items.spec_for(last)
+    assert spec["bankroll"] == 999 and spec["profile"] == "demo"
+    assert not (tmp_path / "exports").exists()
+
+
+def test_grid_sweep_streams_items_into_manifest(tmp_path, monkeypatch):
+    template = _mk_template_spec(tmp_path)
+    plan = _mk_sweep_grid(tmp_path, template)
+    seen = []
+
+    from crapssim_control import batch_runner as br
+
+    def fake_run_spec_item(spec, source, out_root, **_kw):
+        seen.append(spec)
+        return {"run_id": str(len(seen)), "source": source, "status": "success"}
+
+    monkeypatch.setattr(br, "run_spec_item", fake_run_spec_item)
+    manifest_path = run_sweep(plan)
+
+    manifest = json.loads(Path(manifest_path).read_text("utf-8"))
+    assert manifest["artifacts"] == "standard"
+    assert [r["overrides"] for r in manifest["items"]][:2] == [
+        {"bankroll": 500, "table_min": 5},
+        {"bankroll": 500, "table_min": 10},
+    ]
+    assert [s["bankroll"] for s in seen] == [500, 500, 1000, 1000, 2000, 2000]
+    assert {r["source"] for r in manifest["items"]} == {str(template)}
+    assert sorted(p.name for p in (tmp_path / "exports").iterdir()) == ["batch_manifest.json"]
+
+
 def test_aggregator_handles_success_and_error(tmp_path, monkeypatch):
     # We'll fabricate a batch_manifest.json and reports for 2 runs
     out_dir = tmp_path / "exports"
@@ -0,0 +1,106 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from crapssim_control import batch_runner as br
+from crapssim_control.engine_adapter import resolve_engine_adapter
+from crapssim_control.sweep import SampledExpansion, _halving_rungs, expand_plan, run_sweep
+
+
+def _write_json(path, obj):
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    Path(path).write_text(json.dumps(obj, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def _plan(tmp_path, **extra):
+    template = tmp_path / "template.json"
+    _write_json(
+        template,
+        {
+            "table": {},
+            "variables": {"units": 5},
+            "modes": {"Main": {"template": {"pass": "units"}}},
+            "rules": [],
+            "run": {"rolls": 10},
+        },
+    )
+    plan = {
+        "mode": "halving",
+        "template": str(template),
+        "out_dir": str(tmp_path / "exports"),
+        "vars": {"edge": list(range(9))},
+        "halving": {"metric": "ROI", "eta": 3, "min_rolls": 10, "max_rolls": 90, "seed": 5},
+    }
+    plan.update(extra)
+    _write_json(tmp_path / "plan.json", plan)
+    return str(tmp_path / "plan.json")
+
+
+def test_halving_keeps_top_third_per_rung(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_run_spec_item(spec, source, out_root, *, artifacts, seed, **_kw):
+        calls.append((spec["edge"], spec["run"]["rolls"], artifacts, seed["seed"]))
+        final = 1000 + spec["edge"] * 10
+        return {
+            "run_id": f"{spec['edge']}-{spec['run']['rolls']}",
+            "source": source,
+            "input_type": "spec",
+            "status": "success",
+            "summary": {"bankroll_start": 1000, "bankroll_final": final},
+        }
+
+    monkeypatch.setattr(br, "run_spec_item", fake_run_spec_item)
+    manifest = json.loads(Path(run_sweep(_plan(tmp_path))).read_text("utf-8"))
+
+    rungs = manifest["halving"]["rungs"]
+    assert [(r["rolls"], r["candidates"]) for r in rungs] == [(10, 9), (30, 3), (90, 1)]
+    assert rungs[0]["kept"] == [8, 7, 6]
+    assert manifest["halving"]["leaders"] == [8]
+    assert [r["artifacts"] for r in rungs] == ["metrics-only", "metrics-only", "standard"]
+    assert [item["overrides"] for item in manifest["items"]] == [{"edge": 8}]
+    assert manifest["items"][0]["source"] == str(tmp_path / "template.json")
+    # same_dice: a candidate keeps its seed across rungs
+    assert len({seed for edge, _, _, seed in calls if edge == 8}) == 1
+
+
+def test_lhs_sample_hits_every_stratum(tmp_path):
+    sample = SampledExpansion(
+        {"name": "t"},
+        {"bankroll": {"low": 0, "high": 99}, "table_min": [5, 10, 15, 25]},
+        {"method": "lhs", "n": 4, "seed": 3},
+        str(tmp_path),
+        "t",
+    )
+    assert len(sample) == 4
+    combos = [item.overrides for item in sample]
+    assert sorted(c["bankroll"] // 25 for c in combos) == [0, 1, 2, 3]
+    assert sorted(c["table_min"] for c in combos) == [5, 10, 15, 25]
+    assert sample.spec_for(sample[0])["name"] == "t"
+
+
+def test_halving_plan_with_sample_expands_to_n(tmp_path):
+    plan = _plan(tmp_path, sample={"method": "random", "n": 7, "seed": 1})
+    items, _, _ = expand_plan(plan)
+    assert len(items) == 7
+
+
+@pytest.mark.skipif(resolve_engine_adapter()[0] is None, reason="CrapsSim engine not installed")
+def test_halving_runs_on_engine(tmp_path):
+    plan = _plan(tmp_path, vars={"variables": [{"units": u} for u in (5, 10, 15)]})
+    manifest = json.loads(Path(run_sweep(plan)).read_text("utf-8"))
+    rungs = manifest["halving"]["rungs"]
+    assert [r["candidates"] for r in rungs] == [3, 1, 1]
+    assert all(r["status"] == "success" for rung in rungs for r in rung["results"])
+    (item,) = manifest["items"]
+    assert item["output_zip"] and Path(item["output_zip"]).is_file()
+
+
+@pytest.mark.parametrize(
+    "cfg",
+    [{"eta": 1}, {"eta": 0}, {"min_rolls": 0}, {"rolls": [100, 100]}, {"rolls": [300, 100]}],
+)
+def test_halving_rejects_budgets_that_never_grow(cfg):
+    with pytest.raises(ValueError):
+        _halving_rungs(cfg)
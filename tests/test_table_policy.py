@@ -0,0 +1,77 @@
+import pytest
+
+from crapssim_control.controller import ControlStrategy
+from crapssim_control.legalize import legalize_amount
+from crapssim_control.risk_schema import load_risk_policy
+from crapssim_control.table_policy import DEFAULT_TABLE_POLICY, compile_table_policy
+
+
+def test_compiled_policy_matches_dict_legalizer():
+    table = {"bubble": False, "level": 15, "place_410_increment": 10}
+    policy = compile_table_policy({"table": table})
+    for bet, amt in [("pass_line", 7), ("place_4", 27), ("place_6", 20), ("field", 3.5)]:
+        assert legalize_amount(bet, amt, policy) == legalize_amount(bet, amt, table)
+    assert legalize_amount("odds_6_pass", 100, policy, base_line_bet=10) == legalize_amount(
+        "odds_6_pass", 100, table, base_line_bet=10
+    )
+
+
+def test_bubble_place_steps_and_default_policy():
+    policy = compile_table_policy({"table": {"bubble": True}})
+    assert all(policy.place_step(n) == 1 for n in (4, 5, 6, 8, 9, 10))
+    assert DEFAULT_TABLE_POLICY.place_step(6) == 6
+    assert DEFAULT_TABLE_POLICY.place_step(4) == 5
+
+
+def test_policy_is_immutable():
+    policy = compile_table_policy({})
+    with pytest.raises(Exception):
+        policy.max_heat = 1.0  # type: ignore[misc]
+    with pytest.raises(TypeError):
+        policy.place_steps[6] = 1  # type: ignore[index]
+
+
+def test_min_thresholds_and_caps():
+    spec = {
+        "run": {
+            "table_mins": {"line": 10, "field": 7, "odds_unit": 3, "place_unit": {"default": 8}},
+            "risk": {"bet_caps": {"place_6": 4, "field": "bad"}, "max_drawdown_pct": 25},
+        }
+    }
+    policy = compile_table_policy(spec, risk_policy=load_risk_policy(spec))
+    assert policy.min_bet(point_on=False) == 7
+    assert policy.min_bet(point_on=True) == 7
+    assert policy.min_bet(point_on=True, has_flat_line=True) == 3
+    assert policy.caps_allow(4) and not policy.caps_allow(5)
+    assert policy.drawdown_exceeded(70, 100)
+    assert not policy.drawdown_exceeded(80, 100)
+
+
+def test_table_rules_odds_multiples():
+    spec = {"table_rules": {"profile": "live_3_4_5x"}}
+    policy = compile_table_policy(spec)
+    assert policy.odds_multiple(6) == 5.0
+    assert policy.odds_multiple(4) == 3.0
+    flat = compile_table_policy({"table_rules": {"profile": "bubble_1000x"}})
+    assert flat.odds_multiple(5) == 1000.0
+    assert DEFAULT_TABLE_POLICY.odds_multiple(6) == 3.0
+
+
+def test_policy_odds_multiple_caps_legalized_odds():
+    policy = compile_table_policy({"table_rules": {"profile": "live_3_4_5x"}})
+    assert legalize_amount("odds_6_pass", 100, policy, base_line_bet=10)[0] == 50
+    assert legalize_amount("odds_4_pass", 100, policy, base_line_bet=10)[0] == 30
+
+
+def test_controller_templates_render_against_the_spec_table():
+    spec = {
+        "table": {"bubble": True},
+        "variables": {"units": 7},
+        "modes": {"Main": {"template": {"place": {"6": "units"}}}},
+        "rules": [],
+        "run": {"http_commands": {"enabled": False}},
+    }
+    ctrl = ControlStrategy(spec)
+    ctrl.point, ctrl.on_comeout = 6, False
+    (plan,) = ctrl._apply_mode_template_plan({})
+    assert plan["bet_type"] == "place_6" and plan["amount"] == 7
@@ -0,0 +1,81 @@
+from crapssim_control.bet_attrib import attach_bet_attrib
+from crapssim_control.tracker import RollRecord, Tracker, TrackerObserver
+from crapssim_control.tracker_histograms import attach_histograms
+from crapssim_control.tracker_ledger_shim import wire_ledger
+
+
+class _Recorder(TrackerObserver):
+    name = "recorder"
+
+    def __init__(self):
+        self.rolls = []
+        self.sevens = 0
+
+    def on_roll(self, rec: RollRecord) -> None:
+        self.rolls.append((rec.total, rec.roll_index, rec.is_comeout, rec.point))
+
+    def on_seven_out(self) -> None:
+        self.sevens += 1
+
+
+def test_observers_get_one_parsed_record_and_only_overridden_hooks_bind():
+    t = Tracker({"enabled": True})
+    rec = t.register_observer(_Recorder())
+    t.on_roll(6)
+    t.on_point_established(6)
+    t.on_roll({"total": 8})
+    t.on_roll(total=7.0)
+    t.on_seven_out()
+
+    assert rec.rolls == [(6, 0, True, 0), (8, 1, False, 6), (7, 2, False, 6)]
+    assert rec.sevens == 1
+    assert t._hooks["on_bet_placed"] == ()
+    assert t._hooks["contribute"] == ()
+
+    # Re-registering under the same name replaces rather than stacks.
+    again = t.register_observer(_Recorder())
+    t.on_roll(5)
+    assert len(rec.rolls) == 3 and len(again.rolls) == 1
+    assert t.unregister_observer("recorder") is again
+    assert t._roll_hooks == ()
+
+
+def test_all_analytics_attached_counts_each_roll_once():
+    t = Tracker({"enabled": True})
+    wire_ledger(t)
+    attach_bet_attrib(t, enabled=True)
+    attach_histograms(t, enabled=True)
+    attach_histograms(t, enabled=True)  # idempotent
+
+    t.on_bet_placed({"bet": "place", "bet_type": "place_6", "amount": 30, "number": 6})
+    t.on_bet_placed({"bet": "place", "bet_type": "place_6", "amount": 30, "number": 6})
+    for total in (6, 8, 5):
+        t.on_roll(total)
+    t.on_bet_resolved(
+        {
+            "bet": "place",
+            "bet_type": "place_6",
+            "amount": 30,
+            "payout": 65,
+            "number": 6,
+            "outcome": "win",
+        }
+    )
+    t.on_roll(9)
+
+    snap = t.snapshot()
+    assert snap["hits"] == {6: 1, 8: 1, 5: 1, 9: 1}
+    assert snap["history"]["session_hits"]["6"] == 1
+    assert snap["history"]["hand_inside_hits"] == 4
+    assert snap["history"]["hand_outside_hits"] == 2
+
+    row = snap["bet_attrib"]["by_bet_type"]["place_6"]
+    # two units open for three rolls, then one unit for one more roll
+    assert row["exposure_rolls"] == 7
+    assert row["peak_open_bets"] == 2
+    assert row["wins"] == 1
+
+    # Both bet observers see every bet event.
+    assert snap["ledger"]["open_count"] == 1
+    assert snap["ledger"]["closed_count"] == 1
+    assert snap["ledger"]["closed"][0]["meta"]["roll_index_closed"] == 2
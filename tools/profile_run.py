@@ -1,8 +1,8 @@
 """
 CSC Profiling Tool — Phase 16
 
-Profiles controller runtime for duration and memory churn.
-Run:  python -m tools.profile_run <spec_path>
+Profiles controller runtime for duration, memory churn and hot-path spans.
+Run:  python -m tools.profile_run <spec_path> [rolls]
 """
 
 import json
@@ -10,12 +10,16 @@ import sys
 import time
 import tracemalloc
 from pathlib import Path
+from typing import Optional
 
-from crapssim_control import controller
+from crapssim_control import hotpath
+from crapssim_control.events import event_for_roll
+from crapssim_control.controller import ControlStrategy
+from crapssim_control.engine_adapter import VanillaAdapter
 from crapssim_control.spec_loader import load_spec_file
 
 
-def main(spec_path: str) -> None:
+def main(spec_path: str, rolls: int = 1000) -> None:
     spec_path_obj = Path(spec_path)
     if not spec_path_obj.exists():
         raise FileNotFoundError(spec_path)
@@ -24,21 +28,37 @@ def main(spec_path: str) -> None:
         spec["_csc_spec_path"] = str(spec_path_obj)
     except Exception:
         pass
-    if not hasattr(controller, "run"):
-        raise RuntimeError("controller.run is unavailable in this build")
+
+    hotpath.PROFILER.reset()
+    hotpath.PROFILER.enable()
+    adapter = VanillaAdapter()
+    adapter.start_session(spec)
+    ctrl = ControlStrategy(spec)
+
     tracemalloc.start()
-    t0 = time.time()
-    controller.run(spec)
-    elapsed = time.time() - t0
+    t0 = time.perf_counter()
+    prev_point: Optional[int] = None
+    completed = 0
+    for _ in range(rolls):
+        result = adapter.step_roll()
+        if result.get("status") == "terminated":
+            break
+        ctrl.handle_event(event_for_roll(prev_point, result), adapter.bets)
+        prev_point = (result.get("snapshot") or {}).get("point_value")
+        completed += 1
+    elapsed = time.perf_counter() - t0
     current, peak = tracemalloc.get_traced_memory()
     tracemalloc.stop()
+    hotpath.PROFILER.disable()
     print(
         json.dumps(
             {
                 "phase": 16,
+                "rolls": completed,
                 "elapsed_sec": round(elapsed, 3),
                 "mem_current_kb": current // 1024,
                 "mem_peak_kb": peak // 1024,
+                "hotpath": hotpath.summary()["spans"],
             },
             indent=2,
         )
@@ -47,6 +67,6 @@ def main(spec_path: str) -> None:
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python -m tools.profile_run <spec_path>")
+        print("Usage: python -m tools.profile_run <spec_path> [rolls]")
     else:
-        main(sys.argv[1])
+        main(sys.argv[1], int(sys.argv[2]) if len(sys.argv) > 2 else 1000)